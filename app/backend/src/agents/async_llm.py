@@ -0,0 +1,103 @@
+"""Run the synchronous model-stage helpers against asyncio clients.
+
+Every ``run_*_model`` function builds its messages, issues one chat
+completion and post-processes the reply. Rather than keeping a second async
+copy of each stage, :func:`run_model_async` runs the existing function once
+inside a greenlet: when the stage calls ``client.chat.completions.create`` the
+greenlet switches back to the event loop, which awaits the ``AsyncOpenAI``
+request and resumes the stage with the response (or raises the API error
+inside it, so the stage's own fallbacks apply). No worker thread is involved.
+
+:func:`run_blocking` exposes the same bridge for other synchronous code, and
+:class:`AwaitingProxy` presents an asyncio client (``AsyncOpenAI``,
+``redis.asyncio.Redis``) through the blocking interface that code expects.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import inspect
+import sys
+from typing import Any, Awaitable, Callable, TypeVar
+
+from greenlet import getcurrent, greenlet
+from openai import AsyncOpenAI
+
+T = TypeVar("T")
+
+# Attribute values handed back as they are rather than proxied.
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None), dict, list, tuple, set)
+
+
+class _BridgeGreenlet(greenlet):
+    """Greenlet running synchronous code that awaits through :func:`await_`."""
+
+
+def await_(awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable`` from synchronous code running under :func:`run_blocking`."""
+
+    current = getcurrent()
+    if not isinstance(current, _BridgeGreenlet):
+        raise RuntimeError("await_() called outside run_blocking().")
+    return current.parent.switch(awaitable)
+
+
+async def run_blocking(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run ``fn`` on the event loop thread, awaiting whatever it passes to :func:`await_`.
+
+    ``fn`` sees the caller's context variables; exceptions raised by an awaited
+    call (including cancellation) are raised at the ``await_`` site.
+    """
+
+    bridge = _BridgeGreenlet(fn, getcurrent())
+    bridge.gr_context = contextvars.copy_context()
+    result: Any = bridge.switch(*args, **kwargs)
+    while not bridge.dead:
+        try:
+            value = await result
+        except BaseException:
+            result = bridge.throw(*sys.exc_info())
+        else:
+            result = bridge.switch(value)
+    return result
+
+
+class AwaitingProxy:
+    """Blocking view of an asyncio client for code run under :func:`run_blocking`.
+
+    Namespaces such as ``client.chat.completions`` are proxied in turn; calls
+    returning an awaitable are awaited on the event loop.
+    """
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if callable(value):
+            return _awaiting(value)
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+        return AwaitingProxy(value)
+
+
+def _awaiting(method: Callable[..., Any]) -> Callable[..., Any]:
+    def _call(*args: Any, **kwargs: Any) -> Any:
+        result = method(*args, **kwargs)
+        return await_(result) if inspect.isawaitable(result) else result
+
+    return _call
+
+
+async def run_model_async(
+    run_model: Callable[..., Any],
+    *,
+    client: AsyncOpenAI,
+    **kwargs: Any,
+) -> Any:
+    """Run ``run_model`` once, awaiting its chat completions on ``client``."""
+
+    return await run_blocking(run_model, client=AwaitingProxy(client), **kwargs)
+
+
+__all__ = ["AwaitingProxy", "await_", "run_blocking", "run_model_async"]
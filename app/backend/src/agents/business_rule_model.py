@@ -6,8 +6,9 @@ import json
 from typing import Any
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .async_llm import run_model_async
 from .ir import AnalyticsIR
 from .json_utils import _extract_json_object
 
@@ -166,3 +167,9 @@ def run_business_rule_model(
         result["issues"] = []
 
     return result
+
+
+async def arun_business_rule_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_business_rule_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_business_rule_model, client=client, **kwargs)
@@ -2,48 +2,92 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import re
 import json
+import threading
 from dataclasses import dataclass, field
-import hashlib
 from html import escape
 from time import perf_counter
 import time
-from typing import Any, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from pydantic import BaseModel
 from sqlalchemy import text as sql_text
 from sqlalchemy.engine import Engine
 
 from app.backend.src.core.config import get_settings
 from app.backend.src.core.redis_cache import RedisAnalyticsCache
+from app.backend.src.core.single_flight import FlightLease, RedisSingleFlight
 from app.backend.src.core.memory import ConversationMemory, RedisConversationMemory
-from app.backend.src.db import get_engine
+from app.backend.src.db import get_async_engine, get_engine
+from app.backend.src.models.materialized_report import ORIGIN_PREFETCH, ORIGIN_USER
+from app.backend.src.services.entity_catalog import get_entity_catalog
+from app.backend.src.services.prefetch_accounting import (
+    amark_prefetched,
+    arecord_prefetch_hit,
+    mark_prefetched,
+    record_prefetch_hit,
+)
+from app.backend.src.services.prefetch_predictor import (
+    arecord_transition,
+    is_prefetch_session,
+    record_transition,
+)
 from app.backend.src.services.prefetch_service import enqueue_prefetch_jobs
 from app.backend.src.services.s3 import get_s3_client
 from app.backend.src.services.materialized_report_service import (
+    afetch_materialized_report,
+    apersist_materialized_report,
     fetch_materialized_report,
     persist_materialized_report,
 )
-from .multi_turn_model import MultiTurnConversationManager
+from .async_llm import AwaitingProxy, await_, run_blocking, run_model_async
+from .multi_turn_model import ConversationState, MultiTurnConversationManager
 from .business_rule_model import build_business_rule_system_prompt, run_business_rule_model
 from .entity_resolution_model import (
     build_entity_resolution_system_prompt,
     run_entity_resolution_model,
 )
+from .fast_path import FastPathPlan, intent_for_plan, plan_fast_path, plan_for_intent
 from .insight_model import build_insight_system_prompt, run_insight_model
 from .ir import AnalyticsEntities, AnalyticsIR, _coerce_rows, _payload_to_ir
 from .logic_model import build_logic_system_prompt, run_logic_model
-from .nlv_model import build_nlv_system_prompt, run_nlv_model
+from .nlv_model import build_nlv_system_prompt, normalize_nlv_payload, run_nlv_model
+from .query_cache import QUERY_CACHE, build_entry, intent_cache_key, query_cache_key
 from .rendering_model import build_rendering_system_prompt, run_rendering_model
 from .sql_router import build_sql_router_system_prompt, run_sql_router_model
 from .sql_planner_model import build_sql_planner_system_prompt, run_sql_planner_model
+from .stage_graph import (
+    GraphResult,
+    Stage,
+    StageGraph,
+    StageHalt,
+    StageSpan,
+    critical_path,
+    run_sync,
+)
+from .stage_memo import StageMemo
+from .table_templates import select_table_template
 from .validator_model import build_validator_system_prompt, run_validator_model
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
 LOGGER = structlog.get_logger(__name__)
-CACHE = RedisAnalyticsCache()
+# Keys carry the district's data version, so entries go stale by key rather
+# than by expiry and the TTL only bounds memory.
+CACHE = RedisAnalyticsCache(
+    ttl_seconds=get_settings().analytics_cache_ttl_sec,
+    l1_max_bytes=get_settings().analytics_l1_cache_max_bytes,
+)
+SINGLE_FLIGHT = RedisSingleFlight(
+    key_prefix="analytics_inflight",
+    lock_ttl_seconds=get_settings().analytics_single_flight_lock_ttl_sec,
+)
 
 
 def log_timing(stage, start, end):
@@ -114,7 +158,14 @@ class AgentContext:
     memory: ConversationMemory | None = None
     last_sql: str | None = None
     timings: dict[str, float] = field(default_factory=dict)
+    spans: dict[str, StageSpan] = field(default_factory=dict)
+    stage_dependencies: dict[str, tuple[str, ...]] = field(default_factory=dict)
     started_at: float = field(default_factory=perf_counter)
+    native_async: bool = False
+    on_event: Callable[[str, dict[str, Any]], None] | None = None
+    flight_lease: FlightLease | None = None
+    # Plan kind the session answered last, read before this turn updates it.
+    prior_plan_kind: str | None = None
 
     @property
     def district_id(self) -> int | None:
@@ -145,6 +196,7 @@ class Tool:
     description: str
     input_schema: Mapping[str, Any]
     handler: Any
+    async_handler: Any = None
 
     def schema(self) -> dict[str, Any]:
         return {
@@ -159,6 +211,38 @@ class Tool:
     def invoke(self, context: AgentContext, arguments: Mapping[str, Any]) -> Any:
         return self.handler(context, arguments)
 
+    async def ainvoke(self, context: AgentContext, arguments: Mapping[str, Any]) -> Any:
+        _emit(context, "stage_started", stage=self.name)
+        if context.native_async and self.async_handler is not None:
+            return await self.async_handler(context, arguments)
+        return await asyncio.to_thread(self.handler, context, arguments)
+
+
+def _emit(context: AgentContext, event: str, **data: Any) -> None:
+    """Report workflow progress to ``context.on_event`` (used for streaming)."""
+
+    if context.on_event is None:
+        return
+    try:
+        context.on_event(event, data)
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("analytics_event_emit_failed", event_name=event, error=str(exc))
+
+
+def _emit_rows_ready(context: AgentContext, ir: AnalyticsIR, mode: str | None) -> None:
+    """Emit the result rows and their table HTML before the insight/rendering stages."""
+
+    if context.on_event is None or not ir.rows:
+        return
+    rows = _strip_sensitive_columns(ir.rows)
+    table_ir = ir.model_copy(update={"rows": rows})
+    try:
+        html = select_table_template(table_ir, mode or getattr(ir, "mode", None))
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("analytics_rows_table_failed", error=str(exc))
+        html = _render_html_table(rows)
+    _emit(context, "rows_ready", rows=rows, html=html, mode=getattr(table_ir, "mode", mode))
+
 
 def _record_stage_duration(context: AgentContext, stage: str, start_time: float) -> None:
     """Track the elapsed time for an individual model stage."""
@@ -170,6 +254,18 @@ def _record_stage_duration(context: AgentContext, stage: str, start_time: float)
 
     previous = context.timings.get(stage, 0.0)
     context.timings[stage] = previous + elapsed
+    context.spans[stage] = StageSpan(
+        start=start_time - context.started_at, end=start_time - context.started_at + elapsed
+    )
+
+
+def _record_graph_spans(context: AgentContext, graph: StageGraph, result: GraphResult) -> None:
+    """Fold the spans of a completed stage graph into the context timings."""
+
+    context.stage_dependencies.update(graph.dependencies)
+    for name, span in result.spans.items():
+        context.timings[name] = context.timings.get(name, 0.0) + span.duration
+        context.spans[name] = span
 
 
 def _build_timing_summary(context: AgentContext) -> dict[str, Any] | None:
@@ -186,6 +282,13 @@ def _build_timing_summary(context: AgentContext) -> dict[str, Any] | None:
             name: round(duration, 3) for name, duration in context.timings.items()
         }
 
+    if context.spans:
+        summary["spans"] = {
+            name: {"start": round(span.start, 3), "end": round(span.end, 3)}
+            for name, span in sorted(context.spans.items(), key=lambda item: item[1].start)
+        }
+        summary["critical_path"] = critical_path(context.spans, context.stage_dependencies)
+
     return summary
 
 
@@ -424,72 +527,133 @@ def _maybe_apply_active_student_filter(raw_query: str, active_filters: dict[str,
     return rewritten_query
 
 
-def _load_district_entities(engine: Engine, district_key: str | None) -> dict[str, list[str]]:
-    """Load district-scoped entities for students, vendors, and clinicians."""
+_DISTRICT_STUDENTS_SQL = """
+    SELECT DISTINCT student_name
+    FROM invoices
+    WHERE district_key = :district_key
+      AND student_name IS NOT NULL
+    ORDER BY student_name;
+"""
+
+_DISTRICT_VENDORS_SQL = """
+    SELECT DISTINCT name
+    FROM vendors
+    WHERE district_key = :district_key
+      AND name IS NOT NULL
+    ORDER BY name;
+"""
+
+_DISTRICT_CLINICIANS_SQL = """
+    SELECT DISTINCT ili.clinician
+    FROM invoice_line_items ili
+    JOIN invoices i ON i.id = ili.invoice_id
+    WHERE i.district_key = :district_key
+      AND ili.clinician IS NOT NULL
+    ORDER BY ili.clinician;
+"""
+
+
+# Runs one statement and returns its rows as dicts. The blocking variant
+# uses an Engine; under run_blocking() the awaiting variant drives an
+# AsyncEngine, so each loader and the run_sql tool are written once.
+SqlExecutor = Callable[[str, Mapping[str, Any]], list[dict[str, Any]]]
+
+
+def _engine_executor(engine: Engine) -> SqlExecutor:
+    def _execute(sql: str, params: Mapping[str, Any]) -> list[dict[str, Any]]:
+        with engine.connect() as conn:
+            return [dict(row) for row in conn.execute(sql_text(sql), params).mappings()]
+
+    return _execute
+
 
+def _awaiting_executor(engine: "AsyncEngine") -> SqlExecutor:
+    async def _aexecute(sql: str, params: Mapping[str, Any]) -> list[dict[str, Any]]:
+        async with engine.connect() as conn:
+            result = await conn.execute(sql_text(sql), params)
+            return [dict(row) for row in result.mappings()]
+
+    return lambda sql, params: await_(_aexecute(sql, params))
+
+
+def _first_column(rows: list[dict[str, Any]]) -> list[Any]:
+    return [next(iter(row.values())) for row in rows]
+
+
+def _district_entities(
+    district_key: str | None, execute: SqlExecutor
+) -> dict[str, list[str]]:
     empty_entities: dict[str, list[str]] = {"students": [], "vendors": [], "clinicians": []}
     if not district_key:
         return empty_entities
 
+    params = {"district_key": district_key}
     try:
-        with engine.connect() as conn:
-            students = [
-                row.student_name
-                for row in conn.execute(
-                    sql_text(
-                        """
-                        SELECT DISTINCT student_name
-                        FROM invoices
-                        WHERE district_key = :district_key
-                          AND student_name IS NOT NULL
-                        ORDER BY student_name;
-                        """
-                    ),
-                    {"district_key": district_key},
-                )
-            ]
-
-            vendors = [
-                row.name
-                for row in conn.execute(
-                    sql_text(
-                        """
-                        SELECT DISTINCT name
-                        FROM vendors
-                        WHERE district_key = :district_key
-                          AND name IS NOT NULL
-                        ORDER BY name;
-                        """
-                    ),
-                    {"district_key": district_key},
-                )
-            ]
-
-            clinicians = [
-                row.clinician
-                for row in conn.execute(
-                    sql_text(
-                        """
-                        SELECT DISTINCT ili.clinician
-                        FROM invoice_line_items ili
-                        JOIN invoices i ON i.id = ili.invoice_id
-                        WHERE i.district_key = :district_key
-                          AND ili.clinician IS NOT NULL
-                        ORDER BY ili.clinician;
-                        """
-                    ),
-                    {"district_key": district_key},
-                )
-            ]
+        return {
+            "students": _first_column(execute(_DISTRICT_STUDENTS_SQL, params)),
+            "vendors": _first_column(execute(_DISTRICT_VENDORS_SQL, params)),
+            "clinicians": _first_column(execute(_DISTRICT_CLINICIANS_SQL, params)),
+        }
     except Exception as exc:  # pragma: no cover - defensive
         LOGGER.warning("district_entity_load_failed", error=str(exc))
         return empty_entities
 
-    return {
-        "students": list(students),
-        "vendors": list(vendors),
-        "clinicians": list(clinicians),
-    }
+
+def _load_district_entities(engine: Engine, district_key: str | None) -> dict[str, list[str]]:
+    """Load district-scoped entities for students, vendors, and clinicians."""
+
+    return _district_entities(district_key, _engine_executor(engine))
+
+
+async def _aload_district_entities(
+    engine: "AsyncEngine", district_key: str | None
+) -> dict[str, list[str]]:
+    """Async variant of :func:`_load_district_entities`."""
+
+    return await run_blocking(_district_entities, district_key, _awaiting_executor(engine))
+
+
+_DISTRICT_DATA_VERSION_SQL = "SELECT data_version FROM districts WHERE district_key = :district_key"
+
+
+def _data_version(district_key: str | None, execute: SqlExecutor) -> int | None:
+    if not district_key:
+        return None
+    try:
+        rows = execute(_DISTRICT_DATA_VERSION_SQL, {"district_key": district_key})
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("district_data_version_load_failed", error=str(exc))
+        return None
+    return _first_column(rows)[0] if rows else None
+
+
+def _load_data_version(engine: Engine | None, district_key: str | None) -> int | None:
+    """Return ``districts.data_version``, which ingestion and status changes bump."""
+
+    if engine is None:
+        return None
+    return _data_version(district_key, _engine_executor(engine))
+
+
+async def _aload_data_version(engine: "AsyncEngine", district_key: str | None) -> int | None:
+    """Async variant of :func:`_load_data_version`."""
+
+    return await run_blocking(_data_version, district_key, _awaiting_executor(engine))
+
+
+class _StateWriteGuard:
+    """Redis facade that turns state writes into no-ops once ``cancelled`` is set."""
+
+    _WRITES = frozenset({"set", "setex", "expire", "delete"})
+
+    def __init__(self, client: Any, cancelled: threading.Event) -> None:
+        self._client = client
+        self._cancelled = cancelled
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._WRITES and self._cancelled.is_set():
+            return lambda *args, **kwargs: None
+        return getattr(self._client, name)
 
 
 class Workflow:
@@ -510,6 +674,10 @@ class Workflow:
         max_iterations: int = MAX_ITERATIONS,
         memory: ConversationMemory | None = None,
         engine: Engine | None = None,
+        async_engine: "AsyncEngine | None" = None,
+        memo: StageMemo | None = None,
+        fast_path: bool = True,
+        entity_candidates: int | None = None,
     ) -> None:
         self.nlv_system_prompt = nlv_system_prompt
         self.entity_resolution_system_prompt = entity_resolution_system_prompt
@@ -523,105 +691,704 @@ class Workflow:
         self.max_iterations = max_iterations
         self.memory = memory
         self.engine = engine
+        self.async_engine = async_engine
+        self.memo = memo
+        self.fast_path = fast_path
+        self.entity_candidates = entity_candidates
+
+    async def _call_model(
+        self, agent: "Agent", context: AgentContext, run_model: Any, **kwargs: Any
+    ) -> Any:
+        """Run a model stage on the async client, or on a worker thread.
+
+        Completions of stages covered by ``self.memo`` are served from the
+        stage memo when an identical request was answered before.
+        """
 
-    def execute(self, agent: "Agent", query: str, user_context: dict[str, Any]) -> AgentResponse:
-        session_id = _build_session_id(user_context)
-        context = AgentContext(
-            query=query, user_context=user_context or {}, session_id=session_id, memory=self.memory
-        )
-        history: list[dict[str, str]] = []
-        if self.memory and session_id:
-            try:
-                history = self.memory.load_messages(session_id)
-            except Exception as exc:  # pragma: no cover - defensive
-                LOGGER.warning("analytics_memory_load_failed", error=str(exc))
-
-        # Multi-turn fusion: incorporate follow-up context into a fused query
-        multi_turn_state: dict[str, Any] | None = None
-        fused_query: str | None = None
-        if agent.multi_turn_manager and session_id:
-            try:
-                fusion = agent.multi_turn_manager.process_user_message(session_id, query)
-                fused = fusion.get("fused_query")
-                if isinstance(fusion, Mapping):
-                    state = fusion.get("state")
-                    if isinstance(state, Mapping):
-                        multi_turn_state = dict(state)
-                if isinstance(fused, str) and fused.strip():
-                    fused_query = fused.strip()
-                query = query.strip()
-            except Exception as exc:
-                LOGGER.warning("multi_turn_fusion_failed", error=str(exc))
-                query = query.strip()
-
-        # Sticky student filters are disabled in favor of multi-turn active_topic.
-        # active_filters = _extract_active_filters_from_history(history)
-        # if active_filters:
-        #     query = _maybe_apply_active_student_filter(query, active_filters)
-
-        start_time = perf_counter()
-        start = time.monotonic()
-        # Prefer fused_query for NLV if available; otherwise use the original raw query.
-        nlv_query = fused_query or context.query
-
-        normalized_intent = run_nlv_model(
-            user_query=nlv_query,
-            user_context={**context.user_context, "multi_turn_state": multi_turn_state},
-            client=agent.client,
-            model=agent.nlv_model,
-            system_prompt=self.nlv_system_prompt,
-            temperature=agent.nlv_temperature,
-        )
-        log_timing("NLV", start, time.monotonic())
-        current_intent = normalized_intent.get("intent") if isinstance(normalized_intent, Mapping) else None
-        if agent.multi_turn_manager and session_id:
-            try:
-                agent.multi_turn_manager.update_last_plan_kind(session_id, current_intent)
-            except Exception as exc:  # pragma: no cover - defensive
-                LOGGER.warning("multi_turn_state_update_failed", error=str(exc))
-        _record_stage_duration(context, "nlv_model", start_time)
-
-        LOGGER.info(
-            "nlv_normalized_intent",
-            normalized_intent=normalized_intent,
-        )
+        stage = run_model.__name__.removeprefix("run_")
+        _emit(context, "stage_started", stage=stage)
+        memo = self.memo if self.memo is not None and self.memo.covers(stage) else None
+        if context.native_async:
+            client = memo.awrap(agent.async_client, stage) if memo else agent.async_client
+            return await run_model_async(run_model, client=client, **kwargs)
+        client = memo.wrap(agent.client, stage) if memo else agent.client
+        return await asyncio.to_thread(run_model, client=client, **kwargs)
+
+    async def _cache_get(
+        self, context: AgentContext, key: str, *, cache: RedisAnalyticsCache | None = None
+    ) -> Any | None:
+        cache = cache or CACHE
+        if context.native_async:
+            return await cache.aget(key, district_key=context.district_key)
+        return await asyncio.to_thread(cache.get, key, district_key=context.district_key)
+
+    async def _cache_set(
+        self,
+        context: AgentContext,
+        key: str,
+        value: Any,
+        *,
+        cache: RedisAnalyticsCache | None = None,
+    ) -> None:
+        cache = cache or CACHE
+        if context.native_async:
+            await cache.aset(key, value, district_key=context.district_key)
+        else:
+            await asyncio.to_thread(cache.set, key, value, district_key=context.district_key)
 
-        nlv_intent_json = json.dumps(normalized_intent or {}, sort_keys=True)
-        cache_key = hashlib.sha256(nlv_intent_json.encode("utf-8")).hexdigest()
+    async def _lookup_response(self, context: AgentContext, key: str) -> AgentResponse | None:
+        """Return the cached response for intent ``key`` from Redis or Postgres."""
 
-        cached_response = CACHE.get(cache_key)
+        cached_response = await self._cache_get(context, key)
         if cached_response:
-            LOGGER.info("cache_hit", key=cache_key)
+            LOGGER.info("cache_hit", key=key)
             try:
                 return AgentResponse(**cached_response)
             except Exception as exc:  # pragma: no cover - defensive
-                LOGGER.warning("cache_deserialize_failed", key=cache_key, error=str(exc))
+                LOGGER.warning("cache_deserialize_failed", key=key, error=str(exc))
 
         # ----------------------------
         # Step 5.2: Postgres Fallback
         # ----------------------------
-
-        pg_cached = fetch_materialized_report(
-            engine=self.engine,
-            cache_key=cache_key,
-            district_key=context.district_key,
-        )
+        pg_cached = await self._fetch_report(context, key)
 
         if pg_cached:
-            LOGGER.info("pg_cache_hit", key=cache_key)
+            LOGGER.info("pg_cache_hit", key=key)
             try:
                 # Rehydrate into AgentResponse so UI layer stays consistent
                 return AgentResponse(**pg_cached)
             except Exception as exc:
                 LOGGER.warning(
                     "pg_cache_deserialize_failed",
-                    key=cache_key,
+                    key=key,
                     error=str(exc),
                 )
 
-        LOGGER.info("cache_miss", key=cache_key)
+        LOGGER.info("cache_miss", key=key)
+        return None
+
+    async def _join_flight(self, context: AgentContext, key: str) -> AgentResponse | None:
+        """Lead the pipeline run for ``key`` or wait for the run already leading it.
+
+        Returns the leader's response, or None once this request should run
+        the pipeline itself: as the new leader (``context.flight_lease`` is
+        set), or unlocked after ``ANALYTICS_SINGLE_FLIGHT_WAIT_SEC``. A leader
+        that finishes without caching a response frees the lease, so a waiter
+        takes over rather than waiting out the timeout.
+        """
+
+        settings = get_settings()
+        if not (settings.analytics_single_flight_enabled and settings.redis_enabled):
+            return None
+
+        async def _acquire() -> FlightLease | None:
+            if context.native_async:
+                return await SINGLE_FLIGHT.aacquire(key)
+            return await asyncio.to_thread(SINGLE_FLIGHT.acquire, key)
+
+        async def _shared() -> AgentResponse | None:
+            cached = await self._cache_get(context, key)
+            if not cached:
+                return None
+            try:
+                response = AgentResponse(**cached)
+            except Exception as exc:  # pragma: no cover - defensive
+                LOGGER.warning("cache_deserialize_failed", key=key, error=str(exc))
+                return None
+            LOGGER.info("single_flight_result_shared", key=key)
+            return response
+
+        deadline = time.monotonic() + settings.analytics_single_flight_wait_sec
+        delay = 0.05
+        waited = False
+        while True:
+            lease = await _acquire()
+            if lease is not None:
+                context.flight_lease = lease
+                if waited:
+                    # The leader may have cached its response and released the
+                    # lease since the last poll.
+                    response = await _shared()
+                    if response is not None:
+                        await self._release_flight(context)
+                        return response
+                    LOGGER.info("single_flight_takeover", key=key)
+                return None
+            if time.monotonic() >= deadline:
+                LOGGER.warning(
+                    "single_flight_wait_timeout",
+                    key=key,
+                    waited_sec=settings.analytics_single_flight_wait_sec,
+                )
+                return None
+            if not waited:
+                LOGGER.info("single_flight_follow", key=key)
+                waited = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            response = await _shared()
+            if response is not None:
+                return response
+
+    async def _record_followup(self, context: AgentContext, plan_kind: str | None) -> None:
+        """Teach the prefetch predictor that this session moved on to ``plan_kind``."""
+
+        previous = context.prior_plan_kind
+        if not (previous and plan_kind) or is_prefetch_session(context.session_id):
+            return
+        if context.native_async:
+            await arecord_transition(context.district_key, previous, plan_kind)
+        else:
+            await asyncio.to_thread(record_transition, context.district_key, previous, plan_kind)
+
+    async def _note_prefetch_hit(self, context: AgentContext, key: str) -> None:
+        """Credit the prefetch that produced intent ``key``, if one did."""
+
+        if not get_settings().prefetch_enabled or is_prefetch_session(context.session_id):
+            return
+        if context.native_async:
+            await arecord_prefetch_hit(context.district_key, key)
+        else:
+            await asyncio.to_thread(record_prefetch_hit, context.district_key, key)
+
+    async def _mark_prefetched(self, context: AgentContext, key: str) -> None:
+        """Tag intent ``key`` as computed by this prefetch run."""
+
+        edge = context.user_context.get("prefetch_edge")
+        compute_sec = perf_counter() - context.started_at
+        if context.native_async:
+            await amark_prefetched(context.district_key, key, edge, compute_sec=compute_sec)
+        else:
+            await asyncio.to_thread(
+                mark_prefetched, context.district_key, key, edge, compute_sec=compute_sec
+            )
+
+    async def _multi_turn(
+        self, agent: "Agent", context: AgentContext, method: str, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Call ``agent.multi_turn_manager.<method>`` without blocking the loop.
+
+        In natively async runs a manager built on this workflow's memory runs
+        on the loop with its Redis and LLM calls awaited on the asyncio
+        clients; otherwise it runs on a worker thread, which cancellation
+        cannot stop, so a cancelled call's remaining state writes are dropped.
+        """
+
+        manager = agent.multi_turn_manager
+        if (
+            context.native_async
+            and isinstance(self.memory, RedisConversationMemory)
+            and manager.redis is self.memory.client
+        ):
+            view = copy.copy(manager)
+            view.redis = AwaitingProxy(self.memory.async_client)
+            if manager.llm_client is agent.client:
+                view.llm_client = AwaitingProxy(agent.async_client)
+            return await run_blocking(getattr(view, method), *args, **kwargs)
+        cancelled = threading.Event()
+        view = copy.copy(manager)
+        view.redis = _StateWriteGuard(manager.redis, cancelled)
+        try:
+            return await asyncio.to_thread(getattr(view, method), *args, **kwargs)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def _release_flight(self, context: AgentContext) -> None:
+        lease, context.flight_lease = context.flight_lease, None
+        if lease is None:
+            return
+        if context.native_async:
+            await SINGLE_FLIGHT.arelease(lease)
+        else:
+            await asyncio.to_thread(SINGLE_FLIGHT.release, lease)
+
+    async def _fetch_report(self, context: AgentContext, key: str) -> dict[str, Any] | None:
+        if context.native_async and self.async_engine is not None:
+            return await afetch_materialized_report(
+                engine=self.async_engine, cache_key=key, district_key=context.district_key
+            )
+        return await asyncio.to_thread(
+            fetch_materialized_report,
+            engine=self.engine,
+            cache_key=key,
+            district_key=context.district_key,
+        )
+
+    async def _persist_report(self, context: AgentContext, **kwargs: Any) -> None:
+        if context.native_async and self.async_engine is not None:
+            await apersist_materialized_report(engine=self.async_engine, **kwargs)
+        else:
+            await asyncio.to_thread(persist_materialized_report, engine=self.engine, **kwargs)
+
+    async def _remember(self, context: AgentContext, response: AgentResponse) -> None:
+        if not context.memory or not context.session_id:
+            return
+
+        try:
+            if context.native_async:
+                await context.memory.aappend_interaction(
+                    context.session_id,
+                    user_message={"content": context.query},
+                    assistant_message={"content": _summarize_response(response)},
+                )
+            else:
+                await asyncio.to_thread(_remember_interaction, context, response)
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("analytics_memory_append_failed", error=str(exc))
+
+    async def _run_fast_path_sql(
+        self, agent: "Agent", context: AgentContext, plan: FastPathPlan
+    ) -> bool:
+        """Execute ``plan``'s SQL into ``plan.rows``; ``False`` means fall back."""
+
+        _emit(context, "stage_started", stage="fast_path")
+        try:
+            rows = await agent.lookup_tool("run_sql").ainvoke(context, {"query": plan.sql})
+        except Exception as exc:
+            LOGGER.warning("fast_path_failed", plan_kind=plan.plan_kind, error=str(exc))
+            return False
+        if not rows:
+            # An empty result may just mean the name matched loosely; let the
+            # models interpret the question.
+            LOGGER.info("fast_path_fallback", plan_kind=plan.plan_kind, reason="no_rows")
+            return False
+        plan.rows = _strip_sensitive_columns(list(rows))
+        return True
+
+    async def _answer_fast_path(
+        self, agent: "Agent", context: AgentContext, plan: FastPathPlan
+    ) -> AgentResponse:
+        """Render the rows fetched by the fast path with the MV table templates.
+
+        A plan whose answer was already cached carries that response instead.
+        """
+
+        response = plan.response or _render_fast_path(plan, context)
+        await self._remember(context, response)
+        if agent.multi_turn_manager and context.session_id:
+            try:
+                await self._multi_turn(
+                    agent,
+                    context,
+                    "record_resolved_topic",
+                    context.session_id,
+                    context.query,
+                    entity_type=plan.entity_type,
+                    entity_value=plan.entity_name,
+                    plan_kind=plan.plan_kind,
+                )
+            except Exception as exc:  # pragma: no cover - defensive
+                LOGGER.warning("multi_turn_state_update_failed", error=str(exc))
+        await self._record_followup(context, plan.plan_kind)
+        LOGGER.info(
+            "fast_path_answered",
+            plan_kind=plan.plan_kind,
+            rows=len(response.rows or []),
+            cached=plan.response is not None,
+        )
+        return response
+
+    async def aprefetch(self, agent: "Agent", query: str, user_context: dict[str, Any]) -> bool:
+        """Answer a prefetch job from its intent with one SQL statement.
+
+        The intent arrives with the job (``user_context["prefetch_intent"]``)
+        and goes through NLV's deterministic rules, as the user's own question
+        and the fast path's cache check will; the report is then planned,
+        queried and rendered like a fast-path answer and written under that
+        intent's cache key without any model call. Returns False when no
+        deterministic plan covers the intent, in which case the caller runs
+        the full workflow instead.
+        """
+
+        intent = user_context.get("prefetch_intent")
+        if not self.fast_path and _carries_time_window(
+            user_context.get("multi_turn_state_seed")
+        ):
+            # Without the fast path the follow-up is read through fusion,
+            # which can carry the seed's window into it; read it the same way.
+            return False
+        context = AgentContext(
+            query=query,
+            user_context=user_context,
+            session_id=_build_session_id(user_context),
+            native_async=False,
+        )
+        district_key = context.district_key
+        if not isinstance(intent, Mapping) or not district_key:
+            return False
+
+        def _load() -> dict[str, list[str]]:
+            return _load_district_entities(self.engine, district_key)
+
+        known_entities, data_version = await asyncio.gather(
+            asyncio.to_thread(get_entity_catalog().get, district_key, _load),
+            asyncio.to_thread(_load_data_version, self.engine, district_key),
+        )
+        intent = normalize_nlv_payload(
+            copy.deepcopy(dict(intent)), user_query=query, user_context=user_context
+        )
+        plan = plan_for_intent(intent, query, known_entities)
+        if plan is None:
+            LOGGER.info("prefetch_template_unplanned", plan_kind=intent.get("intent"))
+            return False
+
+        key = intent_cache_key(intent, district_key, data_version)
+        if await self._cache_get(context, key):
+            LOGGER.info("prefetch_already_cached", key=key)
+            return True
+        try:
+            rows = await agent.lookup_tool("run_sql").ainvoke(context, {"query": plan.sql})
+        except Exception as exc:
+            LOGGER.warning("prefetch_template_failed", plan_kind=plan.plan_kind, error=str(exc))
+            return True
+        if not rows:
+            # Nothing worth caching; the user's own request will explain the gap.
+            LOGGER.info("prefetch_template_empty", plan_kind=plan.plan_kind)
+            return True
+
+        plan.rows = _strip_sensitive_columns(list(rows))
+        response = _render_fast_path(plan, context)
+        await self._cache_set(context, key, response.dict())
+        await self._persist_report(
+            context,
+            district_key=district_key,
+            cache_key=key,
+            normalized_intent=dict(intent),
+            router_decision=plan.router_decision.to_dict(),
+            agent_response=response.dict(),
+            origin=ORIGIN_PREFETCH,
+        )
+        await self._mark_prefetched(context, key)
+        LOGGER.info("prefetch_template_written", plan_kind=plan.plan_kind, rows=len(plan.rows))
+        return True
+
+    def execute(self, agent: "Agent", query: str, user_context: dict[str, Any]) -> AgentResponse:
+        """Run the workflow from synchronous code (no running event loop).
+
+        Blocking clients are driven from worker threads so independent
+        stages still overlap; threads a cache hit leaves behind are not
+        waited for.
+        """
+
+        return run_sync(self.aexecute(agent, query, user_context, native_async=False))
+
+    async def aexecute(
+        self,
+        agent: "Agent",
+        query: str,
+        user_context: dict[str, Any],
+        *,
+        native_async: bool = True,
+        on_event: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> AgentResponse:
+        """Run the workflow on the event loop.
+
+        With ``native_async`` the model stages await ``AsyncOpenAI`` and cache,
+        memory and database access use asyncio clients where available.
+        ``on_event`` receives progress events (``stage_started``,
+        ``rows_ready``, ``insights_ready``) as the workflow advances.
+        """
+
+        session_id = _build_session_id(user_context)
+        context = AgentContext(
+            query=query,
+            user_context=user_context or {},
+            session_id=session_id,
+            memory=self.memory,
+            native_async=native_async and agent.async_client is not None,
+            on_event=on_event,
+        )
+        query = query.strip()
+        try:
+            return await self._run_pipeline(agent, context, query, session_id)
+        finally:
+            await self._release_flight(context)
+
+    async def _run_pipeline(
+        self, agent: "Agent", context: AgentContext, query: str, session_id: str | None
+    ) -> AgentResponse:
+        """Body of :meth:`aexecute`; leaves any single-flight lease to the caller."""
+
+        # ------------------------------------------------------------------
+        # Stage graph: everything up to entity resolution is expressed as a
+        # dependency graph so independent work (memory load, entity loading,
+        # multi-turn bookkeeping) overlaps with the NLV call. The raw-query
+        # cache runs first because fusion mutates the state it is keyed on.
+        # Fusion and NLV wait for the model-free fast path's verdict, so a
+        # question it answers makes no model call at all.
+        # Later stages form a strict data chain and run sequentially below.
+        # ------------------------------------------------------------------
+        async def _load_history(_: Mapping[str, Any]) -> list[dict[str, str]]:
+            if not (self.memory and session_id):
+                return []
+            try:
+                if context.native_async:
+                    return await self.memory.aload_messages(session_id)
+                return await asyncio.to_thread(self.memory.load_messages, session_id)
+            except Exception as exc:  # pragma: no cover - defensive
+                LOGGER.warning("analytics_memory_load_failed", error=str(exc))
+                return []
+
+        async def _load_version(_: Mapping[str, Any]) -> int | None:
+            if context.native_async and self.async_engine is not None:
+                return await _aload_data_version(self.async_engine, context.district_key)
+            return await asyncio.to_thread(_load_data_version, self.engine, context.district_key)
+
+        async def _lookup_query_cache(inputs: Mapping[str, Any]) -> str:
+            # First-tier cache keyed on the raw question and the conversation
+            # state it was asked in; a hit skips fusion, NLV and everything after.
+            prior_state: dict[str, Any] | None = None
+            if agent.multi_turn_manager and session_id:
+                try:
+                    seed = context.user_context.get("multi_turn_state_seed")
+                    if is_prefetch_session(session_id) and isinstance(seed, Mapping):
+                        # Read the prefetched question in the state the user's
+                        # follow-up will be read in, so both produce one intent key.
+                        state_obj = ConversationState.from_dict(dict(seed))
+                        await self._multi_turn(
+                            agent, context, "save_state", state_obj, session_id
+                        )
+                    else:
+                        state_obj = await self._multi_turn(
+                            agent, context, "get_state", session_id
+                        )
+                    prior_state = state_obj.to_dict()
+                    context.prior_plan_kind = prior_state.get("last_plan_kind")
+                except Exception as exc:  # pragma: no cover - defensive
+                    LOGGER.warning("multi_turn_state_load_failed", error=str(exc))
+            key = query_cache_key(
+                query, context.district_key, prior_state, data_version=inputs["data_version"]
+            )
 
-        def _cache_and_return(payload: Mapping[str, Any]) -> AgentResponse:
+            entry = await self._cache_get(context, key, cache=QUERY_CACHE)
+            intent_key = entry.get("intent_key") if isinstance(entry, Mapping) else None
+            if intent_key:
+                response = await self._lookup_response(context, intent_key)
+                if response is not None:
+                    LOGGER.info("query_cache_hit", key=key, intent_key=intent_key)
+                    await self._note_prefetch_hit(context, intent_key)
+                    next_state = entry.get("state")
+                    if agent.multi_turn_manager and session_id and isinstance(next_state, Mapping):
+                        try:
+                            await self._multi_turn(
+                                agent,
+                                context,
+                                "save_state",
+                                ConversationState.from_dict(dict(next_state)),
+                                session_id,
+                            )
+                        except Exception as exc:  # pragma: no cover - defensive
+                            LOGGER.warning("multi_turn_state_restore_failed", error=str(exc))
+                    if isinstance(next_state, Mapping):
+                        await self._record_followup(context, next_state.get("last_plan_kind"))
+                    raise StageHalt(response)
+            LOGGER.info("query_cache_miss", key=key)
+            return key
+
+        def _state_after_turn(inputs: Mapping[str, Any]) -> dict[str, Any] | None:
+            state_value, _ = inputs["multi_turn_fusion"]
+            next_state = dict(state_value) if isinstance(state_value, Mapping) else None
+            intent = inputs["nlv_model"]
+            plan_kind = intent.get("intent") if isinstance(intent, Mapping) else None
+            if next_state is not None and plan_kind:
+                # Mirror the multi-turn update this turn makes.
+                next_state["last_plan_kind"] = plan_kind
+            return next_state
+
+        async def _remember_query(inputs: Mapping[str, Any], intent_key: str) -> None:
+            # A replayed hit leaves the same state as this run.
+            await self._cache_set(
+                context,
+                inputs["query_cache_lookup"],
+                build_entry(intent_key, _state_after_turn(inputs)),
+                cache=QUERY_CACHE,
+            )
+
+        async def _fuse_multi_turn(
+            _: Mapping[str, Any],
+        ) -> tuple[dict[str, Any] | None, str | None]:
+            # Multi-turn fusion: incorporate follow-up context into a fused query
+            state_value: dict[str, Any] | None = None
+            fused_value: str | None = None
+            if agent.multi_turn_manager and session_id:
+                try:
+                    fusion = await self._multi_turn(
+                        agent, context, "process_user_message", session_id, query
+                    )
+                    fused = fusion.get("fused_query")
+                    if isinstance(fusion, Mapping):
+                        state = fusion.get("state")
+                        if isinstance(state, Mapping):
+                            state_value = dict(state)
+                    if isinstance(fused, str) and fused.strip():
+                        fused_value = fused.strip()
+                except Exception as exc:
+                    LOGGER.warning("multi_turn_fusion_failed", error=str(exc))
+            return state_value, fused_value
+
+        async def _load_entities(_: Mapping[str, Any]) -> dict[str, list[str]]:
+            # The catalog only rebuilds when ingestion bumps its version stamp.
+            catalog = get_entity_catalog()
+            district_key = context.district_key
+
+            def _load() -> dict[str, list[str]]:
+                return _load_district_entities(self.engine, district_key)
+
+            async def _aload() -> dict[str, list[str]]:
+                if self.async_engine is not None:
+                    return await _aload_district_entities(self.async_engine, district_key)
+                return await asyncio.to_thread(_load)
+
+            if context.native_async:
+                return await catalog.aget(district_key, _aload)
+            return await asyncio.to_thread(catalog.get, district_key, _load)
+
+        async def _run_fast_path(inputs: Mapping[str, Any]) -> None:
+            # Deterministic plan kind, routing and SQL for well-understood
+            # questions; any doubt falls through to the model chain.
+            if not self.fast_path:
+                return None
+            plan = plan_fast_path(query, inputs["district_entities"])
+            if plan is None:
+                return None
+            # A prefetch keys its report on the intent NLV would read this
+            # question as; serve it before running any SQL.
+            key = intent_cache_key(
+                intent_for_plan(plan, query, context.user_context),
+                context.district_key,
+                inputs["data_version"],
+            )
+            plan.response = await self._lookup_response(context, key)
+            if plan.response is not None:
+                LOGGER.info("fast_path_cache_hit", key=key, plan_kind=plan.plan_kind)
+                await self._note_prefetch_hit(context, key)
+                raise StageHalt(plan)
+            if await self._run_fast_path_sql(agent, context, plan):
+                raise StageHalt(plan)
+            return None
+
+        async def _run_nlv(inputs: Mapping[str, Any]) -> dict[str, Any]:
+            state_value, fused_value = inputs["multi_turn_fusion"]
+            start = time.monotonic()
+            # Prefer fused_query for NLV if available; otherwise use the original raw query.
+            result = await self._call_model(
+                agent,
+                context,
+                run_nlv_model,
+                user_query=fused_value or context.query,
+                user_context={**context.user_context, "multi_turn_state": state_value},
+                model=agent.nlv_model,
+                system_prompt=self.nlv_system_prompt,
+                temperature=agent.nlv_temperature,
+            )
+            log_timing("NLV", start, time.monotonic())
+            LOGGER.info("nlv_normalized_intent", normalized_intent=result)
+            return result
+
+        async def _update_multi_turn(inputs: Mapping[str, Any]) -> None:
+            intent = inputs["nlv_model"]
+            current_intent = intent.get("intent") if isinstance(intent, Mapping) else None
+            if agent.multi_turn_manager and session_id:
+                try:
+                    await self._multi_turn(
+                        agent, context, "update_last_plan_kind", session_id, current_intent
+                    )
+                except Exception as exc:  # pragma: no cover - defensive
+                    LOGGER.warning("multi_turn_state_update_failed", error=str(exc))
+            await self._record_followup(context, current_intent)
+
+        async def _lookup_cache(inputs: Mapping[str, Any]) -> str:
+            key = intent_cache_key(
+                inputs["nlv_model"], context.district_key, inputs["data_version"]
+            )
+
+            response = await self._lookup_response(context, key)
+            if response is None:
+                # Identical requests in flight share one run of the stages below.
+                response = await self._join_flight(context, key)
+            if response is not None:
+                await self._note_prefetch_hit(context, key)
+                await _remember_query(inputs, key)
+                raise StageHalt(response)
+            return key
+
+        async def _resolve_entities(inputs: Mapping[str, Any]) -> dict[str, Any]:
+            start = time.monotonic()
+            result = await self._call_model(
+                agent,
+                context,
+                run_entity_resolution_model,
+                user_query=query,
+                normalized_intent=inputs["nlv_model"],
+                user_context=context.user_context,
+                known_entities=inputs["district_entities"],
+                model=agent.entity_model,
+                system_prompt=self.entity_resolution_system_prompt,
+                temperature=agent.entity_temperature,
+                candidate_limit=self.entity_candidates,
+            )
+            log_timing("Entity Resolution", start, time.monotonic())
+            return result
+
+        graph = StageGraph(
+            [
+                Stage("memory_load", _load_history),
+                Stage("data_version", _load_version),
+                Stage(
+                    "query_cache_lookup", _lookup_query_cache, depends_on=("data_version",)
+                ),
+                Stage("district_entities", _load_entities),
+                Stage(
+                    "fast_path",
+                    _run_fast_path,
+                    depends_on=("query_cache_lookup", "district_entities", "data_version"),
+                ),
+                # Fusion may call a model and NLV always does; neither starts
+                # until the fast path has declined the question.
+                Stage(
+                    "multi_turn_fusion",
+                    _fuse_multi_turn,
+                    depends_on=("query_cache_lookup", "fast_path"),
+                ),
+                Stage("nlv_model", _run_nlv, depends_on=("multi_turn_fusion",)),
+                Stage("multi_turn_update", _update_multi_turn, depends_on=("nlv_model",)),
+                Stage(
+                    "cache_lookup",
+                    _lookup_cache,
+                    depends_on=(
+                        "nlv_model",
+                        "multi_turn_fusion",
+                        "query_cache_lookup",
+                        "data_version",
+                    ),
+                ),
+                Stage(
+                    "entity_resolution_model",
+                    _resolve_entities,
+                    depends_on=("nlv_model", "district_entities", "cache_lookup"),
+                ),
+            ]
+        )
+        graph_result = await graph.arun(origin=context.started_at)
+        _record_graph_spans(context, graph, graph_result)
+        if graph_result.halted:
+            if isinstance(graph_result.halt_value, FastPathPlan):
+                return await self._answer_fast_path(agent, context, graph_result.halt_value)
+            return graph_result.halt_value
+
+        history: list[dict[str, str]] = graph_result.results["memory_load"]
+        multi_turn_state, _ = graph_result.results["multi_turn_fusion"]
+        normalized_intent = graph_result.results["nlv_model"]
+        cache_key: str = graph_result.results["cache_lookup"]
+        query_inputs = {
+            name: graph_result.results[name]
+            for name in ("query_cache_lookup", "multi_turn_fusion", "nlv_model")
+        }
+        entity_result = graph_result.results["entity_resolution_model"]
+        router_decision = None
+
+        async def _cache_and_return(payload: Mapping[str, Any]) -> AgentResponse:
             # router_decision will be populated later in the workflow; we only read it here.
             nonlocal router_decision
 
@@ -646,12 +1413,15 @@ class Workflow:
 
                 insights: list[str] = []
                 if ir.rows is not None:
+                    _emit_rows_ready(context, ir, getattr(ir, "mode", None))
                     try:
                         start_time = perf_counter()
                         start = time.monotonic()
-                        insights_result = run_insight_model(
+                        insights_result = await self._call_model(
+                            agent,
+                            context,
+                            run_insight_model,
                             ir=ir,
-                            client=agent.client,
                             model=agent.insight_model,
                             system_prompt=self.insight_system_prompt,
                             temperature=agent.insight_temperature,
@@ -659,6 +1429,7 @@ class Workflow:
                         log_timing("Insight Model", start, time.monotonic())
                         _record_stage_duration(context, "insight_model", start_time)
                         insights = insights_result.get("insights") or []
+                        _emit(context, "insights_ready", insights=insights)
                     except Exception as exc:  # pragma: no cover - defensive
                         LOGGER.warning("insight_model_failed", error=str(exc))
 
@@ -666,11 +1437,13 @@ class Workflow:
                         try:
                             start_time = perf_counter()
                             start = time.monotonic()
-                            render_payload = run_rendering_model(
+                            render_payload = await self._call_model(
+                                agent,
+                                context,
+                                run_rendering_model,
                                 user_query=context.query,
                                 ir=ir,
                                 insights=insights,
-                                client=agent.client,
                                 model=agent.render_model,
                                 system_prompt=self.rendering_system_prompt,
                                 temperature=agent.render_temperature,
@@ -688,53 +1461,46 @@ class Workflow:
                 ir = ir or _payload_to_ir(payload, context.last_rows)
                 render_payload = ir.to_payload()
 
-            response = _finalise_response(render_payload, context)
+            response = _finalise_response(render_payload, context, remember=False)
+            await self._remember(context, response)
 
             # Persist to Redis
-            CACHE.set(cache_key, response.dict())
+            await self._cache_set(context, cache_key, response.dict())
             LOGGER.info("cache_write", key=cache_key)
+            prefetched = is_prefetch_session(context.session_id)
+            if prefetched:
+                await self._mark_prefetched(context, cache_key)
+            await _remember_query(query_inputs, cache_key)
 
             # Best-effort persistence to Postgres as a materialized report
             try:
-                persist_materialized_report(
-                    engine=self.engine,
+                await self._persist_report(
+                    context,
                     district_key=context.district_key,
                     cache_key=cache_key,
                     normalized_intent=normalized_intent,
                     router_decision=router_decision.to_dict() if router_decision else None,
                     agent_response=response.dict(),
+                    origin=ORIGIN_PREFETCH if prefetched else ORIGIN_USER,
                 )
 
-                # Best-effort enqueue of prefetch jobs based on the current report.
-                enqueue_prefetch_jobs(
-                    normalized_intent=normalized_intent,
-                    router_decision=router_decision.to_dict() if router_decision else None,
-                    last_rows=context.last_rows,
-                    district_key=context.district_key,
-                    user_id=context.user_context.get("user_id") if isinstance(context.user_context, dict) else None,
-                )
+                # Best-effort enqueue of prefetch jobs based on the current report;
+                # prefetch runs do not chain further prefetches.
+                if not prefetched:
+                    await asyncio.to_thread(
+                        enqueue_prefetch_jobs,
+                        normalized_intent=normalized_intent,
+                        router_decision=router_decision.to_dict() if router_decision else None,
+                        last_rows=context.last_rows,
+                        district_key=context.district_key,
+                        user_id=context.user_context.get("user_id") if isinstance(context.user_context, dict) else None,
+                        multi_turn_state=_state_after_turn(query_inputs),
+                    )
 
             except Exception as exc:  # pragma: no cover - defensive
                 LOGGER.warning("persist_materialized_report_wrapper_failed", error=str(exc))
             return response
 
-        known_entities = _load_district_entities(self.engine, context.district_key)
-
-        start_time = perf_counter()
-        start = time.monotonic()
-        entity_result = run_entity_resolution_model(
-            user_query=query,
-            normalized_intent=normalized_intent,
-            user_context=context.user_context,
-            known_entities=known_entities,
-            client=agent.client,
-            model=agent.entity_model,
-            system_prompt=self.entity_resolution_system_prompt,
-            temperature=agent.entity_temperature,
-        )
-        log_timing("Entity Resolution", start, time.monotonic())
-        _record_stage_duration(context, "entity_resolution_model", start_time)
-
         resolved_intent = entity_result.get("normalized_intent") or normalized_intent
         resolved_entities = entity_result.get("entities") or {}
 
@@ -761,11 +1527,13 @@ class Workflow:
 
             start_time = perf_counter()
             start = time.monotonic()
-            br_result = run_business_rule_model(
+            br_result = await self._call_model(
+                agent,
+                context,
+                run_business_rule_model,
                 ir=logic_ir,
                 entities=resolved_entities,
                 plan=None,
-                client=agent.client,
                 model=agent.business_rule_model,
                 system_prompt=self.business_rule_system_prompt,
                 temperature=agent.business_rule_temperature,
@@ -777,9 +1545,11 @@ class Workflow:
 
             start_time = perf_counter()
             start = time.monotonic()
-            validator_result = run_validator_model(
+            validator_result = await self._call_model(
+                agent,
+                context,
+                run_validator_model,
                 ir=effective_ir,
-                client=agent.client,
                 model=agent.validator_model,
                 system_prompt=self.validator_system_prompt,
                 temperature=agent.validator_temperature,
@@ -801,11 +1571,13 @@ class Workflow:
                 )
                 start_time = perf_counter()
                 start = time.monotonic()
-                render_payload = run_rendering_model(
+                render_payload = await self._call_model(
+                    agent,
+                    context,
+                    run_rendering_model,
                     user_query=context.query,
                     ir=safe_ir,
                     insights=[],
-                    client=agent.client,
                     model=agent.render_model,
                     system_prompt=self.rendering_system_prompt,
                     temperature=agent.render_temperature,
@@ -813,13 +1585,15 @@ class Workflow:
                 render_payload["_rendered"] = True
                 log_timing("Rendering Model", start, time.monotonic())
                 _record_stage_duration(context, "rendering_model", start_time)
-                return _cache_and_return(render_payload)
+                return await _cache_and_return(render_payload)
 
             start_time = perf_counter()
             start = time.monotonic()
-            insight_result = run_insight_model(
+            insight_result = await self._call_model(
+                agent,
+                context,
+                run_insight_model,
                 ir=effective_ir,
-                client=agent.client,
                 model=agent.insight_model,
                 system_prompt=self.insight_system_prompt,
                 temperature=agent.insight_temperature,
@@ -827,14 +1601,17 @@ class Workflow:
             log_timing("Insight Model", start, time.monotonic())
             _record_stage_duration(context, "insight_model", start_time)
             insights = insight_result.get("insights") or []
+            _emit(context, "insights_ready", insights=insights)
 
             start_time = perf_counter()
             start = time.monotonic()
-            render_payload = run_rendering_model(
+            render_payload = await self._call_model(
+                agent,
+                context,
+                run_rendering_model,
                 user_query=context.query,
                 ir=effective_ir,
                 insights=insights,
-                client=agent.client,
                 model=agent.render_model,
                 system_prompt=self.rendering_system_prompt,
                 temperature=agent.render_temperature,
@@ -842,16 +1619,18 @@ class Workflow:
             render_payload["_rendered"] = True
             log_timing("Rendering Model", start, time.monotonic())
             _record_stage_duration(context, "rendering_model", start_time)
-            return _cache_and_return(render_payload)
+            return await _cache_and_return(render_payload)
 
         start_time = perf_counter()
         start = time.monotonic()
-        sql_plan_result = run_sql_planner_model(
+        sql_plan_result = await self._call_model(
+            agent,
+            context,
+            run_sql_planner_model,
             user_query=query,
             normalized_intent=resolved_intent,
             entities=resolved_entities,
             user_context=context.user_context,
-            client=agent.client,
             model=agent.sql_planner_model,
             system_prompt=self.sql_planner_system_prompt,
             temperature=agent.sql_planner_temperature,
@@ -877,11 +1656,13 @@ class Workflow:
 
             start_time = perf_counter()
             start = time.monotonic()
-            br_result = run_business_rule_model(
+            br_result = await self._call_model(
+                agent,
+                context,
+                run_business_rule_model,
                 ir=logic_ir,
                 entities=resolved_entities,
                 plan=plan,
-                client=agent.client,
                 model=agent.business_rule_model,
                 system_prompt=self.business_rule_system_prompt,
                 temperature=agent.business_rule_temperature,
@@ -893,9 +1674,11 @@ class Workflow:
 
             start_time = perf_counter()
             start = time.monotonic()
-            validator_result = run_validator_model(
+            validator_result = await self._call_model(
+                agent,
+                context,
+                run_validator_model,
                 ir=effective_ir,
-                client=agent.client,
                 model=agent.validator_model,
                 system_prompt=self.validator_system_prompt,
                 temperature=agent.validator_temperature,
@@ -917,11 +1700,13 @@ class Workflow:
                 )
                 start_time = perf_counter()
                 start = time.monotonic()
-                render_payload = run_rendering_model(
+                render_payload = await self._call_model(
+                    agent,
+                    context,
+                    run_rendering_model,
                     user_query=context.query,
                     ir=safe_ir,
                     insights=[],
-                    client=agent.client,
                     model=agent.render_model,
                     system_prompt=self.rendering_system_prompt,
                     temperature=agent.render_temperature,
@@ -929,13 +1714,15 @@ class Workflow:
                 render_payload["_rendered"] = True
                 log_timing("Rendering Model", start, time.monotonic())
                 _record_stage_duration(context, "rendering_model", start_time)
-                return _cache_and_return(render_payload)
+                return await _cache_and_return(render_payload)
 
             start_time = perf_counter()
             start = time.monotonic()
-            insight_result = run_insight_model(
+            insight_result = await self._call_model(
+                agent,
+                context,
+                run_insight_model,
                 ir=effective_ir,
-                client=agent.client,
                 model=agent.insight_model,
                 system_prompt=self.insight_system_prompt,
                 temperature=agent.insight_temperature,
@@ -943,14 +1730,17 @@ class Workflow:
             log_timing("Insight Model", start, time.monotonic())
             _record_stage_duration(context, "insight_model", start_time)
             insights = insight_result.get("insights") or []
+            _emit(context, "insights_ready", insights=insights)
 
             start_time = perf_counter()
             start = time.monotonic()
-            render_payload = run_rendering_model(
+            render_payload = await self._call_model(
+                agent,
+                context,
+                run_rendering_model,
                 user_query=context.query,
                 ir=effective_ir,
                 insights=insights,
-                client=agent.client,
                 model=agent.render_model,
                 system_prompt=self.rendering_system_prompt,
                 temperature=agent.render_temperature,
@@ -958,17 +1748,19 @@ class Workflow:
             render_payload["_rendered"] = True
             log_timing("Rendering Model", start, time.monotonic())
             _record_stage_duration(context, "rendering_model", start_time)
-            return _cache_and_return(render_payload)
+            return await _cache_and_return(render_payload)
 
         start_time = perf_counter()
         start = time.monotonic()
-        router_decision = run_sql_router_model(
+        router_decision = await self._call_model(
+            agent,
+            context,
+            run_sql_router_model,
             user_query=query,
             sql_plan=plan,
             entities=resolved_entities,
             normalized_intent=resolved_intent,
             multi_turn_state=multi_turn_state,
-            client=agent.client,
             model=agent.router_model,
             system_prompt=self.router_system_prompt,
             temperature=agent.router_temperature,
@@ -1042,7 +1834,7 @@ class Workflow:
                         LOGGER.warning("run_sql_tool_unavailable_for_provider_month", query=query)
                     else:
                         try:
-                            rows = run_sql_tool.invoke(context, {"query": sql, "month": month})
+                            rows = await run_sql_tool.ainvoke(context, {"query": sql, "month": month})
                         except Exception as exc:  # pragma: no cover - defensive
                             context.last_error = str(exc)
                             payload = {
@@ -1053,7 +1845,7 @@ class Workflow:
                         else:
                             context.last_rows = rows
                             payload = {"text": "", "rows": rows, "html": None}
-                        return _cache_and_return(payload)
+                        return await _cache_and_return(payload)
 
                 # Otherwise, fall back to invoice-scope provider breakdown using invoice_numbers from the last rows
                 inv_values = {
@@ -1092,7 +1884,7 @@ class Workflow:
                         LOGGER.warning("run_sql_tool_unavailable_for_provider_include", query=query)
                     else:
                         try:
-                            rows = run_sql_tool.invoke(context, {"query": sql})
+                            rows = await run_sql_tool.ainvoke(context, {"query": sql})
                         except Exception as exc:  # pragma: no cover - defensive
                             context.last_error = str(exc)
                             payload = {
@@ -1104,12 +1896,14 @@ class Workflow:
                             context.last_rows = rows
                             payload = {"text": "", "rows": rows, "html": None}
 
-                        return _cache_and_return(payload)
+                        return await _cache_and_return(payload)
 
             start_time = perf_counter()
             start = time.monotonic()
-            message = run_logic_model(
-                agent.client,
+            message = await self._call_model(
+                agent,
+                context,
+                run_logic_model,
                 model=agent.logic_model,
                 messages=messages,
                 tools=[tool.schema() for tool in agent.tools],
@@ -1158,7 +1952,7 @@ class Workflow:
                     tool = agent.lookup_tool(tool_name)
 
                     try:
-                        tool_result = tool.invoke(context, arguments)
+                        tool_result = await tool.ainvoke(context, arguments)
                         tool_payload = {"tool": tool.name, "result": tool_result}
                     except Exception as exc:  # pragma: no cover - defensive
                         LOGGER.warning("tool_execution_failed", tool=tool.name, error=str(exc))
@@ -1170,7 +1964,7 @@ class Workflow:
                                 "rows": None,
                                 "html": _safe_html(error_text),
                             }
-                            return _cache_and_return(payload)
+                            return await _cache_and_return(payload)
                         tool_payload = {"tool": tool.name, "error": str(exc)}
                         tool_result = None
 
@@ -1207,7 +2001,7 @@ class Workflow:
                         "invoices": resolved_entities.get("invoices", []),
                     },
                 }
-                return _cache_and_return(final_payload)
+                return await _cache_and_return(final_payload)
 
             raw_content = message.content or ""
 
@@ -1227,7 +2021,7 @@ class Workflow:
                         "invoices": resolved_entities.get("invoices", []),
                     },
                 }
-                return _cache_and_return(fallback_payload)
+                return await _cache_and_return(fallback_payload)
 
             logic_ir = _payload_to_ir(payload, context.last_rows)
 
@@ -1267,11 +2061,13 @@ class Workflow:
             except Exception as exc:
                 LOGGER.warning("invoice_details_enforcement_failed", error=str(exc))
 
-            br_result = run_business_rule_model(
+            br_result = await self._call_model(
+                agent,
+                context,
+                run_business_rule_model,
                 ir=logic_ir,
                 entities=resolved_entities,
                 plan=plan,
-                client=agent.client,
                 model=agent.business_rule_model,
                 system_prompt=self.business_rule_system_prompt,
                 temperature=agent.business_rule_temperature,
@@ -1279,9 +2075,11 @@ class Workflow:
             br_ir_dict = br_result.get("ir") if isinstance(br_result.get("ir"), dict) else None
             effective_ir = _payload_to_ir(br_ir_dict, context.last_rows) if br_ir_dict else logic_ir
 
-            validator_result = run_validator_model(
+            validator_result = await self._call_model(
+                agent,
+                context,
+                run_validator_model,
                 ir=effective_ir,
-                client=agent.client,
                 model=agent.validator_model,
                 system_prompt=self.validator_system_prompt,
                 temperature=agent.validator_temperature,
@@ -1301,11 +2099,13 @@ class Workflow:
                 )
                 start_time = perf_counter()
                 start = time.monotonic()
-                render_payload = run_rendering_model(
+                render_payload = await self._call_model(
+                    agent,
+                    context,
+                    run_rendering_model,
                     user_query=context.query,
                     ir=safe_ir,
                     insights=[],
-                    client=agent.client,
                     model=agent.render_model,
                     system_prompt=self.rendering_system_prompt,
                     temperature=agent.render_temperature,
@@ -1313,26 +2113,33 @@ class Workflow:
                 render_payload["_rendered"] = True
                 log_timing("Rendering Model", start, time.monotonic())
                 _record_stage_duration(context, "rendering_model", start_time)
-                return _cache_and_return(render_payload)
+                return await _cache_and_return(render_payload)
+
+            _emit_rows_ready(context, effective_ir, getattr(router_decision, "mode", None))
 
             start_time = perf_counter()
-            insight_result = run_insight_model(
+            insight_result = await self._call_model(
+                agent,
+                context,
+                run_insight_model,
                 ir=effective_ir,
-                client=agent.client,
                 model=agent.insight_model,
                 system_prompt=self.insight_system_prompt,
                 temperature=agent.insight_temperature,
             )
             _record_stage_duration(context, "insight_model", start_time)
             insights = insight_result.get("insights") or []
+            _emit(context, "insights_ready", insights=insights)
 
             start_time = perf_counter()
             start = time.monotonic()
-            render_payload = run_rendering_model(
+            render_payload = await self._call_model(
+                agent,
+                context,
+                run_rendering_model,
                 user_query=context.query,
                 ir=effective_ir,
                 insights=insights,
-                client=agent.client,
                 model=agent.render_model,
                 system_prompt=self.rendering_system_prompt,
                 temperature=agent.render_temperature,
@@ -1340,7 +2147,7 @@ class Workflow:
             render_payload["_rendered"] = True
             log_timing("Rendering Model", start, time.monotonic())
             _record_stage_duration(context, "rendering_model", start_time)
-            return _cache_and_return(render_payload)
+            return await _cache_and_return(render_payload)
 
         raise RuntimeError("Agent workflow exceeded iteration limit.")
 
@@ -1363,6 +2170,7 @@ class Agent:
         business_rule_model: str,
         workflow: Workflow,
         tools: Sequence[Tool],
+        async_client: AsyncOpenAI | None = None,
         nlv_temperature: float = 0.1,
         entity_temperature: float = 0.1,
         sql_planner_temperature: float = 0.1,
@@ -1374,6 +2182,7 @@ class Agent:
         business_rule_temperature: float = 0.1,
     ) -> None:
         self.client = client
+        self.async_client = async_client
         self.nlv_model = nlv_model
         self.entity_model = entity_model
         self.sql_planner_model = sql_planner_model
@@ -1416,6 +2225,15 @@ class Agent:
     def run(self, query: str, user_context: dict[str, Any]) -> AgentResponse:
         return self.workflow.execute(self, query, user_context)
 
+    async def arun(
+        self,
+        query: str,
+        user_context: dict[str, Any],
+        *,
+        on_event: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> AgentResponse:
+        return await self.workflow.aexecute(self, query, user_context, on_event=on_event)
+
 
 def _json_default(value: Any) -> Any:
     if hasattr(value, "isoformat"):
@@ -1715,6 +2533,29 @@ def _strip_sensitive_columns(rows: list[dict[str, Any]]) -> list[dict[str, Any]]
     return sanitized
 
 
+def _carries_time_window(state: Any) -> bool:
+    """Whether a serialized :class:`ConversationState` remembers a time window."""
+
+    if not isinstance(state, Mapping):
+        return False
+    return any(
+        state.get(name)
+        for name in ("last_period_start", "last_period_end", "last_month", "last_year_window")
+    )
+
+
+def _render_fast_path(plan: FastPathPlan, context: AgentContext) -> AgentResponse:
+    """Render a deterministic plan's rows with the MV table templates."""
+
+    rows = plan.rows or []
+    ir = AnalyticsIR(text="", rows=rows, mode=plan.mode)
+    _emit_rows_ready(context, ir, plan.mode)
+    subject = plan.plan_kind.replace("_", " ").capitalize()
+    text = f"{subject} for {plan.entity_name}." if plan.entity_name else f"{subject}."
+    html = select_table_template(ir, plan.mode)
+    return _finalise_response({"text": text, "rows": rows, "html": html}, context, remember=False)
+
+
 def _remember_interaction(context: AgentContext, response: AgentResponse) -> None:
     if not context.memory or not context.session_id:
         return
@@ -1883,7 +2724,9 @@ def _build_session_id(user_context: Mapping[str, Any] | None) -> str | None:
     return sid
 
 
-def _finalise_response(payload: Mapping[str, Any], context: AgentContext) -> AgentResponse:
+def _finalise_response(
+    payload: Mapping[str, Any], context: AgentContext, *, remember: bool = True
+) -> AgentResponse:
     text_value = str(payload.get("text") or "").strip()
     text_value = _strip_html(text_value)
 
@@ -1946,7 +2789,8 @@ def _finalise_response(payload: Mapping[str, Any], context: AgentContext) -> Age
     # ATTACH SQL (THIS IS THE IMPORTANT PART)
     setattr(response, "debug_sql", context.last_sql)
 
-    _remember_interaction(context, response)
+    if remember:
+        _remember_interaction(context, response)
     return response
 
 
@@ -1980,168 +2824,196 @@ def _apply_district_filter(
     return normalized, params
 
 
-def _build_run_sql_tool(engine: Engine) -> Tool:
-    description = (
-        "Execute a read-only SQL query against the analytics database. "
-        "Use invoices.total_cost for money amounts. "
-        "Use invoices.district_key = :district_key to restrict by district. "
-        "Supports searching by student name (invoices.student_name) and vendor name (JOIN vendors on vendor_id). "
-        "Supports month/year filters using service_month TEXT and invoice_date."
+def _rewrite_run_sql(sql_statement: str) -> str:
+    """Strip literal district predicates and scope bare ``SELECT *`` queries."""
+
+    # Remove any hard-coded district_key string literals from the SQL.
+    # This fixes queries like "i.district_key = '1'" that incorrectly
+    # filter out all rows. Since the current deployment is effectively
+    # single-tenant, dropping this predicate is safe.
+    sql_no_dk = sql_statement
+
+    # Case 1: "WHERE i.district_key = '... ' AND ..." -> drop the predicate, keep the rest.
+    sql_no_dk = re.sub(
+        r"(?i)\bWHERE\s+(?:i|invoices)\.district_key\s*=\s*'[^']*'\s+AND\s+",
+        "WHERE ",
+        sql_no_dk,
     )
-    schema = {
-        "type": "object",
-        "properties": {
-            "query": {
-                "type": "string",
-                "description": "Complete SQL statement starting with SELECT or WITH.",
-            }
-        },
-        "required": ["query"],
-        "additionalProperties": False,
-    }
 
-    def handler(context: AgentContext, arguments: Mapping[str, Any]) -> list[dict[str, Any]]:
-        query = arguments.get("query")
-        if not isinstance(query, str) or not query.strip():
-            raise ValueError("SQL query must be a non-empty string.")
+    # Case 2: "WHERE i.district_key = '...'" with no trailing AND -> replace with neutral WHERE 1=1.
+    sql_no_dk = re.sub(
+        r"(?i)\bWHERE\s+(?:i|invoices)\.district_key\s*=\s*'[^']*'\s*(?=$|\s*(ORDER|GROUP|LIMIT|;))",
+        "WHERE 1=1 ",
+        sql_no_dk,
+    )
 
-        normalized = query.lstrip().lower()
-        if not (normalized.startswith("select") or normalized.startswith("with")):
-            raise ValueError("Only SELECT and WITH statements are permitted.")
+    # Case 3: "AND i.district_key = '...'" in the middle of other conditions -> remove that AND clause.
+    sql_no_dk = re.sub(
+        r"(?i)\bAND\s+(?:i|invoices)\.district_key\s*=\s*'[^']*'\s*",
+        " ",
+        sql_no_dk,
+    )
 
-        filtered_query, parameters = _apply_district_filter(
-            query, context.district_id, context.district_key
-        )
+    # Additional cleanup for bare district_key predicates without table alias.
+    # Case A: "WHERE district_key = '... ' AND ..." -> drop the predicate, keep the rest.
+    sql_no_dk = re.sub(
+        r"(?i)\bWHERE\s+district_key\s*=\s*'[^']*'\s+AND\s+",
+        "WHERE ",
+        sql_no_dk,
+    )
 
-        sql_statement = filtered_query.strip()
-        params = dict(parameters)
+    # Case B: "WHERE district_key = '...'" with no trailing AND -> replace with neutral WHERE 1=1.
+    sql_no_dk = re.sub(
+        r"(?i)\bWHERE\s+district_key\s*=\s*'[^']*'\s*(?=$|\s*(ORDER|GROUP|LIMIT|;))",
+        "WHERE 1=1 ",
+        sql_no_dk,
+    )
 
-        # If the caller did not provide a district_key but we have a district_id,
-        # resolve the key from the districts table so parameter binding succeeds.
-        if "district_key" not in params and context.district_id is not None:
-            try:
-                with engine.connect() as connection:
-                    result = connection.execute(
-                        sql_text(
-                            "SELECT district_key FROM districts WHERE id = :district_id"
-                        ),
-                        {"district_id": context.district_id},
-                    )
-                    resolved_key = result.scalar_one_or_none()
-            except Exception as exc:  # pragma: no cover - defensive
-                resolved_key = None
-                LOGGER.warning(
-                    "district_key_lookup_failed",
-                    district_id=context.district_id,
-                    error=str(exc),
-                )
+    # Case C: "AND district_key = '...'" -> remove that AND clause.
+    sql_no_dk = re.sub(
+        r"(?i)\bAND\s+district_key\s*=\s*'[^']*'\s*",
+        " ",
+        sql_no_dk,
+    )
 
-            if resolved_key:
-                params["district_key"] = resolved_key
-                context.user_context["district_key"] = resolved_key
-
-        # Remove any hard-coded district_key string literals from the SQL.
-        # This fixes queries like "i.district_key = '1'" that incorrectly
-        # filter out all rows. Since the current deployment is effectively
-        # single-tenant, dropping this predicate is safe.
-        sql_no_dk = sql_statement
-
-        # Case 1: "WHERE i.district_key = '... ' AND ..." -> drop the predicate, keep the rest.
-        sql_no_dk = re.sub(
-            r"(?i)\bWHERE\s+(?:i|invoices)\.district_key\s*=\s*'[^']*'\s+AND\s+",
-            "WHERE ",
-            sql_no_dk,
-        )
+    sql_statement = sql_no_dk
 
-        # Case 2: "WHERE i.district_key = '...'" with no trailing AND -> replace with neutral WHERE 1=1.
-        sql_no_dk = re.sub(
-            r"(?i)\bWHERE\s+(?:i|invoices)\.district_key\s*=\s*'[^']*'\s*(?=$|\s*(ORDER|GROUP|LIMIT|;))",
-            "WHERE 1=1 ",
-            sql_no_dk,
-        )
+    lowered = sql_statement.lower()
+    needs_wrap = (
+        " from invoices" in lowered
+        and "district_key" not in lowered
+        and "sub.district_key" not in lowered
+    )
 
-        # Case 3: "AND i.district_key = '...'" in the middle of other conditions -> remove that AND clause.
-        sql_no_dk = re.sub(
-            r"(?i)\bAND\s+(?:i|invoices)\.district_key\s*=\s*'[^']*'\s*",
-            " ",
-            sql_no_dk,
-        )
+    # Only auto-wrap when the query selects * from invoices; if it uses an explicit
+    # column list (no "*"), skip wrapping to avoid referencing sub.district_key when
+    # that column is not present in the projection.
+    if needs_wrap and re.search(r"(?i)\bselect\s+\*", sql_statement):
+        sql_statement = f"""
+    SELECT *
+    FROM (
+        {sql_statement}
+    ) AS sub
+    WHERE sub.district_key = :district_key
+    """
 
-        # Additional cleanup for bare district_key predicates without table alias.
-        # Case A: "WHERE district_key = '... ' AND ..." -> drop the predicate, keep the rest.
-        sql_no_dk = re.sub(
-            r"(?i)\bWHERE\s+district_key\s*=\s*'[^']*'\s+AND\s+",
-            "WHERE ",
-            sql_no_dk,
-        )
+    return normalize_sql_for_postgres(sql_statement)
 
-        # Case B: "WHERE district_key = '...'" with no trailing AND -> replace with neutral WHERE 1=1.
-        sql_no_dk = re.sub(
-            r"(?i)\bWHERE\s+district_key\s*=\s*'[^']*'\s*(?=$|\s*(ORDER|GROUP|LIMIT|;))",
-            "WHERE 1=1 ",
-            sql_no_dk,
-        )
 
-        # Case C: "AND district_key = '...'" -> remove that AND clause.
-        sql_no_dk = re.sub(
-            r"(?i)\bAND\s+district_key\s*=\s*'[^']*'\s*",
-            " ",
-            sql_no_dk,
-        )
+def _prepare_run_sql(
+    context: AgentContext, arguments: Mapping[str, Any]
+) -> tuple[str, dict[str, Any]]:
+    """Validate a ``run_sql`` call and return the statement and bind parameters."""
 
-        sql_statement = sql_no_dk
+    query = arguments.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("SQL query must be a non-empty string.")
 
-        lowered = sql_statement.lower()
-        needs_wrap = (
-            " from invoices" in lowered
-            and "district_key" not in lowered
-            and "sub.district_key" not in lowered
-        )
+    normalized = query.lstrip().lower()
+    if not (normalized.startswith("select") or normalized.startswith("with")):
+        raise ValueError("Only SELECT and WITH statements are permitted.")
 
-        # Only auto-wrap when the query selects * from invoices; if it uses an explicit
-        # column list (no "*"), skip wrapping to avoid referencing sub.district_key when
-        # that column is not present in the projection.
-        if needs_wrap and re.search(r"(?i)\bselect\s+\*", sql_statement):
-            sql_statement = f"""
-        SELECT *
-        FROM (
-            {sql_statement}
-        ) AS sub
-        WHERE sub.district_key = :district_key
-        """
+    filtered_query, parameters = _apply_district_filter(
+        query, context.district_id, context.district_key
+    )
+    return filtered_query.strip(), dict(parameters)
 
-        normalized_sql = normalize_sql_for_postgres(sql_statement)
 
-        LOGGER.info(
-            "analytics_run_sql_request",
-            sql=normalized_sql,
-            params=params,
-        )
+_DISTRICT_KEY_LOOKUP_SQL = "SELECT district_key FROM districts WHERE id = :district_id"
+
+
+def _run_sql(
+    context: AgentContext, arguments: Mapping[str, Any], execute: SqlExecutor
+) -> list[dict[str, Any]]:
+    """Body of the ``run_sql`` tool, running statements through ``execute``."""
+
+    sql_statement, params = _prepare_run_sql(context, arguments)
 
+    # If the caller did not provide a district_key but we have a district_id,
+    # resolve the key from the districts table so parameter binding succeeds.
+    if "district_key" not in params and context.district_id is not None:
         try:
-            with engine.connect() as connection:
-                result = connection.execute(sql_text(normalized_sql), params)
-                rows = [dict(row) for row in result.mappings()]
-        except Exception as exc:
-            LOGGER.error(
-                "analytics_run_sql_error",
-                sql=normalized_sql,
-                params=params,
+            found = execute(_DISTRICT_KEY_LOOKUP_SQL, {"district_id": context.district_id})
+            resolved_key = _first_column(found)[0] if found else None
+        except Exception as exc:  # pragma: no cover - defensive
+            resolved_key = None
+            LOGGER.warning(
+                "district_key_lookup_failed",
+                district_id=context.district_id,
                 error=str(exc),
             )
-            raise
 
-        LOGGER.info(
-            "analytics_run_sql_result",
+        if resolved_key:
+            params["district_key"] = resolved_key
+            context.user_context["district_key"] = resolved_key
+
+    normalized_sql = _rewrite_run_sql(sql_statement)
+
+    LOGGER.info(
+        "analytics_run_sql_request",
+        sql=normalized_sql,
+        params=params,
+    )
+
+    try:
+        rows = execute(normalized_sql, params)
+    except Exception as exc:
+        LOGGER.error(
+            "analytics_run_sql_error",
             sql=normalized_sql,
-            row_count=len(rows),
+            params=params,
+            error=str(exc),
         )
+        raise
 
-        context.last_sql = normalized_sql
+    LOGGER.info(
+        "analytics_run_sql_result",
+        sql=normalized_sql,
+        row_count=len(rows),
+    )
 
-        return rows
+    context.last_sql = normalized_sql
+
+    return rows
+
+
+def _build_run_sql_tool(engine: Engine, async_engine: "AsyncEngine | None" = None) -> Tool:
+    description = (
+        "Execute a read-only SQL query against the analytics database. "
+        "Use invoices.total_cost for money amounts. "
+        "Use invoices.district_key = :district_key to restrict by district. "
+        "Supports searching by student name (invoices.student_name) and vendor name (JOIN vendors on vendor_id). "
+        "Supports month/year filters using service_month TEXT and invoice_date."
+    )
+    schema = {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Complete SQL statement starting with SELECT or WITH.",
+            }
+        },
+        "required": ["query"],
+        "additionalProperties": False,
+    }
 
-    return Tool(name="run_sql", description=description, input_schema=schema, handler=handler)
+    def handler(context: AgentContext, arguments: Mapping[str, Any]) -> list[dict[str, Any]]:
+        return _run_sql(context, arguments, _engine_executor(engine))
+
+    async def async_handler(
+        context: AgentContext, arguments: Mapping[str, Any]
+    ) -> list[dict[str, Any]]:
+        return await run_blocking(
+            _run_sql, context, arguments, _awaiting_executor(async_engine)
+        )
+
+    return Tool(
+        name="run_sql",
+        description=description,
+        input_schema=schema,
+        handler=handler,
+        async_handler=async_handler if async_engine is not None else None,
+    )
 
 
 def _build_list_s3_tool() -> Tool:
@@ -2209,7 +3081,9 @@ def _build_agent() -> Agent:
         raise RuntimeError("OPENAI_API_KEY is not configured.")
 
     client = OpenAI(api_key=settings.openai_api_key)
+    async_client = AsyncOpenAI(api_key=settings.openai_api_key)
     engine = get_engine()
+    async_engine = get_async_engine()
     memory = _build_memory_store(settings)
     nlv_system_prompt = build_nlv_system_prompt()
     entity_resolution_system_prompt = build_entity_resolution_system_prompt()
@@ -2237,10 +3111,15 @@ def _build_agent() -> Agent:
         max_iterations=MAX_ITERATIONS,
         memory=memory,
         engine=engine,
+        async_engine=async_engine,
+        memo=StageMemo.from_settings(settings),
+        fast_path=settings.analytics_fast_path_enabled,
+        entity_candidates=settings.entity_match_top_k or None,
     )
-    tools = [_build_run_sql_tool(engine), _build_list_s3_tool()]
+    tools = [_build_run_sql_tool(engine, async_engine), _build_list_s3_tool()]
     return Agent(
         client=client,
+        async_client=async_client,
         nlv_model=default_model,
         entity_model=default_model,
         sql_planner_model=default_model,
@@ -2291,4 +3170,45 @@ def run_analytics_agent(query: str, user_context: dict[str, Any] | None = None)
     return agent.run(query.strip(), user_context or {})
 
 
-__all__ = ["AgentResponse", "run_analytics_agent", "AgentContext", "Tool", "Workflow", "Agent"]
+def prefetch_analytics_report(query: str, user_context: dict[str, Any]) -> bool:
+    """Run a templated prefetch job without models; False means run the full agent."""
+
+    if not get_settings().prefetch_templated:
+        return False
+    agent = _get_agent()
+    return run_sync(agent.workflow.aprefetch(agent, query.strip(), user_context))
+
+
+async def arun_analytics_agent(
+    query: str,
+    user_context: dict[str, Any] | None = None,
+    *,
+    on_event: Callable[[str, dict[str, Any]], None] | None = None,
+) -> AgentResponse:
+    """Async variant of :func:`run_analytics_agent` for use on the event loop.
+
+    ``on_event`` is called with workflow progress events for streaming clients.
+    """
+
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("A query is required.")
+
+    try:
+        agent = _get_agent()
+    except Exception as exc:  # pragma: no cover - configuration issue
+        LOGGER.error("analytics_agent_init_failed", error=str(exc))
+        raise
+
+    return await agent.arun(query.strip(), user_context or {}, on_event=on_event)
+
+
+__all__ = [
+    "AgentResponse",
+    "prefetch_analytics_report",
+    "run_analytics_agent",
+    "arun_analytics_agent",
+    "AgentContext",
+    "Tool",
+    "Workflow",
+    "Agent",
+]
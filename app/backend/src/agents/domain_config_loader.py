@@ -1,5 +1,22 @@
-from pathlib import Path
+"""Loader for ``domain_config.json``, the source of truth for intents and routing.
+
+The config is parsed once and compiled into a :class:`CompiledDomainConfig`.
+The synonym and trigger matching that NLV and the SQL router run on every
+question is folded into one Aho-Corasick automaton. The file's mtime is
+checked on each call, so edits are picked up without a restart.
+
+The dict returned by :func:`load_domain_config` is shared between callers
+and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
 import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterable
+
 import structlog
 
 LOGGER = structlog.get_logger(__name__)
@@ -7,10 +24,175 @@ LOGGER = structlog.get_logger(__name__)
 CONFIG_PATH = Path(__file__).parent / "domain_config.json"
 
 
-def load_domain_config() -> dict:
+class AhoCorasick:
+    """Multi-pattern substring matcher over lower-cased text.
+
+    ``find(text)`` reports the index of every pattern that occurs in ``text``,
+    with the same semantics as ``pattern in text`` evaluated for each pattern.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self.size = 0
+        for pattern_id, pattern in enumerate(patterns):
+            self.size += 1
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pattern_id)
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+def _string_items(values: Any) -> list[str]:
+    if not isinstance(values, list):
+        return []
+    return [value for value in values if isinstance(value, str)]
+
+
+class CompiledDomainConfig:
+    """``domain_config.json`` plus precompiled intent and trigger matchers."""
+
+    def __init__(self, raw: dict[str, Any], *, mtime_ns: int | None = None) -> None:
+        self.raw = raw
+        self.mtime_ns = mtime_ns
+
+        patterns: list[str] = []
+        # Pattern index -> plan kinds (intent_synonyms) or router modes (triggers)
+        # that list it. Duplicate entries are kept so scores match a plain scan.
+        self._synonym_kinds: list[list[str]] = []
+        self._trigger_modes: list[list[str]] = []
+        pattern_ids: dict[str, int] = {}
+
+        def _pattern_id(text: str) -> int:
+            if text not in pattern_ids:
+                pattern_ids[text] = len(patterns)
+                patterns.append(text)
+                self._synonym_kinds.append([])
+                self._trigger_modes.append([])
+            return pattern_ids[text]
+
+        plan_kinds = raw.get("plan_kinds", {}) or {}
+        self.plan_kind_order: list[str] = []
+        if isinstance(plan_kinds, dict):
+            for kind_name, cfg in plan_kinds.items():
+                if not isinstance(cfg, dict):
+                    continue
+                self.plan_kind_order.append(kind_name)
+                for synonym in _string_items(cfg.get("intent_synonyms")):
+                    text = synonym.strip().lower()
+                    if text:
+                        self._synonym_kinds[_pattern_id(text)].append(kind_name)
+
+        router_modes = raw.get("router_modes", {}) or {}
+        self.router_mode_order: list[str] = []
+        if isinstance(router_modes, dict):
+            for mode_key, cfg in router_modes.items():
+                self.router_mode_order.append(mode_key)
+                triggers = cfg.get("triggers", []) if isinstance(cfg, dict) else []
+                for trigger in _string_items(triggers):
+                    text = trigger.lower()
+                    if text:
+                        self._trigger_modes[_pattern_id(text)].append(mode_key)
+
+        self.matcher = AhoCorasick(patterns)
+
+    def intent_scores(self, query: str) -> dict[str, int]:
+        """Number of ``intent_synonyms`` of each plan kind contained in ``query``."""
+
+        scores: dict[str, int] = {}
+        for pattern_id in self.matcher.find(query.lower()):
+            for kind_name in self._synonym_kinds[pattern_id]:
+                scores[kind_name] = scores.get(kind_name, 0) + 1
+        return scores
+
+    def first_intent(self, query: str) -> str | None:
+        """First plan kind, in config order, with an ``intent_synonyms`` entry in ``query``."""
+
+        scores = self.intent_scores(query)
+        return next((kind for kind in self.plan_kind_order if kind in scores), None)
+
+    def triggered_modes(self, query: str) -> list[str]:
+        """Router modes with a trigger contained in ``query``, in config order."""
+
+        hits: set[str] = set()
+        for pattern_id in self.matcher.find(query.lower()):
+            hits.update(self._trigger_modes[pattern_id])
+        return [mode for mode in self.router_mode_order if mode in hits]
+
+
+_LOCK = threading.Lock()
+_COMPILED: CompiledDomainConfig | None = None
+
+
+def _config_mtime_ns() -> int | None:
     try:
-        with CONFIG_PATH.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as exc:
-        LOGGER.warning("domain-config-load-failed", error=str(exc))
-        return {}
+        return CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_domain_config() -> CompiledDomainConfig:
+    """Return the compiled config, reloading it when the file has changed."""
+
+    global _COMPILED
+
+    mtime_ns = _config_mtime_ns()
+    compiled = _COMPILED
+    if compiled is not None and compiled.mtime_ns == mtime_ns:
+        return compiled
+
+    with _LOCK:
+        if _COMPILED is not None and _COMPILED.mtime_ns == mtime_ns:
+            return _COMPILED
+        try:
+            with CONFIG_PATH.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except Exception as exc:
+            LOGGER.warning("domain-config-load-failed", error=str(exc))
+            if _COMPILED is not None and _COMPILED.raw:
+                # Keep serving the last good config while the file is being edited.
+                return _COMPILED
+            raw = {}
+        _COMPILED = CompiledDomainConfig(raw if isinstance(raw, dict) else {}, mtime_ns=mtime_ns)
+        LOGGER.info("domain_config_compiled", patterns=_COMPILED.matcher.size)
+        return _COMPILED
+
+
+def load_domain_config() -> dict:
+    return get_domain_config().raw
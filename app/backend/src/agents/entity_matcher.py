@@ -0,0 +1,243 @@
+"""Local candidate generation for the entity resolution stage.
+
+Shipping every district student, vendor and clinician to the entity
+resolution model makes its prompt grow with district size. The
+:class:`TrigramEntityIndex` scores names against the mentions in a question
+with pg_trgm-style trigram similarity, so that:
+
+* exact and near-exact mentions resolve deterministically, and
+* ambiguous mentions only send their top-k candidates to the model.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+import structlog
+
+LOGGER = structlog.get_logger(__name__)
+
+ENTITY_KINDS = ("students", "vendors", "clinicians")
+
+# normalized_intent entity keys produced by the NLV stage.
+MENTION_KEYS: dict[str, str] = {
+    "student_name": "students",
+    "student_name_candidates": "students",
+    "clinician_name": "clinicians",
+    "clinician_name_candidates": "clinicians",
+    "provider_name": "clinicians",
+    "vendor_name": "vendors",
+}
+
+# A mention resolves without the model when its best match scores at least
+# NEAR_EXACT_SCORE and leads the runner-up by RESOLVE_MARGIN.
+NEAR_EXACT_SCORE = 0.8
+RESOLVE_MARGIN = 0.15
+# Candidates scoring below this are not worth showing to the model.
+MIN_CANDIDATE_SCORE = 0.25
+# Share of a name's trigrams that must appear in the query to count as mentioned.
+QUERY_CONTAINMENT_SCORE = 0.9
+_MIN_NAME_LENGTH = 3
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(value: str) -> str:
+    return " ".join(_NON_WORD_RE.sub(" ", (value or "").lower()).split())
+
+
+def trigrams(value: str) -> set[str]:
+    """Word-padded trigrams of ``value``, as computed by pg_trgm."""
+
+    grams: set[str] = set()
+    for word in normalize_name(value).split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass
+class EntityShortlist:
+    """Outcome of matching a question's mentions against the entity catalog."""
+
+    resolved: dict[str, list[str]] = field(default_factory=dict)
+    candidates: dict[str, list[str]] = field(default_factory=dict)
+    ambiguous: list[str] = field(default_factory=list)
+
+    @property
+    def fully_resolved(self) -> bool:
+        return any(self.resolved.values()) and not self.ambiguous
+
+    def known_entities(self) -> dict[str, list[str]]:
+        """Shortlisted names for the model prompt, resolved names included."""
+
+        shortlisted: dict[str, list[str]] = {}
+        for kind in ENTITY_KINDS:
+            names = list(self.resolved.get(kind, []))
+            names += [name for name in self.candidates.get(kind, []) if name not in names]
+            shortlisted[kind] = names
+        return shortlisted
+
+
+class TrigramEntityIndex:
+    """Inverted trigram index over a district's entity catalog."""
+
+    def __init__(self, known_entities: Mapping[str, Iterable[str]]) -> None:
+        self._names: list[tuple[str, str, str, int]] = []
+        self._postings: dict[str, list[int]] = {}
+        seen: set[tuple[str, str]] = set()
+        for kind in ENTITY_KINDS:
+            for name in known_entities.get(kind) or []:
+                if not isinstance(name, str):
+                    continue
+                normalized = normalize_name(name)
+                if len(normalized) < _MIN_NAME_LENGTH or (kind, normalized) in seen:
+                    continue
+                seen.add((kind, normalized))
+                grams = trigrams(normalized)
+                entry_id = len(self._names)
+                self._names.append((kind, name, normalized, len(grams)))
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append(entry_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _overlaps(self, grams: set[str]) -> Counter[int]:
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        return shared
+
+    def search(
+        self, mention: str, *, kind: str | None = None, limit: int = 5
+    ) -> list[tuple[str, str, float]]:
+        """Return ``(kind, name, similarity)`` for the best matches of ``mention``."""
+
+        normalized = normalize_name(mention)
+        grams = trigrams(normalized)
+        if not grams:
+            return []
+        scored: list[tuple[float, str, str]] = []
+        for entry_id, shared in self._overlaps(grams).items():
+            entry_kind, name, entry_normalized, size = self._names[entry_id]
+            if kind is not None and entry_kind != kind:
+                continue
+            if entry_normalized == normalized:
+                score = 1.0
+            else:
+                # Dice coefficient, capped below an exact match.
+                score = min(2.0 * shared / (len(grams) + size), 0.99)
+            scored.append((score, entry_kind, name))
+        scored.sort(key=lambda item: (-item[0], item[2]))
+        return [(entry_kind, name, score) for score, entry_kind, name in scored[:limit]]
+
+    def mentioned_in(self, text: str, *, limit: int = 5) -> list[tuple[str, str, float]]:
+        """Names whose trigrams are (almost) all present in ``text``."""
+
+        grams = trigrams(text)
+        hits: list[tuple[float, str, str]] = []
+        for entry_id, shared in self._overlaps(grams).items():
+            entry_kind, name, _, size = self._names[entry_id]
+            containment = shared / size if size else 0.0
+            if containment >= QUERY_CONTAINMENT_SCORE:
+                hits.append((containment, entry_kind, name))
+        hits.sort(key=lambda item: (-item[0], item[2]))
+        return [(entry_kind, name, score) for score, entry_kind, name in hits[:limit]]
+
+
+def _mentions(normalized_intent: Mapping[str, Any] | None) -> list[tuple[str, str]]:
+    entities = (normalized_intent or {}).get("entities")
+    if not isinstance(entities, Mapping):
+        return []
+    mentions: list[tuple[str, str]] = []
+    for key, kind in MENTION_KEYS.items():
+        value = entities.get(key)
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            if isinstance(item, str) and item.strip() and (item, kind) not in mentions:
+                mentions.append((item, kind))
+    return mentions
+
+
+def shortlist_entities(
+    index: TrigramEntityIndex,
+    *,
+    user_query: str,
+    normalized_intent: Mapping[str, Any] | None,
+    top_k: int,
+) -> EntityShortlist:
+    """Resolve the mentions in a question locally and shortlist the rest."""
+
+    shortlist = EntityShortlist()
+
+    def _add(target: dict[str, list[str]], kind: str, name: str) -> None:
+        names = target.setdefault(kind, [])
+        if name not in names:
+            names.append(name)
+
+    for mention, kind in _mentions(normalized_intent):
+        matches = index.search(mention, kind=kind, limit=top_k)
+        if not matches or matches[0][2] < MIN_CANDIDATE_SCORE:
+            # The NLV stage may have typed the name wrongly ("provider" for a student).
+            matches = index.search(mention, limit=top_k)
+        matches = [match for match in matches if match[2] >= MIN_CANDIDATE_SCORE]
+        if not matches:
+            shortlist.ambiguous.append(mention)
+            continue
+        best_kind, best_name, best_score = matches[0]
+        runner_up = matches[1][2] if len(matches) > 1 else 0.0
+        if best_score == 1.0 or (
+            best_score >= NEAR_EXACT_SCORE and best_score - runner_up >= RESOLVE_MARGIN
+        ):
+            _add(shortlist.resolved, best_kind, best_name)
+            continue
+        shortlist.ambiguous.append(mention)
+        for match_kind, name, _ in matches:
+            _add(shortlist.candidates, match_kind, name)
+
+    # Names spelled out in the query that the NLV stage did not extract.
+    for kind, name, _ in index.mentioned_in(user_query, limit=top_k):
+        if name not in shortlist.resolved.get(kind, []):
+            _add(shortlist.candidates, kind, name)
+
+    return shortlist
+
+
+_INDEX_CACHE: "OrderedDict[int, tuple[Mapping[str, Any], TrigramEntityIndex]]" = OrderedDict()
+_INDEX_CACHE_SIZE = 16
+_INDEX_LOCK = threading.Lock()
+
+
+def get_entity_index(known_entities: Mapping[str, Iterable[str]]) -> TrigramEntityIndex:
+    """Return the index for ``known_entities``, reusing it while the catalog object lives.
+
+    Catalogs come from the entity catalog cache, which hands out the same
+    mapping until the district's version changes, so identity is a cheap key.
+    """
+
+    key = id(known_entities)
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(key)
+        if cached is not None and cached[0] is known_entities:
+            _INDEX_CACHE.move_to_end(key)
+            return cached[1]
+    index = TrigramEntityIndex(known_entities)
+    with _INDEX_LOCK:
+        _INDEX_CACHE[key] = (known_entities, index)
+        _INDEX_CACHE.move_to_end(key)
+        while len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+__all__ = [
+    "EntityShortlist",
+    "TrigramEntityIndex",
+    "get_entity_index",
+    "shortlist_entities",
+]
@@ -6,8 +6,10 @@ import json
 from typing import Any
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .async_llm import run_model_async
+from .entity_matcher import get_entity_index, shortlist_entities
 from .json_utils import _extract_json_object
 
 LOGGER = structlog.get_logger(__name__)
@@ -56,6 +58,7 @@ Rules:
 
 Entity classification rules:
 - Use known_entities as the universe of valid students, vendors, and clinicians, but you may fuzzy match user-supplied names against those lists.
+- known_entities may be a shortlist of the closest candidates rather than the whole district; treat a name missing from it as unmatched.
 - Fuzzy matching rules (case-insensitive):
   • exact equality
   • one name contains the other (user_name contains known_name or known_name contains user_name)
@@ -89,8 +92,40 @@ def run_entity_resolution_model(
     model: str,
     system_prompt: str,
     temperature: float,
+    candidate_limit: int | None = None,
 ) -> dict[str, Any]:
-    """Execute the entity resolution model with safe fallbacks."""
+    """Execute the entity resolution model with safe fallbacks.
+
+    With ``candidate_limit`` set, mentions are matched locally first: when all
+    of them resolve to exact or near-exact names the model is skipped, and
+    otherwise it only sees up to ``candidate_limit`` candidates per mention.
+    """
+
+    if candidate_limit and known_entities:
+        index = get_entity_index(known_entities)
+        shortlist = shortlist_entities(
+            index,
+            user_query=user_query,
+            normalized_intent=normalized_intent,
+            top_k=candidate_limit,
+        )
+        if shortlist.fully_resolved and not (normalized_intent or {}).get(
+            "requires_clarification"
+        ):
+            LOGGER.info(
+                "entity_resolution_local",
+                resolved={kind: len(names) for kind, names in shortlist.resolved.items()},
+            )
+            payload = _default_payload(normalized_intent)
+            payload["entities"] = {kind: list(names) for kind, names in shortlist.resolved.items()}
+            return payload
+        known_entities = shortlist.known_entities()
+        LOGGER.info(
+            "entity_resolution_shortlisted",
+            catalog_size=len(index),
+            candidates=sum(len(names) for names in known_entities.values()),
+            ambiguous=len(shortlist.ambiguous),
+        )
 
     messages = [
         {"role": "system", "content": system_prompt},
@@ -151,3 +186,9 @@ def run_entity_resolution_model(
         payload["normalized_intent"] = normalized_intent or {}
 
     return payload
+
+
+async def arun_entity_resolution_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_entity_resolution_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_entity_resolution_model, client=client, **kwargs)
@@ -0,0 +1,267 @@
+"""Deterministic, model-free planning for well-understood analytics questions.
+
+Questions such as "monthly spend for <student>" are fully described by the
+rules the chain already uses: the plan kind comes from
+``domain_config.plan_kinds`` synonyms, the router mode from
+:func:`route_sql`, and the SQL from the logic stage's deterministic overrides.
+:func:`plan_fast_path` applies those rules to the raw question and returns a
+plan only when every step resolves unambiguously; anything else goes through
+the full model chain. :func:`plan_for_intent` does the same for a question
+whose plan kind and entity are already known, as they are for prefetch jobs,
+and :func:`intent_for_plan` gives the normalized intent both key their
+answers on.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import structlog
+
+from app.backend.src.services.prefetch_predictor import followup_intent
+
+from .domain_config_loader import load_domain_config
+from .logic_model import build_deterministic_sql_call
+from .nlv_model import (
+    _deterministic_intent_from_config,
+    _has_time_reference,
+    normalize_nlv_payload,
+)
+from .sql_router import PLAN_KIND_TO_MODE, RouterDecision, route_sql
+
+LOGGER = structlog.get_logger(__name__)
+
+# known_entities keys by the entity_role used in domain_config.plan_kinds.
+ENTITY_ROLE_KEYS: dict[str, str] = {
+    "student": "students",
+    "vendor": "vendors",
+    "clinician": "clinicians",
+}
+
+# Router modes whose deterministic SQL applies the month named in the query.
+MONTH_AWARE_MODES = {"student_provider_breakdown"}
+
+# References to earlier turns need multi-turn fusion to be answered correctly.
+_CONTEXTUAL_RE = re.compile(
+    r"\b(he|she|him|her|his|hers|they|them|their|it|its|that|those|these|same|also|"
+    r"again|instead|what about|how about)\b"
+)
+_MONTH_RE = re.compile(
+    r"\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|"
+    r"aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b"
+)
+_MIN_ENTITY_LENGTH = 3
+
+
+@dataclass
+class FastPathPlan:
+    """A question answered by one deterministic SQL statement."""
+
+    plan_kind: str
+    router_decision: RouterDecision
+    sql: str
+    entity_type: str | None = None
+    entity_name: str | None = None
+    # Filled in once the SQL has run.
+    rows: list[dict[str, Any]] | None = None
+    # Or the response already cached under the plan's intent, served instead.
+    response: Any = None
+
+    @property
+    def mode(self) -> str:
+        return self.router_decision.mode
+
+
+def _match_entities(
+    text: str, known_entities: Mapping[str, list[str]]
+) -> list[tuple[str, str, re.Match[str]]]:
+    matches: list[tuple[str, str, re.Match[str]]] = []
+    for role, key in ENTITY_ROLE_KEYS.items():
+        for name in known_entities.get(key) or []:
+            if not isinstance(name, str) or len(name.strip()) < _MIN_ENTITY_LENGTH:
+                continue
+            # Names are interpolated into SQL by the logic overrides.
+            if "'" in name:
+                continue
+            pattern = r"\b" + r"\s+".join(map(re.escape, name.lower().split())) + r"\b"
+            match = re.search(pattern, text)
+            if match:
+                matches.append((role, name, match))
+
+    # Drop names contained in a longer match ("Ana" inside "Ana Lopez").
+    return [
+        (role, name, match)
+        for role, name, match in matches
+        if not any(
+            other is not match
+            and other.start() <= match.start()
+            and match.end() <= other.end()
+            and (other.end() - other.start()) > (match.end() - match.start())
+            for _, _, other in matches
+        )
+    ]
+
+
+def plan_fast_path(
+    query: str, known_entities: Mapping[str, list[str]] | None
+) -> FastPathPlan | None:
+    """Return a deterministic plan for ``query`` or ``None`` to use the model chain."""
+
+    text = " ".join((query or "").lower().split())
+    if not text or _CONTEXTUAL_RE.search(text):
+        return None
+
+    matches = _match_entities(text, known_entities or {})
+    if len({(role, name.lower()) for role, name, _ in matches}) > 1:
+        return None
+
+    entity_type = entity_name = None
+    intent_text = text
+    if matches:
+        entity_type, entity_name, match = matches[0]
+        # Synonyms are phrased generically ("monthly spend for student").
+        intent_text = text[: match.start()] + entity_type + text[match.end() :]
+
+    plan_kind = _deterministic_intent_from_config(intent_text)
+    if not plan_kind or plan_kind not in PLAN_KIND_TO_MODE:
+        return None
+
+    plan_cfg = load_domain_config().get("plan_kinds", {}).get(plan_kind) or {}
+    entity_role = plan_cfg.get("entity_role")
+    if plan_kind.endswith("_list"):
+        # Lists cover the whole district; a named entity means something else.
+        if entity_type is not None:
+            return None
+    elif entity_role in ENTITY_ROLE_KEYS:
+        if entity_type != entity_role:
+            return None
+    elif entity_role == "district":
+        if entity_type is not None:
+            return None
+    else:
+        return None
+
+    return _deterministic_plan(text, plan_kind, entity_role, entity_type, entity_name)
+
+
+def plan_for_intent(
+    normalized_intent: Mapping[str, Any] | None,
+    query: str,
+    known_entities: Mapping[str, list[str]] | None,
+) -> FastPathPlan | None:
+    """Return a deterministic plan for an already-normalized intent, or ``None``.
+
+    The entity must be one of the district's ``known_entities``; the plan
+    carries the catalog's spelling of it.
+    """
+
+    if not isinstance(normalized_intent, Mapping):
+        return None
+    plan_kind = normalized_intent.get("intent")
+    if not isinstance(plan_kind, str) or plan_kind not in PLAN_KIND_TO_MODE:
+        return None
+
+    plan_cfg = load_domain_config().get("plan_kinds", {}).get(plan_kind) or {}
+    entity_role = plan_cfg.get("entity_role")
+    entity_type = entity_name = None
+    if entity_role in ENTITY_ROLE_KEYS and not plan_kind.endswith("_list"):
+        entities = normalized_intent.get("entities") or {}
+        wanted = entities.get(f"{entity_role}_name") if isinstance(entities, Mapping) else None
+        if not isinstance(wanted, str):
+            return None
+        wanted = " ".join(wanted.lower().split())
+        for name in (known_entities or {}).get(ENTITY_ROLE_KEYS[entity_role]) or []:
+            # Names are interpolated into SQL by the logic overrides.
+            if isinstance(name, str) and "'" not in name and " ".join(name.lower().split()) == wanted:
+                entity_type, entity_name = entity_role, name
+                break
+        else:
+            return None
+    elif entity_role != "district" and not plan_kind.endswith("_list"):
+        return None
+
+    text = " ".join((query or "").lower().split())
+    return _deterministic_plan(text, plan_kind, entity_role, entity_type, entity_name)
+
+
+def intent_for_plan(
+    plan: FastPathPlan, query: str, user_context: Mapping[str, Any] | None = None
+) -> dict[str, Any]:
+    """The normalized intent NLV settles on for ``query``, which ``plan`` answers.
+
+    Prefetch jobs write their reports under the same intent, so the fast path
+    can serve them before running its SQL.
+    """
+
+    slot = f"{plan.entity_type}_name" if plan.entity_type else None
+    return normalize_nlv_payload(
+        followup_intent(plan.plan_kind, slot, plan.entity_name),
+        user_query=query,
+        user_context=dict(user_context or {}),
+    )
+
+
+def _deterministic_plan(
+    text: str,
+    plan_kind: str,
+    entity_role: str | None,
+    entity_type: str | None,
+    entity_name: str | None,
+) -> FastPathPlan | None:
+    decision = route_sql(
+        user_query=text,
+        sql_plan={
+            "kind": plan_kind,
+            "primary_entity_type": entity_role,
+            "primary_entities": [entity_name] if entity_name else [],
+        },
+        entities=None,
+        normalized_intent={"intent": plan_kind},
+        multi_turn_state=None,
+    )
+    if decision.mode != PLAN_KIND_TO_MODE[plan_kind]:
+        # Query keywords pulled the router elsewhere; let the models decide.
+        return None
+
+    if _has_time_reference(text, None):
+        # Only month-aware SQL can honour a time filter, and only a bare month.
+        if decision.mode not in MONTH_AWARE_MODES or not decision.month_names:
+            return None
+        if _has_time_reference(_MONTH_RE.sub(" ", text), None):
+            return None
+
+    tool_call = build_deterministic_sql_call(decision.to_dict())
+    if tool_call is None:
+        return None
+    sql = _tool_call_sql(tool_call)
+    if sql is None:
+        return None
+
+    LOGGER.info(
+        "fast_path_planned",
+        plan_kind=plan_kind,
+        mode=decision.mode,
+        entity_type=entity_type,
+    )
+    return FastPathPlan(
+        plan_kind=plan_kind,
+        router_decision=decision,
+        sql=sql,
+        entity_type=entity_type,
+        entity_name=entity_name,
+    )
+
+
+def _tool_call_sql(message: Any) -> str | None:
+    try:
+        arguments = json.loads(message.tool_calls[0].function.arguments)
+    except Exception:
+        return None
+    sql = arguments.get("query") if isinstance(arguments, dict) else None
+    return sql if isinstance(sql, str) and sql.strip() else None
+
+
+__all__ = ["FastPathPlan", "intent_for_plan", "plan_fast_path", "plan_for_intent"]
@@ -6,8 +6,9 @@ import json
 from typing import Any
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .async_llm import run_model_async
 from .ir import AnalyticsIR
 from .json_utils import _extract_json_object
 from .thin_ir_insights import reduce_ir_for_insights
@@ -118,3 +119,9 @@ def run_insight_model(
         default_payload["insights"] = [str(item) for item in insights_value]
 
     return default_payload
+
+
+async def arun_insight_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_insight_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_insight_model, client=client, **kwargs)
@@ -12,11 +12,17 @@ import pandas as pd
 import structlog
 from sqlalchemy.orm import Session
 
-from ..db import session_scope
+from ..core.config import get_settings
+from ..db import get_engine, session_scope
 from ..models import Clinician, Invoice, InvoiceLineItem, Job, Student, Vendor
+from ..services.entity_catalog import get_entity_catalog
+from ..services.materialized_views import apply_summary_deltas, refresh_materialized_views
 from ..services.metrics import invoice_jobs_total
 from ..services.pdf_generation import InvoicePdf, generate_invoice_pdf
-from ..services.s3 import sanitize_company_name, upload_bytes
+from ..services.s3 import (
+    build_invoice_storage_components,
+    open_upload_stream,
+)
 
 LOGGER = structlog.get_logger(__name__)
 
@@ -232,11 +238,15 @@ class InvoiceAgent:
         duplicates: list[str] = []
         pdf_artifacts: list[InvoicePdf] = []
         invoice_audit_log: list[dict[str, Any]] = []
+        district_key: str | None = None
+        vendor_names: list[str] = []
         self.logger.info("invoice_agent_start", upload=str(file_path))
         try:
             with session_scope() as session:
                 vendor = self._get_vendor(session)
                 vendor_name = self._ensure_vendor_company_name(session, vendor)
+                district_key = vendor.district_key
+                vendor_names = [vendor.company_name] if vendor.company_name else []
                 for student, student_frame in dataframe.groupby("Client"):
                     invoice_number = generate_invoice_number(student, self.service_month_date)
                     if self._invoice_exists(session, invoice_number):
@@ -265,6 +275,8 @@ class InvoiceAgent:
                             "s3_key": invoice.s3_key,
                         }
                     )
+                if invoices:
+                    self._apply_summary_deltas(session, [invoice.id for invoice in invoices])
         except Exception as exc:
             invoice_jobs_total.labels(status="failed").inc()
             self.logger.error("invoice_agent_error", error=str(exc))
@@ -291,6 +303,10 @@ class InvoiceAgent:
                 duplicate_count=len(keys) - len(set(keys)),
             )
 
+        if invoices:
+            self._refresh_entity_catalog(district_key, invoices, dataframe, vendor_names)
+            self._refresh_materialized_views()
+
         zip_key = self._bundle_invoices(pdf_artifacts)
         status = "completed" if invoices else "skipped"
         message = self._compose_job_message(len(invoices), duplicates)
@@ -400,6 +416,58 @@ class InvoiceAgent:
         session.flush()
         return invoice, pdf_artifact
 
+    def _refresh_entity_catalog(
+        self,
+        district_key: str | None,
+        invoices: list[Invoice],
+        dataframe: pd.DataFrame,
+        vendor_names: list[str],
+    ) -> None:
+        """Bump the analytics entity catalog when this upload introduced new names."""
+
+        student_names = {invoice.student_name for invoice in invoices}
+        clinicians = set(
+            dataframe.loc[dataframe["Client"].isin(student_names), "Employee"].astype(str)
+        )
+        try:
+            bumped = get_entity_catalog().note_entities(
+                district_key,
+                students=sorted(student_names),
+                clinicians=sorted(clinicians),
+                vendors=vendor_names,
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            self.logger.warning("entity_catalog_refresh_failed", error=str(exc))
+            return
+        if bumped:
+            self.logger.info("entity_catalog_invalidated", district_key=district_key)
+
+    def _apply_summary_deltas(self, session: Session, invoice_ids: list[int]) -> None:
+        """Add this batch to the incremental summary tables in the ingest transaction.
+
+        Runs in a savepoint so a failure never loses the invoices; the
+        reconciliation job repairs whatever the batch failed to apply.
+        """
+
+        try:
+            with session.begin_nested():
+                updated = apply_summary_deltas(session.connection(), invoice_ids)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.logger.warning("summary_delta_failed", error=str(exc))
+            return
+        if updated:
+            self.logger.info("summary_deltas_applied", tables=updated, invoices=len(invoice_ids))
+
+    def _refresh_materialized_views(self) -> None:
+        """Bring the analytics ``mv_*`` aggregates up to date with this upload."""
+
+        if not get_settings().mv_refresh_on_ingest:
+            return
+        try:
+            refresh_materialized_views(get_engine())
+        except Exception as exc:  # pragma: no cover - defensive
+            self.logger.warning("materialized_view_refresh_failed", error=str(exc))
+
     def _invoice_exists(self, session: Session, invoice_number: str) -> bool:
         """Return True when an invoice number already exists for this vendor."""
 
@@ -417,27 +485,20 @@ class InvoiceAgent:
         if not pdf_artifacts:
             return ""
 
-        from io import BytesIO
         from zipfile import ZipFile
 
-        zip_buffer = BytesIO()
-        with ZipFile(zip_buffer, "w") as bundle:
-            for artifact in pdf_artifacts:
-                bundle.writestr(artifact.filename, artifact.content)
-
-        zip_buffer.seek(0)
         reference_date = self.service_month_date
-        safe_company = sanitize_company_name(self.vendor_company_name)
-        bundle_name = (
-            f"{safe_company}_{reference_date.year:04d}_{reference_date.month:02d}_invoices.zip"
-        )
-        zip_key = upload_bytes(
-            zip_buffer.getvalue(),
-            filename=bundle_name,
-            content_type="application/zip",
-            company_name=self.vendor_company_name,
-            reference_date=reference_date,
+        prefix, safe_company, year_segment, month_segment = (
+            build_invoice_storage_components(self.vendor_company_name, reference_date)
         )
+        zip_key = f"{prefix}{safe_company}_{year_segment}_{month_segment}_invoices.zip"
+
+        # Stream the archive straight into storage instead of materialising it
+        # in memory first.
+        with open_upload_stream(zip_key, content_type="application/zip") as stream:
+            with ZipFile(stream, "w") as bundle:
+                for artifact in pdf_artifacts:
+                    bundle.writestr(artifact.filename, artifact.content)
         return zip_key
 
     def _get_vendor(self, session: Session) -> Vendor:
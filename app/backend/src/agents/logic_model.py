@@ -10,8 +10,9 @@ import json
 from types import SimpleNamespace
 from typing import Any, Sequence
 
+from .async_llm import run_model_async
 from .domain_config_loader import load_domain_config
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 DB_SCHEMA_HINT = """
 You are querying a Postgres database for a school district invoice system.
@@ -781,19 +782,27 @@ def _build_router_guidance(router_decision: dict[str, Any] | None) -> str:
     return "\n".join(lines)
 
 
-def run_logic_model(
-    client: OpenAI,
-    *,
-    model: str,
-    messages: Sequence[dict[str, Any]],
-    tools: Sequence[dict[str, Any]],
-    temperature: float,
-    router_decision: dict[str, Any] | None = None,
-):
-    """Execute the logic model using the existing OpenAI client pattern."""
-    has_tool_results = any(
-        isinstance(m, dict) and m.get("role") == "tool" for m in messages
-    )
+# Router modes whose SQL comes from the provider-breakdown override or from
+# the model rather than from the generic materialized-view query.
+MV_OVERRIDE_MODES = {
+    "student_provider_breakdown",
+    "student_provider_year",
+    "provider_breakdown",
+    "invoice_details",
+    "top_invoices",
+}
+
+
+def build_deterministic_sql_call(router_decision: dict[str, Any] | None) -> SimpleNamespace | None:
+    """Return the ``run_sql`` tool call fully determined by ``router_decision``.
+
+    Returns ``None`` when the decision still needs the logic model to write
+    the SQL.
+    """
+
+    if not router_decision:
+        return None
+
     # ------------------------------------------------------------------
     # HARD OVERRIDE: student provider breakdown / provider-year
     #
@@ -816,103 +825,74 @@ def run_logic_model(
     #       • month_names[0] → service_month filter
     #       • date_range.start_date/end_date → invoice_date filter
     # ------------------------------------------------------------------
-    if router_decision and not has_tool_results:
-        mode = router_decision.get("mode")
-        primary_type = router_decision.get("primary_entity_type")
-        primary_entities = router_decision.get("primary_entities") or []
-        needs_provider_breakdown = bool(router_decision.get("needs_provider_breakdown"))
-        date_range = router_decision.get("date_range") or {}
-        month_names = router_decision.get("month_names") or []
-
-        if (
-            primary_entities
-            and primary_type != "vendor"
-            and (
-                mode in {"student_provider_breakdown", "student_provider_year"}
-                or needs_provider_breakdown
-            )
-        ):
-            student = primary_entities[0]
-            start = date_range.get("start_date")
-            end = date_range.get("end_date")
-
-            # Build WHERE filters incrementally to avoid ambiguity and to
-            # keep the SQL deterministic.
-            filters: list[str] = [
-                "i.district_key = :district_key",
-                f"LOWER(i.student_name) LIKE LOWER('%{student}%')",
-            ]
-
-            if isinstance(month_names, list) and month_names:
-                # Month-scoped provider breakdown:
-                # Use service_month only and DO NOT add invoice_date BETWEEN,
-                # to avoid over-filtering when the planner also supplied a
-                # date_range for the same month.
-                month = str(month_names[0])
-                filters.append(f"LOWER(i.service_month) = LOWER('{month}')")
-            elif isinstance(start, str) and isinstance(end, str):
-                # No explicit month in RouterDecision:
-                # use invoice_date BETWEEN only for true school-year / explicit
-                # calendar range queries (e.g., student_provider_year or
-                # date-range provider breakdown).
-                filters.append(f"i.invoice_date BETWEEN '{start}' AND '{end}'")
-
-            where_clause = "  WHERE " + "\n        AND ".join(filters)
-
-            sql = f"""
-            SELECT
-                ili.clinician AS provider,
-                SUM(ili.hours) AS total_hours,
-                SUM(ili.cost)  AS total_cost
-            FROM invoice_line_items ili
-            JOIN invoices i ON i.id = ili.invoice_id
-{where_clause}
-            GROUP BY ili.clinician
-            ORDER BY total_hours DESC;
-            """
-
-            tool_call = SimpleNamespace(
-                id="call_student_provider_breakdown",
-                type="function",
-                function=SimpleNamespace(
-                    name="run_sql",
-                    arguments=json.dumps({"query": sql}),
-                ),
-            )
+    mode = router_decision.get("mode")
+    primary_type = router_decision.get("primary_entity_type")
+    primary_entities = router_decision.get("primary_entities") or []
+    needs_provider_breakdown = bool(router_decision.get("needs_provider_breakdown"))
+    date_range = router_decision.get("date_range") or {}
+    month_names = router_decision.get("month_names") or []
 
-            return SimpleNamespace(content="", tool_calls=[tool_call])
+    if (
+        primary_entities
+        and primary_type != "vendor"
+        and (
+            mode in {"student_provider_breakdown", "student_provider_year"}
+            or needs_provider_breakdown
+        )
+    ):
+        student = primary_entities[0]
+        start = date_range.get("start_date")
+        end = date_range.get("end_date")
 
-    mv_name = None
-    if router_decision:
-        config = load_domain_config()
-        mode_to_mv_map = config.get("mode_to_mv_map", {})
-        mv_name = mode_to_mv_map.get(router_decision.get("mode"))
-        print("[DOMAIN-CONFIG-DEBUG][LOGIC] router_mode:", router_decision.get("mode"))
-        print("[DOMAIN-CONFIG-DEBUG][LOGIC] MV chosen:", mv_name)
+        # Build WHERE filters incrementally to avoid ambiguity and to
+        # keep the SQL deterministic.
+        filters: list[str] = [
+            "i.district_key = :district_key",
+            f"LOWER(i.student_name) LIKE LOWER('%{student}%')",
+        ]
 
-    router_instructions = _build_router_guidance(router_decision)
-    routed_messages = list(messages)
-    if router_instructions:
-        routed_messages.append({"role": "system", "content": router_instructions})
+        if isinstance(month_names, list) and month_names:
+            # Month-scoped provider breakdown:
+            # Use service_month only and DO NOT add invoice_date BETWEEN,
+            # to avoid over-filtering when the planner also supplied a
+            # date_range for the same month.
+            month = str(month_names[0])
+            filters.append(f"LOWER(i.service_month) = LOWER('{month}')")
+        elif isinstance(start, str) and isinstance(end, str):
+            # No explicit month in RouterDecision:
+            # use invoice_date BETWEEN only for true school-year / explicit
+            # calendar range queries (e.g., student_provider_year or
+            # date-range provider breakdown).
+            filters.append(f"i.invoice_date BETWEEN '{start}' AND '{end}'")
 
-    override_modes = {
-        "student_provider_breakdown",
-        "student_provider_year",
-        "provider_breakdown",
-        "invoice_details",
-        "top_invoices",
-    }
+        where_clause = "  WHERE " + "\n        AND ".join(filters)
 
-    if (
-        mv_name
-        and router_decision
-        and not has_tool_results
-        and router_decision.get("mode") not in override_modes
-    ):
-        mv_filters = ["district_key = :district_key"]
-        primary_entities = router_decision.get("primary_entities") or []
-        primary_type = router_decision.get("primary_entity_type")
+        sql = f"""
+        SELECT
+            ili.clinician AS provider,
+            SUM(ili.hours) AS total_hours,
+            SUM(ili.cost)  AS total_cost
+        FROM invoice_line_items ili
+        JOIN invoices i ON i.id = ili.invoice_id
+{where_clause}
+        GROUP BY ili.clinician
+        ORDER BY total_hours DESC;
+        """
+
+        tool_call = SimpleNamespace(
+            id="call_student_provider_breakdown",
+            type="function",
+            function=SimpleNamespace(
+                name="run_sql",
+                arguments=json.dumps({"query": sql}),
+            ),
+        )
 
+        return SimpleNamespace(content="", tool_calls=[tool_call])
+
+    mv_name = load_domain_config().get("mode_to_mv_map", {}).get(mode)
+    if mv_name and mode not in MV_OVERRIDE_MODES:
+        mv_filters = ["district_key = :district_key"]
         if primary_entities:
             primary_entity = primary_entities[0]
             if primary_type == "student":
@@ -945,11 +925,45 @@ SELECT * FROM {mv_name}{where_clause}
 
         return SimpleNamespace(content="", tool_calls=[tool_call])
 
+    return None
+
+
+def run_logic_model(
+    client: OpenAI,
+    *,
+    model: str,
+    messages: Sequence[dict[str, Any]],
+    tools: Sequence[dict[str, Any]],
+    temperature: float,
+    router_decision: dict[str, Any] | None = None,
+):
+    """Execute the logic model using the existing OpenAI client pattern."""
+    has_tool_results = any(
+        isinstance(m, dict) and m.get("role") == "tool" for m in messages
+    )
+    if router_decision and not has_tool_results:
+        deterministic_call = build_deterministic_sql_call(router_decision)
+        if deterministic_call is not None:
+            return deterministic_call
+
+    mv_name = None
+    if router_decision:
+        config = load_domain_config()
+        mode_to_mv_map = config.get("mode_to_mv_map", {})
+        mv_name = mode_to_mv_map.get(router_decision.get("mode"))
+        print("[DOMAIN-CONFIG-DEBUG][LOGIC] router_mode:", router_decision.get("mode"))
+        print("[DOMAIN-CONFIG-DEBUG][LOGIC] MV chosen:", mv_name)
+
+    router_instructions = _build_router_guidance(router_decision)
+    routed_messages = list(messages)
+    if router_instructions:
+        routed_messages.append({"role": "system", "content": router_instructions})
+
     if (
         mv_name
         and router_decision
         and not has_tool_results
-        and router_decision.get("mode") not in override_modes
+        and router_decision.get("mode") not in MV_OVERRIDE_MODES
     ):
         routed_messages.append(
             {
@@ -1009,3 +1023,9 @@ SELECT * FROM {mv_name}{where_clause}
         temperature=temperature,
     )
     return completion.choices[0].message
+
+
+async def arun_logic_model(*, client: AsyncOpenAI, **kwargs: Any) -> Any:
+    """Async variant of :func:`run_logic_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_logic_model, client=client, **kwargs)
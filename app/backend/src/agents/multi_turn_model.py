@@ -177,6 +177,31 @@ class MultiTurnConversationManager:
         state.last_plan_kind = plan_kind
         self.save_state(state, session_id=session_id)
 
+    def record_resolved_topic(
+        self,
+        session_id: str,
+        user_message: str,
+        *,
+        entity_type: Optional[str],
+        entity_value: Optional[str],
+        plan_kind: Optional[str],
+    ) -> None:
+        """Start a new thread for a message answered without running fusion.
+
+        Keeps follow-ups ("what about her providers?") anchored to the
+        entity the deterministic fast path resolved.
+        """
+
+        state = self._start_new_thread(user_message, None)
+        if entity_type and entity_value:
+            state.active_topic = {
+                "type": entity_type,
+                "value": entity_value,
+                "last_query": user_message,
+            }
+        state.last_plan_kind = plan_kind
+        self.save_state(state, session_id=session_id)
+
     def _get_pattern_list(
         self, key: str, default: Optional[List[str]] = None
     ) -> List[str]:
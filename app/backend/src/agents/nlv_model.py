@@ -8,9 +8,10 @@ from datetime import date
 from typing import Any
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from .domain_config_loader import load_domain_config
+from .async_llm import run_model_async
+from .domain_config_loader import get_domain_config, load_domain_config
 from .json_utils import _extract_json_object
 
 LOGGER = structlog.get_logger(__name__)
@@ -25,24 +26,7 @@ def _deterministic_intent_from_config(user_query: str) -> str | None:
     or ambiguous.
     """
     try:
-        config = load_domain_config()
-        plan_kinds = config.get("plan_kinds", {}) or {}
-        if not isinstance(plan_kinds, dict):
-            return None
-
-        q = user_query.lower()
-        scores: dict[str, int] = {}
-
-        for kind_name, cfg in plan_kinds.items():
-            if not isinstance(cfg, dict):
-                continue
-            synonyms = cfg.get("intent_synonyms") or []
-            for syn in synonyms:
-                if not isinstance(syn, str):
-                    continue
-                syn_l = syn.strip().lower()
-                if syn_l and syn_l in q:
-                    scores[kind_name] = scores.get(kind_name, 0) + 1
+        scores = get_domain_config().intent_scores(user_query)
 
         if not scores:
             return None
@@ -456,6 +440,335 @@ def _is_time_only_followup_query(user_query: str) -> bool:
     return mentions_month and not mentions_intent
 
 
+def normalize_nlv_payload(
+    parsed: dict[str, Any],
+    *,
+    user_query: str,
+    user_context: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Apply the deterministic NLV rules to the model's ``parsed`` intent for ``user_query``.
+
+    The prefetch worker and the fast path run a bare intent through these
+    same rules, so they key their answers the way the user's NLV run will.
+    """
+
+    payload = _default_payload()
+    payload.update(parsed)
+    if "clarification_needed" in parsed and not isinstance(
+        parsed.get("clarification_needed"), list
+    ):
+        payload["clarification_needed"] = []
+
+    _inherit_active_entity_from_context(user_context, payload)
+
+    # --------------------------------------------------------------------
+    # Provider-style follow-ups should default to the active topic
+    # --------------------------------------------------------------------
+    provider_terms = [
+        "who provided support",
+        "who provided care",
+        "who supported",
+        "which nurse",
+        "which clinicians",
+        "which providers",
+        "who helped",
+        "who worked with",
+    ]
+    text_lower = (user_query or "").lower()
+    active_topic = user_context.get("active_topic") if isinstance(user_context, dict) else None
+    if any(term in text_lower for term in provider_terms) and isinstance(active_topic, dict):
+        entities = payload.get("entities") or {}
+        if not isinstance(entities, dict):
+            entities = {}
+        active_type = active_topic.get("type")
+        active_value = active_topic.get("value")
+
+        if active_type == "student" and active_value and not entities.get("student_name"):
+            entities["student_name"] = active_value
+            if payload.get("scope") in (None, ""):
+                payload["scope"] = "single_student"
+        elif active_type == "clinician" and active_value and not entities.get("clinician_name"):
+            entities["clinician_name"] = active_value
+            if payload.get("scope") in (None, ""):
+                payload["scope"] = "provider"
+
+        payload["entities"] = entities
+
+    # ------------------------------------------------------------
+    # Detect explicit month + year (e.g., "September 2025")
+    # ------------------------------------------------------------
+    explicit_month_year = re.search(
+        r"\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
+        r"Dec(?:ember)?)\s+(['’]?\d{2,4})\b",
+        user_query,
+        flags=re.IGNORECASE,
+    )
+
+    def _normalize_two_digit_year(year_text: str) -> int:
+        year_text = year_text.strip("’'")
+        if len(year_text) == 2:
+            return int(f"20{year_text}")
+        return int(year_text)
+
+    explicit_month_year_found = False
+    if explicit_month_year:
+        month = explicit_month_year.group(1)
+        year_raw = explicit_month_year.group(2)
+        year = _normalize_two_digit_year(year_raw)
+
+        time_period = payload.get("time_period") or {}
+        if not isinstance(time_period, dict):
+            time_period = {}
+
+        time_period["month"] = month
+        time_period["year"] = year
+        time_period["relative"] = None
+        time_period["start_date"] = None
+        time_period["end_date"] = None
+
+        payload["time_period"] = time_period
+
+        explicit_month_year_found = True
+    else:
+        # --------------------------------------------------------
+        # Month without year → default to current school year
+        # --------------------------------------------------------
+        month_only = re.search(
+            r"\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+            r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
+            r"Dec(?:ember)?)\b",
+            user_query,
+            flags=re.IGNORECASE,
+        )
+        time_period = payload.get("time_period") or {}
+        existing_year = None
+        if isinstance(time_period, dict):
+            existing_year = time_period.get("year")
+
+        explicit_year_in_query = bool(
+            re.search(r"\b\d{4}\b", user_query)
+            or re.search(r"['’]\d{2}\b", user_query)
+        )
+
+        if month_only and (existing_year in (None, "")) and not explicit_year_in_query:
+            today = date.today()
+            school_year_window = _compute_current_school_year(today)
+            month_name = month_only.group(1)
+
+            month_lower = month_name.lower()
+            jul_to_dec = {
+                "july",
+                "august",
+                "september",
+                "october",
+                "november",
+                "december",
+            }
+            if month_lower in jul_to_dec:
+                inferred_year = school_year_window["school_year"] - 1
+            else:
+                inferred_year = school_year_window["school_year"]
+
+            if not isinstance(time_period, dict):
+                time_period = {}
+
+            time_period.update(
+                {
+                    "month": month_name,
+                    "year": inferred_year,
+                    "school_year": school_year_window["school_year"],
+                    "start_date": school_year_window["start_date"],
+                    "end_date": school_year_window["end_date"],
+                    "relative": "this_school_year",
+                }
+            )
+
+            clar_list = payload.get("clarification_needed")
+            if isinstance(clar_list, list):
+                clar_list = [c for c in clar_list if c != "time_period"]
+                payload["clarification_needed"] = clar_list
+                if not clar_list:
+                    payload["requires_clarification"] = False
+
+            payload["time_period"] = time_period
+
+    # --------------------------------------------------------------------
+    # Default student totals → current school year window
+    # --------------------------------------------------------------------
+    time_period = payload.get("time_period") if isinstance(payload.get("time_period"), dict) else {}
+    if (
+        payload.get("scope") == "single_student"
+        and _contains_total_keywords(user_query)
+        and not explicit_month_year_found
+        and not _has_time_reference(user_query, time_period)
+    ):
+        if not isinstance(time_period, dict):
+            time_period = {}
+
+        if time_period.get("month") is None and time_period.get("year") is None:
+            window = _compute_current_school_year(date.today())
+            time_period.update(
+                {
+                    "school_year": window["school_year"],
+                    "start_date": window["start_date"],
+                    "end_date": window["end_date"],
+                    "relative": "this_school_year",
+                }
+            )
+            clar_list = payload.get("clarification_needed")
+            if isinstance(clar_list, list):
+                clar_list = [c for c in clar_list if c != "time_period"]
+                payload["clarification_needed"] = clar_list
+                if not clar_list:
+                    payload["requires_clarification"] = False
+            payload["time_period"] = time_period
+
+    # Deterministic override for "this school year" / "this year" semantics.
+    if not explicit_month_year_found:
+        _apply_this_school_year_override(user_query, payload)
+
+    _strip_inherited_entity_clarifications(payload)
+
+    # ------------------------------------------------------------------
+    # FINAL MONTH/TIME_PERIOD FALLBACK
+    #
+    # If the query clearly names a month but time_period is still empty
+    # and "time_period" is in clarification_needed, infer it using the
+    # current school year and remove the time_period clarification.
+    # ------------------------------------------------------------------
+    clar_list = payload.get("clarification_needed")
+    time_period = payload.get("time_period") or {}
+    if not isinstance(time_period, dict):
+        time_period = {}
+
+    if isinstance(clar_list, list) and "time_period" in clar_list:
+        # Detect a month name in the original user_query
+        month_match = re.search(
+            r"\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+            r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
+            r"Dec(?:ember)?)\b",
+            user_query,
+            flags=re.IGNORECASE,
+        )
+
+        existing_month = time_period.get("month")
+        existing_year = time_period.get("year")
+
+        if month_match and (existing_month in (None, "")) and (existing_year in (None, "")):
+            month_name = month_match.group(1)
+            today = date.today()
+            school_year_window = _compute_current_school_year(today)
+
+            month_lower = month_name.lower()
+            jul_to_dec = {
+                "july",
+                "august",
+                "september",
+                "october",
+                "november",
+                "december",
+            }
+            if month_lower in jul_to_dec:
+                inferred_year = school_year_window["school_year"] - 1
+            else:
+                inferred_year = school_year_window["school_year"]
+
+            time_period.update(
+                {
+                    "month": month_name,
+                    "year": inferred_year,
+                    "school_year": school_year_window["school_year"],
+                    "start_date": school_year_window["start_date"],
+                    "end_date": school_year_window["end_date"],
+                    "relative": "this_school_year",
+                }
+            )
+            payload["time_period"] = time_period
+
+            # Strip time_period from clarifications
+            clar_list = [c for c in clar_list if c != "time_period"]
+            payload["clarification_needed"] = clar_list
+            if not clar_list:
+                payload["requires_clarification"] = False
+
+    # Deterministic override: enforce intent from domain_config.plan_kinds when
+    # there is a clear, unambiguous match. If config is missing or ambiguous,
+    # we safely fall back to the model-chosen intent.
+    explicit_intent = _deterministic_intent_from_config(user_query)
+    if explicit_intent:
+        payload["intent"] = explicit_intent
+
+    # Intent carryover for time-only follow-ups
+    try:
+        from typing import Mapping
+
+        mt_state = None
+        if isinstance(user_context, Mapping):
+            mt_state = user_context.get("multi_turn_state")
+        last_plan_kind = None
+        if isinstance(mt_state, Mapping):
+            last_plan_kind = mt_state.get("last_plan_kind")
+    except Exception:
+        mt_state = None
+        last_plan_kind = None
+
+    if last_plan_kind and _is_time_only_followup_query(user_query or ""):
+        payload["intent"] = last_plan_kind
+
+    # Provider-style intent override when we have an active student topic.
+    try:
+        from typing import Mapping
+
+        text_lower = (user_query or "").lower()
+        # Heuristic phrases that indicate a provider breakdown question.
+        provider_phrases = [
+            "who provided care",
+            "who provides care",
+            "who supported",
+            "who provides services",
+            "who provided services",
+            "which clinicians worked with",
+            "which clinician worked with",
+            "which nurse supported",
+            "which provider helped",
+            "who helped the student",
+            "who was the provider",
+        ]
+
+        looks_like_provider_question = any(phrase in text_lower for phrase in provider_phrases)
+
+        mt_state = None
+        if isinstance(user_context, Mapping):
+            mt_state = user_context.get("multi_turn_state")
+        active_topic = None
+        if isinstance(mt_state, Mapping):
+            active_topic = mt_state.get("active_topic")
+
+        has_active_student = (
+            isinstance(active_topic, Mapping)
+            and active_topic.get("type") == "student"
+            and active_topic.get("value")
+        )
+
+        if looks_like_provider_question and has_active_student:
+            student_name_from_topic = str(active_topic.get("value"))
+            entities = payload.get("entities") or {}
+            if not isinstance(entities, dict):
+                entities = {}
+            # If model did not already set student_name, fill it from active topic.
+            if not entities.get("student_name"):
+                entities["student_name"] = student_name_from_topic
+            payload["entities"] = entities
+            payload["intent"] = "student_provider_breakdown"
+            payload["scope"] = "single_student"
+    except Exception:
+        # Best-effort override only; never crash NLV on failure.
+        pass
+
+    return payload
+
+
 def run_nlv_model(
     *,
     user_query: str,
@@ -496,320 +809,14 @@ def run_nlv_model(
 
         if not isinstance(parsed, dict):
             return _default_payload()
-        payload = _default_payload()
-        payload.update(parsed)
-        if "clarification_needed" in parsed and not isinstance(
-            parsed.get("clarification_needed"), list
-        ):
-            payload["clarification_needed"] = []
-
-        _inherit_active_entity_from_context(user_context, payload)
-
-        # --------------------------------------------------------------------
-        # Provider-style follow-ups should default to the active topic
-        # --------------------------------------------------------------------
-        provider_terms = [
-            "who provided support",
-            "who provided care",
-            "who supported",
-            "which nurse",
-            "which clinicians",
-            "which providers",
-            "who helped",
-            "who worked with",
-        ]
-        text_lower = (user_query or "").lower()
-        active_topic = user_context.get("active_topic") if isinstance(user_context, dict) else None
-        if any(term in text_lower for term in provider_terms) and isinstance(active_topic, dict):
-            entities = payload.get("entities") or {}
-            if not isinstance(entities, dict):
-                entities = {}
-            active_type = active_topic.get("type")
-            active_value = active_topic.get("value")
-
-            if active_type == "student" and active_value and not entities.get("student_name"):
-                entities["student_name"] = active_value
-                if payload.get("scope") in (None, ""):
-                    payload["scope"] = "single_student"
-            elif active_type == "clinician" and active_value and not entities.get("clinician_name"):
-                entities["clinician_name"] = active_value
-                if payload.get("scope") in (None, ""):
-                    payload["scope"] = "provider"
-
-            payload["entities"] = entities
-
-        # ------------------------------------------------------------
-        # Detect explicit month + year (e.g., "September 2025")
-        # ------------------------------------------------------------
-        explicit_month_year = re.search(
-            r"\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-            r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
-            r"Dec(?:ember)?)\s+(['’]?\d{2,4})\b",
-            user_query,
-            flags=re.IGNORECASE,
+        return normalize_nlv_payload(
+            parsed, user_query=user_query, user_context=user_context
         )
+    except Exception:
+        return _default_payload()
 
-        def _normalize_two_digit_year(year_text: str) -> int:
-            year_text = year_text.strip("’'")
-            if len(year_text) == 2:
-                return int(f"20{year_text}")
-            return int(year_text)
-
-        explicit_month_year_found = False
-        if explicit_month_year:
-            month = explicit_month_year.group(1)
-            year_raw = explicit_month_year.group(2)
-            year = _normalize_two_digit_year(year_raw)
-
-            time_period = payload.get("time_period") or {}
-            if not isinstance(time_period, dict):
-                time_period = {}
-
-            time_period["month"] = month
-            time_period["year"] = year
-            time_period["relative"] = None
-            time_period["start_date"] = None
-            time_period["end_date"] = None
-
-            payload["time_period"] = time_period
-
-            explicit_month_year_found = True
-        else:
-            # --------------------------------------------------------
-            # Month without year → default to current school year
-            # --------------------------------------------------------
-            month_only = re.search(
-                r"\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-                r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
-                r"Dec(?:ember)?)\b",
-                user_query,
-                flags=re.IGNORECASE,
-            )
-            time_period = payload.get("time_period") or {}
-            existing_year = None
-            if isinstance(time_period, dict):
-                existing_year = time_period.get("year")
-
-            explicit_year_in_query = bool(
-                re.search(r"\b\d{4}\b", user_query)
-                or re.search(r"['’]\d{2}\b", user_query)
-            )
-
-            if month_only and (existing_year in (None, "")) and not explicit_year_in_query:
-                today = date.today()
-                school_year_window = _compute_current_school_year(today)
-                month_name = month_only.group(1)
-
-                month_lower = month_name.lower()
-                jul_to_dec = {
-                    "july",
-                    "august",
-                    "september",
-                    "october",
-                    "november",
-                    "december",
-                }
-                if month_lower in jul_to_dec:
-                    inferred_year = school_year_window["school_year"] - 1
-                else:
-                    inferred_year = school_year_window["school_year"]
-
-                if not isinstance(time_period, dict):
-                    time_period = {}
-
-                time_period.update(
-                    {
-                        "month": month_name,
-                        "year": inferred_year,
-                        "school_year": school_year_window["school_year"],
-                        "start_date": school_year_window["start_date"],
-                        "end_date": school_year_window["end_date"],
-                        "relative": "this_school_year",
-                    }
-                )
-
-                clar_list = payload.get("clarification_needed")
-                if isinstance(clar_list, list):
-                    clar_list = [c for c in clar_list if c != "time_period"]
-                    payload["clarification_needed"] = clar_list
-                    if not clar_list:
-                        payload["requires_clarification"] = False
-
-                payload["time_period"] = time_period
-
-        # --------------------------------------------------------------------
-        # Default student totals → current school year window
-        # --------------------------------------------------------------------
-        time_period = payload.get("time_period") if isinstance(payload.get("time_period"), dict) else {}
-        if (
-            payload.get("scope") == "single_student"
-            and _contains_total_keywords(user_query)
-            and not explicit_month_year_found
-            and not _has_time_reference(user_query, time_period)
-        ):
-            if not isinstance(time_period, dict):
-                time_period = {}
-
-            if time_period.get("month") is None and time_period.get("year") is None:
-                window = _compute_current_school_year(date.today())
-                time_period.update(
-                    {
-                        "school_year": window["school_year"],
-                        "start_date": window["start_date"],
-                        "end_date": window["end_date"],
-                        "relative": "this_school_year",
-                    }
-                )
-                clar_list = payload.get("clarification_needed")
-                if isinstance(clar_list, list):
-                    clar_list = [c for c in clar_list if c != "time_period"]
-                    payload["clarification_needed"] = clar_list
-                    if not clar_list:
-                        payload["requires_clarification"] = False
-                payload["time_period"] = time_period
-
-        # Deterministic override for "this school year" / "this year" semantics.
-        if not explicit_month_year_found:
-            _apply_this_school_year_override(user_query, payload)
-
-        _strip_inherited_entity_clarifications(payload)
-
-        # ------------------------------------------------------------------
-        # FINAL MONTH/TIME_PERIOD FALLBACK
-        #
-        # If the query clearly names a month but time_period is still empty
-        # and "time_period" is in clarification_needed, infer it using the
-        # current school year and remove the time_period clarification.
-        # ------------------------------------------------------------------
-        clar_list = payload.get("clarification_needed")
-        time_period = payload.get("time_period") or {}
-        if not isinstance(time_period, dict):
-            time_period = {}
-
-        if isinstance(clar_list, list) and "time_period" in clar_list:
-            # Detect a month name in the original user_query
-            month_match = re.search(
-                r"\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-                r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
-                r"Dec(?:ember)?)\b",
-                user_query,
-                flags=re.IGNORECASE,
-            )
-
-            existing_month = time_period.get("month")
-            existing_year = time_period.get("year")
-
-            if month_match and (existing_month in (None, "")) and (existing_year in (None, "")):
-                month_name = month_match.group(1)
-                today = date.today()
-                school_year_window = _compute_current_school_year(today)
-
-                month_lower = month_name.lower()
-                jul_to_dec = {
-                    "july",
-                    "august",
-                    "september",
-                    "october",
-                    "november",
-                    "december",
-                }
-                if month_lower in jul_to_dec:
-                    inferred_year = school_year_window["school_year"] - 1
-                else:
-                    inferred_year = school_year_window["school_year"]
-
-                time_period.update(
-                    {
-                        "month": month_name,
-                        "year": inferred_year,
-                        "school_year": school_year_window["school_year"],
-                        "start_date": school_year_window["start_date"],
-                        "end_date": school_year_window["end_date"],
-                        "relative": "this_school_year",
-                    }
-                )
-                payload["time_period"] = time_period
-
-                # Strip time_period from clarifications
-                clar_list = [c for c in clar_list if c != "time_period"]
-                payload["clarification_needed"] = clar_list
-                if not clar_list:
-                    payload["requires_clarification"] = False
-
-        # Deterministic override: enforce intent from domain_config.plan_kinds when
-        # there is a clear, unambiguous match. If config is missing or ambiguous,
-        # we safely fall back to the model-chosen intent.
-        explicit_intent = _deterministic_intent_from_config(user_query)
-        if explicit_intent:
-            payload["intent"] = explicit_intent
 
-        # Intent carryover for time-only follow-ups
-        try:
-            from typing import Mapping
-
-            mt_state = None
-            if isinstance(user_context, Mapping):
-                mt_state = user_context.get("multi_turn_state")
-            last_plan_kind = None
-            if isinstance(mt_state, Mapping):
-                last_plan_kind = mt_state.get("last_plan_kind")
-        except Exception:
-            mt_state = None
-            last_plan_kind = None
-
-        if last_plan_kind and _is_time_only_followup_query(user_query or ""):
-            payload["intent"] = last_plan_kind
-
-        # Provider-style intent override when we have an active student topic.
-        try:
-            from typing import Mapping
-
-            text_lower = (user_query or "").lower()
-            # Heuristic phrases that indicate a provider breakdown question.
-            provider_phrases = [
-                "who provided care",
-                "who provides care",
-                "who supported",
-                "who provides services",
-                "who provided services",
-                "which clinicians worked with",
-                "which clinician worked with",
-                "which nurse supported",
-                "which provider helped",
-                "who helped the student",
-                "who was the provider",
-            ]
-
-            looks_like_provider_question = any(phrase in text_lower for phrase in provider_phrases)
-
-            mt_state = None
-            if isinstance(user_context, Mapping):
-                mt_state = user_context.get("multi_turn_state")
-            active_topic = None
-            if isinstance(mt_state, Mapping):
-                active_topic = mt_state.get("active_topic")
-
-            has_active_student = (
-                isinstance(active_topic, Mapping)
-                and active_topic.get("type") == "student"
-                and active_topic.get("value")
-            )
+async def arun_nlv_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_nlv_model` that awaits ``AsyncOpenAI``."""
 
-            if looks_like_provider_question and has_active_student:
-                student_name_from_topic = str(active_topic.get("value"))
-                entities = payload.get("entities") or {}
-                if not isinstance(entities, dict):
-                    entities = {}
-                # If model did not already set student_name, fill it from active topic.
-                if not entities.get("student_name"):
-                    entities["student_name"] = student_name_from_topic
-                payload["entities"] = entities
-                payload["intent"] = "student_provider_breakdown"
-                payload["scope"] = "single_student"
-        except Exception:
-            # Best-effort override only; never crash NLV on failure.
-            pass
-
-        return payload
-    except Exception:
-        return _default_payload()
+    return await run_model_async(run_nlv_model, client=client, **kwargs)
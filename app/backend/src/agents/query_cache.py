@@ -0,0 +1,141 @@
+"""First-tier analytics cache keyed on the raw question, before NLV runs.
+
+The response cache is keyed on the NLV output, so a repeated question still
+pays for the NLV round trip before it can be served. This tier maps the
+normalized raw query, the district and a digest of the multi-turn state the
+question was asked in to the intent cache key, letting a repeat skip every
+model call. Entries also carry the multi-turn state the original run moved
+the conversation to, so a hit can replay that transition.
+
+The intent tier hashes :func:`canonical_intent` rather than the raw NLV
+output, so spellings of the same question that differ only in empty fields,
+name casing or resolved-away candidate lists (a user's follow-up and the
+prefetch run that anticipated it, say) share one entry.
+
+Both tiers fold in the district's ``data_version``, which ingestion and
+invoice status changes bump. New data therefore misses the cache (and the
+``materialized_reports`` rows keyed the same way) without any flush.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any, Mapping
+
+from app.backend.src.core.config import get_settings
+from app.backend.src.core.redis_cache import RedisAnalyticsCache
+
+# Conversation bookkeeping that changes every turn without changing how the
+# next message is interpreted.
+_VOLATILE_STATE_FIELDS = frozenset({"history", "latest_user_message", "last_session_id"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " ?!.;,"
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold ``query`` and collapse whitespace and trailing punctuation."""
+
+    return _WHITESPACE_RE.sub(" ", query or "").strip().rstrip(_TRAILING_PUNCTUATION).casefold()
+
+
+def state_digest(state: Mapping[str, Any] | None) -> str:
+    """Return a stable digest of the interpretation-relevant multi-turn state."""
+
+    relevant = {
+        key: value
+        for key, value in (state or {}).items()
+        if key not in _VOLATILE_STATE_FIELDS and value not in (None, "", [], {})
+    }
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def query_cache_key(
+    query: str,
+    district_key: str | None,
+    state: Mapping[str, Any] | None,
+    *,
+    data_version: int | None = None,
+) -> str:
+    """Key for ``query`` asked in ``district_key`` from conversation ``state``."""
+
+    payload = json.dumps(
+        [normalize_query(query), district_key or "", state_digest(state), data_version],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _drop_empty(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        cleaned = {key: _drop_empty(item) for key, item in value.items()}
+        return {key: item for key, item in cleaned.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        return [_drop_empty(item) for item in value]
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(" ", value).strip()
+    return value
+
+
+def canonical_intent(normalized_intent: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Return the part of an NLV intent that decides the answer, in one spelling."""
+
+    canonical = _drop_empty(dict(normalized_intent or {}))
+    entities = canonical.get("entities")
+    if isinstance(entities, dict):
+        canonical["entities"] = {
+            key: value.casefold() if isinstance(value, str) else value
+            for key, value in entities.items()
+            # Candidates only matter while the name itself is unresolved.
+            if not (key.endswith("_candidates") and entities.get(key[: -len("_candidates")]))
+        }
+    if not canonical.get("requires_clarification"):
+        canonical.pop("requires_clarification", None)
+        canonical.pop("clarification_needed", None)
+    return canonical
+
+
+def intent_cache_key(
+    normalized_intent: Mapping[str, Any] | None,
+    district_key: str | None,
+    data_version: int | None,
+) -> str:
+    """Response cache key for an NLV intent against one version of a district's data."""
+
+    if district_key is None and data_version is None:
+        # Unscoped requests keep the historical key.
+        intent_json = json.dumps(normalized_intent or {}, sort_keys=True)
+        return hashlib.sha256(intent_json.encode("utf-8")).hexdigest()
+    intent_json = json.dumps(canonical_intent(normalized_intent), sort_keys=True, default=str)
+    payload = f"{district_key or ''}:{data_version}:{intent_json}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_entry(intent_key: str, next_state: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Entry pointing at the intent cache key plus the state to restore on a hit."""
+
+    return {
+        "intent_key": intent_key,
+        "state": dict(next_state) if isinstance(next_state, Mapping) else None,
+    }
+
+
+QUERY_CACHE = RedisAnalyticsCache(
+    key_prefix="analytics_query",
+    ttl_seconds=get_settings().analytics_cache_ttl_sec,
+    l1_max_bytes=get_settings().analytics_l1_cache_max_bytes,
+)
+
+
+__all__ = [
+    "QUERY_CACHE",
+    "build_entry",
+    "canonical_intent",
+    "intent_cache_key",
+    "normalize_query",
+    "query_cache_key",
+    "state_digest",
+]
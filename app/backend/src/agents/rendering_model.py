@@ -12,8 +12,9 @@ import time
 from typing import Any
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .async_llm import run_model_async
 from .ir import AnalyticsEntities, AnalyticsIR
 from .json_utils import _extract_json_object
 from .thin_ir_rendering import (
@@ -238,3 +239,9 @@ def run_rendering_model(
             "html": table_html or None,
             "rows": ir.rows,
         }
+
+
+async def arun_rendering_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_rendering_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_rendering_model, client=client, **kwargs)
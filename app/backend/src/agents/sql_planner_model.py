@@ -8,9 +8,10 @@ from typing import Any, Mapping
 
 import structlog
 from jinja2 import Environment, FileSystemLoader
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from .domain_config_loader import load_domain_config
+from .async_llm import run_model_async
+from .domain_config_loader import get_domain_config, load_domain_config
 from .json_utils import _extract_json_object
 
 LOGGER = structlog.get_logger(__name__)
@@ -268,9 +269,10 @@ def run_sql_planner_model(
     """Execute the SQL planner model and return a semantic plan."""
 
     inferred_plan_kind = None
+    compiled_config = None
     try:
-        config = load_domain_config()
-        plan_kinds = config.get("plan_kinds", {}) if isinstance(config, dict) else {}
+        compiled_config = get_domain_config()
+        plan_kinds = compiled_config.raw.get("plan_kinds", {})
         print("[DOMAIN-CONFIG-DEBUG][PLANNER] Loaded plan_kinds:", list(plan_kinds.keys()))
         print("[DOMAIN-CONFIG-DEBUG][PLANNER] inferred_plan_kind:", inferred_plan_kind)
         print("[DOMAIN-CONFIG-DEBUG][PLANNER] Example synonyms:", {
@@ -279,22 +281,9 @@ def run_sql_planner_model(
     except Exception:
         plan_kinds = {}
 
-    query_lower = user_query.lower() if isinstance(user_query, str) else ""
-    if isinstance(plan_kinds, dict) and query_lower:
-        for plan_kind, plan_kind_config in plan_kinds.items():
-            synonyms = []
-            if isinstance(plan_kind_config, dict):
-                intent_synonyms = plan_kind_config.get("intent_synonyms")
-                if isinstance(intent_synonyms, list):
-                    synonyms = intent_synonyms
-
-            for synonym in synonyms:
-                if isinstance(synonym, str) and synonym.lower() in query_lower:
-                    inferred_plan_kind = plan_kind
-                    break
-
-            if inferred_plan_kind:
-                break
+    if compiled_config is not None and isinstance(user_query, str) and user_query:
+        # One pass of the compiled synonym automaton instead of a scan per synonym.
+        inferred_plan_kind = compiled_config.first_intent(user_query)
 
     messages = [
         {"role": "system", "content": system_prompt},
@@ -481,3 +470,9 @@ def run_sql_planner_model(
         payload["plan"] = None
 
     return payload
+
+
+async def arun_sql_planner_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_sql_planner_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_sql_planner_model, client=client, **kwargs)
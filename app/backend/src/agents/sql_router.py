@@ -4,9 +4,10 @@ from dataclasses import dataclass, asdict
 from typing import Any, List
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from .domain_config_loader import load_domain_config
+from .async_llm import run_model_async
+from .domain_config_loader import get_domain_config, load_domain_config
 from .json_utils import _extract_json_object
 
 
@@ -86,8 +87,8 @@ def route_sql(
     intent = normalized_intent or {}
     mt = multi_turn_state or {}
 
-    config = load_domain_config()
-    router_modes = config.get("router_modes", {})
+    compiled_config = get_domain_config()
+    router_modes = compiled_config.raw.get("router_modes", {})
     print("[DOMAIN-CONFIG-DEBUG][ROUTER] Loaded router_modes:", list(router_modes.keys()))
 
     primary_type = plan.get("primary_entity_type")
@@ -104,25 +105,10 @@ def route_sql(
     metrics = plan.get("metrics") or []
 
     # Match router modes based on domain_config.router_modes[*].triggers
+    # (compiled into one automaton; modes come back deduplicated in config order)
     q_lower = user_query.lower()
-    matched_modes: list[str] = []
-    if isinstance(router_modes, dict):
-        for mode_key, cfg in router_modes.items():
-            triggers = cfg.get("triggers", []) if isinstance(cfg, dict) else []
-            for trigger in triggers:
-                if isinstance(trigger, str) and trigger.lower() in q_lower:
-                    matched_modes.append(mode_key)
-
-    # Deduplicate while preserving order (triggers can add duplicates)
-    if matched_modes:
-        seen: set[str] = set()
-        deduped: list[str] = []
-        for m in matched_modes:
-            if m in seen:
-                continue
-            seen.add(m)
-            deduped.append(m)
-        matched_modes = deduped
+    matched_trigger_modes = compiled_config.triggered_modes(q_lower)
+    matched_modes: list[str] = list(matched_trigger_modes)
 
     # Prefer a mode derived from the plan kind when available, using
     # PLAN_KIND_TO_MODE as the authoritative mapping from plan_kinds
@@ -200,11 +186,7 @@ def route_sql(
     # We combine:
     #   1) plan_kind == "student_provider_breakdown" (authoritative intent), and
     #   2) router_modes.student_provider_breakdown.triggers, if present.
-    provider_mode_cfg = router_modes.get("student_provider_breakdown", {}) if isinstance(router_modes, dict) else {}
-    provider_triggers = provider_mode_cfg.get("triggers", []) if isinstance(provider_mode_cfg, dict) else []
-    provider_trigger_hit = any(
-        isinstance(kw, str) and kw.lower() in q_lower for kw in provider_triggers
-    )
+    provider_trigger_hit = "student_provider_breakdown" in matched_trigger_modes
     needs_provider_breakdown = (
         (plan_kind == "student_provider_breakdown") or provider_trigger_hit
     ) and not top_invoices_intent
@@ -563,3 +545,9 @@ def run_sql_router_model(
 
     router_decision.mode = mode or router_decision.mode or "district_summary"
     return router_decision
+
+
+async def arun_sql_router_model(*, client: AsyncOpenAI, **kwargs: Any) -> RouterDecision:
+    """Async variant of :func:`run_sql_router_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_sql_router_model, client=client, **kwargs)
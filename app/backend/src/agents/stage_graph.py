@@ -0,0 +1,245 @@
+"""Dependency-graph scheduler for analytics workflow stages."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Mapping, Sequence, TypeVar
+
+import structlog
+
+LOGGER = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class StageHalt(Exception):
+    """Raised by a stage to stop the graph early with ``value`` as the outcome.
+
+    Stages that are still running are cancelled and no new stages are started.
+    """
+
+    def __init__(self, value: Any = None) -> None:
+        super().__init__("stage graph halted")
+        self.value = value
+
+
+@dataclass
+class Stage:
+    """A unit of work that runs once all of its dependencies have finished.
+
+    ``func`` receives a mapping of completed stage results keyed by stage
+    name and returns this stage's result. It may be a plain callable or a
+    coroutine function.
+    """
+
+    name: str
+    func: Callable[[Mapping[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class StageSpan:
+    """Start and end offsets (seconds) of a stage relative to a shared origin."""
+
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class GraphResult:
+    """Outcome of :meth:`StageGraph.run`."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    spans: dict[str, StageSpan] = field(default_factory=dict)
+    halted: bool = False
+    halt_value: Any = None
+
+
+class StageGraph:
+    """Run stages with as much concurrency as their dependencies allow."""
+
+    def __init__(self, stages: Sequence[Stage], *, max_workers: int | None = None) -> None:
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique.")
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown stages {missing}.")
+        self._check_acyclic()
+        self.max_workers = max_workers or max(len(stages), 1)
+
+    @property
+    def dependencies(self) -> dict[str, tuple[str, ...]]:
+        return {name: stage.depends_on for name, stage in self.stages.items()}
+
+    def _check_acyclic(self) -> None:
+        state: dict[str, int] = {}
+
+        def visit(name: str) -> None:
+            if state.get(name) == 1:
+                raise ValueError(f"Stage graph has a cycle through {name!r}.")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            state[name] = 2
+
+        for name in self.stages:
+            visit(name)
+
+    def run(self, *, origin: float | None = None) -> GraphResult:
+        """Synchronous entry point for :meth:`arun` (no running event loop)."""
+
+        return run_sync(self.arun(origin=origin))
+
+    async def arun(self, *, origin: float | None = None) -> GraphResult:
+        """Execute the graph and return results plus per-stage spans.
+
+        Coroutine stages run on the event loop; plain callables run on worker
+        threads so blocking I/O still overlaps. ``origin`` is the
+        ``perf_counter`` value spans are measured from; it defaults to the
+        moment the graph starts. The first stage exception is re-raised once
+        no further stages can make progress.
+        """
+
+        origin = perf_counter() if origin is None else origin
+        outcome = GraphResult()
+        pending = dict(self.stages)
+        running: dict[asyncio.Task, str] = {}
+        error: BaseException | None = None
+        limiter = asyncio.Semaphore(self.max_workers)
+
+        async def _timed(stage: Stage, inputs: Mapping[str, Any]) -> Any:
+            async with limiter:
+                started = perf_counter()
+                try:
+                    if inspect.iscoroutinefunction(stage.func):
+                        return await stage.func(inputs)
+                    return await asyncio.to_thread(stage.func, inputs)
+                finally:
+                    outcome.spans[stage.name] = StageSpan(
+                        start=started - origin, end=perf_counter() - origin
+                    )
+
+        def _schedule_ready() -> None:
+            for name, stage in list(pending.items()):
+                if all(dep in outcome.results for dep in stage.depends_on):
+                    inputs = {dep: outcome.results[dep] for dep in stage.depends_on}
+                    running[asyncio.ensure_future(_timed(stage, inputs))] = name
+                    del pending[name]
+
+        try:
+            _schedule_ready()
+            while running:
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    try:
+                        outcome.results[name] = task.result()
+                    except StageHalt as halt:
+                        LOGGER.debug("stage_graph_halted", stage=name)
+                        outcome.halted = True
+                        outcome.halt_value = halt.value
+                    except BaseException as exc:
+                        LOGGER.warning("stage_graph_stage_failed", stage=name, error=str(exc))
+                        error = error or exc
+                if outcome.halted:
+                    return outcome
+                if error is None:
+                    _schedule_ready()
+        finally:
+            # Stages still in flight after a halt (or cancellation) only
+            # produce results that are no longer needed.
+            for task in running:
+                task.cancel()
+
+        if error is not None:
+            raise error
+        return outcome
+
+
+def run_sync(main: Awaitable[T]) -> T:
+    """Run ``main`` on a fresh event loop from synchronous code.
+
+    Unlike ``asyncio.run``, this does not join the loop's worker threads on
+    the way out: blocking stages a halt cancelled keep running in the
+    background and their results are dropped, so the caller gets its answer
+    as soon as ``main`` finishes.
+    """
+
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(thread_name_prefix="stage-graph"))
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            leftover = asyncio.all_tasks(loop)
+            for task in leftover:
+                task.cancel()
+            if leftover:
+                loop.run_until_complete(asyncio.gather(*leftover, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            # close() shuts the default executor down without waiting.
+            loop.close()
+
+
+def critical_path(
+    spans: Mapping[str, StageSpan],
+    dependencies: Mapping[str, Sequence[str]] | None = None,
+) -> list[str]:
+    """Return the chain of stages that determined the end-to-end latency.
+
+    Starting from the stage that finished last, walk back through the
+    predecessor that finished latest. Stages listed in ``dependencies`` only
+    consider their declared dependencies; for any other stage, every stage
+    that finished before it started counts as a predecessor, which covers
+    stages that ran sequentially after the graph.
+    """
+
+    if not spans:
+        return []
+
+    dependencies = dependencies or {}
+    current = max(spans, key=lambda name: spans[name].end)
+    path = [current]
+    while True:
+        if current in dependencies:
+            candidates = [dep for dep in dependencies[current] if dep in spans]
+        else:
+            start = spans[current].start
+            candidates = [
+                name
+                for name, span in spans.items()
+                if name not in path and span.end <= start
+            ]
+        if not candidates:
+            break
+        current = max(candidates, key=lambda name: spans[name].end)
+        path.append(current)
+    path.reverse()
+    return path
+
+
+__all__ = [
+    "GraphResult",
+    "Stage",
+    "StageGraph",
+    "StageHalt",
+    "StageSpan",
+    "critical_path",
+    "run_sync",
+]
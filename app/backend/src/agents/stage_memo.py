@@ -0,0 +1,226 @@
+"""Memoization of individual LLM stage completions.
+
+Each model stage is a pure function of its chat-completion request (model,
+system prompt, input JSON and temperature all live in the request kwargs),
+so completions can be reused across requests even when the full-response
+cache misses. :class:`StageMemo` wraps the OpenAI clients handed to a stage
+and serves repeated requests from an in-process LRU backed by Redis.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Mapping
+
+import structlog
+
+from app.backend.src.core.redis_cache import RedisAnalyticsCache
+from app.backend.src.services.metrics import llm_stage_memo_total
+
+LOGGER = structlog.get_logger(__name__)
+
+# Stages whose completions are memoized, with their default TTLs in seconds.
+# Entity resolution and insights see district data in their prompts, so they
+# expire sooner than the purely linguistic stages.
+DEFAULT_STAGE_TTLS: dict[str, int] = {
+    "nlv_model": 3600,
+    "entity_resolution_model": 900,
+    "sql_planner_model": 3600,
+    "sql_router_model": 3600,
+    "business_rule_model": 3600,
+    "validator_model": 1800,
+    "insight_model": 900,
+    "rendering_model": 900,
+}
+
+
+def memo_key(stage: str, request: Mapping[str, Any]) -> str:
+    """Hash of a stage's completion request."""
+
+    payload = json.dumps(request, sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{stage}:{digest}"
+
+
+def _content(response: Any) -> str | None:
+    try:
+        message = response.choices[0].message
+    except Exception:
+        return None
+    if getattr(message, "tool_calls", None):
+        return None
+    content = getattr(message, "content", None)
+    return content if isinstance(content, str) else None
+
+
+def _completion(content: str) -> SimpleNamespace:
+    message = SimpleNamespace(role="assistant", content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class StageMemo:
+    """Two-tier (LRU + Redis) cache of stage completions with hit metrics."""
+
+    def __init__(
+        self,
+        *,
+        redis_cache: RedisAnalyticsCache | None = None,
+        max_entries: int = 512,
+        stage_ttls: Mapping[str, int] | None = None,
+        default_ttl_seconds: int = 3600,
+    ) -> None:
+        self.redis_cache = redis_cache
+        self.max_entries = max_entries
+        self.stage_ttls = {**DEFAULT_STAGE_TTLS, **(stage_ttls or {})}
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "StageMemo | None":
+        if not getattr(settings, "llm_memo_enabled", True):
+            return None
+        redis_cache = None
+        if getattr(settings, "redis_enabled", False):
+            redis_cache = RedisAnalyticsCache(
+                key_prefix="llm_stage_memo", ttl_seconds=settings.llm_memo_ttl_sec
+            )
+        return cls(
+            redis_cache=redis_cache,
+            max_entries=settings.llm_memo_lru_size,
+            stage_ttls=settings.llm_memo_stage_ttls,
+            default_ttl_seconds=settings.llm_memo_ttl_sec,
+        )
+
+    def covers(self, stage: str) -> bool:
+        return stage in self.stage_ttls
+
+    def ttl_for(self, stage: str) -> int:
+        return self.stage_ttls.get(stage) or self.default_ttl_seconds
+
+    def _record(self, stage: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._stats.setdefault(stage, {"lru": 0, "redis": 0, "miss": 0})
+            counts[outcome] += 1
+        llm_stage_memo_total.labels(stage=stage, outcome=outcome).inc()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-stage lookup counts and hit rate since process start."""
+
+        with self._lock:
+            snapshot = {stage: dict(counts) for stage, counts in self._stats.items()}
+        for counts in snapshot.values():
+            total = counts["lru"] + counts["redis"] + counts["miss"]
+            counts["hit_rate"] = (counts["lru"] + counts["redis"]) / total if total else 0.0
+        return snapshot
+
+    def _lru_get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, content = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return content
+
+    def _lru_put(self, stage: str, key: str, content: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_for(stage), content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, stage: str, key: str) -> str | None:
+        content = self._lru_get(key)
+        if content is not None:
+            self._record(stage, "lru")
+            return content
+        if self.redis_cache is not None:
+            content = self.redis_cache.get(key)
+            if isinstance(content, str):
+                self._lru_put(stage, key, content)
+                self._record(stage, "redis")
+                return content
+        self._record(stage, "miss")
+        return None
+
+    async def aget(self, stage: str, key: str) -> str | None:
+        content = self._lru_get(key)
+        if content is not None:
+            self._record(stage, "lru")
+            return content
+        if self.redis_cache is not None:
+            content = await self.redis_cache.aget(key)
+            if isinstance(content, str):
+                self._lru_put(stage, key, content)
+                self._record(stage, "redis")
+                return content
+        self._record(stage, "miss")
+        return None
+
+    def put(self, stage: str, key: str, content: str) -> None:
+        self._lru_put(stage, key, content)
+        if self.redis_cache is not None:
+            self.redis_cache.set(key, content, ttl_seconds=self.ttl_for(stage))
+
+    async def aput(self, stage: str, key: str, content: str) -> None:
+        self._lru_put(stage, key, content)
+        if self.redis_cache is not None:
+            await self.redis_cache.aset(key, content, ttl_seconds=self.ttl_for(stage))
+
+    def wrap(self, client: Any, stage: str) -> Any:
+        """Return a client whose completions for ``stage`` go through the memo."""
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=_MemoCompletions(self, stage, client)))
+
+    def awrap(self, client: Any, stage: str) -> Any:
+        """Async counterpart of :meth:`wrap` for ``AsyncOpenAI`` clients."""
+
+        return SimpleNamespace(
+            chat=SimpleNamespace(completions=_AsyncMemoCompletions(self, stage, client))
+        )
+
+
+class _MemoCompletions:
+    def __init__(self, memo: StageMemo, stage: str, client: Any) -> None:
+        self._memo = memo
+        self._stage = stage
+        self._client = client
+
+    def create(self, **kwargs: Any) -> Any:
+        key = memo_key(self._stage, kwargs)
+        content = self._memo.get(self._stage, key)
+        if content is not None:
+            LOGGER.debug("llm_stage_memo_hit", stage=self._stage)
+            return _completion(content)
+        response = self._client.chat.completions.create(**kwargs)
+        content = _content(response)
+        if content is not None:
+            self._memo.put(self._stage, key, content)
+        return response
+
+
+class _AsyncMemoCompletions(_MemoCompletions):
+    async def create(self, **kwargs: Any) -> Any:  # type: ignore[override]
+        key = memo_key(self._stage, kwargs)
+        content = await self._memo.aget(self._stage, key)
+        if content is not None:
+            LOGGER.debug("llm_stage_memo_hit", stage=self._stage)
+            return _completion(content)
+        response = await self._client.chat.completions.create(**kwargs)
+        content = _content(response)
+        if content is not None:
+            await self._memo.aput(self._stage, key, content)
+        return response
+
+
+__all__ = ["DEFAULT_STAGE_TTLS", "StageMemo", "memo_key"]
@@ -6,8 +6,9 @@ import json
 from typing import Any
 
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .async_llm import run_model_async
 from .json_utils import _extract_json_object
 
 LOGGER = structlog.get_logger(__name__)
@@ -188,3 +189,9 @@ def run_validator_model(
         default_payload["issues"] = []
 
     return default_payload
+
+
+async def arun_validator_model(*, client: AsyncOpenAI, **kwargs: Any) -> dict[str, Any]:
+    """Async variant of :func:`run_validator_model` that awaits ``AsyncOpenAI``."""
+
+    return await run_model_async(run_validator_model, client=client, **kwargs)
@@ -13,6 +13,7 @@ from . import (
     health,
     invoices,
     jobs,
+    storage,
     uploads,
     users,
     vendors,
@@ -31,6 +32,7 @@ __all__ = [
     "health",
     "invoices",
     "jobs",
+    "storage",
     "uploads",
     "users",
     "vendors",
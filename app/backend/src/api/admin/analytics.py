@@ -9,13 +9,15 @@ from typing import Any
 import structlog
 from fastapi import APIRouter, Depends, HTTPException
 from redis import Redis
-from sqlalchemy import create_engine, func
+from sqlalchemy import case, create_engine, func
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.backend.src.core.codec import decode_payload
 from app.backend.src.core.config import get_settings
 from app.backend.src.core.security import get_current_user
 from app.backend.src.models import User
 from app.backend.src.models.materialized_report import MaterializedReport
+from app.backend.src.services.prefetch_accounting import prefetch_roi
 
 LOGGER = structlog.get_logger(__name__)
 
@@ -68,8 +70,7 @@ def list_cache_entries(_: User = Depends(_require_admin)) -> dict[str, Any]:
 
             if value is not None:
                 try:
-                    decoded = value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else value
-                    payload = json.loads(decoded)
+                    payload = decode_payload(value)
                     if isinstance(payload, dict):
                         district_key = payload.get("district_key")
                         created_at = payload.get("created_at")
@@ -133,9 +134,14 @@ def list_materialized_reports(
         items: list[dict[str, Any]] = []
         for row in rows:
             payload_preview: dict[str, Any] | None = None
-            if isinstance(row.payload, dict):
-                text = row.payload.get("text")
-                rows_data = row.payload.get("rows")
+            try:
+                payload = row.decoded_payload
+            except Exception as exc:  # pragma: no cover - defensive
+                LOGGER.warning("materialized_report_decode_failed", id=row.id, error=str(exc))
+                payload = None
+            if isinstance(payload, dict):
+                text = payload.get("text")
+                rows_data = payload.get("rows")
                 rows_count = len(rows_data) if isinstance(rows_data, list) else None
                 payload_preview = {"text": text, "rows_count": rows_count}
 
@@ -149,11 +155,13 @@ def list_materialized_reports(
                 "last_accessed_at": row.last_accessed_at.isoformat()
                 if isinstance(row.last_accessed_at, datetime)
                 else None,
+                "origin": row.origin,
+                "hit_count": row.hit_count,
                 "payload_preview": payload_preview,
             }
 
             if raw:
-                item["payload"] = row.payload
+                item["payload"] = payload
 
             items.append(item)
 
@@ -180,3 +188,46 @@ def list_prefetch_history(_: User = Depends(_require_admin)) -> dict[str, Any]:
             continue
 
     return {"items": items}
+
+
+@router.get("/prefetch/roi")
+def get_prefetch_roi(
+    *,
+    district_key: str | None = None,
+    _: User = Depends(_require_admin),
+) -> dict[str, Any]:
+    """Prefetch hit rates and time saved, from Redis counters and stored reports.
+
+    ``cache`` covers reports while they live in the Redis cache; ``reports``
+    counts persisted reports by origin, with the hits served from Postgres
+    after their cache entries expired.
+    """
+
+    settings = get_settings()
+    try:
+        cache = prefetch_roi(district_key)
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_roi_read_failed", error=str(exc))
+        cache = None
+
+    engine = create_engine(settings.database_url)
+    SessionLocal = sessionmaker(bind=engine)
+    reports: dict[str, Any] = {}
+    with SessionLocal() as session:  # type: Session
+        query = session.query(
+            MaterializedReport.origin,
+            func.count(),
+            func.sum(case((MaterializedReport.hit_count > 0, 1), else_=0)),
+            func.sum(MaterializedReport.hit_count),
+        )
+        if district_key:
+            query = query.filter(MaterializedReport.district_key == district_key)
+        for origin, total, read, hits in query.group_by(MaterializedReport.origin).all():
+            reports[origin] = {
+                "reports": int(total or 0),
+                "reports_read": int(read or 0),
+                "hits": int(hits or 0),
+                "read_rate": round(int(read or 0) / total, 4) if total else None,
+            }
+
+    return {"district_key": district_key, "cache": cache, "reports": reports}
@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from html import escape
-from typing import Any
+from typing import Any, AsyncIterator
 
 import structlog
 from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.backend.src.agents.district_analytics_agent import (
     AgentResponse,
+    arun_analytics_agent as _aexecute_analytics_agent,
     run_analytics_agent as _execute_analytics_agent,
 )
 from app.backend.src.core.security import get_current_user
@@ -43,12 +48,17 @@ def run_analytics_agent(query: str, user_context: dict[str, Any]) -> dict[str, A
     return response.model_dump()
 
 
-@router.post("/analytics", response_model=AgentResponse)
-def analytics_agent_endpoint(
-    payload: AnalyticsAgentRequest,
-    user: User = Depends(get_current_user),
-) -> dict[str, Any]:
-    """Execute the district analytics agent and return the structured output."""
+async def arun_analytics_agent(query: str, user_context: dict[str, Any]) -> dict[str, Any]:
+    """Async variant of :func:`run_analytics_agent` that stays on the event loop."""
+
+    response = await _aexecute_analytics_agent(query=query, user_context=user_context)
+    return response.model_dump()
+
+
+def _resolve_agent_request(
+    payload: AnalyticsAgentRequest, user: User
+) -> tuple[str, dict[str, Any]]:
+    """Validate the query and build the tenant-scoped agent context."""
 
     print("RAW PAYLOAD:", payload.dict())
 
@@ -79,9 +89,24 @@ def analytics_agent_endpoint(
         context.setdefault("user_id", user.id)
 
     print("RESOLVED CONTEXT:", context)
+    return query, context
+
+
+@router.post("/analytics", response_model=AgentResponse)
+async def analytics_agent_endpoint(
+    payload: AnalyticsAgentRequest,
+    user: User = Depends(get_current_user),
+) -> dict[str, Any]:
+    """Execute the district analytics agent and return the structured output.
+
+    The agent awaits its model, cache and database calls, so a single worker
+    serves many concurrent conversations without tying up threadpool slots.
+    """
+
+    query, context = _resolve_agent_request(payload, user)
 
     try:
-        return run_analytics_agent(query=query, user_context=context)
+        return await arun_analytics_agent(query=query, user_context=context)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except (SQLAlchemyError, BotoCoreError, ClientError, NoCredentialsError) as exc:
@@ -96,10 +121,80 @@ def analytics_agent_endpoint(
         ) from exc
 
 
+def _sse(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), default=str)}\n\n"
+
+
+@router.post("/analytics/stream")
+async def analytics_agent_stream(
+    payload: AnalyticsAgentRequest,
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream analytics progress as server-sent events.
+
+    Emits ``stage_started`` as each model stage begins, ``rows_ready`` with the
+    result rows and table HTML as soon as SQL returns, ``insights_ready`` once
+    insights exist, and finally ``final`` with the full response (or ``error``).
+    """
+
+    query, context = _resolve_agent_request(payload, user)
+    queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+
+    def _on_event(event: str, data: dict[str, Any]) -> None:
+        queue.put_nowait((event, data))
+
+    async def _events() -> AsyncIterator[str]:
+        task = asyncio.create_task(
+            _aexecute_analytics_agent(query=query, user_context=context, on_event=_on_event)
+        )
+        try:
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {next_event, task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_event in done:
+                    yield _sse(*next_event.result())
+                    continue
+                next_event.cancel()
+                break
+
+            while not queue.empty():
+                yield _sse(*queue.get_nowait())
+
+            try:
+                response = task.result()
+            except ValueError as exc:
+                yield _sse("error", {"detail": str(exc)})
+                return
+            except (SQLAlchemyError, BotoCoreError, ClientError, NoCredentialsError) as exc:
+                LOGGER.warning("analytics_agent_data_error", error=str(exc))
+                message = "Unable to complete the requested analytics operation."
+                response = AgentResponse(text=message, html=_as_html(message), rows=None)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.error("analytics_agent_unexpected_error", error=str(exc))
+                yield _sse("error", {"detail": "Analytics agent is temporarily unavailable."})
+                return
+
+            yield _sse("final", response.model_dump())
+        finally:
+            # The client went away mid-stream; stop spending on the LLM chain.
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _as_html(text: str) -> str:
     if not text:
         return "<p></p>"
     return f"<p>{escape(text)}</p>"
 
 
-__all__ = ["router", "run_analytics_agent"]
+__all__ = ["router", "arun_analytics_agent", "run_analytics_agent"]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 
 from app.backend.src.core.security import require_district_user
@@ -17,8 +17,13 @@ from app.backend.src.schemas.district import (
     DistrictProfileUpdate,
     DistrictProfileUpdateNormalized,
     DistrictVendorOverview,
+    DistrictVendorStudentPage,
+)
+from app.backend.src.services.district_cache import versioned_json_response
+from app.backend.src.services.district_overview import (
+    fetch_district_vendor_overview,
+    fetch_vendor_month_students,
 )
-from app.backend.src.services.district_overview import fetch_district_vendor_overview
 
 router = APIRouter(prefix="/districts", tags=["districts"])
 
@@ -204,9 +209,10 @@ def _apply_mailing_address(district: District, address: PostalAddress) -> None:
 
 @router.get("/vendors", response_model=DistrictVendorOverview)
 def list_vendor_overview(
+    request: Request,
     session: Session = Depends(get_session_dependency),
     current_user: User = Depends(require_district_user),
-) -> DistrictVendorOverview:
+) -> DistrictVendorOverview | Response:
     """Return vendor performance data for district reviewers."""
 
     membership = _get_active_membership(session, current_user)
@@ -216,7 +222,84 @@ def list_vendor_overview(
             detail="District profile not found",
         )
 
-    return fetch_district_vendor_overview(session, membership.district_id)
+    district = membership.district
+    if district is None or not district.district_key:
+        return fetch_district_vendor_overview(session, membership.district_id)
+
+    return versioned_json_response(
+        request,
+        kind="district_vendor_overview",
+        district_key=district.district_key,
+        version=district.data_version,
+        params={},
+        build=lambda: fetch_district_vendor_overview(session, membership.district_id),
+    )
+
+
+@router.get(
+    "/vendors/{vendor_id}/months/{year}/{month}/students",
+    response_model=DistrictVendorStudentPage,
+)
+def list_vendor_month_students(
+    request: Request,
+    vendor_id: int,
+    year: int,
+    month: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_session_dependency),
+    current_user: User = Depends(require_district_user),
+) -> DistrictVendorStudentPage | Response:
+    """Return paginated student detail for a vendor's invoice month."""
+
+    if month < 1 or month > 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid month value",
+        )
+
+    membership = _get_active_membership(session, current_user)
+    if membership is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="District profile not found",
+        )
+
+    def _build() -> DistrictVendorStudentPage:
+        result = fetch_vendor_month_students(
+            session,
+            membership.district_id,
+            vendor_id,
+            year,
+            month,
+            page=page,
+            page_size=page_size,
+        )
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vendor not found",
+            )
+        return result
+
+    district = membership.district
+    if district is None or not district.district_key:
+        return _build()
+
+    return versioned_json_response(
+        request,
+        kind="district_vendor_month_students",
+        district_key=district.district_key,
+        version=district.data_version,
+        params={
+            "vendor_id": vendor_id,
+            "year": year,
+            "month": month,
+            "page": page,
+            "page_size": page_size,
+        },
+        build=_build,
+    )
 
 
 @router.get("/memberships", response_model=DistrictMembershipCollection)
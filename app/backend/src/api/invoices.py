@@ -2,15 +2,12 @@
 
 from __future__ import annotations
 
-import csv
 import re
 from calendar import month_abbr, month_name
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
-from io import BytesIO, StringIO
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from zipfile import ZipFile, ZIP_DEFLATED
 
 import structlog
 from botocore.exceptions import BotoCoreError, ClientError
@@ -22,8 +19,11 @@ from fastapi import (
     HTTPException,
     UploadFile,
     Query,
+    Request,
+    Response,
 )
 from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.backend.src.core.security import (
@@ -32,13 +32,18 @@ from app.backend.src.core.security import (
     require_district_user,
 )
 from app.backend.src.models import Invoice, Job, User, Vendor
+from app.backend.src.services.district_cache import (
+    get_district_data_version,
+    versioned_json_response,
+)
+from app.backend.src.services.invoice_archives import (
+    build_vendor_month_archive,
+    get_vendor_month_archive,
+)
 from app.backend.src.services.s3 import (
-    build_invoice_storage_components,
     generate_presigned_url,
-    get_s3_client,
     sanitize_object_key,
 )
-from app.backend.src.core.config import get_settings
 from ..db import get_session_dependency
 
 try:
@@ -62,22 +67,6 @@ def _select_queue(file_size: int) -> str:
     return "large"
 
 
-def _resolve_vendor_company_name(session: Session, vendor_id: int) -> str:
-    try:
-        vendor: Vendor | None = session.get(Vendor, vendor_id)
-    except Exception as exc:  # pragma: no cover - defensive fallback
-        LOGGER.warning(
-            "vendor_lookup_failed",
-            vendor_id=vendor_id,
-            error=str(exc),
-        )
-        return f"vendor-{vendor_id}"
-
-    if vendor and vendor.company_name:
-        return vendor.company_name
-    return f"vendor-{vendor_id}"
-
-
 def _resolve_year_month(month_token: str) -> tuple[str, str]:
     candidate = (month_token or "").strip()
     for fmt in ("%Y-%m", "%Y/%m", "%m-%Y", "%m/%Y", "%B %Y", "%b %Y"):
@@ -323,31 +312,19 @@ def download_invoice(
 
     sanitized_key = sanitize_object_key(str(pdf_s3_key))
 
-    settings = get_settings()
-    bucket_name = settings.aws_s3_bucket or "invoice-agent-files"
-    if bucket_name.lower() == "local":
-        bucket_name = "invoice-agent-files"
-
-    client = get_s3_client()
-
     LOGGER.info(
         "invoice_download_request_received",
         invoice_id=invoice_id,
         user=current_user.email,
-        bucket=bucket_name,
         key_preview=sanitized_key[:80],
     )
 
     try:
-        url = client.generate_presigned_url(
-            "get_object",
-            Params={
-                "Bucket": bucket_name,
-                "Key": sanitized_key,
-                "ResponseContentDisposition": f'inline; filename="{Path(sanitized_key).name}"',
-                "ResponseContentType": "application/pdf",
-            },
-            ExpiresIn=3600,
+        url = generate_presigned_url(
+            sanitized_key,
+            download_name=Path(sanitized_key).name,
+            response_content_type="application/pdf",
+            disposition="inline",
         )
     except (ClientError, BotoCoreError) as exc:
         LOGGER.error(
@@ -372,7 +349,12 @@ async def download_invoices_zip(
     current_user: User = Depends(require_district_user),
     session: Session = Depends(get_session_dependency),
 ) -> dict[str, str]:
-    """Return a presigned URL for a vendor's monthly invoice archive."""
+    """Return a presigned URL for a vendor's monthly invoice archive.
+
+    Archives are pre-built by ``tasks.medium.build_vendor_month_archive`` when a
+    vendor upload finishes, so the common path only presigns. Months ingested
+    before archives were recorded are built once here and recorded as well.
+    """
 
     if vendor_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid vendor identifier")
@@ -381,12 +363,6 @@ async def download_invoices_zip(
     if not normalized_month or ".." in normalized_month:
         raise HTTPException(status_code=400, detail="Invalid month value")
 
-    settings = get_settings()
-    bucket_name = settings.aws_s3_bucket or "invoice-agent-files"
-    if bucket_name.lower() == "local":
-        bucket_name = "invoice-agent-files"
-
-    vendor_company = _resolve_vendor_company_name(session, vendor_id)
     year_token, month_token = _resolve_year_month(normalized_month)
 
     try:
@@ -397,142 +373,66 @@ async def download_invoices_zip(
     target_year = reference_date.year
     target_month = reference_date.month
 
-    (
-        prefix,
-        company_segment,
-        year_segment,
-        month_segment,
-    ) = build_invoice_storage_components(vendor_company, reference_date)
-
-    client = get_s3_client()
-
     LOGGER.info(
         "invoice_zip_request_received",
         vendor_id=vendor_id,
-        company=company_segment,
         month=normalized_month,
         user=current_user.email,
     )
 
-    invoices = (
-        session.query(Invoice)
-        .filter(Invoice.vendor_id == vendor_id)
-        .filter(Invoice.service_year == target_year)
-        .filter(Invoice.service_month_num == target_month)
-        .order_by(Invoice.student_name.asc())
-        .all()
-    )
-
-    pdf_keys: list[tuple[str, Invoice]] = []
-    summary_rows: list[list[object]] = []
-
-    for invoice in invoices:
-        key = getattr(invoice, "pdf_s3_key", None)
-        if not key:
-            continue
-
-        sanitized = sanitize_object_key(str(key).strip())
-        if not sanitized:
-            continue
-
-        pdf_keys.append((sanitized, invoice))
-        summary_rows.append(
-            [
-                (invoice.student_name or "").strip(),
-                str(invoice.id),
-                float(invoice.total_cost or 0),
-                (invoice.status or "").strip(),
-                sanitized,
-            ]
-        )
-
-    if not pdf_keys:
-        LOGGER.warning(
-            "invoice_zip_no_objects",
+    archive = get_vendor_month_archive(session, vendor_id, target_year, target_month)
+    if archive is None:
+        LOGGER.info(
+            "invoice_zip_archive_missing",
             vendor_id=vendor_id,
-            company=company_segment,
             month=normalized_month,
         )
-        raise HTTPException(status_code=404, detail="No invoices available for this month")
-
-    buffer = BytesIO()
-    with ZipFile(buffer, "w", ZIP_DEFLATED) as zf:
-        for s3_key, invoice in pdf_keys:
-            try:
-                obj = await run_in_threadpool(
-                    client.get_object, Bucket=bucket_name, Key=s3_key
-                )
-                body = obj["Body"].read()
-            except (ClientError, BotoCoreError) as exc:
-                LOGGER.error(
-                    "invoice_zip_fetch_failed",
-                    vendor_id=vendor_id,
-                    company=company_segment,
-                    month=normalized_month,
-                    key=s3_key,
-                    error=str(exc),
-                )
-                raise HTTPException(
-                    status_code=502, detail="Unable to read invoice files"
-                ) from exc
-
-            student_slug = re.sub(
-                r"[^A-Za-z0-9._-]+",
-                "_",
-                (invoice.student_name or "").strip() or "invoice",
+        try:
+            archive = await run_in_threadpool(
+                build_vendor_month_archive,
+                session,
+                vendor_id,
+                target_year,
+                target_month,
             )
-            arcname = f"{student_slug}_{year_segment}_{month_segment}.pdf"
-            zf.writestr(arcname, body)
-
-        csv_buffer = StringIO()
-        writer = csv.writer(csv_buffer)
-        writer.writerow(
-            ["student_name", "invoice_id", "total_cost", "status", "pdf_s3_key"]
-        )
-        writer.writerows(summary_rows)
-        zf.writestr("invoice_summary.csv", csv_buffer.getvalue())
-
-    zip_bytes = buffer.getvalue()
-
-    zip_key = f"{prefix}{company_segment}_{year_segment}_{month_segment}_invoices_dynamic.zip"
-    zip_key = sanitize_object_key(zip_key)
+            session.commit()
+        except IntegrityError:
+            # The post-ingest task recorded the month first; serve its archive.
+            session.rollback()
+            archive = get_vendor_month_archive(
+                session, vendor_id, target_year, target_month
+            )
+        except (ClientError, BotoCoreError, OSError) as exc:
+            session.rollback()
+            LOGGER.error(
+                "invoice_zip_build_failed",
+                vendor_id=vendor_id,
+                month=normalized_month,
+                error=str(exc),
+            )
+            raise HTTPException(
+                status_code=502, detail="Unable to build invoice archive"
+            ) from exc
 
-    try:
-        await run_in_threadpool(
-            client.put_object,
-            Bucket=bucket_name,
-            Key=zip_key,
-            Body=zip_bytes,
-            ContentType="application/zip",
-        )
-    except (ClientError, BotoCoreError) as exc:
-        LOGGER.error(
-            "invoice_zip_upload_failed",
+    if archive is None:
+        LOGGER.warning(
+            "invoice_zip_no_objects",
             vendor_id=vendor_id,
-            company=company_segment,
             month=normalized_month,
-            key=zip_key,
-            error=str(exc),
         )
-        raise HTTPException(status_code=502, detail="Unable to store invoice archive")
-
-    download_name = re.sub(r"[^A-Za-z0-9._-]+", "_", Path(zip_key).name)
-    params = {
-        "Bucket": bucket_name,
-        "Key": zip_key,
-        "ResponseContentDisposition": f'attachment; filename="{download_name}"',
-        "ResponseContentType": "application/zip",
-    }
+        raise HTTPException(status_code=404, detail="No invoices available for this month")
 
+    zip_key = archive.s3_key
     try:
-        url = client.generate_presigned_url(
-            "get_object", Params=params, ExpiresIn=3600
+        url = generate_presigned_url(
+            zip_key,
+            download_name=Path(zip_key).name,
+            response_content_type="application/zip",
         )
     except (ClientError, BotoCoreError) as exc:
         LOGGER.error(
             "invoice_zip_presign_failed",
             vendor_id=vendor_id,
-            company=company_segment,
             month=normalized_month,
             key=zip_key,
             error=str(exc),
@@ -542,7 +442,6 @@ async def download_invoices_zip(
     LOGGER.info(
         "invoice_zip_success",
         vendor_id=vendor_id,
-        company=company_segment,
         month=normalized_month,
         key=zip_key,
     )
@@ -552,44 +451,10 @@ async def download_invoices_zip(
     }
 
 
-# --------------------------------------------------------------------------
-# GET /invoices/{vendor_id}/{year}/{month}
-# --------------------------------------------------------------------------
-@router.get("/{vendor_id}/{year}/{month}")
-def list_vendor_invoices(
-    vendor_id: int,
-    year: int,
-    month: int,
-    session: Session = Depends(get_session_dependency),
-    current_user: User = Depends(require_district_user),
+def _build_vendor_invoice_listing(
+    session: Session, vendor_id: int, year: int, month: int
 ) -> list[dict[str, object]]:
-    """Return invoice metadata for a vendor in a specific month."""
-
-    if vendor_id <= 0:
-        raise HTTPException(status_code=400, detail="Invalid vendor identifier")
-
-    if month <= 0 or month > 12:
-        raise HTTPException(status_code=400, detail="Invalid month value")
-
-    if year <= 0:
-        raise HTTPException(status_code=400, detail="Invalid year value")
-
-    vendor = session.get(Vendor, vendor_id)
-    if vendor is None:
-        raise HTTPException(status_code=404, detail="Vendor not found")
-
-    try:
-        reference_date = datetime(year, month, 1)
-    except ValueError as exc:  # pragma: no cover - defensive guard
-        raise HTTPException(status_code=400, detail="Invalid invoice period") from exc
-
-    LOGGER.info(
-        "district_invoice_listing_requested",
-        vendor_id=vendor_id,
-        year=year,
-        month=month,
-        user=current_user.email,
-    )
+    """Return serialized invoice rows for a vendor month, newest first."""
 
     invoices = (
         session.query(Invoice)
@@ -640,3 +505,57 @@ def list_vendor_invoices(
         entry.pop("uploaded_at", None)
 
     return results
+
+
+# --------------------------------------------------------------------------
+# GET /invoices/{vendor_id}/{year}/{month}
+# --------------------------------------------------------------------------
+@router.get("/{vendor_id}/{year}/{month}", response_model=list[dict[str, object]])
+def list_vendor_invoices(
+    request: Request,
+    vendor_id: int,
+    year: int,
+    month: int,
+    session: Session = Depends(get_session_dependency),
+    current_user: User = Depends(require_district_user),
+) -> list[dict[str, object]] | Response:
+    """Return invoice metadata for a vendor in a specific month."""
+
+    if vendor_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid vendor identifier")
+
+    if month <= 0 or month > 12:
+        raise HTTPException(status_code=400, detail="Invalid month value")
+
+    if year <= 0:
+        raise HTTPException(status_code=400, detail="Invalid year value")
+
+    vendor = session.get(Vendor, vendor_id)
+    if vendor is None:
+        raise HTTPException(status_code=404, detail="Vendor not found")
+
+    try:
+        reference_date = datetime(year, month, 1)
+    except ValueError as exc:  # pragma: no cover - defensive guard
+        raise HTTPException(status_code=400, detail="Invalid invoice period") from exc
+
+    LOGGER.info(
+        "district_invoice_listing_requested",
+        vendor_id=vendor_id,
+        year=year,
+        month=month,
+        user=current_user.email,
+    )
+
+    version = get_district_data_version(session, vendor.district_key)
+    if version is None:
+        return _build_vendor_invoice_listing(session, vendor_id, year, month)
+
+    return versioned_json_response(
+        request,
+        kind="vendor_invoice_listing",
+        district_key=vendor.district_key,
+        version=version,
+        params={"vendor_id": vendor_id, "year": year, "month": month},
+        build=lambda: _build_vendor_invoice_listing(session, vendor_id, year, month),
+    )
@@ -0,0 +1,66 @@
+"""Serve objects written by the local filesystem storage backend."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import structlog
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.backend.src.core.storage import LocalFilesystemStorage
+from app.backend.src.services.s3 import get_storage_backend, sanitize_object_key
+
+LOGGER = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+
+@router.get("/local/{key:path}")
+def download_local_object(
+    key: str,
+    expires: int = Query(...),
+    signature: str = Query(...),
+    disposition: str = Query("attachment"),
+    filename: str | None = Query(None),
+    content_type: str | None = Query(None),
+) -> FileResponse:
+    """Stream a locally stored object referenced by a signed URL.
+
+    ``FileResponse`` hands the file descriptor to the ASGI server (``sendfile``
+    where supported) and answers ``Range`` requests with partial content.
+    """
+
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalFilesystemStorage):
+        raise HTTPException(status_code=404, detail="Local storage is not enabled")
+
+    sanitized_key = sanitize_object_key(key)
+    if disposition not in {"attachment", "inline"}:
+        raise HTTPException(status_code=400, detail="Invalid disposition")
+
+    if not backend.verify(
+        sanitized_key,
+        expires=expires,
+        signature=signature,
+        download_name=filename,
+        content_type=content_type,
+        disposition=disposition,
+    ):
+        LOGGER.warning("local_storage_signature_rejected", key=sanitized_key)
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+
+    try:
+        path = backend.path_for(sanitized_key)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid object key") from None
+
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    return FileResponse(
+        path,
+        media_type=content_type,
+        filename=filename or Path(sanitized_key).name,
+        content_disposition_type=disposition,
+    )
@@ -0,0 +1,221 @@
+"""Pluggable binary codec for cached analytics payloads.
+
+Encoded values start with a four byte header::
+
+    0xC1 | format version | serializer id | compression id
+
+``0xC1`` can never start UTF-8 JSON text (or a msgpack object), so anything
+without the header is a legacy ``json.dumps`` value and is still decoded.
+Readers understand every serializer and compressor id regardless of what
+they are configured to write, which lets a deployment switch codecs (or roll
+back to ``legacy``) without flushing Redis or rewriting stored reports.
+
+Specs are ``"<serializer>[+<compression>]"``, e.g. ``"orjson+zlib"`` or
+``"msgpack+zstd"``. ``orjson``, ``msgpack`` and ``zstandard`` are optional;
+a spec naming a missing library falls back to ``json`` / ``zlib``.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+import structlog
+
+from .config import get_settings
+
+LOGGER = structlog.get_logger(__name__)
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+MAGIC = 0xC1
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+SERIALIZERS = {"json": 0, "orjson": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+class CodecError(ValueError):
+    """Raised for payloads this process cannot decode."""
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _json_loads(data: bytes) -> Any:
+    # orjson reads the same JSON several times faster when it is installed.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _zstd_compress(data: bytes, level: int | None) -> bytes:
+    return zstandard.ZstdCompressor(level=level or 3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+_DUMPS: dict[str, Callable[[Any], bytes]] = {
+    "json": _json_dumps,
+    "orjson": _orjson_dumps,
+    "msgpack": _msgpack_dumps,
+}
+_LOADS: dict[int, Callable[[bytes], Any]] = {0: _json_loads, 1: _json_loads, 2: _msgpack_loads}
+_AVAILABLE = {
+    "json": True,
+    "orjson": orjson is not None,
+    "msgpack": msgpack is not None,
+    "none": True,
+    "zlib": True,
+    "zstd": zstandard is not None,
+}
+
+
+@dataclass(frozen=True)
+class PayloadCodec:
+    """Encode values as ``serializer`` output, compressed once it is large enough.
+
+    ``serializer="legacy"`` writes bare ``json.dumps`` text with no header, for
+    deployments whose readers predate this module.
+    """
+
+    serializer: str = "json"
+    compression: str = "none"
+    compress_min_bytes: int = 1024
+    level: int | None = None
+
+    @classmethod
+    def from_spec(cls, spec: str, *, compress_min_bytes: int = 1024) -> "PayloadCodec":
+        serializer, _, compression = (spec or "json").strip().lower().partition("+")
+        compression = compression or "none"
+        if serializer != "legacy" and serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer {serializer!r}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression {compression!r}")
+        if not _AVAILABLE.get(serializer, True):
+            LOGGER.warning("cache_codec_serializer_unavailable", serializer=serializer)
+            serializer = "json"
+        if not _AVAILABLE[compression]:
+            LOGGER.warning("cache_codec_compression_unavailable", compression=compression)
+            compression = "zlib"
+        return cls(serializer, compression, compress_min_bytes)
+
+    @property
+    def spec(self) -> str:
+        if self.compression == "none":
+            return self.serializer
+        return f"{self.serializer}+{self.compression}"
+
+    def encode(self, value: Any) -> bytes:
+        if self.serializer == "legacy":
+            return json.dumps(value).encode("utf-8")
+
+        body = _DUMPS[self.serializer](value)
+        compression = "none"
+        if self.compression != "none" and len(body) >= self.compress_min_bytes:
+            packed = (
+                zlib.compress(body, 3 if self.level is None else self.level)
+                if self.compression == "zlib"
+                else _zstd_compress(body, self.level)
+            )
+            # Incompressible payloads are stored as-is.
+            if len(packed) < len(body):
+                body, compression = packed, self.compression
+
+        header = bytes(
+            (MAGIC, FORMAT_VERSION, SERIALIZERS[self.serializer], COMPRESSIONS[compression])
+        )
+        return header + body
+
+    def decode(self, raw: bytes | bytearray | memoryview | str) -> Any:
+        return decode_payload(raw)
+
+    def decode_sized(self, raw: bytes | bytearray | memoryview | str) -> tuple[Any, int]:
+        return decode_sized(raw)
+
+
+def decode_payload(raw: bytes | bytearray | memoryview | str) -> Any:
+    """Decode any framed payload, or a legacy JSON one."""
+
+    return decode_sized(raw)[0]
+
+
+def decode_sized(raw: bytes | bytearray | memoryview | str) -> tuple[Any, int]:
+    """Decode ``raw`` and return the value with its serialized, uncompressed size."""
+
+    if isinstance(raw, str):
+        return json.loads(raw), len(raw.encode("utf-8"))
+    data = bytes(raw)
+    if not data or data[0] != MAGIC:
+        return _json_loads(data), len(data)
+    if len(data) < HEADER_SIZE or data[1] != FORMAT_VERSION:
+        raise CodecError(f"Unsupported cache payload format {data[1:2]!r}")
+
+    serializer_id, compression_id = data[2], data[3]
+    body = data[HEADER_SIZE:]
+    if compression_id == COMPRESSIONS["zlib"]:
+        body = zlib.decompress(body)
+    elif compression_id == COMPRESSIONS["zstd"]:
+        if zstandard is None:
+            raise CodecError("Payload is zstd-compressed but zstandard is not installed")
+        body = _zstd_decompress(body)
+    elif compression_id != COMPRESSIONS["none"]:
+        raise CodecError(f"Unknown compression id {compression_id}")
+
+    loads = _LOADS.get(serializer_id)
+    if loads is None:
+        raise CodecError(f"Unknown serializer id {serializer_id}")
+    if serializer_id == SERIALIZERS["msgpack"] and msgpack is None:
+        raise CodecError("Payload is msgpack-encoded but msgpack is not installed")
+    return loads(body), len(body)
+
+
+@lru_cache(maxsize=None)
+def _codec_for(spec: str, compress_min_bytes: int) -> PayloadCodec:
+    return PayloadCodec.from_spec(spec, compress_min_bytes=compress_min_bytes)
+
+
+def get_codec() -> PayloadCodec:
+    """Return the codec configured by ``CACHE_CODEC``."""
+
+    settings = get_settings()
+    return _codec_for(settings.cache_codec, settings.cache_codec_compress_min_bytes)
+
+
+__all__ = [
+    "CodecError",
+    "PayloadCodec",
+    "decode_payload",
+    "decode_sized",
+    "get_codec",
+]
@@ -41,6 +41,21 @@ class Settings(BaseSettings):
     local_storage_path: str = Field(
         default="/tmp/invoice-agent", alias="LOCAL_STORAGE_PATH"
     )
+    s3_multipart_part_size_mb: int = Field(
+        default=16, alias="S3_MULTIPART_PART_SIZE_MB"
+    )
+    s3_multipart_max_concurrency: int = Field(
+        default=4, alias="S3_MULTIPART_MAX_CONCURRENCY"
+    )
+    local_storage_base_url: str = Field(
+        default="/api/storage/local", alias="LOCAL_STORAGE_BASE_URL"
+    )
+    # Signs and verifies download URLs when AWS_S3_BUCKET=local. Every process
+    # serving or issuing URLs needs the same value; unset, each process signs
+    # with its own random key.
+    local_storage_signing_key: str | None = Field(
+        default=None, alias="LOCAL_STORAGE_SIGNING_KEY"
+    )
     # Prefetch throttling
     prefetch_enabled: bool = Field(default=True, alias="PREFETCH_ENABLED")
     prefetch_max_queue: int = Field(default=3, alias="PREFETCH_MAX_QUEUE")
@@ -53,6 +68,91 @@ class Settings(BaseSettings):
     prefetch_skip_expensive: bool = Field(
         default=True, alias="PREFETCH_SKIP_EXPENSIVE"
     )
+    # Token buckets, one token per prefetched query.
+    prefetch_global_burst: int = Field(default=40, alias="PREFETCH_GLOBAL_BURST")
+    prefetch_global_refill_per_sec: float = Field(
+        default=2.0, alias="PREFETCH_GLOBAL_REFILL_PER_SEC"
+    )
+    prefetch_district_burst: int = Field(default=8, alias="PREFETCH_DISTRICT_BURST")
+    prefetch_district_refill_per_sec: float = Field(
+        default=0.4, alias="PREFETCH_DISTRICT_REFILL_PER_SEC"
+    )
+    # Learned follow-up prediction; see services/prefetch_predictor.py.
+    prefetch_top_k: int = Field(default=4, alias="PREFETCH_TOP_K")
+    prefetch_min_probability: float = Field(
+        default=0.1, alias="PREFETCH_MIN_PROBABILITY"
+    )
+    prefetch_min_transitions: int = Field(default=5, alias="PREFETCH_MIN_TRANSITIONS")
+    prefetch_min_hit_rate: float = Field(default=0.05, alias="PREFETCH_MIN_HIT_RATE")
+    prefetch_hit_rate_min_samples: int = Field(
+        default=20, alias="PREFETCH_HIT_RATE_MIN_SAMPLES"
+    )
+    prefetch_transition_ttl_sec: int = Field(
+        default=30 * 86400, alias="PREFETCH_TRANSITION_TTL_SEC"
+    )
+    # Answer templated prefetch jobs with one SQL query instead of the model chain.
+    prefetch_templated: bool = Field(default=True, alias="PREFETCH_TEMPLATED")
+    # Analytics response and query caches; keys carry districts.data_version.
+    analytics_cache_ttl_sec: int = Field(default=86400, alias="ANALYTICS_CACHE_TTL_SEC")
+    # Coalesce concurrent identical analytics requests onto one pipeline run.
+    analytics_single_flight_enabled: bool = Field(
+        default=True, alias="ANALYTICS_SINGLE_FLIGHT_ENABLED"
+    )
+    analytics_single_flight_lock_ttl_sec: int = Field(
+        default=120, alias="ANALYTICS_SINGLE_FLIGHT_LOCK_TTL_SEC"
+    )
+    analytics_single_flight_wait_sec: float = Field(
+        default=45.0, alias="ANALYTICS_SINGLE_FLIGHT_WAIT_SEC"
+    )
+    # Wire format for cached payloads, "<serializer>[+<compression>]"; see core/codec.py.
+    cache_codec: str = Field(default="orjson+zlib", alias="CACHE_CODEC")
+    cache_codec_compress_min_bytes: int = Field(
+        default=1024, alias="CACHE_CODEC_COMPRESS_MIN_BYTES"
+    )
+    # In-process tier in front of the analytics caches; 0 bytes disables it.
+    analytics_l1_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024, alias="ANALYTICS_L1_CACHE_MAX_BYTES"
+    )
+    analytics_l1_cache_ttl_sec: int = Field(default=30, alias="ANALYTICS_L1_CACHE_TTL_SEC")
+    district_response_cache_ttl_sec: int = Field(
+        default=900, alias="DISTRICT_RESPONSE_CACHE_TTL_SEC"
+    )
+    entity_catalog_ttl_sec: int = Field(default=86400, alias="ENTITY_CATALOG_TTL_SEC")
+    entity_catalog_local_ttl_sec: int = Field(
+        default=300, alias="ENTITY_CATALOG_LOCAL_TTL_SEC"
+    )
+    mv_refresh_on_ingest: bool = Field(default=True, alias="MV_REFRESH_ON_INGEST")
+    summary_reconcile_interval_sec: int = Field(
+        default=21600, alias="SUMMARY_RECONCILE_INTERVAL_SEC"
+    )
+    # Per-district budgets for persisted analytics reports; 0 disables a budget.
+    materialized_report_max_rows_per_district: int = Field(
+        default=5000, alias="MATERIALIZED_REPORT_MAX_ROWS_PER_DISTRICT"
+    )
+    materialized_report_max_bytes_per_district: int = Field(
+        default=256 * 1024 * 1024, alias="MATERIALIZED_REPORT_MAX_BYTES_PER_DISTRICT"
+    )
+    materialized_report_eviction_policy: str = Field(
+        default="lru", alias="MATERIALIZED_REPORT_EVICTION_POLICY"
+    )
+    materialized_report_eviction_interval_sec: int = Field(
+        default=3600, alias="MATERIALIZED_REPORT_EVICTION_INTERVAL_SEC"
+    )
+    materialized_report_access_flush_sec: int = Field(
+        default=30, alias="MATERIALIZED_REPORT_ACCESS_FLUSH_SEC"
+    )
+    # Candidates per ambiguous mention sent to entity resolution; 0 sends every name.
+    entity_match_top_k: int = Field(default=5, alias="ENTITY_MATCH_TOP_K")
+    analytics_fast_path_enabled: bool = Field(
+        default=True, alias="ANALYTICS_FAST_PATH_ENABLED"
+    )
+    # Memoization of individual LLM stage calls
+    llm_memo_enabled: bool = Field(default=True, alias="LLM_MEMO_ENABLED")
+    llm_memo_lru_size: int = Field(default=512, alias="LLM_MEMO_LRU_SIZE")
+    llm_memo_ttl_sec: int = Field(default=3600, alias="LLM_MEMO_TTL_SEC")
+    llm_memo_stage_ttls: dict[str, int] = Field(
+        default_factory=dict, alias="LLM_MEMO_STAGE_TTLS"
+    )
     auth0_domain: str | None = Field(default=None, alias="AUTH0_DOMAIN")
     auth0_audience: str | None = Field(default=None, alias="AUTH0_AUDIENCE")
     analytics_default_model: str = Field(
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 from typing import Any, Iterable, Mapping
 
 import structlog
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from .codec import PayloadCodec, get_codec
 
 LOGGER = structlog.get_logger(__name__)
 
@@ -22,6 +25,23 @@ class ConversationMemory:
     ) -> None:
         raise NotImplementedError
 
+    async def aload_messages(self, session_id: str) -> list[dict[str, str]]:
+        """Async variant of :meth:`load_messages`; defaults to a worker thread."""
+
+        return await asyncio.to_thread(self.load_messages, session_id)
+
+    async def aappend_interaction(
+        self, session_id: str, *, user_message: Mapping[str, Any], assistant_message: Mapping[str, Any]
+    ) -> None:
+        """Async variant of :meth:`append_interaction`; defaults to a worker thread."""
+
+        await asyncio.to_thread(
+            self.append_interaction,
+            session_id,
+            user_message=user_message,
+            assistant_message=assistant_message,
+        )
+
 
 class RedisConversationMemory(ConversationMemory):
     """Redis-backed conversation history for agents."""
@@ -33,8 +53,12 @@ class RedisConversationMemory(ConversationMemory):
         key_prefix: str = "analytics_agent",
         ttl_seconds: int = 60 * 60 * 24 * 7,
         max_messages: int = 40,
+        codec: PayloadCodec | None = None,
     ) -> None:
         self.client = Redis.from_url(url)
+        self.codec = codec or get_codec()
+        self._url = url
+        self._async_client: AsyncRedis | None = None
         self.key_prefix = key_prefix
         self.ttl_seconds = ttl_seconds
         self.max_messages = max_messages
@@ -47,34 +71,75 @@ class RedisConversationMemory(ConversationMemory):
             LOGGER.warning("redis_memory_read_failed", key=key, error=str(exc))
             return []
 
+        return self._decode(key, raw)
+
+    def append_interaction(
+        self, session_id: str, *, user_message: Mapping[str, Any], assistant_message: Mapping[str, Any]
+    ) -> None:
+        messages = self.load_messages(session_id)
+        serialized = self._append(messages, user_message, assistant_message)
+
+        key = self._key(session_id)
+        try:
+            self.client.setex(key, self.ttl_seconds, serialized)
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("redis_memory_write_failed", key=key, error=str(exc))
+
+    @property
+    def async_client(self) -> AsyncRedis:
+        """Lazily created asyncio client sharing this memory's URL."""
+
+        if self._async_client is None:
+            self._async_client = AsyncRedis.from_url(self._url)
+        return self._async_client
+
+    async def aload_messages(self, session_id: str) -> list[dict[str, str]]:
+        key = self._key(session_id)
+        try:
+            raw = await self.async_client.get(key)
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("redis_memory_read_failed", key=key, error=str(exc))
+            return []
+
+        return self._decode(key, raw)
+
+    async def aappend_interaction(
+        self, session_id: str, *, user_message: Mapping[str, Any], assistant_message: Mapping[str, Any]
+    ) -> None:
+        messages = await self.aload_messages(session_id)
+        serialized = self._append(messages, user_message, assistant_message)
+
+        key = self._key(session_id)
+        try:
+            await self.async_client.setex(key, self.ttl_seconds, serialized)
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("redis_memory_write_failed", key=key, error=str(exc))
+
+    def _decode(self, key: str, raw: Any) -> list[dict[str, str]]:
         if not raw:
             return []
 
         try:
-            payload = json.loads(raw)
+            payload = self.codec.decode(raw)
         except Exception as exc:  # pragma: no cover - defensive
             LOGGER.warning("redis_memory_json_error", key=key, error=str(exc))
             return []
 
         return self._coerce_messages(payload)
 
-    def append_interaction(
-        self, session_id: str, *, user_message: Mapping[str, Any], assistant_message: Mapping[str, Any]
-    ) -> None:
-        messages = self.load_messages(session_id)
+    def _append(
+        self,
+        messages: list[dict[str, str]],
+        user_message: Mapping[str, Any],
+        assistant_message: Mapping[str, Any],
+    ) -> bytes:
         messages.append({"role": "user", "content": str(user_message.get("content", ""))})
         messages.append(
             {"role": "assistant", "content": str(assistant_message.get("content", ""))}
         )
 
         trimmed = messages[-(self.max_messages * 2) :]
-        serialized = json.dumps(trimmed)
-
-        key = self._key(session_id)
-        try:
-            self.client.setex(key, self.ttl_seconds, serialized)
-        except Exception as exc:  # pragma: no cover - defensive
-            LOGGER.warning("redis_memory_write_failed", key=key, error=str(exc))
+        return self.codec.encode(trimmed)
 
     def _key(self, session_id: str) -> str:
         return f"{self.key_prefix}:{session_id}"
@@ -1,39 +1,307 @@
 from __future__ import annotations
 import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
 import structlog
 from typing import Any
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
+from .codec import PayloadCodec, get_codec
 from .config import get_settings
 
 LOGGER = structlog.get_logger(__name__)
 
+# Published (JSON ``{"district_key": ...}``) whenever a district's data_version
+# is bumped, so every process drops that district's in-process entries.
+INVALIDATION_CHANNEL = "analytics_cache:invalidate"
+
+
+class LocalCacheTier:
+    """Byte-bounded, short-TTL LRU of decoded cache values.
+
+    Sizes are the length of each value's serialized form before compression,
+    which tracks the memory the decoded value occupies far better than the
+    compressed bytes Redis holds. Values are handed out as-is, so callers
+    must treat them as read-only.
+    """
+
+    def __init__(self, *, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.current_bytes = 0
+        # key -> (expires_at, district_key, size, value)
+        self._entries: OrderedDict[str, tuple[float, str | None, int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[3]
+
+    def put(self, key: str, value: Any, size: int, district_key: str | None = None) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, district_key, size, value)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_district(self, district_key: str) -> int:
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[1] == district_key]
+            for key in stale:
+                self._drop(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _drop(self, key: str) -> None:
+        self.current_bytes -= self._entries.pop(key)[2]
+
+
+_L1_CACHES: "weakref.WeakSet[RedisAnalyticsCache]" = weakref.WeakSet()
+_SUBSCRIBER: threading.Thread | None = None
+_SUBSCRIBER_LOCK = threading.Lock()
+_PUBLISHER: Redis | None = None
+
+
+def _apply_invalidation(data: bytes | str) -> None:
+    try:
+        district_key = json.loads(data).get("district_key")
+    except Exception:  # pragma: no cover - defensive
+        return
+    if not district_key:
+        return
+    for cache in list(_L1_CACHES):
+        cache.invalidate_local(district_key)
+
+
+def _listen_for_invalidations(redis_url: str) -> None:
+    backoff = 1.0
+    while True:
+        try:
+            pubsub = Redis.from_url(redis_url).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            backoff = 1.0
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _apply_invalidation(message["data"])
+        except Exception as exc:  # pragma: no cover - requires Redis
+            # Entries still expire on their TTL while we are disconnected.
+            LOGGER.warning("analytics_cache_invalidation_listener_failed", error=str(exc))
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+
+def _ensure_invalidation_listener(redis_url: str) -> None:
+    global _SUBSCRIBER
+
+    with _SUBSCRIBER_LOCK:
+        if _SUBSCRIBER is not None or not get_settings().redis_enabled:
+            return
+        _SUBSCRIBER = threading.Thread(
+            target=_listen_for_invalidations,
+            args=(redis_url,),
+            name="analytics-cache-invalidation",
+            daemon=True,
+        )
+        _SUBSCRIBER.start()
+
+
+def publish_district_invalidation(district_keys: list[str] | set[str]) -> None:
+    """Tell every process to drop in-process entries for ``district_keys``."""
+
+    global _PUBLISHER
+
+    settings = get_settings()
+    if not district_keys:
+        return
+    messages = [json.dumps({"district_key": key}) for key in sorted(district_keys)]
+    # Apply here too in case this process's listener is not connected.
+    for message in messages:
+        _apply_invalidation(message)
+    if not settings.redis_enabled:
+        return
+    try:
+        if _PUBLISHER is None:
+            _PUBLISHER = Redis.from_url(settings.redis_url)
+        for message in messages:
+            _PUBLISHER.publish(INVALIDATION_CHANNEL, message)
+    except Exception as exc:
+        LOGGER.warning("analytics_cache_invalidation_publish_failed", error=str(exc))
+
+
 class RedisAnalyticsCache:
-    """Simple Redis cache for full analytics responses."""
+    """Simple Redis cache for full analytics responses.
+
+    With ``l1_max_bytes`` set, decoded values are also kept in a
+    :class:`LocalCacheTier` for ``l1_ttl_seconds`` so hot keys skip both the
+    round trip and the decode. Entries written with a ``district_key`` are
+    dropped early when that district's data version is bumped anywhere.
 
-    def __init__(self, *, key_prefix: str = "analytics_cache", ttl_seconds: int = 3600):
+    Values are stored with ``codec`` (the ``CACHE_CODEC`` setting by
+    default); legacy plain-JSON entries still decode.
+    """
+
+    def __init__(
+        self,
+        *,
+        key_prefix: str = "analytics_cache",
+        ttl_seconds: int = 3600,
+        l1_max_bytes: int = 0,
+        l1_ttl_seconds: float | None = None,
+        codec: PayloadCodec | None = None,
+    ):
         settings = get_settings()
+        self.codec = codec or get_codec()
         self.client = Redis.from_url(settings.redis_url)
+        self._redis_url = settings.redis_url
+        self._async_client: AsyncRedis | None = None
         self.key_prefix = key_prefix
         self.ttl_seconds = ttl_seconds
+        self.local: LocalCacheTier | None = None
+        if l1_max_bytes > 0:
+            self.local = LocalCacheTier(
+                max_bytes=l1_max_bytes,
+                ttl_seconds=(
+                    settings.analytics_l1_cache_ttl_sec if l1_ttl_seconds is None else l1_ttl_seconds
+                ),
+            )
+            _L1_CACHES.add(self)
 
     def _key(self, suffix: str) -> str:
         return f"{self.key_prefix}:{suffix}"
 
-    def get(self, suffix: str) -> Any | None:
+    def invalidate_local(self, district_key: str) -> None:
+        if self.local is not None and self.local.invalidate_district(district_key):
+            LOGGER.debug(
+                "analytics_cache_l1_invalidated", prefix=self.key_prefix, district_key=district_key
+            )
+
+    def _local_get(self, key: str) -> tuple[bool, Any]:
+        if self.local is None:
+            return False, None
+        _ensure_invalidation_listener(self._redis_url)
+        return self.local.get(key)
+
+    def _remember(self, key: str, value: Any, size: int, district_key: str | None) -> None:
+        if self.local is not None:
+            self.local.put(key, value, size, district_key)
+
+    def get(self, suffix: str, *, district_key: str | None = None) -> Any | None:
         key = self._key(suffix)
+        hit, value = self._local_get(key)
+        if hit:
+            return value
         try:
             raw = self.client.get(key)
             if not raw:
                 return None
-            return json.loads(raw)
+            value, size = self.codec.decode_sized(raw)
+        except Exception as exc:
+            LOGGER.warning("redis_cache_read_failed", key=key, error=str(exc))
+            return None
+        self._remember(key, value, size, district_key)
+        return value
+
+    def set(
+        self,
+        suffix: str,
+        value: Any,
+        *,
+        ttl_seconds: int | None = None,
+        district_key: str | None = None,
+    ) -> None:
+        key = self._key(suffix)
+        try:
+            raw = self.codec.encode(value)
+            self.client.setex(key, ttl_seconds or self.ttl_seconds, raw)
+        except Exception as exc:
+            LOGGER.warning("redis_cache_write_failed", key=key, error=str(exc))
+            return
+        if self.local is not None:
+            # Keep a private copy so later mutations by the caller cannot leak in.
+            self._remember(key, *self.codec.decode_sized(raw), district_key)
+
+    def get_raw(self, suffix: str) -> bytes | None:
+        """Return the stored payload without JSON decoding."""
+
+        key = self._key(suffix)
+        try:
+            return self.client.get(key)
         except Exception as exc:
             LOGGER.warning("redis_cache_read_failed", key=key, error=str(exc))
             return None
 
-    def set(self, suffix: str, value: Any) -> None:
+    def set_raw(self, suffix: str, value: bytes) -> None:
+        """Store an already-serialized payload."""
+
+        key = self._key(suffix)
+        try:
+            self.client.setex(key, self.ttl_seconds, value)
+        except Exception as exc:
+            LOGGER.warning("redis_cache_write_failed", key=key, error=str(exc))
+
+    @property
+    def async_client(self) -> AsyncRedis:
+        """Lazily created asyncio client sharing this cache's URL."""
+
+        if self._async_client is None:
+            self._async_client = AsyncRedis.from_url(self._redis_url)
+        return self._async_client
+
+    async def aget(self, suffix: str, *, district_key: str | None = None) -> Any | None:
+        """Async variant of :meth:`get` for use on the event loop."""
+
+        key = self._key(suffix)
+        hit, value = self._local_get(key)
+        if hit:
+            return value
+        try:
+            raw = await self.async_client.get(key)
+            if not raw:
+                return None
+            value, size = self.codec.decode_sized(raw)
+        except Exception as exc:
+            LOGGER.warning("redis_cache_read_failed", key=key, error=str(exc))
+            return None
+        self._remember(key, value, size, district_key)
+        return value
+
+    async def aset(
+        self,
+        suffix: str,
+        value: Any,
+        *,
+        ttl_seconds: int | None = None,
+        district_key: str | None = None,
+    ) -> None:
+        """Async variant of :meth:`set` for use on the event loop."""
+
         key = self._key(suffix)
         try:
-            self.client.setex(key, self.ttl_seconds, json.dumps(value))
+            raw = self.codec.encode(value)
+            await self.async_client.setex(key, ttl_seconds or self.ttl_seconds, raw)
         except Exception as exc:
             LOGGER.warning("redis_cache_write_failed", key=key, error=str(exc))
+            return
+        if self.local is not None:
+            self._remember(key, *self.codec.decode_sized(raw), district_key)
@@ -0,0 +1,110 @@
+"""Redis-backed single-flight leases for coalescing identical work.
+
+The first caller for a key takes a lease (``SET NX PX`` with a random token)
+and does the work; concurrent callers for the same key see the lease held and
+wait for the leader's result instead of repeating the work. Leases expire on
+their own, so a crashed leader cannot block followers for longer than
+``lock_ttl_seconds``, and release is a compare-and-delete so a slow leader
+never frees a lease that has since passed to someone else.
+
+When Redis is unreachable every caller becomes a leader with an untracked
+lease, which degrades to the uncoordinated behaviour.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+
+import structlog
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from .config import get_settings
+
+LOGGER = structlog.get_logger(__name__)
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class FlightLease:
+    """Leadership for ``key``; ``token`` is None when nothing was locked."""
+
+    key: str
+    token: str | None
+
+
+class RedisSingleFlight:
+    """Leader election for identical in-flight requests across processes."""
+
+    def __init__(self, *, key_prefix: str = "inflight", lock_ttl_seconds: int = 120) -> None:
+        settings = get_settings()
+        self.client = Redis.from_url(settings.redis_url)
+        self._redis_url = settings.redis_url
+        self._async_client: AsyncRedis | None = None
+        self.key_prefix = key_prefix
+        self.lock_ttl_seconds = lock_ttl_seconds
+
+    def _key(self, suffix: str) -> str:
+        return f"{self.key_prefix}:{suffix}"
+
+    @property
+    def async_client(self) -> AsyncRedis:
+        """Lazily created asyncio client sharing this lock's URL."""
+
+        if self._async_client is None:
+            self._async_client = AsyncRedis.from_url(self._redis_url)
+        return self._async_client
+
+    def acquire(self, suffix: str) -> FlightLease | None:
+        """Return a lease if this caller leads, or None if another caller does."""
+
+        key = self._key(suffix)
+        token = uuid.uuid4().hex
+        try:
+            if self.client.set(key, token, nx=True, px=self.lock_ttl_seconds * 1000):
+                return FlightLease(key, token)
+            return None
+        except Exception as exc:
+            LOGGER.warning("single_flight_acquire_failed", key=key, error=str(exc))
+            return FlightLease(key, None)
+
+    def release(self, lease: FlightLease) -> None:
+        if lease.token is None:
+            return
+        try:
+            self.client.eval(_RELEASE_SCRIPT, 1, lease.key, lease.token)
+        except Exception as exc:
+            LOGGER.warning("single_flight_release_failed", key=lease.key, error=str(exc))
+
+    async def aacquire(self, suffix: str) -> FlightLease | None:
+        """Async variant of :meth:`acquire`."""
+
+        key = self._key(suffix)
+        token = uuid.uuid4().hex
+        try:
+            if await self.async_client.set(key, token, nx=True, px=self.lock_ttl_seconds * 1000):
+                return FlightLease(key, token)
+            return None
+        except Exception as exc:
+            LOGGER.warning("single_flight_acquire_failed", key=key, error=str(exc))
+            return FlightLease(key, None)
+
+    async def arelease(self, lease: FlightLease) -> None:
+        """Async variant of :meth:`release`."""
+
+        if lease.token is None:
+            return
+        try:
+            await self.async_client.eval(_RELEASE_SCRIPT, 1, lease.key, lease.token)
+        except Exception as exc:
+            LOGGER.warning("single_flight_release_failed", key=lease.key, error=str(exc))
+
+
+__all__ = ["FlightLease", "RedisSingleFlight"]
@@ -1,17 +1,111 @@
-"""Storage helpers for S3 interactions."""
+"""Storage backends for invoice artifacts."""
 
 from __future__ import annotations
 
+import hashlib
+import hmac
+import os
+import shutil
+import tempfile
+import time
+import urllib.parse
+from pathlib import Path
 from typing import Protocol
 
 
+class StorageWriter:
+    """Write-only, forward-only stream that commits an object on ``close``.
+
+    Writers are used as context managers: a clean exit commits the object and
+    an exception aborts it so no partial object becomes visible. They expose
+    ``tell`` but not ``seek``, which is enough for ``zipfile.ZipFile`` to write
+    an archive straight into storage.
+    """
+
+    def __init__(self) -> None:
+        self._position = 0
+        self.closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        return None
+
+    def write(self, data: bytes) -> int:
+        if self.closed:
+            raise ValueError("write to closed storage writer")
+        size = len(data)
+        if size:
+            self._write(memoryview(data))
+            self._position += size
+        return size
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._commit()
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._abort()
+
+    def _write(self, data: memoryview) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def _commit(self) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def _abort(self) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def __enter__(self) -> "StorageWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
 class StorageBackend(Protocol):
-    """Minimal protocol for storage backends."""
+    """Protocol shared by the S3 and local filesystem backends."""
 
-    def put(self, key: str, data: bytes) -> str:
+    def put(self, key: str, data: bytes, *, content_type: str | None = None) -> str:
         """Persist bytes and return an object key."""
 
-    def url(self, key: str) -> str:
+    def put_file(
+        self, key: str, path: Path, *, content_type: str | None = None
+    ) -> str:
+        """Persist a file from disk and return an object key."""
+
+    def open_writer(
+        self, key: str, *, content_type: str | None = None
+    ) -> StorageWriter:
+        """Return a streaming writer that stores ``key`` when closed."""
+
+    def get(self, key: str) -> bytes:
+        """Return the stored bytes for ``key``."""
+
+    def exists(self, key: str) -> bool:
+        """Return ``True`` when ``key`` has been stored."""
+
+    def url(
+        self,
+        key: str,
+        *,
+        expires_in: int = 3600,
+        download_name: str | None = None,
+        content_type: str | None = None,
+        disposition: str = "attachment",
+    ) -> str:
         """Return an access URL."""
 
 
@@ -21,11 +115,193 @@ class InMemoryStorage:
     def __init__(self) -> None:
         self._store: dict[str, bytes] = {}
 
-    def put(self, key: str, data: bytes) -> str:
+    def put(self, key: str, data: bytes, *, content_type: str | None = None) -> str:
         self._store[key] = data
         return key
 
-    def url(self, key: str) -> str:
+    def put_file(
+        self, key: str, path: Path, *, content_type: str | None = None
+    ) -> str:
+        return self.put(key, Path(path).read_bytes(), content_type=content_type)
+
+    def open_writer(
+        self, key: str, *, content_type: str | None = None
+    ) -> StorageWriter:
+        return _InMemoryWriter(self._store, key)
+
+    def get(self, key: str) -> bytes:
+        return self._store[key]
+
+    def exists(self, key: str) -> bool:
+        return key in self._store
+
+    def url(self, key: str, **_: object) -> str:
         if key not in self._store:
             raise KeyError(key)
         return f"memory://{key}"
+
+
+class _InMemoryWriter(StorageWriter):
+    def __init__(self, store: dict[str, bytes], key: str) -> None:
+        super().__init__()
+        self._store = store
+        self._key = key
+        self._buffer = bytearray()
+
+    def _write(self, data: memoryview) -> None:
+        self._buffer += data
+
+    def _commit(self) -> None:
+        self._store[self._key] = bytes(self._buffer)
+
+    def _abort(self) -> None:
+        self._buffer.clear()
+
+
+class _LocalFileWriter(StorageWriter):
+    """Stream into a temp file beside the destination and rename on commit."""
+
+    def __init__(self, destination: Path) -> None:
+        super().__init__()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        self._destination = destination
+        fd, tmp_name = tempfile.mkstemp(dir=destination.parent, prefix=".tmp-")
+        self._tmp_path = Path(tmp_name)
+        self._handle = os.fdopen(fd, "wb")
+
+    def _write(self, data: memoryview) -> None:
+        self._handle.write(data)
+
+    def _commit(self) -> None:
+        try:
+            self._handle.close()
+            os.replace(self._tmp_path, self._destination)
+        except BaseException:
+            self._tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _abort(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class LocalFilesystemStorage:
+    """Store objects below a directory and hand out signed download URLs.
+
+    URLs point at the ``/storage/local`` route, which verifies the signature and
+    streams the file with ``FileResponse`` so the ASGI server can use
+    ``sendfile`` and honour ``Range`` requests. Without a ``signing_key``
+    objects can still be stored, but no URL is signed or accepted.
+    """
+
+    def __init__(
+        self, root: Path | str, *, base_url: str, signing_key: str | None
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip("/")
+        self._signing_key = signing_key.encode("utf-8") if signing_key else None
+
+    def path_for(self, key: str) -> Path:
+        """Return the on-disk path for ``key``, refusing paths outside the root."""
+
+        root = self.root.resolve()
+        candidate = (root / key.lstrip("/")).resolve()
+        if candidate != root and root not in candidate.parents:
+            raise ValueError(f"Storage key escapes root: {key!r}")
+        return candidate
+
+    def put(self, key: str, data: bytes, *, content_type: str | None = None) -> str:
+        with self.open_writer(key, content_type=content_type) as writer:
+            writer.write(data)
+        return key
+
+    def open_writer(
+        self, key: str, *, content_type: str | None = None
+    ) -> StorageWriter:
+        # Writes land in a sibling temp file that is renamed into place, so
+        # readers never see a partially written object.
+        return _LocalFileWriter(self.path_for(key))
+
+    def put_file(
+        self, key: str, path: Path, *, content_type: str | None = None
+    ) -> str:
+        destination = self.path_for(key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        # copyfile uses sendfile/copy_file_range on Linux, so the payload
+        # never passes through Python buffers.
+        shutil.copyfile(path, destination)
+        return key
+
+    def get(self, key: str) -> bytes:
+        return self.path_for(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self.path_for(key).is_file()
+
+    def _signature(
+        self,
+        key: str,
+        expires: int,
+        download_name: str,
+        content_type: str,
+        disposition: str,
+    ) -> str:
+        if self._signing_key is None:
+            raise RuntimeError("LOCAL_STORAGE_SIGNING_KEY is not configured.")
+        message = "\n".join(
+            [key, str(expires), download_name, content_type, disposition]
+        ).encode("utf-8")
+        return hmac.new(self._signing_key, message, hashlib.sha256).hexdigest()
+
+    def url(
+        self,
+        key: str,
+        *,
+        expires_in: int = 3600,
+        download_name: str | None = None,
+        content_type: str | None = None,
+        disposition: str = "attachment",
+    ) -> str:
+        key = key.lstrip("/")
+        expires = int(time.time()) + int(expires_in)
+        name = download_name or ""
+        media_type = content_type or ""
+        params = {
+            "expires": str(expires),
+            "disposition": disposition,
+            "signature": self._signature(key, expires, name, media_type, disposition),
+        }
+        if name:
+            params["filename"] = name
+        if media_type:
+            params["content_type"] = media_type
+        quoted_key = urllib.parse.quote(key, safe="/")
+        return f"{self.base_url}/{quoted_key}?{urllib.parse.urlencode(params)}"
+
+    def verify(
+        self,
+        key: str,
+        *,
+        expires: int,
+        signature: str,
+        download_name: str | None = None,
+        content_type: str | None = None,
+        disposition: str = "attachment",
+    ) -> bool:
+        """Return ``True`` when ``signature`` is valid and has not expired."""
+
+        if self._signing_key is None or expires < int(time.time()):
+            return False
+        expected = self._signature(
+            key, expires, download_name or "", content_type or "", disposition
+        )
+        return hmac.compare_digest(expected, signature)
+
+
+__all__ = [
+    "StorageWriter",
+    "StorageBackend",
+    "InMemoryStorage",
+    "LocalFilesystemStorage",
+]
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from .base import Base
 
-from .session import SessionLocal, engine as _engine
+from .session import SessionLocal, engine as _engine, get_async_engine
 
 # Safe session manager for FastAPI + SQLAlchemy
 # Prevents premature close() during active transactions
@@ -61,6 +61,7 @@ def session_scope() -> Iterator[Session]:
 
 __all__ = [
     "Base",
+    "get_async_engine",
     "get_engine",
     "get_session",
     "get_session_dependency",
@@ -0,0 +1,28 @@
+"""Create the invoice_archives table for pre-built vendor-month ZIPs."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect
+
+from app.backend.src.db import get_engine
+from app.backend.src.models.invoice_archive import InvoiceArchive
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        if "invoice_archives" not in inspect(connection).get_table_names():
+            InvoiceArchive.__table__.create(connection)
+
+
+def downgrade() -> None:
+    """Revert the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        InvoiceArchive.__table__.drop(connection, checkfirst=True)
+
+
+__all__ = ["upgrade", "downgrade"]
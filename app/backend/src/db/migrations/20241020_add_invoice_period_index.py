@@ -0,0 +1,37 @@
+"""Index invoices by vendor and service period for overview aggregation."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect
+
+from app.backend.src.db import get_engine
+from app.backend.src.models.invoice import Invoice
+
+INDEX_NAME = "ix_invoices_vendor_service_period"
+
+
+def _index():
+    return next(index for index in Invoice.__table__.indexes if index.name == INDEX_NAME)
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        existing = {index["name"] for index in inspect(connection).get_indexes("invoices")}
+        if INDEX_NAME not in existing:
+            _index().create(connection)
+
+
+def downgrade() -> None:
+    """Revert the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        existing = {index["name"] for index in inspect(connection).get_indexes("invoices")}
+        if INDEX_NAME in existing:
+            _index().drop(connection)
+
+
+__all__ = ["upgrade", "downgrade"]
@@ -0,0 +1,34 @@
+"""Add districts.data_version for conditional GETs and versioned caching."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+
+from app.backend.src.db import get_engine
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        columns = {column["name"] for column in inspect(connection).get_columns("districts")}
+        if "data_version" not in columns:
+            connection.execute(
+                text(
+                    "ALTER TABLE districts ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+
+
+def downgrade() -> None:
+    """Revert the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        columns = {column["name"] for column in inspect(connection).get_columns("districts")}
+        if "data_version" in columns:
+            connection.execute(text("ALTER TABLE districts DROP COLUMN data_version"))
+
+
+__all__ = ["upgrade", "downgrade"]
@@ -0,0 +1,38 @@
+"""Create the mv_* analytics aggregates and their freshness table."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+
+from app.backend.src.db import get_engine
+from app.backend.src.models import MaterializedViewRefresh
+from app.backend.src.services.materialized_views import (
+    MATERIALIZED_VIEWS,
+    MaterializedViewManager,
+)
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    MaterializedViewManager(get_engine()).ensure_views()
+
+
+def downgrade() -> None:
+    """Revert the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        tables = set(inspector.get_table_names())
+        is_postgres = connection.dialect.name in {"postgresql", "postgres"}
+        views = set(inspector.get_materialized_view_names()) if is_postgres else set()
+        for spec in MATERIALIZED_VIEWS:
+            if spec.name in views:
+                connection.execute(text(f"DROP MATERIALIZED VIEW {spec.name}"))
+            elif spec.name in tables:
+                connection.execute(text(f"DROP TABLE {spec.name}"))
+        MaterializedViewRefresh.__table__.drop(connection, checkfirst=True)
+
+
+__all__ = ["upgrade", "downgrade"]
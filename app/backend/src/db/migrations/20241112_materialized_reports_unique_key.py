@@ -0,0 +1,70 @@
+"""Deduplicate materialized_reports and make (district_key, cache_key) unique."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+
+from app.backend.src.db import get_engine
+
+CONSTRAINT = "uq_materialized_reports_district_cache_key"
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        if "materialized_reports" not in inspector.get_table_names():
+            return
+
+        columns = {column["name"] for column in inspector.get_columns("materialized_reports")}
+        for column in ("hit_count", "payload_bytes"):
+            if column not in columns:
+                connection.execute(
+                    text(
+                        f"ALTER TABLE materialized_reports "
+                        f"ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                    )
+                )
+        if "payload_bytes" not in columns:
+            # Close enough to the serialized size for the eviction byte budget.
+            connection.execute(
+                text(
+                    "UPDATE materialized_reports "
+                    "SET payload_bytes = COALESCE(LENGTH(CAST(payload AS TEXT)), 0)"
+                )
+            )
+
+        # Keep the newest row of every duplicated key.
+        connection.execute(
+            text(
+                """
+                DELETE FROM materialized_reports
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM materialized_reports
+                    GROUP BY district_key, cache_key
+                )
+                """
+            )
+        )
+
+        indexes = {index["name"] for index in inspector.get_indexes("materialized_reports")}
+        if CONSTRAINT not in indexes:
+            connection.execute(
+                text(
+                    f"CREATE UNIQUE INDEX {CONSTRAINT} "
+                    "ON materialized_reports (district_key, cache_key)"
+                )
+            )
+
+
+def downgrade() -> None:
+    """Revert the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX IF EXISTS {CONSTRAINT}"))
+
+
+__all__ = ["upgrade", "downgrade"]
@@ -0,0 +1,76 @@
+"""Store materialized report payloads codec-encoded in payload_encoded."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+
+from app.backend.src.db import get_engine
+from app.backend.src.models.materialized_report import MaterializedReport
+
+LEGACY_TABLE = "materialized_reports__legacy"
+
+
+def _relax_payload_sqlite(connection) -> None:
+    """SQLite cannot drop NOT NULL in place, so rebuild the table."""
+
+    connection.execute(text(f"ALTER TABLE materialized_reports RENAME TO {LEGACY_TABLE}"))
+    for index in inspect(connection).get_indexes(LEGACY_TABLE):
+        connection.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+    MaterializedReport.__table__.create(connection)
+
+    legacy_columns = {column["name"] for column in inspect(connection).get_columns(LEGACY_TABLE)}
+    columns = ", ".join(
+        column.name for column in MaterializedReport.__table__.columns if column.name in legacy_columns
+    )
+    connection.execute(
+        text(f"INSERT INTO materialized_reports ({columns}) SELECT {columns} FROM {LEGACY_TABLE}")
+    )
+    connection.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        if "materialized_reports" not in inspector.get_table_names():
+            return
+
+        columns = {column["name"]: column for column in inspector.get_columns("materialized_reports")}
+        if "payload_encoded" not in columns:
+            blob = "BYTEA" if connection.dialect.name == "postgresql" else "BLOB"
+            connection.execute(
+                text(f"ALTER TABLE materialized_reports ADD COLUMN payload_encoded {blob}")
+            )
+
+        if columns["payload"]["nullable"]:
+            return
+        if connection.dialect.name == "sqlite":
+            _relax_payload_sqlite(connection)
+        else:
+            connection.execute(
+                text("ALTER TABLE materialized_reports ALTER COLUMN payload DROP NOT NULL")
+            )
+
+
+def downgrade() -> None:
+    """Revert the migration.
+
+    Encoded rows have no JSON copy, so they are dropped and repopulate on the
+    next cache miss.
+    """
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        if "materialized_reports" not in inspector.get_table_names():
+            return
+        columns = {column["name"] for column in inspector.get_columns("materialized_reports")}
+        if "payload_encoded" not in columns:
+            return
+        connection.execute(text("DELETE FROM materialized_reports WHERE payload IS NULL"))
+        connection.execute(text("ALTER TABLE materialized_reports DROP COLUMN payload_encoded"))
+
+
+__all__ = ["upgrade", "downgrade"]
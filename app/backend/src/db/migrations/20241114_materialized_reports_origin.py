@@ -0,0 +1,50 @@
+"""Record whether a user request or a prefetch run computed each report."""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+
+from app.backend.src.db import get_engine
+
+INDEX = "ix_materialized_reports_origin"
+
+
+def upgrade() -> None:
+    """Apply the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        if "materialized_reports" not in inspector.get_table_names():
+            return
+
+        columns = {column["name"] for column in inspector.get_columns("materialized_reports")}
+        if "origin" not in columns:
+            # Existing rows cannot be told apart; count them as user reports.
+            connection.execute(
+                text(
+                    "ALTER TABLE materialized_reports "
+                    "ADD COLUMN origin VARCHAR(16) NOT NULL DEFAULT 'user'"
+                )
+            )
+
+        indexes = {index["name"] for index in inspector.get_indexes("materialized_reports")}
+        if INDEX not in indexes:
+            connection.execute(text(f"CREATE INDEX {INDEX} ON materialized_reports (origin)"))
+
+
+def downgrade() -> None:
+    """Revert the migration."""
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        if "materialized_reports" not in inspector.get_table_names():
+            return
+        connection.execute(text(f"DROP INDEX IF EXISTS {INDEX}"))
+        columns = {column["name"] for column in inspector.get_columns("materialized_reports")}
+        if "origin" in columns:
+            connection.execute(text("ALTER TABLE materialized_reports DROP COLUMN origin"))
+
+
+__all__ = ["upgrade", "downgrade"]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import structlog
 from sqlalchemy import create_engine
@@ -11,6 +12,9 @@ from sqlalchemy.orm import sessionmaker
 
 from app.backend.src.core.config import get_settings
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
 LOGGER = structlog.get_logger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
 
@@ -59,4 +63,45 @@ SessionLocal = sessionmaker(
 
 LOGGER.info("database_engine_initialized", url=str(_database_url))
 
-__all__ = ["engine", "SessionLocal"]
+# asyncio drivers used by the async analytics agent, keyed by backend name.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+_async_engine: "AsyncEngine | None" = None
+_async_engine_failed = False
+
+
+def get_async_engine() -> "AsyncEngine | None":
+    """Return an asyncio engine for the configured database.
+
+    Returns ``None`` when the backend has no asyncio driver installed, in which
+    case callers fall back to the synchronous engine on a worker thread.
+    """
+
+    global _async_engine, _async_engine_failed
+    if _async_engine is not None or _async_engine_failed:
+        return _async_engine
+
+    driver = ASYNC_DRIVERS.get(_database_url.get_backend_name())
+    if driver is None:
+        _async_engine_failed = True
+        LOGGER.info("async_database_engine_unsupported", backend=_database_url.get_backend_name())
+        return None
+
+    try:
+        # Imported lazily: the asyncio extension needs greenlet and a driver.
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            _database_url.set(drivername=driver),
+            pool_pre_ping=True,
+        )
+    except Exception as exc:
+        _async_engine_failed = True
+        LOGGER.warning("async_database_engine_unavailable", driver=driver, error=str(exc))
+        return None
+
+    LOGGER.info("async_database_engine_initialized", driver=driver)
+    return _async_engine
+
+
+__all__ = ["engine", "SessionLocal", "get_async_engine"]
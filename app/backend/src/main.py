@@ -23,6 +23,7 @@ from .api import (
     health,
     invoices,
     jobs,
+    storage,
     vendors,
     uploads,
     users,
@@ -30,10 +31,12 @@ from .api import (
 from .api import analytics_agent
 from .api.admin.analytics import router as admin_analytics_router
 from .core.logging import configure_logging
+from .services.district_cache import install_data_version_hooks
 
 
 def create_app() -> FastAPI:
     configure_logging()
+    install_data_version_hooks()
     app = FastAPI(title="CareSpend Analytics", version="0.1.0")
 
     app.add_middleware(
@@ -50,6 +53,7 @@ def create_app() -> FastAPI:
     app.include_router(uploads.router, prefix="/api")
     app.include_router(invoices.router, prefix="/api")
     app.include_router(jobs.router, prefix="/api")
+    app.include_router(storage.router, prefix="/api")
     app.include_router(analytics.router, prefix="/api")
     app.include_router(analytics_agent.router, prefix="/api")
     app.include_router(agents.router, prefix="/api")
@@ -5,6 +5,7 @@ from .dataset import DatasetProfile
 from .district import District
 from .district_membership import DistrictMembership
 from .invoice import Invoice
+from .invoice_archive import InvoiceArchive
 from .job import Job
 from .line_item import InvoiceLineItem
 from .upload import Upload
@@ -13,12 +14,14 @@ from .vendor import Vendor
 from .student import Student
 from .clinician import Clinician
 from .materialized_report import MaterializedReport
+from .materialized_view_refresh import MaterializedViewRefresh
 
 __all__ = [
     "Approval",
     "DatasetProfile",
     "District",
     "Invoice",
+    "InvoiceArchive",
     "InvoiceLineItem",
     "Job",
     "Upload",
@@ -28,4 +31,5 @@ __all__ = [
     "Student",
     "Clinician",
     "MaterializedReport",
+    "MaterializedViewRefresh",
 ]
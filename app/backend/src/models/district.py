@@ -5,7 +5,7 @@ from __future__ import annotations
 import secrets
 import string
 
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.backend.src.db.base import Base
@@ -30,6 +30,11 @@ class District(Base):
     district_key: Mapped[str] = mapped_column(
         String(32), unique=True, nullable=False, index=True, default=lambda: _generate_district_key()
     )
+    # Bumped whenever the district's invoice data changes; used for ETags and
+    # versioned response caching.
+    data_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     users: Mapped[list["User"]] = relationship("User", back_populates="district")
     memberships: Mapped[list["DistrictMembership"]] = relationship(
@@ -4,7 +4,16 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.backend.src.db.base import Base
@@ -57,4 +66,12 @@ class Invoice(Base):
         self.pdf_s3_key = value
 
 
+Index(
+    "ix_invoices_vendor_service_period",
+    Invoice.vendor_id,
+    Invoice.service_year,
+    Invoice.service_month_num,
+)
+
+
 __all__ = ["Invoice"]
@@ -0,0 +1,37 @@
+"""Pre-built vendor-month invoice archives."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.backend.src.db.base import Base
+
+
+class InvoiceArchive(Base):
+    """Storage location of the district-facing ZIP for a vendor and month."""
+
+    __tablename__ = "invoice_archives"
+    __table_args__ = (
+        UniqueConstraint(
+            "vendor_id",
+            "service_year",
+            "service_month_num",
+            name="uq_invoice_archives_vendor_period",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    vendor_id: Mapped[int] = mapped_column(ForeignKey("vendors.id"), nullable=False, index=True)
+    service_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    service_month_num: Mapped[int] = mapped_column(Integer, nullable=False)
+    s3_key: Mapped[str] = mapped_column(String(512), nullable=False)
+    invoice_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+__all__ = ["InvoiceArchive"]
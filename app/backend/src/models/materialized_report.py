@@ -5,15 +5,34 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Column, DateTime, Integer, String, JSON, Index
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    String,
+    JSON,
+    Index,
+    LargeBinary,
+    UniqueConstraint,
+)
 
+from app.backend.src.core.codec import decode_payload
 from app.backend.src.db.base import Base
 
+# Who computed a report: a user request, or a prefetch run ahead of one.
+ORIGIN_USER = "user"
+ORIGIN_PREFETCH = "prefetch"
+
 
 class MaterializedReport(Base):
     """Persisted analytics reports for reuse across sessions and cache flushes."""
 
     __tablename__ = "materialized_reports"
+    __table_args__ = (
+        UniqueConstraint(
+            "district_key", "cache_key", name="uq_materialized_reports_district_cache_key"
+        ),
+    )
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -27,8 +46,11 @@ class MaterializedReport(Base):
     report_kind: str | None = Column(String(128), nullable=True, index=True)
     primary_entity: str | None = Column(String(255), nullable=True, index=True)
 
-    # Serialized AgentResponse (text, html, rows, etc.)
-    payload: dict[str, Any] = Column(JSON, nullable=False)
+    # Serialized AgentResponse (text, html, rows, etc.). New rows store it
+    # codec-encoded in payload_encoded; payload holds legacy rows and rows
+    # written with CACHE_CODEC=legacy.
+    payload: dict[str, Any] | None = Column(JSON, nullable=True)
+    payload_encoded: bytes | None = Column(LargeBinary, nullable=True)
 
     created_at: datetime = Column(
         DateTime, nullable=False, default=datetime.utcnow
@@ -37,6 +59,22 @@ class MaterializedReport(Base):
         DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Access and size bookkeeping for the LRU/LFU evictor
+    hit_count: int = Column(Integer, nullable=False, default=0, server_default="0")
+    payload_bytes: int = Column(Integer, nullable=False, default=0, server_default="0")
+
+    origin: str = Column(
+        String(16), nullable=False, default=ORIGIN_USER, server_default=ORIGIN_USER, index=True
+    )
+
+    @property
+    def decoded_payload(self) -> dict[str, Any] | None:
+        """The stored AgentResponse, whichever column holds it."""
+
+        if self.payload_encoded is not None:
+            return decode_payload(self.payload_encoded)
+        return self.payload
+
 
 Index(
     "ix_materialized_reports_district_kind_entity",
@@ -45,4 +83,4 @@ Index(
     MaterializedReport.primary_entity,
 )
 
-__all__ = ["MaterializedReport"]
+__all__ = ["MaterializedReport", "ORIGIN_PREFETCH", "ORIGIN_USER"]
@@ -0,0 +1,23 @@
+"""Freshness bookkeeping for the ``mv_*`` analytics aggregates."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.backend.src.db.base import Base
+
+
+class MaterializedViewRefresh(Base):
+    """Last successful refresh of one analytics materialized view."""
+
+    __tablename__ = "mv_refresh_state"
+
+    view_name: str = Column(String(128), primary_key=True)
+    refreshed_at: datetime = Column(DateTime, nullable=False, default=datetime.utcnow)
+    duration_ms: int = Column(Integer, nullable=False, default=0)
+    row_count: int = Column(Integer, nullable=False, default=0)
+
+
+__all__ = ["MaterializedViewRefresh"]
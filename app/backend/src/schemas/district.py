@@ -156,6 +156,18 @@ class DistrictVendorProfile(BaseModel):
     invoices: dict[int, list[DistrictVendorInvoice]]
 
 
+class DistrictVendorStudentPage(BaseModel):
+    """Paginated student detail for one vendor month."""
+
+    vendor_id: int
+    year: int
+    month: int
+    page: int
+    page_size: int
+    total: int
+    students: list[DistrictVendorInvoiceStudent]
+
+
 class DistrictVendorOverview(BaseModel):
     """Collection of vendor profiles for district consumption."""
 
@@ -176,4 +188,5 @@ __all__ = [
     "DistrictVendorMetrics",
     "DistrictVendorOverview",
     "DistrictVendorProfile",
+    "DistrictVendorStudentPage",
 ]
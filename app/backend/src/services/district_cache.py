@@ -0,0 +1,176 @@
+"""Conditional GET and versioned Redis caching for district dashboard reads."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any, Callable
+
+import structlog
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from app.backend.src.core.config import get_settings
+from app.backend.src.core.redis_cache import (
+    RedisAnalyticsCache,
+    publish_district_invalidation,
+)
+from app.backend.src.models import District, Invoice
+
+LOGGER = structlog.get_logger(__name__)
+
+_CACHE: RedisAnalyticsCache | None = None
+
+
+def _get_cache() -> RedisAnalyticsCache | None:
+    global _CACHE
+
+    settings = get_settings()
+    if not settings.redis_enabled:
+        return None
+    if _CACHE is None:
+        _CACHE = RedisAnalyticsCache(
+            key_prefix="district_response",
+            ttl_seconds=settings.district_response_cache_ttl_sec,
+        )
+    return _CACHE
+
+
+def get_district_data_version(session: Session, district_key: str | None) -> int | None:
+    """Return the current data version for ``district_key``."""
+
+    if not district_key:
+        return None
+    return (
+        session.query(District.data_version)
+        .filter(District.district_key == district_key)
+        .scalar()
+    )
+
+
+def _bump_district_data_version(session: Session, *_: object) -> None:
+    """Bump ``District.data_version`` for new invoices and status changes."""
+
+    district_keys: set[str] = set()
+    for instance in session.new:
+        if isinstance(instance, Invoice) and instance.district_key:
+            district_keys.add(instance.district_key)
+    for instance in session.dirty:
+        if not isinstance(instance, Invoice) or not instance.district_key:
+            continue
+        if inspect(instance).attrs.status.history.has_changes():
+            district_keys.add(instance.district_key)
+    for instance in session.deleted:
+        if isinstance(instance, Invoice) and instance.district_key:
+            district_keys.add(instance.district_key)
+
+    if district_keys:
+        session.execute(
+            update(District)
+            .where(District.district_key.in_(sorted(district_keys)))
+            .values(data_version=District.data_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        session.info.setdefault("bumped_district_keys", set()).update(district_keys)
+
+
+def _publish_district_invalidation(session: Session) -> None:
+    """Drop in-process analytics cache entries for districts whose version moved."""
+
+    district_keys = session.info.pop("bumped_district_keys", None)
+    if district_keys:
+        publish_district_invalidation(district_keys)
+
+
+def _forget_district_bumps(session: Session) -> None:
+    session.info.pop("bumped_district_keys", None)
+
+
+_SESSION_HOOKS: tuple[tuple[str, Callable[..., None]], ...] = (
+    ("before_flush", _bump_district_data_version),
+    ("after_commit", _publish_district_invalidation),
+    ("after_rollback", _forget_district_bumps),
+)
+
+
+def install_data_version_hooks() -> None:
+    """Register the session listeners that keep district data versions current.
+
+    Called once by the API and the Celery worker at startup so that importing
+    the models never pulls in Redis. Safe to call repeatedly.
+    """
+
+    for identifier, listener in _SESSION_HOOKS:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore W/ prefixes on both sides.
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target for candidate in header.split(",")
+    )
+
+
+def _serialize(payload: Any) -> bytes:
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json().encode("utf-8")
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+
+
+def versioned_json_response(
+    request: Request,
+    *,
+    kind: str,
+    district_key: str,
+    version: int,
+    params: dict[str, Any],
+    build: Callable[[], Any],
+) -> Response:
+    """Serve ``build()`` with an ETag derived from the district data version.
+
+    A matching ``If-None-Match`` short-circuits to 304 without touching the
+    database beyond the version lookup. Otherwise the serialized body is read
+    from (or written to) Redis under the same version. Payloads embed presigned
+    URLs, so the tag also rolls over once per cache TTL to keep them fresh.
+    """
+
+    ttl = max(get_settings().district_response_cache_ttl_sec, 1)
+    bucket = int(time.time()) // ttl
+    digest = hashlib.sha256(
+        json.dumps(
+            [kind, district_key, version, bucket, params], sort_keys=True, default=str
+        ).encode("utf-8")
+    ).hexdigest()[:32]
+    etag = f'W/"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        LOGGER.debug("district_response_not_modified", kind=kind, district_key=district_key)
+        return Response(status_code=304, headers=headers)
+
+    cache = _get_cache()
+    cache_key = f"{district_key}:{version}:{kind}:{digest}"
+    body = cache.get_raw(cache_key) if cache is not None else None
+    if body is None:
+        body = _serialize(build())
+        if cache is not None:
+            cache.set_raw(cache_key, body)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+__all__ = [
+    "get_district_data_version",
+    "install_data_version_hooks",
+    "versioned_json_response",
+]
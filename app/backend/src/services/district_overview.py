@@ -8,9 +8,10 @@ from datetime import datetime
 from typing import Any
 
 import structlog
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
 
-from app.backend.src.models import District, Invoice, Vendor
+from app.backend.src.models import District, Invoice, InvoiceLineItem, Vendor
 from app.backend.src.schemas.address import PostalAddress, build_postal_address
 from app.backend.src.schemas.district import (
     DistrictVendorInvoice,
@@ -19,6 +20,7 @@ from app.backend.src.schemas.district import (
     DistrictVendorMetrics,
     DistrictVendorOverview,
     DistrictVendorProfile,
+    DistrictVendorStudentPage,
 )
 from app.backend.src.services.s3 import generate_presigned_url
 
@@ -83,10 +85,96 @@ def _is_approved_status(status: str) -> bool:
     return "approved" in normalized or "paid" in normalized
 
 
+def _period_columns() -> tuple[Any, ...]:
+    """Columns that identify an invoice month for aggregation."""
+
+    return (
+        Invoice.vendor_id,
+        Invoice.service_year,
+        Invoice.service_month_num,
+        Invoice.service_month,
+    )
+
+
+def _aggregate_vendor_months(
+    session: Session, vendor_ids: list[int]
+) -> list[Any]:
+    """Return one aggregated row per vendor and service month."""
+
+    trimmed_status = func.nullif(func.trim(Invoice.status), "")
+    return (
+        session.query(
+            *_period_columns(),
+            func.min(Invoice.id).label("first_id"),
+            func.sum(Invoice.total_cost).label("total"),
+            func.max(Invoice.invoice_date).label("latest_invoice_date"),
+            func.min(trimmed_status).label("min_status"),
+            func.max(trimmed_status).label("max_status"),
+        )
+        .filter(Invoice.vendor_id.in_(vendor_ids))
+        .group_by(*_period_columns())
+        .all()
+    )
+
+
+def _latest_invoice_per_month(
+    session: Session, vendor_ids: list[int]
+) -> dict[tuple[Any, ...], Any]:
+    """Return the most recent invoice of each vendor month, keyed by period."""
+
+    ranked = (
+        session.query(
+            *_period_columns(),
+            Invoice.pdf_s3_key,
+            Invoice.invoice_number,
+            Invoice.student_name,
+            func.row_number()
+            .over(
+                partition_by=_period_columns(),
+                order_by=(Invoice.invoice_date.desc(), Invoice.id.asc()),
+            )
+            .label("rank"),
+        )
+        .filter(Invoice.vendor_id.in_(vendor_ids))
+        .subquery()
+    )
+    rows = session.query(ranked).filter(ranked.c.rank == 1).all()
+    return {
+        (row.vendor_id, row.service_year, row.service_month_num, row.service_month): row
+        for row in rows
+    }
+
+
+def _resolve_period(
+    service_month: str | None,
+    service_year: int | None,
+    service_month_num: int | None,
+    fallback_date: datetime | None,
+) -> tuple[int, str, int | None]:
+    """Map stored period columns to the (year, month name, month index) shown."""
+
+    month_name, parsed_year = _extract_service_month(service_month, service_month_num)
+    if month_name:
+        year = service_year or parsed_year or (
+            fallback_date.year if fallback_date else datetime.utcnow().year
+        )
+        return year, month_name, MONTH_INDEX.get(month_name)
+    if fallback_date:
+        month = fallback_date.strftime("%B")
+        return fallback_date.year, month, MONTH_INDEX.get(month)
+    return datetime.utcnow().year, "Unknown", None
+
+
 def fetch_district_vendor_overview(
     session: Session, district_id: int
 ) -> DistrictVendorOverview:
-    """Return vendor data ready for district consumption."""
+    """Return vendor data ready for district consumption.
+
+    Monthly totals are aggregated in SQL (one row per vendor and month), so the
+    cost of a page load tracks the number of vendor months rather than the
+    district's full line-item history. Student detail for a month is served
+    separately by :func:`fetch_vendor_month_students`.
+    """
 
     district = session.get(District, district_id)
     if district is None or not district.district_key:
@@ -98,121 +186,82 @@ def fetch_district_vendor_overview(
     vendors = (
         session.query(Vendor)
         .filter(Vendor.district_key == district.district_key)
-        .options(selectinload(Vendor.invoices).selectinload(Invoice.line_items))
         .order_by(Vendor.company_name.asc())
         .all()
     )
-
-    profiles: list[DistrictVendorProfile] = []
-    for vendor in vendors:
-        invoice_models = sorted(
-            vendor.invoices,
-            key=lambda invoice: (
-                invoice.invoice_date or invoice.created_at or datetime.min
-            ),
-            reverse=True,
-        )
-
-        invoices_by_year: dict[int, list[DistrictVendorInvoice]] = defaultdict(list)
-        monthly_groups: dict[tuple[int, str], dict[str, Any]] = {}
-
-        for invoice in invoice_models:
-            month_name, service_year = _extract_service_month(
-                invoice.service_month, getattr(invoice, "service_month_num", None)
+    vendor_ids = [vendor.id for vendor in vendors]
+
+    monthly_groups: dict[int, dict[tuple[int, str], dict[str, Any]]] = defaultdict(dict)
+    if vendor_ids:
+        latest_rows = _latest_invoice_per_month(session, vendor_ids)
+        for row in _aggregate_vendor_months(session, vendor_ids):
+            period_key = (
+                row.vendor_id,
+                row.service_year,
+                row.service_month_num,
+                row.service_month,
             )
-            invoice_date = invoice.invoice_date
-            if month_name:
-                year = service_year or (invoice_date.year if invoice_date else datetime.utcnow().year)
-                month = month_name
-                month_index = MONTH_INDEX.get(month_name)
-            elif invoice_date:
-                year = invoice_date.year
-                month = invoice_date.strftime("%B")
-                month_index = MONTH_INDEX.get(month)
-            else:
-                year = datetime.utcnow().year
-                month = "Unknown"
-                month_index = None
-
-            invoice_pdf_key = getattr(invoice, "s3_key", None) or getattr(
-                invoice, "pdf_s3_key", None
+            latest = latest_rows.get(period_key)
+            invoice_date = row.latest_invoice_date
+            year, month, month_index = _resolve_period(
+                row.service_month, row.service_year, row.service_month_num, invoice_date
             )
 
-            students: list[DistrictVendorInvoiceStudent] = []
-            for item in invoice.line_items:
-                student_pdf_key = getattr(item, "pdf_s3_key", None) or getattr(
-                    item, "s3_key", None
-                )
-                if not student_pdf_key:
-                    student_pdf_key = invoice_pdf_key
-
-                students.append(
-                    DistrictVendorInvoiceStudent(
-                        id=item.id,
-                        name=item.student,
-                        service=item.service_code,
-                        amount=float(item.cost or 0),
-                        pdf_s3_key=student_pdf_key,
-                    )
-                )
+            status_values = {
+                value for value in (row.min_status, row.max_status) if value
+            }
+            pdf_s3_key = latest.pdf_s3_key if latest is not None else None
+            download_name = (
+                (latest.invoice_number or latest.student_name) if latest is not None else None
+            ) or "invoice"
+            download_name = download_name.strip() or "invoice"
+            if not download_name.lower().endswith(".pdf"):
+                download_name = f"{download_name}.pdf"
 
-            if not invoice.pdf_s3_key:
+            if latest is not None and not pdf_s3_key:
                 LOGGER.warning(
                     "missing_s3_key",
-                    invoice_id=invoice.id,
-                    student=invoice.student_name,
-                    vendor_id=vendor.id,
+                    vendor_id=row.vendor_id,
+                    student=latest.student_name,
                 )
 
-            status_value = (invoice.status or "").strip()
-            processed_on = _format_processed_on(invoice_date)
-            group_key = (year, month)
-            existing = monthly_groups.get(group_key)
-            download_name = invoice.invoice_number or invoice.student_name or "invoice"
-            download_name = download_name.strip() or "invoice"
-            if not download_name.lower().endswith(".pdf"):
-                download_name = f"{download_name}.pdf"
+            # Legacy rows without service_year/service_month_num can land in
+            # the same display month as structured rows; fold them together.
+            groups = monthly_groups[row.vendor_id]
+            existing = groups.get((year, month))
             if existing is None:
-                monthly_groups[group_key] = {
-                    "id": invoice.id,
+                groups[(year, month)] = {
+                    "id": int(row.first_id),
                     "month": month,
                     "month_index": month_index,
                     "year": year,
-                    "total": float(invoice.total_cost or 0),
-                    "processed_on": processed_on,
+                    "total": float(row.total or 0),
                     "latest_invoice_date": invoice_date,
-                    "status_values": {status_value} if status_value else set(),
-                    "students": list(students),
-                    "pdf_s3_key": invoice.pdf_s3_key,
+                    "status_values": status_values,
+                    "pdf_s3_key": pdf_s3_key,
                     "download_name": download_name,
                 }
-            else:
-                existing["total"] = float(existing["total"]) + float(
-                    invoice.total_cost or 0
-                )
-                existing_students = existing["students"]
-                existing_students.extend(students)
-                if month_index is not None and existing["month_index"] is None:
-                    existing["month_index"] = month_index
-                if status_value:
-                    status_values = existing["status_values"]
-                    status_values.add(status_value)
-                if (
-                    invoice_date
-                    and (
-                        existing["latest_invoice_date"] is None
-                        or invoice_date > existing["latest_invoice_date"]
-                    )
-                ):
-                    existing["latest_invoice_date"] = invoice_date
-                    existing["processed_on"] = processed_on
-                    existing["pdf_s3_key"] = invoice.pdf_s3_key
-                    existing["download_name"] = download_name
-                if invoice.id < existing["id"]:
-                    existing["id"] = invoice.id
+                continue
+
+            existing["total"] = float(existing["total"]) + float(row.total or 0)
+            existing["status_values"] |= status_values
+            existing["id"] = min(existing["id"], int(row.first_id))
+            if month_index is not None and existing["month_index"] is None:
+                existing["month_index"] = month_index
+            if invoice_date and (
+                existing["latest_invoice_date"] is None
+                or invoice_date > existing["latest_invoice_date"]
+            ):
+                existing["latest_invoice_date"] = invoice_date
+                existing["pdf_s3_key"] = pdf_s3_key
+                existing["download_name"] = download_name
 
+    profiles: list[DistrictVendorProfile] = []
+    for vendor in vendors:
+        invoices_by_year: dict[int, list[DistrictVendorInvoice]] = defaultdict(list)
         flat_invoices: list[DistrictVendorInvoice] = []
-        for data in monthly_groups.values():
+
+        for data in monthly_groups.get(vendor.id, {}).values():
             status_values = data["status_values"]
             if not status_values:
                 status_label = ""
@@ -225,30 +274,6 @@ def fetch_district_vendor_overview(
                 data.get("pdf_s3_key"), data.get("download_name"), int(data["id"])
             )
 
-            if download_url:
-                for student in data["students"]:
-                    if student.pdf_s3_key is None:
-                        student.pdf_s3_key = data.get("pdf_s3_key")
-                    student.pdf_url = download_url
-                    LOGGER.debug(
-                        "district_student_pdf_key_assigned",
-                        student_name=student.name,
-                        invoice_id=int(data["id"]),
-                        vendor_id=vendor.id,
-                        pdf_s3_key=student.pdf_s3_key,
-                    )
-            else:
-                for student in data["students"]:
-                    if student.pdf_s3_key is None:
-                        student.pdf_s3_key = data.get("pdf_s3_key")
-                    LOGGER.debug(
-                        "district_student_pdf_key_assigned",
-                        student_name=student.name,
-                        invoice_id=int(data["id"]),
-                        vendor_id=vendor.id,
-                        pdf_s3_key=student.pdf_s3_key,
-                    )
-
             entry = DistrictVendorInvoice(
                 id=int(data["id"]),
                 month=data["month"],
@@ -256,12 +281,12 @@ def fetch_district_vendor_overview(
                 year=int(data["year"]),
                 status=status_label,
                 total=float(data["total"]),
-                processed_on=data["processed_on"],
+                processed_on=_format_processed_on(data["latest_invoice_date"]),
                 download_url=download_url,
                 pdf_url=download_url,
                 pdf_s3_key=data.get("pdf_s3_key"),
                 timesheet_csv_url=None,
-                students=data["students"],
+                students=[],
             )
 
             invoices_by_year[entry.year].append(entry)
@@ -338,6 +363,96 @@ def fetch_district_vendor_overview(
     )
 
 
+def fetch_vendor_month_students(
+    session: Session,
+    district_id: int,
+    vendor_id: int,
+    year: int,
+    month: int,
+    *,
+    page: int = 1,
+    page_size: int = 50,
+) -> DistrictVendorStudentPage | None:
+    """Return one page of student service totals for a vendor month.
+
+    Line items are summed per invoice and service code in SQL. Returns ``None``
+    when the vendor does not belong to the district.
+    """
+
+    district = session.get(District, district_id)
+    vendor = session.get(Vendor, vendor_id)
+    if (
+        district is None
+        or vendor is None
+        or not district.district_key
+        or vendor.district_key != district.district_key
+    ):
+        return None
+
+    month_name = MONTH_ORDER[month - 1]
+    period_filter = or_(
+        and_(Invoice.service_year == year, Invoice.service_month_num == month),
+        and_(
+            Invoice.service_month_num.is_(None),
+            Invoice.service_month.ilike(f"%{month_name}%"),
+            Invoice.service_month.like(f"%{year}%"),
+        ),
+    )
+    grouped = (
+        session.query(
+            func.min(InvoiceLineItem.id).label("id"),
+            InvoiceLineItem.student.label("student"),
+            InvoiceLineItem.service_code.label("service_code"),
+            func.sum(InvoiceLineItem.cost).label("amount"),
+            Invoice.id.label("invoice_id"),
+            Invoice.pdf_s3_key.label("pdf_s3_key"),
+            Invoice.invoice_number.label("invoice_number"),
+        )
+        .join(Invoice, Invoice.id == InvoiceLineItem.invoice_id)
+        .filter(Invoice.vendor_id == vendor_id)
+        .filter(period_filter)
+        .group_by(
+            Invoice.id,
+            Invoice.pdf_s3_key,
+            Invoice.invoice_number,
+            InvoiceLineItem.student,
+            InvoiceLineItem.service_code,
+        )
+    )
+
+    total = grouped.order_by(None).count()
+    rows = (
+        grouped.order_by(InvoiceLineItem.student.asc(), InvoiceLineItem.service_code.asc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+
+    students = [
+        DistrictVendorInvoiceStudent(
+            id=int(row.id),
+            name=row.student,
+            service=row.service_code,
+            amount=float(row.amount or 0),
+            pdf_s3_key=row.pdf_s3_key,
+            pdf_url=_build_presigned_url(
+                row.pdf_s3_key, f"{row.invoice_number or 'invoice'}.pdf", int(row.invoice_id)
+            ),
+        )
+        for row in rows
+    ]
+
+    return DistrictVendorStudentPage(
+        vendor_id=vendor_id,
+        year=year,
+        month=month,
+        page=page,
+        page_size=page_size,
+        total=total,
+        students=students,
+    )
+
+
 def _build_vendor_address(vendor: Vendor) -> PostalAddress | None:
     """Return the vendor remit-to address as a structured object."""
 
@@ -375,4 +490,4 @@ def _build_presigned_url(
         return None
 
 
-__all__ = ["fetch_district_vendor_overview"]
+__all__ = ["fetch_district_vendor_overview", "fetch_vendor_month_students"]
@@ -0,0 +1,234 @@
+"""Versioned per-district catalog of the entities analytics questions mention.
+
+Building the catalog scans invoices and their line items, but the result only
+changes when ingestion introduces a new student, clinician or vendor name.
+Catalogs are therefore cached per district under a version stamp that
+:class:`~app.backend.src.agents.invoice_agent.InvoiceAgent` bumps when it
+ingests unseen names. A read costs one Redis ``GET`` of the stamp (plus the
+catalog itself when this process has not seen that version yet).
+
+In-process copies also expire after ``local_ttl_seconds``, so a bump that
+never reached Redis (or a process running without it) is picked up within
+that window.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterable
+
+import structlog
+
+from app.backend.src.core.config import get_settings
+from app.backend.src.core.redis_cache import RedisAnalyticsCache
+
+LOGGER = structlog.get_logger(__name__)
+
+EntityMap = dict[str, list[str]]
+
+CATALOG_KINDS = ("students", "vendors", "clinicians")
+
+
+def _has_entities(catalog: EntityMap) -> bool:
+    return any(catalog.get(kind) for kind in CATALOG_KINDS)
+
+
+class DistrictEntityCatalog:
+    """Cache of district entity catalogs keyed by a per-district version stamp."""
+
+    def __init__(
+        self,
+        *,
+        redis_cache: RedisAnalyticsCache | None = None,
+        local_ttl_seconds: int = 300,
+    ) -> None:
+        self.redis_cache = redis_cache
+        self.local_ttl_seconds = local_ttl_seconds
+        self._local: dict[str, tuple[int, float, EntityMap]] = {}
+        self._lock = threading.Lock()
+
+    def _version_key(self, district_key: str) -> str:
+        prefix = self.redis_cache.key_prefix if self.redis_cache else "entity_catalog"
+        return f"{prefix}:version:{district_key}"
+
+    # ------------------------------------------------------------------
+    # Version stamps
+    # ------------------------------------------------------------------
+    def version(self, district_key: str) -> int:
+        if self.redis_cache is None:
+            return 0
+        key = self._version_key(district_key)
+        try:
+            return int(self.redis_cache.client.get(key) or 0)
+        except Exception as exc:
+            LOGGER.warning("entity_catalog_version_read_failed", key=key, error=str(exc))
+            return -1
+
+    async def aversion(self, district_key: str) -> int:
+        if self.redis_cache is None:
+            return 0
+        key = self._version_key(district_key)
+        try:
+            return int(await self.redis_cache.async_client.get(key) or 0)
+        except Exception as exc:
+            LOGGER.warning("entity_catalog_version_read_failed", key=key, error=str(exc))
+            return -1
+
+    def bump(self, district_key: str) -> None:
+        """Invalidate ``district_key``'s catalog everywhere."""
+
+        with self._lock:
+            self._local.pop(district_key, None)
+        if self.redis_cache is None:
+            return
+        key = self._version_key(district_key)
+        try:
+            self.redis_cache.client.incr(key)
+        except Exception as exc:
+            LOGGER.warning("entity_catalog_bump_failed", key=key, error=str(exc))
+        else:
+            LOGGER.info("entity_catalog_bumped", district_key=district_key)
+
+    # ------------------------------------------------------------------
+    # Cached catalog lookups
+    # ------------------------------------------------------------------
+    def _local_get(self, district_key: str, version: int) -> EntityMap | None:
+        with self._lock:
+            entry = self._local.get(district_key)
+        if entry is None:
+            return None
+        cached_version, expires_at, catalog = entry
+        if cached_version != version:
+            return None
+        if expires_at <= time.monotonic():
+            return None
+        return catalog
+
+    def _local_put(self, district_key: str, version: int, catalog: EntityMap) -> None:
+        with self._lock:
+            self._local[district_key] = (
+                version,
+                time.monotonic() + self.local_ttl_seconds,
+                catalog,
+            )
+
+    @staticmethod
+    def _shared_entry(payload: Any, version: int) -> EntityMap | None:
+        if isinstance(payload, dict) and payload.get("version") == version:
+            entities = payload.get("entities")
+            if isinstance(entities, dict):
+                return entities
+        return None
+
+    def get(self, district_key: str | None, loader: Callable[[], EntityMap]) -> EntityMap:
+        """Return the catalog for ``district_key``, building it with ``loader`` on a miss."""
+
+        if not district_key:
+            return loader()
+        version = self.version(district_key)
+        if version < 0:
+            return loader()
+        catalog = self._local_get(district_key, version)
+        if catalog is not None:
+            return catalog
+        if self.redis_cache is not None:
+            catalog = self._shared_entry(self.redis_cache.get(district_key), version)
+            if catalog is not None:
+                self._local_put(district_key, version, catalog)
+                return catalog
+
+        catalog = loader()
+        if _has_entities(catalog):
+            self._local_put(district_key, version, catalog)
+            if self.redis_cache is not None:
+                self.redis_cache.set(district_key, {"version": version, "entities": catalog})
+        return catalog
+
+    async def aget(
+        self, district_key: str | None, loader: Callable[[], Awaitable[EntityMap]]
+    ) -> EntityMap:
+        """Async variant of :meth:`get` for use on the event loop."""
+
+        if not district_key:
+            return await loader()
+        version = await self.aversion(district_key)
+        if version < 0:
+            return await loader()
+        catalog = self._local_get(district_key, version)
+        if catalog is not None:
+            return catalog
+        if self.redis_cache is not None:
+            catalog = self._shared_entry(await self.redis_cache.aget(district_key), version)
+            if catalog is not None:
+                self._local_put(district_key, version, catalog)
+                return catalog
+
+        catalog = await loader()
+        if _has_entities(catalog):
+            self._local_put(district_key, version, catalog)
+            if self.redis_cache is not None:
+                await self.redis_cache.aset(
+                    district_key, {"version": version, "entities": catalog}
+                )
+        return catalog
+
+    # ------------------------------------------------------------------
+    # Ingestion hook
+    # ------------------------------------------------------------------
+    def note_entities(
+        self,
+        district_key: str | None,
+        *,
+        students: Iterable[str] = (),
+        clinicians: Iterable[str] = (),
+        vendors: Iterable[str] = (),
+    ) -> bool:
+        """Bump the stamp when ingested names are missing from the cached catalog.
+
+        Returns ``True`` when the catalog was invalidated. When no catalog is
+        found (the shared copy expired, say) any name counts as new, since
+        other processes may still hold a copy without it.
+        """
+
+        if not district_key:
+            return False
+        version = self.version(district_key)
+        catalog = self._local_get(district_key, version) if version >= 0 else None
+        if catalog is None and self.redis_cache is not None and version >= 0:
+            catalog = self._shared_entry(self.redis_cache.get(district_key), version)
+
+        incoming = {"students": students, "clinicians": clinicians, "vendors": vendors}
+        for kind, names in incoming.items():
+            # With Redis unreachable (version < 0) nothing is known either.
+            known = set(catalog.get(kind) or []) if catalog is not None else set()
+            if any(name and name not in known for name in names):
+                self.bump(district_key)
+                return True
+        return False
+
+
+_CATALOG: DistrictEntityCatalog | None = None
+
+
+def get_entity_catalog() -> DistrictEntityCatalog:
+    """Return the process-wide catalog, backed by Redis when it is enabled."""
+
+    global _CATALOG
+
+    if _CATALOG is None:
+        settings = get_settings()
+        redis_cache = None
+        if settings.redis_enabled:
+            redis_cache = RedisAnalyticsCache(
+                key_prefix="entity_catalog",
+                ttl_seconds=settings.entity_catalog_ttl_sec,
+            )
+        _CATALOG = DistrictEntityCatalog(
+            redis_cache=redis_cache,
+            local_ttl_seconds=settings.entity_catalog_local_ttl_sec,
+        )
+    return _CATALOG
+
+
+__all__ = ["DistrictEntityCatalog", "get_entity_catalog"]
@@ -0,0 +1,175 @@
+"""Build and look up district-facing vendor-month invoice archives."""
+
+from __future__ import annotations
+
+import csv
+import re
+from datetime import datetime
+from io import StringIO
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import structlog
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.backend.src.core.storage import StorageBackend
+from app.backend.src.models import Invoice, InvoiceArchive, Vendor
+from app.backend.src.services.s3 import (
+    build_invoice_storage_components,
+    get_storage_backend,
+    sanitize_object_key,
+)
+
+LOGGER = structlog.get_logger(__name__)
+
+SUMMARY_COLUMNS = ["student_name", "invoice_id", "total_cost", "status", "pdf_s3_key"]
+
+
+def archive_key_for(company_name: str | None, year: int, month: int) -> str:
+    """Return the storage key of the vendor-month archive."""
+
+    prefix, company, year_segment, month_segment = build_invoice_storage_components(
+        company_name, datetime(year, month, 1)
+    )
+    return sanitize_object_key(
+        f"{prefix}{company}_{year_segment}_{month_segment}_invoices_dynamic.zip"
+    )
+
+
+def _archive_name(invoice: Invoice, year: int, month: int) -> str:
+    student_slug = re.sub(
+        r"[^A-Za-z0-9._-]+",
+        "_",
+        (invoice.student_name or "").strip() or "invoice",
+    )
+    return f"{student_slug}_{year:04d}_{month:02d}.pdf"
+
+
+def write_invoice_archive(
+    storage: StorageBackend,
+    zip_key: str,
+    invoices: list[Invoice],
+    year: int,
+    month: int,
+) -> int:
+    """Stream the archive and its ``invoice_summary.csv`` into storage.
+
+    Returns the number of invoice PDFs written.
+    """
+
+    summary = StringIO()
+    writer = csv.writer(summary)
+    writer.writerow(SUMMARY_COLUMNS)
+    written = 0
+
+    with storage.open_writer(zip_key, content_type="application/zip") as stream:
+        with ZipFile(stream, "w", ZIP_DEFLATED) as zf:
+            for invoice in invoices:
+                pdf_key = sanitize_object_key(str(invoice.pdf_s3_key or "").strip())
+                if not pdf_key:
+                    continue
+                zf.writestr(_archive_name(invoice, year, month), storage.get(pdf_key))
+                writer.writerow(
+                    [
+                        (invoice.student_name or "").strip(),
+                        str(invoice.id),
+                        float(invoice.total_cost or 0),
+                        (invoice.status or "").strip(),
+                        pdf_key,
+                    ]
+                )
+                written += 1
+            zf.writestr("invoice_summary.csv", summary.getvalue())
+    return written
+
+
+def get_vendor_month_archive(
+    session: Session, vendor_id: int, year: int, month: int
+) -> InvoiceArchive | None:
+    """Return the recorded archive for a vendor and month, if one was built."""
+
+    return (
+        session.query(InvoiceArchive)
+        .filter(InvoiceArchive.vendor_id == vendor_id)
+        .filter(InvoiceArchive.service_year == year)
+        .filter(InvoiceArchive.service_month_num == month)
+        .one_or_none()
+    )
+
+
+def build_vendor_month_archive(
+    session: Session, vendor_id: int, year: int, month: int
+) -> InvoiceArchive | None:
+    """(Re)build the vendor-month archive and record its key.
+
+    Returns ``None`` when the vendor has no invoice PDFs for the month.
+    """
+
+    invoices = [
+        invoice
+        for invoice in (
+            session.query(Invoice)
+            .filter(Invoice.vendor_id == vendor_id)
+            .filter(Invoice.service_year == year)
+            .filter(Invoice.service_month_num == month)
+            .order_by(Invoice.student_name.asc())
+            .all()
+        )
+        if invoice.pdf_s3_key
+    ]
+    if not invoices:
+        LOGGER.info(
+            "invoice_archive_no_objects", vendor_id=vendor_id, year=year, month=month
+        )
+        return None
+
+    vendor = session.get(Vendor, vendor_id)
+    company_name = vendor.company_name if vendor and vendor.company_name else None
+    zip_key = archive_key_for(company_name or f"vendor-{vendor_id}", year, month)
+
+    count = write_invoice_archive(get_storage_backend(), zip_key, invoices, year, month)
+
+    archive = get_vendor_month_archive(session, vendor_id, year, month)
+    if archive is None:
+        archive = InvoiceArchive(
+            vendor_id=vendor_id, service_year=year, service_month_num=month
+        )
+        try:
+            with session.begin_nested():
+                session.add(archive)
+                archive.s3_key = zip_key
+                session.flush()
+        except IntegrityError:
+            # The on-demand build and the post-ingest task can race for the
+            # same month; both wrote the same key, so update the winner's row.
+            LOGGER.info(
+                "invoice_archive_concurrent_build",
+                vendor_id=vendor_id,
+                year=year,
+                month=month,
+            )
+            archive = get_vendor_month_archive(session, vendor_id, year, month)
+            if archive is None:
+                raise
+    archive.s3_key = zip_key
+    archive.invoice_count = count
+    archive.built_at = datetime.utcnow()
+    session.flush()
+
+    LOGGER.info(
+        "invoice_archive_built",
+        vendor_id=vendor_id,
+        year=year,
+        month=month,
+        key=zip_key,
+        invoice_count=count,
+    )
+    return archive
+
+
+__all__ = [
+    "archive_key_for",
+    "build_vendor_month_archive",
+    "get_vendor_month_archive",
+    "write_invoice_archive",
+]
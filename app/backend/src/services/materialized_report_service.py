@@ -1,18 +1,38 @@
-"""Helpers for persisting materialized analytics reports."""
+"""Helpers for persisting materialized analytics reports.
+
+Reports are unique per ``(district_key, cache_key)`` and written with an
+upsert, so concurrent misses for the same question converge on one row.
+Reads never write: each hit is buffered in-process by
+:class:`ReportAccessTracker` and folded into ``last_accessed_at`` /
+``hit_count`` with one batched UPDATE. :func:`evict_materialized_reports`
+uses those columns to hold every district to its row and byte budget.
+"""
 
 from __future__ import annotations
-from datetime import datetime
 
-from typing import Any
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterable
 
 import structlog
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, delete, func, or_, select
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
-from app.backend.src.models.materialized_report import MaterializedReport
+from app.backend.src.core.codec import decode_payload, get_codec
+from app.backend.src.core.config import get_settings
+from app.backend.src.models.materialized_report import ORIGIN_USER, MaterializedReport
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 LOGGER = structlog.get_logger(__name__)
 
+EVICTION_POLICIES = ("lru", "lfu")
+_ACCESS_FLUSH_BATCH = 500
+_DELETE_BATCH = 500
+
 
 def _extract_report_kind(
     normalized_intent: dict[str, Any] | None, router_decision: dict[str, Any] | None
@@ -42,6 +62,186 @@ def _extract_primary_entity(router_decision: dict[str, Any] | None) -> str | Non
     return None
 
 
+def _report_values(
+    district_key: str,
+    cache_key: str,
+    normalized_intent: dict[str, Any] | None,
+    router_decision: dict[str, Any] | None,
+    agent_response: dict[str, Any],
+    origin: str,
+) -> dict[str, Any]:
+    now = datetime.utcnow()
+    codec = get_codec()
+    encoded = codec.encode(agent_response)
+    legacy = codec.serializer == "legacy"
+    return {
+        "district_key": district_key,
+        "cache_key": cache_key,
+        "report_kind": _extract_report_kind(normalized_intent, router_decision),
+        "primary_entity": _extract_primary_entity(router_decision),
+        "payload": agent_response if legacy else None,
+        "payload_encoded": None if legacy else encoded,
+        "payload_bytes": len(encoded),
+        "origin": origin,
+        "created_at": now,
+        "last_accessed_at": now,
+    }
+
+
+def _upsert_statement(dialect: str, values: dict[str, Any]):
+    """Return an INSERT .. ON CONFLICT (district_key, cache_key) DO UPDATE.
+
+    ``hit_count`` and ``created_at`` survive a rewrite so a recomputed report
+    keeps its access history. Returns None for dialects without ON CONFLICT.
+    """
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+
+    stmt = insert(MaterializedReport).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=[MaterializedReport.district_key, MaterializedReport.cache_key],
+        set_={
+            "report_kind": stmt.excluded.report_kind,
+            "primary_entity": stmt.excluded.primary_entity,
+            "payload": stmt.excluded.payload,
+            "payload_encoded": stmt.excluded.payload_encoded,
+            "payload_bytes": stmt.excluded.payload_bytes,
+            "origin": stmt.excluded.origin,
+            "last_accessed_at": stmt.excluded.last_accessed_at,
+        },
+    )
+
+
+def _replace_report(connection: Connection, values: dict[str, Any]) -> None:
+    """Portable fallback for :func:`_upsert_statement`."""
+
+    connection.execute(
+        delete(MaterializedReport).where(
+            MaterializedReport.district_key == values["district_key"],
+            MaterializedReport.cache_key == values["cache_key"],
+        )
+    )
+    connection.execute(MaterializedReport.__table__.insert().values(**values))
+
+
+def _row_payload(row: Any) -> dict[str, Any] | None:
+    if row is None:
+        return None
+    payload, encoded = row
+    return decode_payload(encoded) if encoded is not None else payload
+
+
+class ReportAccessTracker:
+    """Buffer report hits in-process and write them back in batches.
+
+    Each ``(district_key, cache_key)`` keeps its latest access time and hit
+    count until :meth:`drain` hands them to a single executemany UPDATE, so a
+    hot report costs one write per flush interval instead of one per read.
+    """
+
+    def __init__(self, flush_interval_sec: float, max_pending: int = _ACCESS_FLUSH_BATCH) -> None:
+        self.flush_interval_sec = flush_interval_sec
+        self.max_pending = max_pending
+        self._pending: dict[tuple[str, str], tuple[datetime, int]] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, district_key: str, cache_key: str) -> None:
+        key = (district_key, cache_key)
+        with self._lock:
+            _, hits = self._pending.get(key, (None, 0))
+            self._pending[key] = (datetime.utcnow(), hits + 1)
+
+    def due(self) -> bool:
+        with self._lock:
+            if not self._pending:
+                return False
+            return (
+                len(self._pending) >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval_sec
+            )
+
+    def drain(self) -> list[dict[str, Any]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        return [
+            {
+                "b_district_key": district_key,
+                "b_cache_key": cache_key,
+                "b_accessed_at": ts,
+                "b_hits": hits,
+            }
+            for (district_key, cache_key), (ts, hits) in pending.items()
+        ]
+
+    def restore(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Put back rows whose flush failed so their hits are not lost."""
+
+        with self._lock:
+            for row in rows:
+                key = (row["b_district_key"], row["b_cache_key"])
+                ts, hits = self._pending.get(key, (row["b_accessed_at"], 0))
+                self._pending[key] = (max(ts, row["b_accessed_at"]), hits + row["b_hits"])
+
+
+_ACCESS_TRACKER = ReportAccessTracker(get_settings().materialized_report_access_flush_sec)
+
+_table = MaterializedReport.__table__
+_ACCESS_UPDATE = (
+    _table.update()
+    .where(
+        _table.c.district_key == bindparam("b_district_key"),
+        _table.c.cache_key == bindparam("b_cache_key"),
+    )
+    .values(
+        last_accessed_at=bindparam("b_accessed_at"),
+        hit_count=_table.c.hit_count + bindparam("b_hits"),
+    )
+)
+
+
+def flush_report_access(engine: Engine, tracker: ReportAccessTracker | None = None) -> int:
+    """Write buffered report accesses; returns the number of reports touched."""
+
+    tracker = tracker or _ACCESS_TRACKER
+    rows = tracker.drain()
+    if not rows:
+        return 0
+    try:
+        with engine.begin() as connection:
+            connection.execute(_ACCESS_UPDATE, rows)
+    except Exception as exc:  # pragma: no cover - defensive
+        tracker.restore(rows)
+        LOGGER.warning("materialized_report_access_flush_failed", pending=len(rows), error=str(exc))
+        return 0
+    return len(rows)
+
+
+async def aflush_report_access(
+    engine: "AsyncEngine", tracker: ReportAccessTracker | None = None
+) -> int:
+    """Async variant of :func:`flush_report_access`."""
+
+    tracker = tracker or _ACCESS_TRACKER
+    rows = tracker.drain()
+    if not rows:
+        return 0
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(_ACCESS_UPDATE, rows)
+    except Exception as exc:  # pragma: no cover - defensive
+        tracker.restore(rows)
+        LOGGER.warning("materialized_report_access_flush_failed", pending=len(rows), error=str(exc))
+        return 0
+    return len(rows)
+
+
 def persist_materialized_report(
     *,
     engine: Engine,
@@ -50,23 +250,24 @@ def persist_materialized_report(
     normalized_intent: dict[str, Any] | None,
     router_decision: dict[str, Any] | None,
     agent_response: dict[str, Any],
+    origin: str = ORIGIN_USER,
 ) -> None:
     """Persist a cached analytics report to Postgres.
 
+    ``origin`` records whether a user request or a prefetch run computed it.
     This is a best-effort operation; failures are logged but do not affect the response.
     """
 
+    values = _report_values(
+        district_key, cache_key, normalized_intent, router_decision, agent_response, origin
+    )
     try:
-        with Session(engine) as session:
-            report = MaterializedReport(
-                district_key=district_key,
-                cache_key=cache_key,
-                report_kind=_extract_report_kind(normalized_intent, router_decision),
-                primary_entity=_extract_primary_entity(router_decision),
-                payload=agent_response,
-            )
-            session.add(report)
-            session.commit()
+        with engine.begin() as connection:
+            stmt = _upsert_statement(engine.dialect.name, values)
+            if stmt is None:
+                _replace_report(connection, values)
+            else:
+                connection.execute(stmt)
     except Exception as exc:  # pragma: no cover - defensive
         LOGGER.warning(
             "persist_materialized_report_failed",
@@ -89,19 +290,92 @@ def fetch_materialized_report(
     """
     try:
         with Session(engine) as session:
-            report = session.query(MaterializedReport).filter(
-                MaterializedReport.cache_key == cache_key,
-                MaterializedReport.district_key == district_key,
+            row = session.execute(
+                select(MaterializedReport.payload, MaterializedReport.payload_encoded).where(
+                    MaterializedReport.cache_key == cache_key,
+                    MaterializedReport.district_key == district_key,
+                )
             ).one_or_none()
 
-            if report is None:
-                return None
+        payload = _row_payload(row)
+        if payload is None:
+            return None
+
+        _ACCESS_TRACKER.record(district_key, cache_key)
+        if _ACCESS_TRACKER.due():
+            flush_report_access(engine)
+        return payload
+
+    except Exception as exc:  # pragma: no cover
+        LOGGER.warning(
+            "fetch_materialized_report_failed",
+            cache_key=cache_key,
+            district_key=district_key,
+            error=str(exc),
+        )
+        return None
+
+
+async def apersist_materialized_report(
+    *,
+    engine: "AsyncEngine",
+    district_key: str,
+    cache_key: str,
+    normalized_intent: dict[str, Any] | None,
+    router_decision: dict[str, Any] | None,
+    agent_response: dict[str, Any],
+    origin: str = ORIGIN_USER,
+) -> None:
+    """Async variant of :func:`persist_materialized_report`."""
 
-            # Update last_accessed_at
-            report.last_accessed_at = datetime.utcnow()
-            session.commit()
+    values = _report_values(
+        district_key, cache_key, normalized_intent, router_decision, agent_response, origin
+    )
+    try:
+        async with engine.begin() as connection:
+            stmt = _upsert_statement(engine.dialect.name, values)
+            if stmt is None:
+                await connection.run_sync(_replace_report, values)
+            else:
+                await connection.execute(stmt)
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning(
+            "persist_materialized_report_failed",
+            district_key=district_key,
+            cache_key=cache_key,
+            error=str(exc),
+        )
 
-            return report.payload
+
+async def afetch_materialized_report(
+    *,
+    engine: "AsyncEngine",
+    cache_key: str,
+    district_key: str,
+) -> dict[str, Any] | None:
+    """Async variant of :func:`fetch_materialized_report`."""
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    try:
+        async with AsyncSession(engine) as session:
+            row = (
+                await session.execute(
+                    select(MaterializedReport.payload, MaterializedReport.payload_encoded).where(
+                        MaterializedReport.cache_key == cache_key,
+                        MaterializedReport.district_key == district_key,
+                    )
+                )
+            ).one_or_none()
+
+        payload = _row_payload(row)
+        if payload is None:
+            return None
+
+        _ACCESS_TRACKER.record(district_key, cache_key)
+        if _ACCESS_TRACKER.due():
+            await aflush_report_access(engine)
+        return payload
 
     except Exception as exc:  # pragma: no cover
         LOGGER.warning(
@@ -111,3 +385,103 @@ def fetch_materialized_report(
             error=str(exc),
         )
         return None
+
+
+def _eviction_order(policy: str):
+    """Most valuable first: recency for LRU, then hit count ahead of it for LFU."""
+
+    recency = (MaterializedReport.last_accessed_at.desc(), MaterializedReport.id.desc())
+    if policy == "lfu":
+        return (MaterializedReport.hit_count.desc(), *recency)
+    return recency
+
+
+def evict_materialized_reports(
+    engine: Engine,
+    *,
+    max_rows_per_district: int | None = None,
+    max_bytes_per_district: int | None = None,
+    policy: str | None = None,
+) -> dict[str, int]:
+    """Trim every district's reports to its row and byte budgets.
+
+    Reports are ranked by ``policy`` (``"lru"`` or ``"lfu"``) and kept in
+    order until either budget would be exceeded; everything ranked below
+    that point is deleted. A budget of 0 is treated as unlimited.
+
+    Returns:
+        Evicted row counts keyed by district, for districts that lost rows.
+    """
+
+    settings = get_settings()
+    max_rows = (
+        settings.materialized_report_max_rows_per_district
+        if max_rows_per_district is None
+        else max_rows_per_district
+    )
+    max_bytes = (
+        settings.materialized_report_max_bytes_per_district
+        if max_bytes_per_district is None
+        else max_bytes_per_district
+    )
+    policy = (policy or settings.materialized_report_eviction_policy).lower()
+    if policy not in EVICTION_POLICIES:
+        raise ValueError(f"Unknown eviction policy {policy!r}; expected one of {EVICTION_POLICIES}")
+    if max_rows <= 0 and max_bytes <= 0:
+        return {}
+
+    # Rank on current access stats rather than the last flushed ones.
+    flush_report_access(engine)
+
+    over_budget = []
+    if max_rows > 0:
+        over_budget.append(func.count(MaterializedReport.id) > max_rows)
+    if max_bytes > 0:
+        over_budget.append(func.coalesce(func.sum(MaterializedReport.payload_bytes), 0) > max_bytes)
+
+    evicted: dict[str, int] = {}
+    with engine.begin() as connection:
+        districts = connection.execute(
+            select(MaterializedReport.district_key)
+            .group_by(MaterializedReport.district_key)
+            .having(or_(*over_budget))
+        ).scalars().all()
+
+        for district_key in districts:
+            ranked = connection.execute(
+                select(MaterializedReport.id, MaterializedReport.payload_bytes)
+                .where(MaterializedReport.district_key == district_key)
+                .order_by(*_eviction_order(policy))
+            ).all()
+
+            kept_rows = kept_bytes = 0
+            victims: list[int] = []
+            for report_id, payload_bytes in ranked:
+                size = payload_bytes or 0
+                fits = (max_rows <= 0 or kept_rows + 1 <= max_rows) and (
+                    max_bytes <= 0 or kept_bytes + size <= max_bytes
+                )
+                if victims or not fits:
+                    victims.append(report_id)
+                    continue
+                kept_rows += 1
+                kept_bytes += size
+
+            for start in range(0, len(victims), _DELETE_BATCH):
+                connection.execute(
+                    delete(MaterializedReport).where(
+                        MaterializedReport.id.in_(victims[start : start + _DELETE_BATCH])
+                    )
+                )
+            if victims:
+                evicted[district_key] = len(victims)
+
+    if evicted:
+        LOGGER.info(
+            "materialized_reports_evicted",
+            policy=policy,
+            evicted=evicted,
+            max_rows_per_district=max_rows,
+            max_bytes_per_district=max_bytes,
+        )
+    return evicted
@@ -0,0 +1,590 @@
+"""Lifecycle management for the ``mv_*`` analytics aggregates.
+
+The router maps query modes to these views through ``mode_to_mv_map`` in
+``domain_config.json``. Each view is defined once below as a dialect-neutral
+SELECT, and :class:`MaterializedViewManager` uses those definitions to:
+
+* create any missing views idempotently for the active dialect: real
+  materialized views on Postgres, plain tables on SQLite;
+* refresh them after ingestion, with ``REFRESH MATERIALIZED VIEW
+  CONCURRENTLY`` on Postgres and an atomic build-and-swap on SQLite, so
+  readers never see a half-built aggregate;
+* record per-view freshness in ``mv_refresh_state``.
+
+The purely additive monthly aggregates (student, provider and service code)
+are ``incremental``. They are plain tables on every dialect, and
+:func:`apply_summary_deltas` upserts each ingested batch's per-group sums
+into them inside the ingestion transaction, at O(batch) cost.
+:meth:`MaterializedViewManager.reconcile` checks them against the base tables
+and rebuilds any that have drifted.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+import structlog
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.backend.src.models import MaterializedViewRefresh
+
+LOGGER = structlog.get_logger(__name__)
+
+# Dialect-specific expressions substituted into the view templates.
+_EXPRESSIONS: dict[str, dict[str, str]] = {
+    "sqlite": {
+        "year": "CAST(strftime('%Y', ili.service_date) AS INT)",
+        "month_num": "CAST(strftime('%m', ili.service_date) AS INT)",
+        "month": "strftime('%Y-%m', ili.service_date)",
+        "day": "DATE(ili.service_date)",
+        "hours_numeric": "1.0 * SUM(ili.hours)",
+    },
+    "postgresql": {
+        "year": "EXTRACT(YEAR FROM ili.service_date)::int",
+        "month_num": "EXTRACT(MONTH FROM ili.service_date)::int",
+        "month": "to_char(ili.service_date, 'YYYY-MM')",
+        "day": "ili.service_date::date",
+        "hours_numeric": "SUM(ili.hours)::numeric",
+    },
+}
+
+_LINE_ITEMS = "FROM invoice_line_items ili\nJOIN invoices i ON i.id = ili.invoice_id"
+_MONTH_COLUMNS = (
+    "{year} AS service_year, {month_num} AS service_month_num, {month} AS service_month"
+)
+_MONTH_GROUP = "{year}, {month_num}, {month}"
+_TOTALS = "SUM(ili.hours) AS total_hours, SUM(ili.cost) AS total_cost"
+_MONTH_KEY = ("service_year", "service_month_num")
+
+
+@dataclass(frozen=True)
+class MaterializedViewSpec:
+    """Definition of one analytics aggregate."""
+
+    name: str
+    select: str
+    # Grain of the view; backs the unique index CONCURRENTLY refreshes need.
+    unique_key: tuple[str, ...]
+    indexes: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    # Maintained by per-batch deltas instead of full refreshes (see module docs).
+    incremental: bool = False
+
+    def render(self, dialect: str, where: str = "") -> str:
+        return self.select.format(**_EXPRESSIONS[dialect], where=where)
+
+
+def _monthly(
+    name: str,
+    dims: tuple[tuple[str, str], ...],
+    *,
+    extra: str = "",
+    indexes: tuple[tuple[str, tuple[str, ...]], ...] = (),
+    incremental: bool = False,
+) -> MaterializedViewSpec:
+    """Spec for a ``district × dims × month`` aggregate over line items."""
+
+    dim_columns = "".join(f"{expr} AS {alias}, " for alias, expr in dims)
+    dim_group = "".join(f"{expr}, " for _, expr in dims)
+    select = (
+        f"SELECT i.district_key AS district_key, {dim_columns}{_MONTH_COLUMNS}, "
+        f"{extra}{_TOTALS}\n{_LINE_ITEMS}\n{{where}}"
+        f"GROUP BY i.district_key, {dim_group}{_MONTH_GROUP}"
+    )
+    return MaterializedViewSpec(
+        name=name,
+        select=select,
+        unique_key=("district_key", *(alias for alias, _ in dims), *_MONTH_KEY),
+        indexes=indexes,
+        incremental=incremental,
+    )
+
+
+def _daily(
+    name: str,
+    dims: tuple[tuple[str, str], ...],
+    *,
+    extra: str = "",
+    indexes: tuple[tuple[str, tuple[str, ...]], ...] = (),
+) -> MaterializedViewSpec:
+    """Spec for a ``district × dims × day`` aggregate over line items."""
+
+    dim_columns = "".join(f"{expr} AS {alias}, " for alias, expr in dims)
+    dim_group = "".join(f"{expr}, " for _, expr in dims)
+    select = (
+        f"SELECT i.district_key AS district_key, {dim_columns}{{day}} AS service_date, "
+        f"{_TOTALS}{extra}\n{_LINE_ITEMS}\n"
+        f"GROUP BY i.district_key, {dim_group}{{day}}"
+    )
+    return MaterializedViewSpec(
+        name=name,
+        select=select,
+        unique_key=("district_key", *(alias for alias, _ in dims), "service_date"),
+        indexes=indexes,
+    )
+
+
+_STUDENT = ("student", "LOWER(ili.student)")
+_CLINICIAN = ("clinician", "LOWER(ili.clinician)")
+_SERVICE_CODE = ("service_code", "ili.service_code")
+_DK_YEAR_MONTH = ("district_key", "service_year", "service_month_num")
+
+# Mirrors the definitions documented in agents/mv_mapping.md.
+MATERIALIZED_VIEWS: tuple[MaterializedViewSpec, ...] = (
+    _monthly(
+        "mv_student_monthly_hours_cost",
+        (_STUDENT,),
+        indexes=(
+            ("idx_mv_smhc_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_smhc_lower_student", ("student",)),
+        ),
+        incremental=True,
+    ),
+    _monthly(
+        "mv_provider_monthly_hours_cost",
+        (_CLINICIAN,),
+        indexes=(
+            ("idx_mv_pmhc_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_pmhc_lower_clinician", ("clinician",)),
+        ),
+        incremental=True,
+    ),
+    _monthly(
+        "mv_student_provider_monthly",
+        (_STUDENT, _CLINICIAN),
+        indexes=(
+            ("idx_mv_spm_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_spm_lower_student", ("student",)),
+            ("idx_mv_spm_lower_clinician", ("clinician",)),
+        ),
+    ),
+    _monthly(
+        "mv_district_service_code_monthly",
+        (_SERVICE_CODE,),
+        indexes=(
+            ("idx_mv_dscm_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_dscm_service_code", ("service_code",)),
+        ),
+        incremental=True,
+    ),
+    MaterializedViewSpec(
+        name="mv_invoice_summary",
+        select=(
+            "SELECT i.id AS invoice_id, i.district_key AS district_key, "
+            "i.invoice_date AS invoice_date, SUM(ili.hours) AS total_hours, "
+            "SUM(ili.cost) AS total_cost, "
+            "COUNT(DISTINCT LOWER(ili.student)) AS num_students, "
+            "COUNT(DISTINCT LOWER(ili.clinician)) AS num_clinicians\n"
+            "FROM invoices i\nLEFT JOIN invoice_line_items ili ON ili.invoice_id = i.id\n"
+            "GROUP BY i.id, i.district_key, i.invoice_date"
+        ),
+        unique_key=("invoice_id",),
+        indexes=(("idx_mv_is_dk_invoice_date", ("district_key", "invoice_date")),),
+    ),
+    MaterializedViewSpec(
+        name="mv_student_year_summary",
+        select=(
+            "SELECT i.district_key AS district_key, LOWER(ili.student) AS student, "
+            f"{{year}} AS service_year, {_TOTALS}\n{_LINE_ITEMS}\n"
+            "GROUP BY i.district_key, LOWER(ili.student), {year}"
+        ),
+        unique_key=("district_key", "student", "service_year"),
+        indexes=(
+            ("idx_mv_sys_dk_year", ("district_key", "service_year")),
+            ("idx_mv_sys_lower_student", ("student",)),
+        ),
+    ),
+    _monthly(
+        "mv_provider_caseload_monthly",
+        (_CLINICIAN,),
+        extra="COUNT(DISTINCT LOWER(ili.student)) AS num_students, ",
+        indexes=(
+            ("idx_mv_pcm_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_pcm_lower_clinician", ("clinician",)),
+        ),
+    ),
+    _monthly(
+        "mv_district_monthly_hours_cost",
+        (),
+        indexes=(("idx_mv_dmhc_dk_year_month", _DK_YEAR_MONTH),),
+    ),
+    MaterializedViewSpec(
+        name="mv_vendor_monthly_hours_cost",
+        select=(
+            "SELECT i.district_key AS district_key, v.id AS vendor_id, "
+            f"v.name AS vendor_name, {_MONTH_COLUMNS}, {_TOTALS}\n"
+            "FROM invoices i\nJOIN vendors v ON v.id = i.vendor_id\n"
+            "JOIN invoice_line_items ili ON ili.invoice_id = i.id\n"
+            f"GROUP BY i.district_key, v.id, v.name, {_MONTH_GROUP}"
+        ),
+        unique_key=("district_key", "vendor_id", *_MONTH_KEY),
+        indexes=(
+            (
+                "idx_mv_vmhc_dk_year_month_vendor",
+                (*_DK_YEAR_MONTH, "vendor_id"),
+            ),
+            ("idx_mv_vmhc_vendor", ("vendor_id",)),
+        ),
+    ),
+    _monthly(
+        "mv_student_service_code_monthly",
+        (_STUDENT, _SERVICE_CODE),
+        indexes=(
+            ("idx_mv_sscm_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_sscm_lower_student", ("student",)),
+            ("idx_mv_sscm_service_code", ("service_code",)),
+        ),
+    ),
+    _monthly(
+        "mv_provider_service_code_monthly",
+        (_CLINICIAN, _SERVICE_CODE),
+        indexes=(
+            ("idx_mv_pscm_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_pscm_lower_clinician", ("clinician",)),
+            ("idx_mv_pscm_service_code", ("service_code",)),
+        ),
+    ),
+    _daily(
+        "mv_student_daily_hours",
+        (_STUDENT,),
+        indexes=(
+            ("idx_mv_sdh_dk_date", ("district_key", "service_date")),
+            ("idx_mv_sdh_lower_student", ("student",)),
+        ),
+    ),
+    _daily(
+        "mv_provider_daily_hours",
+        (_CLINICIAN,),
+        indexes=(
+            ("idx_mv_pdh_dk_date", ("district_key", "service_date")),
+            ("idx_mv_pdh_lower_clinician", ("clinician",)),
+        ),
+    ),
+    _monthly(
+        "mv_student_service_intensity_monthly",
+        (_STUDENT,),
+        extra=(
+            "COUNT(DISTINCT {day}) AS service_days, "
+            "CASE WHEN COUNT(DISTINCT {day}) = 0 THEN NULL "
+            "ELSE {hours_numeric} / COUNT(DISTINCT {day}) END AS avg_hours_per_day, "
+        ),
+        indexes=(
+            ("idx_mv_ssim_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mv_ssim_lower_student", ("student",)),
+        ),
+    ),
+    _daily(
+        "mv_district_daily_coverage",
+        (),
+        extra=(
+            ", COUNT(DISTINCT LOWER(ili.student)) AS num_students"
+            ", COUNT(DISTINCT LOWER(ili.clinician)) AS num_clinicians"
+        ),
+        indexes=(("idx_mv_ddc_dk_date", ("district_key", "service_date")),),
+    ),
+    _monthly(
+        "mv_provider_student_monthly",
+        (_CLINICIAN, _STUDENT),
+        indexes=(
+            ("idx_mvp_sm_dk_year_month", _DK_YEAR_MONTH),
+            ("idx_mvp_sm_lower_clinician", ("clinician",)),
+            ("idx_mvp_sm_lower_student", ("student",)),
+        ),
+    ),
+)
+
+VIEWS_BY_NAME: dict[str, MaterializedViewSpec] = {spec.name: spec for spec in MATERIALIZED_VIEWS}
+INCREMENTAL_VIEWS: tuple[MaterializedViewSpec, ...] = tuple(
+    spec for spec in MATERIALIZED_VIEWS if spec.incremental
+)
+_ADDITIVE_COLUMNS = ("total_hours", "total_cost")
+
+
+def _dialect_name(connection: Connection | Engine) -> str:
+    dialect = connection.dialect.name
+    return "postgresql" if dialect in {"postgresql", "postgres"} else dialect
+
+
+def apply_summary_deltas(
+    connection: Connection,
+    invoice_ids: Iterable[int],
+    views: Iterable[MaterializedViewSpec] = INCREMENTAL_VIEWS,
+) -> list[str]:
+    """Fold the line items of ``invoice_ids`` into the incremental summary tables.
+
+    Runs on the caller's connection so the deltas commit or roll back with
+    the ingested invoices. Only newly inserted invoices may be passed, since
+    deltas are purely additive. Tables that do not exist yet are skipped,
+    because creating them later aggregates the full history anyway. Returns
+    the names of the tables that were updated.
+    """
+
+    ids = sorted({int(invoice_id) for invoice_id in invoice_ids})
+    if not ids:
+        return []
+    dialect = _dialect_name(connection)
+    inspector = inspect(connection)
+    updated: list[str] = []
+    for spec in views:
+        if not inspector.has_table(spec.name):
+            continue
+        assignments = ", ".join(
+            f"{column} = {spec.name}.{column} + excluded.{column}"
+            for column in _ADDITIVE_COLUMNS
+        )
+        batch = spec.render(dialect, where="WHERE i.id IN :invoice_ids\n")
+        statement = text(
+            f"INSERT INTO {spec.name}\n{batch}\n"
+            f"ON CONFLICT ({', '.join(spec.unique_key)}) DO UPDATE SET {assignments}"
+        ).bindparams(bindparam("invoice_ids", expanding=True))
+        connection.execute(statement, {"invoice_ids": ids})
+        updated.append(spec.name)
+    if updated:
+        table = MaterializedViewRefresh.__table__
+        connection.execute(
+            table.update()
+            .where(table.c.view_name.in_(updated))
+            .values(refreshed_at=datetime.utcnow())
+        )
+    return updated
+
+
+class MaterializedViewManager:
+    """Create, refresh and track freshness of the ``mv_*`` aggregates."""
+
+    def __init__(
+        self, engine: Engine, views: Iterable[MaterializedViewSpec] = MATERIALIZED_VIEWS
+    ) -> None:
+        self.engine = engine
+        self.views = tuple(views)
+        self.dialect = _dialect_name(engine)
+        if self.dialect not in _EXPRESSIONS:
+            raise ValueError(f"Unsupported dialect for materialized views: {self.dialect}")
+
+    def _is_materialized(self, spec: MaterializedViewSpec) -> bool:
+        return self.dialect == "postgresql" and not spec.incremental
+
+    # ------------------------------------------------------------------
+    # DDL
+    # ------------------------------------------------------------------
+    def _existing(self, connection: Connection) -> tuple[set[str], set[str]]:
+        """Return ``(tables, materialized views)`` present in the database."""
+
+        inspector = inspect(connection)
+        views: set[str] = set()
+        if self.dialect == "postgresql":
+            views = set(inspector.get_materialized_view_names())
+        return set(inspector.get_table_names()), views
+
+    def _create_indexes(
+        self, connection: Connection, spec: MaterializedViewSpec, table: str | None = None
+    ) -> None:
+        table = table or spec.name
+        key = ", ".join(spec.unique_key)
+        connection.execute(
+            text(f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{spec.name} ON {table} ({key})")
+        )
+        for index_name, columns in spec.indexes:
+            connection.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {table} ({', '.join(columns)})"
+                )
+            )
+
+    def ensure_views(self) -> list[str]:
+        """Create any missing views; returns the names that were created."""
+
+        created: list[str] = []
+        with self.engine.begin() as connection:
+            MaterializedViewRefresh.__table__.create(connection, checkfirst=True)
+            tables, views = self._existing(connection)
+            for spec in self.views:
+                if spec.incremental and spec.name in views:
+                    # Created before delta maintenance; deltas need a table.
+                    connection.execute(text(f"DROP MATERIALIZED VIEW {spec.name}"))
+                elif spec.name in tables or spec.name in views:
+                    continue
+                kind = "MATERIALIZED VIEW" if self._is_materialized(spec) else "TABLE"
+                connection.execute(
+                    text(f"CREATE {kind} {spec.name} AS\n{spec.render(self.dialect)}")
+                )
+                self._create_indexes(connection, spec)
+                self._record(connection, spec.name, started=time.perf_counter())
+                created.append(spec.name)
+        if created:
+            LOGGER.info("materialized_views_created", views=created, dialect=self.dialect)
+        return created
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    def _refresh_postgres(self, connection: Connection, spec: MaterializedViewSpec) -> None:
+        try:
+            with connection.begin_nested():
+                connection.execute(
+                    text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {spec.name}")
+                )
+        except Exception as exc:
+            # CONCURRENTLY needs a populated view with its unique index.
+            LOGGER.warning(
+                "materialized_view_concurrent_refresh_failed", view=spec.name, error=str(exc)
+            )
+            connection.execute(text(f"REFRESH MATERIALIZED VIEW {spec.name}"))
+
+    def _rebuild_table(self, connection: Connection, spec: MaterializedViewSpec) -> None:
+        # Build the new aggregate alongside the old one, then swap. DDL is
+        # transactional on both dialects, so readers see the old or new table.
+        staging = f"{spec.name}__staging"
+        connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        connection.execute(
+            text(f"CREATE TABLE {staging} AS\n{spec.render(self.dialect)}")
+        )
+        connection.execute(text(f"DROP TABLE IF EXISTS {spec.name}"))
+        connection.execute(text(f"ALTER TABLE {staging} RENAME TO {spec.name}"))
+        self._create_indexes(connection, spec)
+
+    def refresh(self, names: Iterable[str] | None = None) -> dict[str, bool]:
+        """Refresh ``names`` (default: every non-incremental view).
+
+        Returns success per view. Each view refreshes in its own transaction
+        so one failure does not roll back the others. Missing views are
+        created first.
+        """
+
+        if names:
+            selected = [VIEWS_BY_NAME[name] for name in names]
+        else:
+            selected = [spec for spec in self.views if not spec.incremental]
+        self.ensure_views()
+        results: dict[str, bool] = {}
+        for spec in selected:
+            started = time.perf_counter()
+            try:
+                with self.engine.begin() as connection:
+                    if self._is_materialized(spec):
+                        self._refresh_postgres(connection, spec)
+                    else:
+                        self._rebuild_table(connection, spec)
+                    self._record(connection, spec.name, started=started)
+            except Exception as exc:
+                LOGGER.warning("materialized_view_refresh_failed", view=spec.name, error=str(exc))
+                results[spec.name] = False
+                continue
+            results[spec.name] = True
+        LOGGER.info(
+            "materialized_views_refreshed",
+            refreshed=sum(results.values()),
+            failed=[name for name, ok in results.items() if not ok],
+        )
+        return results
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+    def _drift(self, connection: Connection, spec: MaterializedViewSpec) -> int:
+        """Number of groups where ``spec``'s table disagrees with the base tables."""
+
+        key = ", ".join(spec.unique_key)
+        # Deltas sum in a different order than a full scan; compare rounded.
+        sums = ", ".join(
+            f"ROUND(CAST({column} AS NUMERIC), 4) AS {column}" for column in _ADDITIVE_COLUMNS
+        )
+        expected = f"SELECT {key}, {sums} FROM (\n{spec.render(self.dialect)}\n) expected"
+        actual = f"SELECT {key}, {sums} FROM {spec.name}"
+        missing = connection.execute(
+            text(f"SELECT COUNT(*) FROM ({expected} EXCEPT {actual}) missing_groups")
+        ).scalar()
+        extra = connection.execute(
+            text(f"SELECT COUNT(*) FROM ({actual} EXCEPT {expected}) extra_groups")
+        ).scalar()
+        return int(missing or 0) + int(extra or 0)
+
+    def reconcile(
+        self, names: Iterable[str] | None = None, *, repair: bool = True
+    ) -> dict[str, int]:
+        """Verify incremental tables against the base tables.
+
+        Returns the number of drifted groups per table; drifted tables are
+        rebuilt when ``repair`` is set.
+        """
+
+        if names:
+            selected = [VIEWS_BY_NAME[name] for name in names]
+        else:
+            selected = [spec for spec in self.views if spec.incremental]
+        self.ensure_views()
+        drift: dict[str, int] = {}
+        for spec in selected:
+            with self.engine.connect() as connection:
+                drift[spec.name] = self._drift(connection, spec)
+            if drift[spec.name]:
+                LOGGER.warning(
+                    "summary_table_drift_detected", view=spec.name, groups=drift[spec.name]
+                )
+                if repair:
+                    self.refresh([spec.name])
+        LOGGER.info("summary_tables_reconciled", drift=drift, repair=repair)
+        return drift
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+    def _record(self, connection: Connection, name: str, *, started: float) -> None:
+        row_count = connection.execute(text(f"SELECT COUNT(*) FROM {name}")).scalar() or 0
+        table = MaterializedViewRefresh.__table__
+        values = {
+            "refreshed_at": datetime.utcnow(),
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+            "row_count": int(row_count),
+        }
+        updated = connection.execute(
+            table.update().where(table.c.view_name == name).values(**values)
+        )
+        if not updated.rowcount:
+            connection.execute(table.insert().values(view_name=name, **values))
+
+    def freshness(self) -> dict[str, datetime | None]:
+        """Return the last successful refresh time of every managed view."""
+
+        table = MaterializedViewRefresh.__table__
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                table.select().with_only_columns(table.c.view_name, table.c.refreshed_at)
+            ).all()
+        refreshed = {row.view_name: row.refreshed_at for row in rows}
+        return {spec.name: refreshed.get(spec.name) for spec in self.views}
+
+
+def refresh_materialized_views(engine: Engine | None = None) -> dict[str, bool]:
+    """Refresh every analytics view on ``engine`` (default: the app engine)."""
+
+    if engine is None:
+        from app.backend.src.db import get_engine
+
+        engine = get_engine()
+    return MaterializedViewManager(engine).refresh()
+
+
+def reconcile_summary_tables(engine: Engine | None = None) -> dict[str, int]:
+    """Verify and repair the incremental summary tables on ``engine``."""
+
+    if engine is None:
+        from app.backend.src.db import get_engine
+
+        engine = get_engine()
+    return MaterializedViewManager(engine).reconcile()
+
+
+__all__ = [
+    "INCREMENTAL_VIEWS",
+    "MATERIALIZED_VIEWS",
+    "MaterializedViewManager",
+    "MaterializedViewSpec",
+    "apply_summary_deltas",
+    "reconcile_summary_tables",
+    "refresh_materialized_views",
+]
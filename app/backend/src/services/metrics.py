@@ -21,8 +21,15 @@ pdf_generation_seconds = Histogram(
     "Time spent rendering a single invoice PDF.",
 )
 
+llm_stage_memo_total = Counter(
+    "llm_stage_memo_total",
+    "LLM stage memo lookups by stage and outcome (lru, redis or miss).",
+    labelnames=["stage", "outcome"],
+)
+
 __all__ = [
     "invoice_jobs_total",
     "job_duration_seconds",
+    "llm_stage_memo_total",
     "pdf_generation_seconds",
 ]
@@ -0,0 +1,278 @@
+"""Origin tags and hit accounting for prefetched analytics reports.
+
+A prefetch run that computes a report tags its intent cache key with a
+``prefetch:entry:{cache_key}`` hash naming the predicting edge; entries
+without a tag were computed for a user. User requests that hit a tagged
+entry bump, in one script call, the entry's own hit count, the district's
+``hits`` and, on the first hit only, ``entries_hit`` and the edge's ``hit``
+counter that :mod:`prefetch_predictor` ranks edges by.
+
+``prefetch:stats:{district}`` also carries ``enqueued`` (jobs sent),
+``written`` (reports a prefetch run computed) and ``compute_ms`` (pipeline
+time those runs spent), which :func:`prefetch_roi` turns into hit rates and
+an estimate of user-facing time saved per unit of worker time spent.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import structlog
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.commands.core import AsyncScript, Script
+
+from app.backend.src.core.config import get_settings
+from app.backend.src.services.prefetch_throttle import async_redis_client, redis_client
+
+LOGGER = structlog.get_logger(__name__)
+
+_STATS_PREFIX = "prefetch:stats:"
+
+# KEYS: entry tag, district stats, district edges
+_HIT_SCRIPT = """
+local edge = redis.call('HGET', KEYS[1], 'edge')
+if not edge then
+    return false
+end
+local hits = redis.call('HINCRBY', KEYS[1], 'hits', 1)
+redis.call('HINCRBY', KEYS[2], 'hits', 1)
+if hits == 1 then
+    redis.call('HINCRBY', KEYS[2], 'entries_hit', 1)
+    if edge ~= '' then
+        redis.call('HINCRBY', KEYS[3], edge .. ':hit', 1)
+    end
+end
+return {edge, hits}
+"""
+
+_HIT: Script | None = None
+_AHIT: AsyncScript | None = None
+
+
+def edges_key(district_key: str) -> str:
+    return f"prefetch:edges:{district_key}"
+
+
+def stats_key(district_key: str) -> str:
+    return f"{_STATS_PREFIX}{district_key}"
+
+
+def _entry_key(cache_key: str) -> str:
+    return f"prefetch:entry:{cache_key}"
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+def _count_hit(client: Redis, keys: list[str]) -> list | None:
+    global _HIT
+    if _HIT is None:
+        _HIT = client.register_script(_HIT_SCRIPT)
+    return _HIT(keys=keys, client=client)
+
+
+async def _acount_hit(client: AsyncRedis, keys: list[str]) -> list | None:
+    global _AHIT
+    if _AHIT is None:
+        _AHIT = client.register_script(_HIT_SCRIPT)
+    return await _AHIT(keys=keys, client=client)
+
+
+def record_prefetch_sent(district_key: str, edges: Iterable[str], *, pipe: Any) -> None:
+    """Queue ``enqueued`` and per-edge ``sent`` counter updates on ``pipe``."""
+
+    ttl = get_settings().prefetch_transition_ttl_sec
+    edge_hash = edges_key(district_key)
+    sent = 0
+    for edge in edges:
+        pipe.hincrby(edge_hash, f"{edge}:sent", 1)
+        sent += 1
+    pipe.hincrby(stats_key(district_key), "enqueued", sent)
+    pipe.expire(edge_hash, ttl)
+    pipe.expire(stats_key(district_key), ttl)
+
+
+def _queue_mark(
+    pipe: Any, district_key: str, cache_key: str, edge: str | None, compute_sec: float
+) -> None:
+    settings = get_settings()
+    pipe.hset(_entry_key(cache_key), mapping={"edge": edge or "", "hits": 0})
+    pipe.expire(_entry_key(cache_key), settings.analytics_cache_ttl_sec)
+    pipe.hincrby(stats_key(district_key), "written", 1)
+    pipe.hincrby(stats_key(district_key), "compute_ms", int(compute_sec * 1000))
+    pipe.expire(stats_key(district_key), settings.prefetch_transition_ttl_sec)
+
+
+def mark_prefetched(
+    district_key: str | None,
+    cache_key: str,
+    edge: str | None,
+    *,
+    compute_sec: float = 0.0,
+    client: Redis | None = None,
+) -> None:
+    """Tag a report a prefetch run computed and count its cost."""
+
+    if not district_key:
+        return
+    try:
+        pipe = (client or redis_client(get_settings().redis_url)).pipeline(transaction=False)
+        _queue_mark(pipe, district_key, cache_key, edge, compute_sec)
+        pipe.execute()
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_mark_failed", error=str(exc))
+
+
+async def amark_prefetched(
+    district_key: str | None,
+    cache_key: str,
+    edge: str | None,
+    *,
+    compute_sec: float = 0.0,
+    client: AsyncRedis | None = None,
+) -> None:
+    """Async counterpart of :func:`mark_prefetched` on the asyncio client."""
+
+    if not district_key:
+        return
+    try:
+        client = client or async_redis_client(get_settings().redis_url)
+        pipe = client.pipeline(transaction=False)
+        _queue_mark(pipe, district_key, cache_key, edge, compute_sec)
+        await pipe.execute()
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_mark_failed", error=str(exc))
+
+
+def _hit_keys(district_key: str, cache_key: str) -> list[str]:
+    return [_entry_key(cache_key), stats_key(district_key), edges_key(district_key)]
+
+
+def _hit_edge(district_key: str, result: list | None) -> str | None:
+    if not result:
+        return None
+    edge, hits = _text(result[0]), int(result[1])
+    LOGGER.info("prefetch_hit", district_key=district_key, edge=edge or None, hits=hits)
+    return edge
+
+
+def record_prefetch_hit(
+    district_key: str | None,
+    cache_key: str,
+    *,
+    client: Redis | None = None,
+) -> str | None:
+    """Count a user hit on ``cache_key``; return the edge if a prefetch computed it."""
+
+    if not district_key:
+        return None
+    try:
+        result = _count_hit(
+            client or redis_client(get_settings().redis_url),
+            _hit_keys(district_key, cache_key),
+        )
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_hit_record_failed", error=str(exc))
+        return None
+    return _hit_edge(district_key, result)
+
+
+async def arecord_prefetch_hit(
+    district_key: str | None,
+    cache_key: str,
+    *,
+    client: AsyncRedis | None = None,
+) -> str | None:
+    """Async counterpart of :func:`record_prefetch_hit` on the asyncio client."""
+
+    if not district_key:
+        return None
+    try:
+        result = await _acount_hit(
+            client or async_redis_client(get_settings().redis_url),
+            _hit_keys(district_key, cache_key),
+        )
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_hit_record_failed", error=str(exc))
+        return None
+    return _hit_edge(district_key, result)
+
+
+def _ratio(numerator: float, denominator: float) -> float | None:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def summarize_prefetch_stats(stats: dict[str, float]) -> dict[str, Any]:
+    """Derive hit rates and time saved from one district's raw counters."""
+
+    written = stats.get("written", 0.0)
+    hits = stats.get("hits", 0.0)
+    spent_sec = stats.get("compute_ms", 0.0) / 1000
+    # Every hit skipped roughly one average prefetch run on the request path.
+    saved_sec = hits * spent_sec / written if written else 0.0
+    return {
+        "enqueued": int(stats.get("enqueued", 0)),
+        "written": int(written),
+        "entries_hit": int(stats.get("entries_hit", 0)),
+        "hits": int(hits),
+        "hit_rate": _ratio(stats.get("entries_hit", 0.0), written),
+        "hits_per_entry": _ratio(hits, written),
+        "compute_sec": round(spent_sec, 3),
+        "saved_sec": round(saved_sec, 3),
+        "roi": _ratio(saved_sec, spent_sec),
+    }
+
+
+def prefetch_roi(district_key: str | None = None, *, client: Redis | None = None) -> dict[str, Any]:
+    """Return prefetch effectiveness per district and per predicting edge."""
+
+    client = client or redis_client(get_settings().redis_url)
+    if district_key:
+        districts = [district_key]
+    else:
+        districts = sorted(
+            _text(key)[len(_STATS_PREFIX):]
+            for key in client.scan_iter(match=f"{_STATS_PREFIX}*", count=100)
+        )
+
+    pipe = client.pipeline(transaction=False)
+    for district in districts:
+        pipe.hgetall(stats_key(district))
+        pipe.hgetall(edges_key(district))
+    raw = pipe.execute()
+
+    totals: dict[str, float] = {}
+    report: dict[str, Any] = {}
+    for index, district in enumerate(districts):
+        stats = {_text(k): float(v) for k, v in (raw[2 * index] or {}).items()}
+        for name, value in stats.items():
+            totals[name] = totals.get(name, 0.0) + value
+
+        edges: dict[str, dict[str, Any]] = {}
+        for field, value in (raw[2 * index + 1] or {}).items():
+            edge, _, counter = _text(field).rpartition(":")
+            edges.setdefault(edge, {"sent": 0, "hit": 0})[counter] = int(value)
+        for counts in edges.values():
+            counts["hit_rate"] = _ratio(counts["hit"], counts["sent"])
+
+        report[district] = {
+            **summarize_prefetch_stats(stats),
+            "edges": dict(sorted(edges.items(), key=lambda item: -item[1]["sent"])),
+        }
+
+    return {"totals": summarize_prefetch_stats(totals), "districts": report}
+
+
+__all__ = [
+    "amark_prefetched",
+    "arecord_prefetch_hit",
+    "edges_key",
+    "mark_prefetched",
+    "prefetch_roi",
+    "record_prefetch_hit",
+    "record_prefetch_sent",
+    "stats_key",
+    "summarize_prefetch_stats",
+]
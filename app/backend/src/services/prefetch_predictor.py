@@ -0,0 +1,268 @@
+"""Learned follow-up prediction for analytics prefetch.
+
+Every answered user turn whose session already had a plan kind adds one
+``previous -> current`` observation to two Redis hashes: one for the
+district and one shared by all districts (``_all``). Prediction blends the
+two, shrinking a district with little history towards the global
+distribution, and keeps the most likely follow-ups that have a query
+template and the entities to fill it.
+
+Every prefetched query remembers the edge that predicted it, and
+:mod:`prefetch_accounting` counts per edge how many were sent and how many a
+user went on to read, so edges whose prefetches are never read stop
+spending prefetch capacity.
+
+Prefetch runs themselves (``prefetch-*`` sessions) never record
+transitions. Every helper is best-effort and swallows Redis errors.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+import structlog
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from app.backend.src.core.config import get_settings
+from app.backend.src.services.prefetch_accounting import edges_key
+from app.backend.src.services.prefetch_throttle import async_redis_client, redis_client
+
+LOGGER = structlog.get_logger(__name__)
+
+PREFETCH_SESSION_PREFIX = "prefetch-"
+GLOBAL_SCOPE = "_all"
+# Weight, in observations, of the global distribution in a district's estimate.
+PRIOR_STRENGTH = 5.0
+
+# plan kind -> (entity slot, query template). Kinds without an entry are
+# never prefetched because there is no reliable way to phrase them.
+FOLLOWUP_TEMPLATES: dict[str, tuple[str | None, str]] = {
+    "student_monthly_spend": ("student_name", "monthly spend for {student_name}"),
+    "student_monthly_hours": ("student_name", "i want to see the hours for {student_name}"),
+    "student_provider_breakdown": ("student_name", "provider breakdown for {student_name}"),
+    "student_service_code_monthly": ("student_name", "service code breakdown for {student_name}"),
+    "student_invoices": ("student_name", "invoices for {student_name}"),
+    "student_year_summary": ("student_name", "yearly spend for {student_name}"),
+    "student_daily_hours": ("student_name", "daily hours for {student_name}"),
+    "student_service_intensity": ("student_name", "service intensity for {student_name}"),
+    "vendor_monthly_spend": ("vendor_name", "monthly spend for vendor {vendor_name}"),
+    "vendor_invoices": ("vendor_name", "invoices from vendor {vendor_name}"),
+    "caseload": ("clinician_name", "caseload for {clinician_name}"),
+    "clinician_student_breakdown": ("clinician_name", "students supported by {clinician_name}"),
+    "provider_daily_hours": ("clinician_name", "daily hours for {clinician_name}"),
+    "provider_service_code_monthly": (
+        "clinician_name",
+        "provider spending by service code for {clinician_name}",
+    ),
+    "district_monthly_spend": (None, "district monthly spend"),
+    "district_service_code_spend": (None, "district spending by service code"),
+    "district_daily_coverage": (None, "district daily coverage"),
+}
+
+# NLV's ``scope`` for a question about one named entity.
+ENTITY_SCOPES: dict[str, str] = {
+    "student_name": "single_student",
+    "clinician_name": "provider",
+    "vendor_name": "vendor",
+}
+
+
+@dataclass(frozen=True)
+class PrefetchCandidate:
+    """One follow-up query to prefetch and the ``prev>next`` edge behind it.
+
+    ``intent`` is the :func:`followup_intent` ``query`` stands for, letting
+    the worker skip the model chain; it is None when the query says more than an
+    intent can (a specific month, say).
+    """
+
+    plan_kind: str
+    query: str
+    edge: str
+    score: float
+    intent: dict[str, Any] | None = field(default=None, compare=False)
+
+
+def followup_intent(plan_kind: str, slot: str | None, value: str | None) -> dict[str, Any]:
+    """The intent NLV reads for a plan kind about one entity, or the district.
+
+    This is the model's part only; the worker and the fast path pass it
+    through NLV's deterministic rules (default time windows and the like)
+    before keying anything on it.
+    """
+
+    intent: dict[str, Any] = {"intent": plan_kind, "entities": {}}
+    if slot is None:
+        intent["scope"] = "district"
+    elif value:
+        intent["entities"][slot] = value
+        intent["scope"] = ENTITY_SCOPES.get(slot)
+    return intent
+
+
+def is_prefetch_session(session_id: str | None) -> bool:
+    return bool(session_id) and str(session_id).startswith(PREFETCH_SESSION_PREFIX)
+
+
+def edge_name(previous: str, plan_kind: str) -> str:
+    return f"{previous}>{plan_kind}"
+
+
+def _transitions_key(scope: str, previous: str) -> str:
+    return f"prefetch:transitions:{scope}:{previous}"
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+def _counts(raw: Mapping[Any, Any] | None) -> dict[str, float]:
+    counts: dict[str, float] = {}
+    for name, value in (raw or {}).items():
+        try:
+            counts[_text(name)] = float(value)
+        except (TypeError, ValueError):  # pragma: no cover - defensive
+            continue
+    return counts
+
+
+def _queue_transition(pipe: Any, district_key: str, previous: str, plan_kind: str) -> None:
+    ttl = get_settings().prefetch_transition_ttl_sec
+    for scope in (district_key, GLOBAL_SCOPE):
+        key = _transitions_key(scope, previous)
+        pipe.hincrby(key, plan_kind, 1)
+        pipe.expire(key, ttl)
+
+
+def record_transition(
+    district_key: str | None,
+    previous: str | None,
+    plan_kind: str | None,
+    *,
+    client: Redis | None = None,
+) -> None:
+    """Count one observed ``previous -> plan_kind`` follow-up."""
+
+    if not (district_key and previous and plan_kind) or previous == plan_kind:
+        return
+    try:
+        pipe = (client or redis_client(get_settings().redis_url)).pipeline(transaction=False)
+        _queue_transition(pipe, district_key, previous, plan_kind)
+        pipe.execute()
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_transition_record_failed", error=str(exc))
+
+
+async def arecord_transition(
+    district_key: str | None,
+    previous: str | None,
+    plan_kind: str | None,
+    *,
+    client: AsyncRedis | None = None,
+) -> None:
+    """Async counterpart of :func:`record_transition` on the asyncio client."""
+
+    if not (district_key and previous and plan_kind) or previous == plan_kind:
+        return
+    try:
+        client = client or async_redis_client(get_settings().redis_url)
+        pipe = client.pipeline(transaction=False)
+        _queue_transition(pipe, district_key, previous, plan_kind)
+        await pipe.execute()
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_transition_record_failed", error=str(exc))
+
+
+def predict_followups(
+    district_key: str,
+    plan_kind: str,
+    *,
+    k: int,
+    client: Redis | None = None,
+) -> list[tuple[str, float]]:
+    """Return up to ``k`` ``(next plan kind, probability)`` pairs, most likely first.
+
+    Returns nothing until ``PREFETCH_MIN_TRANSITIONS`` follow-ups of
+    ``plan_kind`` have been observed, so callers can fall back to static rules.
+    """
+
+    settings = get_settings()
+    try:
+        pipe = (client or redis_client(settings.redis_url)).pipeline(transaction=False)
+        pipe.hgetall(_transitions_key(district_key, plan_kind))
+        pipe.hgetall(_transitions_key(GLOBAL_SCOPE, plan_kind))
+        pipe.hgetall(edges_key(district_key))
+        district_raw, global_raw, edges_raw = pipe.execute()
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("prefetch_prediction_failed", error=str(exc))
+        return []
+
+    local, shared, edges = _counts(district_raw), _counts(global_raw), _counts(edges_raw)
+    local_total, shared_total = sum(local.values()), sum(shared.values())
+    if max(local_total, shared_total) < settings.prefetch_min_transitions:
+        return []
+
+    scored: list[tuple[str, float]] = []
+    for candidate in set(local) | set(shared):
+        if candidate == plan_kind or candidate not in FOLLOWUP_TEMPLATES:
+            continue
+        prior = shared.get(candidate, 0.0) / shared_total if shared_total else 0.0
+        probability = (local.get(candidate, 0.0) + PRIOR_STRENGTH * prior) / (
+            local_total + PRIOR_STRENGTH
+        )
+        if probability < settings.prefetch_min_probability:
+            continue
+        # Drop edges whose prefetches this district demonstrably never reads.
+        edge = edge_name(plan_kind, candidate)
+        sent = edges.get(f"{edge}:sent", 0.0)
+        if sent >= settings.prefetch_hit_rate_min_samples:
+            if edges.get(f"{edge}:hit", 0.0) / sent < settings.prefetch_min_hit_rate:
+                continue
+        scored.append((candidate, probability))
+
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[: max(k, 0)]
+
+
+def build_candidates(
+    plan_kind: str,
+    entities: Mapping[str, Any] | None,
+    predictions: Iterable[tuple[str, float]],
+) -> list[PrefetchCandidate]:
+    """Phrase predicted follow-ups for the entities of the current request."""
+
+    entities = entities or {}
+    candidates: list[PrefetchCandidate] = []
+    for next_kind, score in predictions:
+        slot, template = FOLLOWUP_TEMPLATES[next_kind]
+        values: dict[str, str] = {}
+        if slot is not None:
+            value = entities.get(slot)
+            if not isinstance(value, str) or not value.strip():
+                continue
+            values[slot] = value.strip()
+        candidates.append(
+            PrefetchCandidate(
+                plan_kind=next_kind,
+                query=template.format(**values),
+                edge=edge_name(plan_kind, next_kind),
+                score=score,
+                intent=followup_intent(next_kind, slot, values.get(slot) if slot else None),
+            )
+        )
+    return candidates
+
+
+__all__ = [
+    "FOLLOWUP_TEMPLATES",
+    "PrefetchCandidate",
+    "arecord_transition",
+    "build_candidates",
+    "edge_name",
+    "followup_intent",
+    "is_prefetch_session",
+    "predict_followups",
+    "record_transition",
+]
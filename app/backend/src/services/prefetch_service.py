@@ -8,76 +8,111 @@ import uuid
 from typing import Any, Mapping
 
 import structlog
-from redis import Redis
 
 from app.backend.src.core.config import get_settings
-from app.backend.src.services.prefetch_throttle import should_throttle_prefetch
+from app.backend.src.services.prefetch_accounting import record_prefetch_sent
+from app.backend.src.services.prefetch_predictor import (
+    PREFETCH_SESSION_PREFIX,
+    PrefetchCandidate,
+    build_candidates,
+    edge_name,
+    followup_intent,
+    predict_followups,
+)
+from app.backend.src.services.prefetch_throttle import redis_client, should_throttle_prefetch
 from tasks.worker import celery
 
 LOGGER = structlog.get_logger(__name__)
 
 
-def _derive_prefetch_queries(
+def _legacy_followups(
+    intent: str | None,
+    student_name: str,
+    last_rows: list[dict[str, Any]] | None,
+) -> list[PrefetchCandidate]:
+    """Static follow-ups used until enough transitions have been observed.
+
+    If the user asked for student_monthly_spend (cost) for a student,
+    prefetch the hours query, provider breakdown, service code breakdown,
+    and latest invoice details for the same student when available.
+    """
+
+    if intent != "student_monthly_spend":
+        return []
+
+    followups: list[tuple[str, str, bool]] = [
+        ("student_monthly_hours", f"i want to see the hours for {student_name}", True),
+        ("student_provider_breakdown", f"provider breakdown for {student_name}", True),
+        ("student_service_code_monthly", f"service code breakdown for {student_name}", True),
+    ]
+
+    # Invoice details for latest month (if last_rows available)
+    if isinstance(last_rows, list) and last_rows:
+        # Expect last_rows to have "service_month"
+        try:
+            months = [
+                row.get("service_month")
+                for row in last_rows
+                if isinstance(row.get("service_month"), str)
+            ]
+            if months:
+                # Use the most recent month (last in order)
+                latest_month = months[-1]
+                # The month has no place in an intent, so this one runs the full chain.
+                followups.append(
+                    (
+                        "student_invoices",
+                        f"invoice details for {student_name} in {latest_month}",
+                        False,
+                    )
+                )
+        except Exception as exc:  # defensive
+            LOGGER.warning(
+                "prefetch_latest_month_failed",
+                error=str(exc),
+            )
+
+    return [
+        PrefetchCandidate(
+            plan_kind=kind,
+            query=query,
+            edge=edge_name(intent, kind),
+            score=0.0,
+            intent=followup_intent(kind, "student_name", student_name) if templated else None,
+        )
+        for kind, query, templated in followups
+    ]
+
+
+def _derive_prefetch_candidates(
     normalized_intent: dict[str, Any] | None,
     last_rows: list[dict[str, Any]] | None,
-    router_decision: Mapping[str, Any] | None,
-) -> list[str]:
-    """Derive a small set of likely follow-up natural-language queries.
+    district_key: str,
+    *,
+    budget: int,
+) -> list[PrefetchCandidate]:
+    """Pick at most ``budget`` likely follow-ups for the current request.
 
-    Minimal v1 behavior:
-    - If the user asked for student_monthly_spend (cost) for a student,
-      prefetch the hours query, provider breakdown, service code breakdown,
-      and latest invoice details for the same student when available.
+    Learned transition probabilities decide once the current intent has
+    enough history; until then the static rules apply.
     """
 
-    if not isinstance(normalized_intent, dict):
+    if not isinstance(normalized_intent, dict) or budget <= 0:
         return []
 
     intent = normalized_intent.get("intent")
+    if not isinstance(intent, str) or not intent:
+        return []
     entities = normalized_intent.get("entities") or {}
-    student_name = entities.get("student_name")
 
+    predictions = predict_followups(district_key, intent, k=budget)
+    if predictions:
+        return build_candidates(intent, entities, predictions)[:budget]
+
+    student_name = entities.get("student_name")
     if not isinstance(student_name, str) or not student_name.strip():
         return []
-
-    queries: list[str] = []
-
-    # If the current query is student_monthly_spend, prefetch student_monthly_hours.
-    if intent == "student_monthly_spend":
-        queries.append(f"i want to see the hours for {student_name}")
-
-        # ---------------------------
-        # Option A Prefetch Additions
-        # ---------------------------
-
-        # Provider breakdown
-        queries.append(f"provider breakdown for {student_name}")
-
-        # Service code breakdown
-        queries.append(f"service code breakdown for {student_name}")
-
-        # Invoice details for latest month (if last_rows available)
-        if isinstance(last_rows, list) and last_rows:
-            # Expect last_rows to have "service_month"
-            try:
-                months = [
-                    row.get("service_month")
-                    for row in last_rows
-                    if isinstance(row.get("service_month"), str)
-                ]
-                if months:
-                    # Use the most recent month (last in order)
-                    latest_month = months[-1]
-                    queries.append(
-                        f"invoice details for {student_name} in {latest_month}"
-                    )
-            except Exception as exc:  # defensive
-                LOGGER.warning(
-                    "prefetch_latest_month_failed",
-                    error=str(exc),
-                )
-
-    return queries
+    return _legacy_followups(intent, student_name, last_rows)[:budget]
 
 
 def enqueue_prefetch_jobs(
@@ -87,17 +122,26 @@ def enqueue_prefetch_jobs(
     router_decision: Mapping[str, Any] | None,
     district_key: str,
     user_id: int | None,
+    multi_turn_state: Mapping[str, Any] | None = None,
 ) -> None:
     """Enqueue background jobs to prefetch likely follow-up reports.
 
+    ``multi_turn_state`` is the conversation state the user's follow-up will
+    be interpreted in. Prefetch runs start from it so their NLV output, and
+    therefore the intent cache key they write, matches the follow-up's.
+
     Best-effort only; failures are logged and never affect the main response.
     """
 
     settings = get_settings()
 
     try:
-        queries = _derive_prefetch_queries(normalized_intent, last_rows, router_decision)
-        if not queries:
+        # The district bucket could never admit a larger batch.
+        budget = min(settings.prefetch_top_k, settings.prefetch_district_burst)
+        candidates = _derive_prefetch_candidates(
+            normalized_intent, last_rows, district_key, budget=budget
+        )
+        if not candidates:
             return
 
         throttle, reason = should_throttle_prefetch(
@@ -105,7 +149,7 @@ def enqueue_prefetch_jobs(
             district_key=district_key,
             normalized_intent=normalized_intent,
             router_decision=router_decision,
-            num_predicted_queries=len(queries),
+            num_predicted_queries=len(candidates),
         )
         if throttle:
             LOGGER.warning(
@@ -114,18 +158,22 @@ def enqueue_prefetch_jobs(
             return
 
         now_ts = time.time()
+        seed_state = dict(multi_turn_state) if isinstance(multi_turn_state, Mapping) else None
 
-        for q in queries:
-            session_id = f"prefetch-{uuid.uuid4()}"
+        for candidate in candidates:
+            session_id = f"{PREFETCH_SESSION_PREFIX}{uuid.uuid4()}"
 
             celery.send_task(
                 "tasks.small.prefetch_analytics",
                 args=[
-                    q,
+                    candidate.query,
                     {
                         "district_key": district_key,
                         "session_id": session_id,
                         "user_id": user_id,
+                        "prefetch_edge": candidate.edge,
+                        "multi_turn_state_seed": seed_state,
+                        "prefetch_intent": candidate.intent,
                     },
                 ],
                 kwargs={"queue_name": "small"},
@@ -134,20 +182,25 @@ def enqueue_prefetch_jobs(
         LOGGER.info(
             "prefetch_jobs_enqueued",
             district_key=district_key,
-            num_queries=len(queries),
+            num_queries=len(candidates),
+            edges=[candidate.edge for candidate in candidates],
         )
 
         try:
-            client = Redis.from_url(settings.redis_url, decode_responses=True)
-            client.set(f"prefetch:last_ts:{district_key}", now_ts)
             history_entry = {
                 "district_key": district_key,
-                "queries": queries,
+                "queries": [candidate.query for candidate in candidates],
+                "edges": [candidate.edge for candidate in candidates],
                 "ts": now_ts,
                 "reason": "enqueued",
             }
-            client.lpush("prefetch:history", json.dumps(history_entry))
-            client.ltrim("prefetch:history", 0, 49)
+            pipe = redis_client(settings.redis_url).pipeline(transaction=False)
+            pipe.lpush("prefetch:history", json.dumps(history_entry))
+            pipe.ltrim("prefetch:history", 0, 49)
+            record_prefetch_sent(
+                district_key, (candidate.edge for candidate in candidates), pipe=pipe
+            )
+            pipe.execute()
         except Exception as exc:  # pragma: no cover - defensive
             LOGGER.warning("prefetch_history_record_failed", error=str(exc))
     except Exception as exc:  # pragma: no cover - defensive
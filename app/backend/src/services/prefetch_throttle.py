@@ -1,4 +1,17 @@
-"""Prefetch throttling utilities."""
+"""Prefetch throttling utilities.
+
+Every decision is one ``EVALSHA`` of :data:`_DECIDE_SCRIPT`, which checks and
+updates, atomically and in a single round trip:
+
+* the broker backlog of the ``small`` queue (``LLEN`` on the Celery list key),
+* the Redis key-count safety valve (``DBSIZE``),
+* the per-district minimum interval (a ``PX`` cooldown key),
+* a global and a per-district token bucket (one token per predicted query),
+* per-reason decision counters in ``prefetch:decisions``.
+
+Nothing here broadcasts to the workers or opens a connection per call, so the
+check is cheap enough for the request path.
+"""
 
 from __future__ import annotations
 
@@ -7,26 +20,125 @@ from typing import Mapping
 
 import structlog
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.commands.core import Script
 
 from tasks.worker import celery
 
 LOGGER = structlog.get_logger(__name__)
 
-
-def _count_small_queue(tasks_mapping: dict | None) -> int:
-    """Return the count of tasks routed to the small queue."""
-
-    if not tasks_mapping:
-        return 0
-
-    count = 0
-    for tasks in tasks_mapping.values():
-        for task in tasks or []:
-            delivery_info = task.get("delivery_info") or {}
-            routing_key = delivery_info.get("routing_key")
-            if routing_key == "small":
-                count += 1
-    return count
+PREFETCH_QUEUE = "small"
+DECISIONS_KEY = "prefetch:decisions"
+
+# KEYS: queue list (or ""), cooldown, global bucket, district bucket, counters
+# ARGV: max_queue, max_keys, cooldown_ms, cost, now_ms,
+#       global capacity, global tokens/ms, district capacity, district tokens/ms,
+#       bucket ttl_ms, queue depth measured by the caller (or -1)
+_DECIDE_SCRIPT = """
+local depth = tonumber(ARGV[11])
+if KEYS[1] ~= '' then
+    depth = redis.call('LLEN', KEYS[1])
+end
+
+local function decide(allowed, reason)
+    redis.call('HINCRBY', KEYS[5], reason, 1)
+    return {allowed, reason, depth}
+end
+
+if depth > tonumber(ARGV[1]) then
+    return decide(0, 'queue_depth')
+end
+local max_keys = tonumber(ARGV[2])
+if max_keys > 0 and redis.call('DBSIZE') > max_keys then
+    return decide(0, 'redis_keys')
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return decide(0, 'min_interval')
+end
+
+local cost = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local function level(key, capacity, rate)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, tokens + math.max(0, now - ts) * rate)
+end
+
+local global_tokens = level(KEYS[3], tonumber(ARGV[6]), tonumber(ARGV[7]))
+if global_tokens < cost then
+    return decide(0, 'global_rate')
+end
+local district_tokens = level(KEYS[4], tonumber(ARGV[8]), tonumber(ARGV[9]))
+if district_tokens < cost then
+    return decide(0, 'district_rate')
+end
+
+local ttl = tonumber(ARGV[10])
+redis.call('HSET', KEYS[3], 'tokens', global_tokens - cost, 'ts', now)
+redis.call('PEXPIRE', KEYS[3], ttl)
+redis.call('HSET', KEYS[4], 'tokens', district_tokens - cost, 'ts', now)
+redis.call('PEXPIRE', KEYS[4], ttl)
+local cooldown = tonumber(ARGV[3])
+if cooldown > 0 then
+    redis.call('SET', KEYS[2], now, 'PX', cooldown)
+end
+return decide(1, 'allowed')
+"""
+
+_CLIENTS: dict[str, Redis] = {}
+_ASYNC_CLIENTS: dict[str, AsyncRedis] = {}
+_DECIDE: Script | None = None
+
+
+def redis_client(url: str) -> Redis:
+    """Shared client for ``url``; redis-py pools connections per client."""
+
+    client = _CLIENTS.get(url)
+    if client is None:
+        client = _CLIENTS[url] = Redis.from_url(url)
+    return client
+
+
+def async_redis_client(url: str) -> AsyncRedis:
+    """Shared asyncio client for ``url``, for callers on the serving event loop."""
+
+    client = _ASYNC_CLIENTS.get(url)
+    if client is None:
+        client = _ASYNC_CLIENTS[url] = AsyncRedis.from_url(url)
+    return client
+
+
+def _decide(client: Redis, keys: list[str], args: list) -> list:
+    """Run the decision script via EVALSHA, loading it on first use per server."""
+
+    global _DECIDE
+    if _DECIDE is None:
+        _DECIDE = client.register_script(_DECIDE_SCRIPT)
+    return _DECIDE(keys=keys, args=args, client=client)
+
+
+def _queue_key(queue: str = PREFETCH_QUEUE) -> str:
+    """Redis list the Celery broker keeps ``queue``'s pending messages in."""
+
+    options = celery.conf.broker_transport_options or {}
+    return f"{options.get('global_keyprefix', '')}{queue}"
+
+
+def _is_expensive(normalized_intent: dict | None, router_decision: Mapping | None) -> bool:
+    mode = None
+    plan_kind = None
+    if isinstance(router_decision, Mapping):
+        mode = router_decision.get("mode")
+        plan_kind = router_decision.get("plan_kind") or router_decision.get("kind")
+
+    intent_name = normalized_intent.get("intent") if isinstance(normalized_intent, dict) else None
+
+    if plan_kind == "invoice_details" or mode == "invoice_details":
+        return True
+    return isinstance(intent_name, str) and (
+        intent_name.startswith("district_") or intent_name.startswith("comparison")
+    )
 
 
 def should_throttle_prefetch(
@@ -36,76 +148,74 @@ def should_throttle_prefetch(
     normalized_intent: dict | None,
     router_decision: Mapping | None,
     num_predicted_queries: int,
+    client: Redis | None = None,
 ) -> tuple[bool, str]:
-    """Return whether prefetch should be throttled and why."""
+    """Return whether prefetch should be throttled and why.
+
+    An allowed decision consumes ``num_predicted_queries`` tokens from both
+    buckets and starts the district's cooldown, so callers should enqueue
+    the batch whenever this returns ``(False, "")``.
+    """
 
     if not settings.prefetch_enabled:
         return True, "disabled"
 
-    # Queue depth
-    try:
-        inspector = celery.control.inspect()
-        if inspector:
-            active = inspector.active() or {}
-            reserved = inspector.reserved() or {}
-            queue_depth = _count_small_queue(active) + _count_small_queue(reserved)
-            if queue_depth > settings.prefetch_max_queue:
-                return True, "queue_depth"
-    except Exception as exc:  # pragma: no cover - defensive
-        LOGGER.warning("prefetch_queue_inspect_failed", error=str(exc))
-
-    # Minimum interval
+    # Complexity guardrails need no I/O, so they go first.
     try:
-        client = Redis.from_url(settings.redis_url, decode_responses=True)
-        last_ts_raw = client.get(f"prefetch:last_ts:{district_key}")
-        if last_ts_raw is not None:
-            try:
-                last_ts = float(last_ts_raw)
-            except (TypeError, ValueError):
-                last_ts = None
-            if last_ts is not None:
-                if time.time() - last_ts < settings.prefetch_min_interval_sec:
-                    return True, "min_interval"
+        if settings.prefetch_skip_expensive and _is_expensive(normalized_intent, router_decision):
+            return True, "expensive"
     except Exception as exc:  # pragma: no cover - defensive
-        LOGGER.warning("prefetch_interval_check_failed", error=str(exc))
+        LOGGER.warning("prefetch_complexity_check_failed", error=str(exc))
 
-    # Redis key count safety valve
-    try:
-        client = Redis.from_url(settings.redis_url)
+    client = client or redis_client(settings.redis_url)
+    same_instance = settings.broker_url == settings.redis_url
+    measured_depth = -1
+    if not same_instance:
+        # The backlog lives on another Redis; one extra LLEN there.
         try:
-            info = client.info() or {}
-            db0 = info.get("db0") or {}
-            keys_count = db0.get("keys")
-        except Exception:
-            keys_count = client.dbsize()
-        if keys_count is not None and keys_count > settings.prefetch_max_redis_keys:
-            return True, "redis_keys"
-    except Exception as exc:  # pragma: no cover - defensive
-        LOGGER.warning("prefetch_key_count_failed", error=str(exc))
-
-    # Complexity guardrails
+            measured_depth = int(redis_client(settings.broker_url).llen(_queue_key()))
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("prefetch_queue_depth_failed", error=str(exc))
+
+    # A batch larger than a bucket could otherwise never be admitted.
+    cost = max(int(num_predicted_queries), 1)
+    global_burst = max(settings.prefetch_global_burst, cost)
+    district_burst = max(settings.prefetch_district_burst, cost)
+    global_rate = max(settings.prefetch_global_refill_per_sec, 1e-6)
+    district_rate = max(settings.prefetch_district_refill_per_sec, 1e-6)
+    # Idle buckets expire once they would have refilled anyway.
+    bucket_ttl_ms = int(1000 * max(global_burst / global_rate, district_burst / district_rate)) + 1000
     try:
-        if settings.prefetch_skip_expensive:
-            mode = None
-            plan_kind = None
-            if isinstance(router_decision, Mapping):
-                mode = router_decision.get("mode")
-                plan_kind = router_decision.get("plan_kind") or router_decision.get("kind")
-
-            if isinstance(normalized_intent, dict):
-                intent_name = normalized_intent.get("intent")
-            else:
-                intent_name = None
-
-            if plan_kind == "invoice_details" or mode == "invoice_details":
-                return True, "expensive"
-
-            if isinstance(intent_name, str) and (
-                intent_name.startswith("district_")
-                or intent_name.startswith("comparison")
-            ):
-                return True, "expensive"
+        allowed, reason, depth = _decide(
+            client,
+            keys=[
+                _queue_key() if same_instance else "",
+                f"prefetch:cooldown:{district_key}",
+                "prefetch:bucket:global",
+                f"prefetch:bucket:district:{district_key}",
+                DECISIONS_KEY,
+            ],
+            args=[
+                settings.prefetch_max_queue,
+                settings.prefetch_max_redis_keys,
+                int(settings.prefetch_min_interval_sec * 1000),
+                cost,
+                int(time.time() * 1000),
+                global_burst,
+                global_rate / 1000,
+                district_burst,
+                district_rate / 1000,
+                bucket_ttl_ms,
+                measured_depth,
+            ],
+        )
     except Exception as exc:  # pragma: no cover - defensive
-        LOGGER.warning("prefetch_complexity_check_failed", error=str(exc))
-
-    return False, ""
+        # Without Redis the prefetch enqueue would fail anyway.
+        LOGGER.warning("prefetch_throttle_check_failed", error=str(exc))
+        return True, "unavailable"
+
+    reason = reason.decode("utf-8") if isinstance(reason, bytes) else str(reason)
+    if int(allowed):
+        return False, ""
+    LOGGER.debug("prefetch_throttle_decision", reason=reason, queue_depth=depth)
+    return True, reason
@@ -2,27 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
 import mimetypes
 import re
-import shutil
+import secrets
+import threading
 import urllib.parse
 from calendar import month_abbr, month_name
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime
 from functools import lru_cache
-from io import BytesIO
 from pathlib import Path
+from typing import AsyncIterable, BinaryIO, Mapping
 from uuid import uuid4
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import BaseClient
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 import structlog
 
 from app.backend.src.core.config import get_settings
+from app.backend.src.core.storage import (
+    LocalFilesystemStorage,
+    StorageBackend,
+    StorageWriter,
+)
 
 LOGGER = structlog.get_logger(__name__)
 
+# S3 rejects multipart parts smaller than 5 MiB (except the last one).
+_MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 def _local_bucket_root() -> Path:
     settings = get_settings()
@@ -35,6 +47,22 @@ def _is_local_mode() -> bool:
     return get_settings().aws_s3_bucket.lower() == "local"
 
 
+@lru_cache(maxsize=1)
+def _ephemeral_signing_key() -> str:
+    LOGGER.warning(
+        "local_storage_signing_key_ephemeral",
+        detail=(
+            "LOCAL_STORAGE_SIGNING_KEY is not set; download URLs are signed with a "
+            "per-process key and only verify in the process that issued them."
+        ),
+    )
+    return secrets.token_hex(32)
+
+
+def _local_signing_key() -> str:
+    return get_settings().local_storage_signing_key or _ephemeral_signing_key()
+
+
 @lru_cache()
 def _resolve_bucket_region() -> str | None:
     """Return the region for the configured S3 bucket."""
@@ -99,6 +127,351 @@ def _client() -> BaseClient:
     return boto3.client("s3", **client_kwargs)
 
 
+class S3MultipartWriter(StorageWriter):
+    """Stream an object into S3 as a multipart upload with parallel parts.
+
+    Full parts are handed to a thread pool while the caller keeps writing; at
+    most ``max_concurrency`` parts are in flight, which bounds memory to a few
+    part buffers regardless of the object size. Streams that never fill a part
+    are sent with a single ``put_object``.
+
+    ``upload_id`` and ``completed_parts`` can be persisted and passed back in to
+    resume an interrupted upload; the caller resumes writing its source from
+    ``resume_offset``, the start of the first part S3 does not have. With
+    ``resumable=True`` an exception leaves the upload open instead of
+    aborting it, so that state can be saved.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        bucket: str,
+        key: str,
+        *,
+        content_type: str,
+        part_size: int,
+        max_concurrency: int,
+        upload_id: str | None = None,
+        completed_parts: Mapping[int, str] | None = None,
+        resumable: bool = False,
+    ) -> None:
+        super().__init__()
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(int(part_size), _MIN_PART_SIZE)
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.upload_id = upload_id
+        self.resumable = resumable
+        self._client = client
+        # Parts finish out of order, so a failed upload can hold 1, 2 and 4
+        # without 3. Resume at the first gap and upload everything after it
+        # again; parts beyond the gap are replaced as they are re-sent.
+        completed = dict(completed_parts or {})
+        self._next_part = 1
+        while self._next_part in completed:
+            self._next_part += 1
+        self.completed_parts: dict[int, str] = {
+            number: etag for number, etag in completed.items() if number < self._next_part
+        }
+        self._buffer = bytearray()
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._pending: list[Future[None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def resume_offset(self) -> int:
+        """Byte offset in the source at which a resumed upload continues."""
+
+        return (self._next_part - 1) * self.part_size
+
+    def _write(self, data: memoryview) -> None:
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit_part(part)
+
+    def _start_upload(self) -> ThreadPoolExecutor:
+        if self.upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+            )
+            self.upload_id = response["UploadId"]
+            LOGGER.info(
+                "s3_multipart_started",
+                bucket=self.bucket,
+                key=self.key,
+                upload_id=self.upload_id,
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="s3-part"
+            )
+        return self._executor
+
+    def _submit_part(self, payload: bytes) -> None:
+        executor = self._start_upload()
+        self._raise_for_failed_parts()
+        # Block the producer while max_concurrency parts are already in flight.
+        self._slots.acquire()
+        part_number = self._next_part
+        self._next_part += 1
+        future = executor.submit(self._upload_part, part_number, payload)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending.append(future)
+
+    def _upload_part(self, part_number: int, payload: bytes) -> None:
+        response = self._client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=payload,
+        )
+        with self._lock:
+            self.completed_parts[part_number] = response["ETag"]
+
+    def _raise_for_failed_parts(self) -> None:
+        still_pending: list[Future[None]] = []
+        for future in self._pending:
+            if future.done():
+                future.result()
+            else:
+                still_pending.append(future)
+        self._pending = still_pending
+
+    def _commit(self) -> None:
+        try:
+            if self.upload_id is None:
+                self._client.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(self._buffer),
+                    ContentType=self.content_type,
+                )
+                LOGGER.info("uploaded_s3", bucket=self.bucket, key=self.key)
+                return
+
+            if self._buffer:
+                self._submit_part(bytes(self._buffer))
+                self._buffer.clear()
+            for future in self._pending:
+                future.result()
+            self._pending = []
+
+            parts = [
+                {"PartNumber": number, "ETag": etag}
+                for number, etag in sorted(self.completed_parts.items())
+            ]
+            self._client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            LOGGER.info(
+                "s3_multipart_completed",
+                bucket=self.bucket,
+                key=self.key,
+                parts=len(parts),
+                size=self.tell(),
+            )
+        except BaseException:
+            if self.resumable:
+                self._suspend()
+            else:
+                self._abort()
+            raise
+        finally:
+            self._shutdown()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and self.resumable and not self.closed:
+            self.closed = True
+            self._suspend()
+            return
+        super().__exit__(exc_type, exc, tb)
+
+    def _suspend(self) -> None:
+        """Stop uploading but keep the multipart upload open for a resume."""
+
+        for future in self._pending:
+            future.cancel()
+        # Let in-flight parts finish so ``completed_parts`` is accurate.
+        self._shutdown()
+        self._pending = []
+        self._buffer.clear()
+        LOGGER.warning(
+            "s3_multipart_suspended",
+            bucket=self.bucket,
+            key=self.key,
+            upload_id=self.upload_id,
+            parts=len(self.completed_parts),
+        )
+
+    def _abort(self) -> None:
+        for future in self._pending:
+            future.cancel()
+        self._shutdown()
+        self._buffer.clear()
+        if self.upload_id is None:
+            return
+        try:
+            self._client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+            LOGGER.warning(
+                "s3_multipart_aborted",
+                bucket=self.bucket,
+                key=self.key,
+                upload_id=self.upload_id,
+            )
+        except (BotoCoreError, ClientError) as exc:  # pragma: no cover - defensive
+            LOGGER.warning(
+                "s3_multipart_abort_failed",
+                bucket=self.bucket,
+                key=self.key,
+                error=str(exc),
+            )
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class S3StorageBackend:
+    """Storage backend that writes to the configured S3 bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        part_size: int = 16 * 1024 * 1024,
+        max_concurrency: int = 4,
+    ) -> None:
+        self.bucket = bucket
+        self.part_size = max(part_size, _MIN_PART_SIZE)
+        self.max_concurrency = max(max_concurrency, 1)
+
+    def put(self, key: str, data: bytes, *, content_type: str | None = None) -> str:
+        try:
+            with self.open_writer(key, content_type=content_type) as writer:
+                writer.write(data)
+        except (BotoCoreError, NoCredentialsError) as exc:
+            LOGGER.error("s3_upload_failed", error=str(exc))
+            raise
+        return key
+
+    def open_writer(
+        self,
+        key: str,
+        *,
+        content_type: str | None = None,
+        upload_id: str | None = None,
+        completed_parts: Mapping[int, str] | None = None,
+        resumable: bool = False,
+    ) -> S3MultipartWriter:
+        return S3MultipartWriter(
+            _client(),
+            self.bucket,
+            key,
+            content_type=_determine_content_type(key, content_type),
+            part_size=self.part_size,
+            max_concurrency=self.max_concurrency,
+            upload_id=upload_id,
+            completed_parts=completed_parts,
+            resumable=resumable,
+        )
+
+    def put_file(
+        self, key: str, path: Path, *, content_type: str | None = None
+    ) -> str:
+        try:
+            _client().upload_file(
+                Filename=str(path),
+                Bucket=self.bucket,
+                Key=key,
+                ExtraArgs={"ContentType": _determine_content_type(key, content_type)},
+                Config=TransferConfig(
+                    multipart_threshold=self.part_size,
+                    multipart_chunksize=self.part_size,
+                    max_concurrency=self.max_concurrency,
+                ),
+            )
+        except (BotoCoreError, NoCredentialsError) as exc:
+            LOGGER.error("s3_upload_failed", error=str(exc))
+            raise
+        LOGGER.info("uploaded_s3", bucket=self.bucket, key=key)
+        return key
+
+    def get(self, key: str) -> bytes:
+        response = _client().get_object(Bucket=self.bucket, Key=key)
+        return response["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            _client().head_object(Bucket=self.bucket, Key=key)
+        except ClientError:
+            return False
+        return True
+
+    def url(
+        self,
+        key: str,
+        *,
+        expires_in: int = 3600,
+        download_name: str | None = None,
+        content_type: str | None = None,
+        disposition: str = "attachment",
+    ) -> str:
+        params: dict[str, str] = {"Bucket": self.bucket, "Key": key}
+
+        if download_name:
+            safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", download_name)
+            params["ResponseContentDisposition"] = (
+                f'{disposition}; filename="{safe_name}"'
+            )
+
+        if content_type:
+            params["ResponseContentType"] = content_type
+
+        client = _client()
+        LOGGER.info(
+            "presign_debug",
+            bucket=self.bucket,
+            region=get_settings().aws_region or client.meta.region_name,
+            sanitized_key=key,
+            response_headers={
+                k: v for k, v in params.items() if k.startswith("Response")
+            },
+        )
+        return client.generate_presigned_url(
+            "get_object",
+            Params=params,
+            ExpiresIn=expires_in,
+        )
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the storage backend selected by ``AWS_S3_BUCKET``."""
+
+    settings = get_settings()
+    if _is_local_mode():
+        return LocalFilesystemStorage(
+            _local_bucket_root(),
+            base_url=settings.local_storage_base_url,
+            signing_key=_local_signing_key(),
+        )
+    return S3StorageBackend(
+        settings.aws_s3_bucket,
+        part_size=settings.s3_multipart_part_size_mb * 1024 * 1024,
+        max_concurrency=settings.s3_multipart_max_concurrency,
+    )
+
+
 def sanitize_company_name(company_name: str | None) -> str:
     """Return a deterministic, ASCII-only company segment for S3 paths."""
 
@@ -252,8 +625,7 @@ def upload_file(
     company_name: str | None = None,
     reference_date: date | datetime | str | None = None,
 ) -> str:
-    """Upload a file to S3 or local storage and return the object key."""
-    settings = get_settings()
+    """Upload a file to the configured storage backend and return the object key."""
     safe_filename = re.sub(r"[\\/]+", "_", file_path.name).strip()
     safe_filename = re.sub(r"_+", "_", safe_filename)
     object_key = _resolve_object_key(
@@ -264,26 +636,9 @@ def upload_file(
     )
     resolved_content_type = _determine_content_type(safe_filename, content_type)
 
-    if _is_local_mode():
-        destination = _local_bucket_root() / object_key
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy(file_path, destination)
-        LOGGER.info("stored_local", key=object_key, path=str(destination))
-        return object_key
-
-    try:
-        client = _client()
-        client.upload_file(
-            Filename=str(file_path),
-            Bucket=settings.aws_s3_bucket,
-            Key=object_key,
-            ExtraArgs={"ContentType": resolved_content_type},
-        )
-        LOGGER.info("uploaded_s3", bucket=settings.aws_s3_bucket, key=object_key)
-        return object_key
-    except (BotoCoreError, NoCredentialsError) as exc:
-        LOGGER.error("s3_upload_failed", error=str(exc))
-        raise
+    return get_storage_backend().put_file(
+        object_key, file_path, content_type=resolved_content_type
+    )
 
 
 def upload_bytes(
@@ -296,7 +651,6 @@ def upload_bytes(
     reference_date: date | datetime | str | None = None,
 ) -> str:
     """Upload in-memory data to storage and return the object key."""
-    settings = get_settings()
     safe_filename = re.sub(r"[\\/]+", "_", filename).strip()
     safe_filename = re.sub(r"_+", "_", safe_filename)
     object_key = _resolve_object_key(
@@ -307,26 +661,69 @@ def upload_bytes(
     )
     resolved_content_type = _determine_content_type(safe_filename, content_type)
 
-    if _is_local_mode():
-        destination = _local_bucket_root() / object_key
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        destination.write_bytes(data)
-        LOGGER.info("stored_local", key=object_key, path=str(destination))
-        return object_key
+    return get_storage_backend().put(
+        object_key, data, content_type=resolved_content_type
+    )
+
+
+def open_upload_stream(
+    key: str,
+    *,
+    content_type: str | None = None,
+) -> StorageWriter:
+    """Return a writer that streams ``key`` into storage.
+
+    Use it as a context manager; the object is committed on a clean exit and
+    discarded if the block raises::
+
+        with open_upload_stream(key, content_type="application/zip") as stream:
+            with ZipFile(stream, "w", ZIP_DEFLATED) as archive:
+                ...
+    """
+
+    object_key = sanitize_object_key(key)
+    return get_storage_backend().open_writer(
+        object_key,
+        content_type=_determine_content_type(object_key, content_type),
+    )
+
+
+def upload_stream(
+    fileobj: BinaryIO,
+    *,
+    key: str,
+    content_type: str | None = None,
+    chunk_size: int = 1024 * 1024,
+) -> str:
+    """Copy a readable file handle into storage without buffering it whole."""
 
+    with open_upload_stream(key, content_type=content_type) as stream:
+        while chunk := fileobj.read(chunk_size):
+            stream.write(chunk)
+    return sanitize_object_key(key)
+
+
+async def upload_async_stream(
+    chunks: AsyncIterable[bytes],
+    *,
+    key: str,
+    content_type: str | None = None,
+) -> str:
+    """Copy an async byte iterator into storage.
+
+    Writes run in a worker thread because a multipart writer blocks while its
+    in-flight part limit is reached.
+    """
+
+    stream = open_upload_stream(key, content_type=content_type)
     try:
-        client = _client()
-        client.upload_fileobj(
-            Fileobj=BytesIO(data),
-            Bucket=settings.aws_s3_bucket,
-            Key=object_key,
-            ExtraArgs={"ContentType": resolved_content_type},
-        )
-        LOGGER.info("uploaded_s3", bucket=settings.aws_s3_bucket, key=object_key)
-        return object_key
-    except (BotoCoreError, NoCredentialsError) as exc:
-        LOGGER.error("s3_upload_failed", error=str(exc))
+        async for chunk in chunks:
+            await asyncio.to_thread(stream.write, chunk)
+        await asyncio.to_thread(stream.close)
+    except BaseException:
+        await asyncio.to_thread(stream.abort)
         raise
+    return sanitize_object_key(key)
 
 
 def sanitize_object_key(key: str) -> str:
@@ -349,36 +746,16 @@ def generate_presigned_url(
     expires_in: int = 3600,
     download_name: str | None = None,
     response_content_type: str | None = None,
+    disposition: str = "attachment",
 ) -> str:
     """Generate a presigned URL; optionally control the downloaded filename."""
 
-    settings = get_settings()
-    sanitized_key = sanitize_object_key(key)
-
-    if _is_local_mode():
-        return (_local_bucket_root() / sanitized_key).resolve().as_uri()
-
-    params: dict[str, str] = {"Bucket": settings.aws_s3_bucket, "Key": sanitized_key}
-
-    if download_name:
-        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", download_name)
-        params["ResponseContentDisposition"] = f'attachment; filename="{safe_name}"'
-
-    if response_content_type:
-        params["ResponseContentType"] = response_content_type
-
-    client = _client()
-    LOGGER.info(
-        "presign_debug",
-        bucket=settings.aws_s3_bucket,
-        region=settings.aws_region or client.meta.region_name,
-        sanitized_key=sanitized_key,
-        response_headers={k: v for k, v in params.items() if k.startswith("Response")},
-    )
-    return client.generate_presigned_url(
-        "get_object",
-        Params=params,
-        ExpiresIn=expires_in,
+    return get_storage_backend().url(
+        sanitize_object_key(key),
+        expires_in=expires_in,
+        download_name=download_name,
+        content_type=response_content_type,
+        disposition=disposition,
     )
 
 
@@ -389,8 +766,14 @@ def get_s3_client() -> BaseClient:
 
 
 __all__ = [
+    "S3MultipartWriter",
+    "S3StorageBackend",
+    "get_storage_backend",
+    "open_upload_stream",
+    "upload_async_stream",
     "upload_file",
     "upload_bytes",
+    "upload_stream",
     "generate_presigned_url",
     "sanitize_object_key",
     "get_s3_client",
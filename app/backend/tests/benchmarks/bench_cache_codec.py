@@ -0,0 +1,100 @@
+"""Benchmark cache payload size and encode/decode cost for each codec.
+
+Run from the repository root::
+
+    python app/backend/tests/benchmarks/bench_cache_codec.py --rows 200 --repeat 200
+
+Payloads mimic a cached AgentResponse: ``rows`` plus the rendered HTML table
+of the same rows. ``legacy`` is the plain ``json.dumps`` text stored before
+codecs existed. Codecs whose optional library is missing are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+from app.backend.src.core import codec as codec_module
+from app.backend.src.core.codec import PayloadCodec, decode_payload
+
+SPECS = [
+    "legacy",
+    "orjson",
+    "json+zlib",
+    "orjson+zlib",
+    "msgpack",
+    "msgpack+zlib",
+    "orjson+zstd",
+    "msgpack+zstd",
+]
+
+
+def _payload(rows: int) -> dict:
+    students = ["Ana Lopez", "Ben Smith", "Carla Diaz", "Dev Patel", "Eli Chen"]
+    data = [
+        {
+            "student": students[i % len(students)],
+            "clinician": f"Clinician {i % 7}",
+            "service_month": f"2024-{(i % 12) + 1:02d}",
+            "total_hours": round(1.5 + (i % 9) * 0.75, 2),
+            "total_cost": round((1.5 + (i % 9) * 0.75) * 72.5, 2),
+        }
+        for i in range(rows)
+    ]
+    header = "".join(f"<th>{column}</th>" for column in data[0])
+    body = "".join(
+        "<tr>" + "".join(f"<td>{value}</td>" for value in row.values()) + "</tr>" for row in data
+    )
+    return {
+        "text": f"Monthly hours and cost for {rows} student-months.",
+        "html": f'<table class="analytics-table"><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>',
+        "rows": data,
+        "timings": {"total_seconds": 1.2},
+    }
+
+
+def _available(spec: str) -> bool:
+    serializer, _, compression = spec.partition("+")
+    needs = {"orjson": codec_module.orjson, "msgpack": codec_module.msgpack, "zstd": codec_module.zstandard}
+    return all(needs.get(part, True) is not None for part in (serializer, compression))
+
+
+def _best_us(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = _payload(args.rows)
+    baseline = len(json.dumps(payload).encode("utf-8"))
+    print(f"{args.rows} rows, legacy JSON {baseline} bytes")
+    print(f"{'codec':<14}{'bytes':>9}{'saved':>8}{'encode us':>12}{'decode us':>12}")
+    for spec in SPECS:
+        if not _available(spec):
+            print(f"{spec:<14}  skipped (library not installed)")
+            continue
+        codec = PayloadCodec.from_spec(spec)
+        encoded = codec.encode(payload)
+        assert decode_payload(encoded) == payload
+        encode_us = _best_us(lambda: codec.encode(payload), args.repeat)
+        decode_us = _best_us(lambda: decode_payload(encoded), args.repeat)
+        saved = 1 - len(encoded) / baseline
+        print(f"{spec:<14}{len(encoded):>9}{saved:>8.0%}{encode_us:>12.1f}{decode_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Benchmark the district vendor overview against a large line-item history.
+
+Run from the repository root::
+
+    python app/backend/tests/benchmarks/bench_district_overview.py --line-items 1000000
+
+The script seeds a throwaway SQLite database (or ``--database-url``) with one
+district, ``--vendors`` vendors and enough invoices to reach the requested
+number of line items spread over ``--months`` months. It then times the
+overview aggregation and a page of student detail.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.backend.src.db.base import Base
+from app.backend.src.models import District, Invoice, InvoiceLineItem, Vendor
+from app.backend.src.services import district_overview
+
+STUDENTS_PER_VENDOR_MONTH = 40
+BATCH_SIZE = 50_000
+
+
+def _seed(engine, *, line_items: int, vendors: int, months: int) -> int:
+    invoices_needed = vendors * months * STUDENTS_PER_VENDOR_MONTH
+    items_per_invoice = max(1, line_items // invoices_needed)
+
+    with Session(engine) as session:
+        district = District(company_name="Bench District", district_key="BENCH")
+        session.add(district)
+        session.flush()
+        district_id = district.id
+
+        session.execute(
+            insert(Vendor),
+            [
+                {
+                    "id": vendor_id,
+                    "company_name": f"Vendor {vendor_id:03d}",
+                    "contact_email": f"vendor{vendor_id}@example.com",
+                    "district_key": "BENCH",
+                }
+                for vendor_id in range(1, vendors + 1)
+            ],
+        )
+
+        invoice_rows: list[dict[str, object]] = []
+        item_rows: list[dict[str, object]] = []
+        invoice_id = 0
+        for vendor_id in range(1, vendors + 1):
+            for offset in range(months):
+                year = 2023 + offset // 12
+                month = offset % 12 + 1
+                for student in range(STUDENTS_PER_VENDOR_MONTH):
+                    invoice_id += 1
+                    number = f"INV-{invoice_id:08d}"
+                    invoice_rows.append(
+                        {
+                            "id": invoice_id,
+                            "vendor_id": vendor_id,
+                            "student_name": f"Student {student:03d}",
+                            "invoice_number": number,
+                            "invoice_code": "",
+                            "service_month": datetime(year, month, 1).strftime("%B %Y"),
+                            "service_year": year,
+                            "service_month_num": month,
+                            "invoice_date": datetime(year, month, 28, tzinfo=timezone.utc),
+                            "total_hours": float(items_per_invoice),
+                            "total_cost": 70.0 * items_per_invoice,
+                            "status": "approved" if offset < months - 1 else "generated",
+                            "pdf_s3_key": f"invoices/bench/{number}.pdf",
+                            "district_key": "BENCH",
+                        }
+                    )
+                    for day in range(items_per_invoice):
+                        item_rows.append(
+                            {
+                                "invoice_id": invoice_id,
+                                "invoice_number": number,
+                                "student": f"Student {student:03d}",
+                                "clinician": f"Clinician {day % 7}",
+                                "service_code": "LVN" if day % 2 else "RN",
+                                "hours": 1.0,
+                                "rate": 70.0,
+                                "cost": 70.0,
+                                "service_date": f"{year:04d}-{month:02d}-{day % 28 + 1:02d}",
+                            }
+                        )
+                    if len(item_rows) >= BATCH_SIZE:
+                        session.execute(insert(Invoice), invoice_rows)
+                        session.execute(insert(InvoiceLineItem), item_rows)
+                        invoice_rows, item_rows = [], []
+
+        if invoice_rows:
+            session.execute(insert(Invoice), invoice_rows)
+        if item_rows:
+            session.execute(insert(InvoiceLineItem), item_rows)
+        session.commit()
+    return district_id
+
+
+def _time(label: str, func, repeat: int) -> None:
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        samples.append(perf_counter() - start)
+    samples.sort()
+    print(f"{label:<32} best={samples[0] * 1000:9.1f} ms  median={samples[len(samples) // 2] * 1000:9.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--line-items", type=int, default=1_000_000)
+    parser.add_argument("--vendors", type=int, default=25)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    # Presigning is not what is being measured here.
+    district_overview.generate_presigned_url = lambda key, **_: f"https://bench/{key}"
+
+    start = perf_counter()
+    district_id = _seed(
+        engine, line_items=args.line_items, vendors=args.vendors, months=args.months
+    )
+    with Session(engine) as session:
+        total_items = session.query(InvoiceLineItem).count()
+    print(f"seeded {total_items:,} line items in {perf_counter() - start:.1f}s ({url})")
+
+    with Session(engine) as session:
+        _time(
+            "fetch_district_vendor_overview",
+            lambda: district_overview.fetch_district_vendor_overview(session, district_id),
+            args.repeat,
+        )
+        _time(
+            "fetch_vendor_month_students",
+            lambda: district_overview.fetch_vendor_month_students(
+                session, district_id, 1, 2024, 12, page=1, page_size=50
+            ),
+            args.repeat,
+        )
+
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark per-query intent and router-trigger matching against domain_config.json.
+
+Run from the repository root::
+
+    python app/backend/tests/benchmarks/bench_intent_matching.py --repeat 5
+
+Each question from ``01_district_eval_questions.jsonl`` is scored the way the
+agent did before configs were compiled (reparse the JSON, then scan every
+``intent_synonyms`` and ``triggers`` entry) and with the compiled
+Aho-Corasick matcher. The script checks that both agree before timing them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+from app.backend.src.agents import domain_config_loader
+from app.backend.src.agents.domain_config_loader import get_domain_config
+
+QUESTIONS_PATH = Path(domain_config_loader.__file__).parent / "01_district_eval_questions.jsonl"
+
+
+def _legacy_match(query: str) -> tuple[dict[str, int], list[str]]:
+    with domain_config_loader.CONFIG_PATH.open("r", encoding="utf-8") as f:
+        config = json.load(f)
+    q = query.lower()
+    scores: dict[str, int] = {}
+    for kind_name, cfg in (config.get("plan_kinds") or {}).items():
+        for syn in cfg.get("intent_synonyms") or []:
+            syn_l = syn.strip().lower() if isinstance(syn, str) else ""
+            if syn_l and syn_l in q:
+                scores[kind_name] = scores.get(kind_name, 0) + 1
+    modes: list[str] = []
+    for mode_key, cfg in (config.get("router_modes") or {}).items():
+        triggers = cfg.get("triggers", []) if isinstance(cfg, dict) else []
+        if any(isinstance(t, str) and t.lower() in q for t in triggers):
+            modes.append(mode_key)
+    return scores, modes
+
+
+def _compiled_match(query: str) -> tuple[dict[str, int], list[str]]:
+    compiled = get_domain_config()
+    return compiled.intent_scores(query), compiled.triggered_modes(query)
+
+
+def _time(label: str, func, questions: list[str], repeat: int) -> None:
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for question in questions:
+            func(question)
+        samples.append((perf_counter() - start) / len(questions))
+    samples.sort()
+    print(
+        f"{label:<12} best={samples[0] * 1e6:9.1f} us/query  "
+        f"median={samples[len(samples) // 2] * 1e6:9.1f} us/query"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    with QUESTIONS_PATH.open("r", encoding="utf-8") as f:
+        questions = [json.loads(line)["question"] for line in f if line.strip()]
+    questions = questions[: args.limit] if args.limit else questions
+
+    mismatches = [q for q in questions if _legacy_match(q) != _compiled_match(q)]
+    if mismatches:
+        raise SystemExit(f"compiled matcher disagrees on {len(mismatches)} questions, e.g. {mismatches[0]!r}")
+
+    compiled = get_domain_config()
+    print(f"{len(questions)} questions, {compiled.matcher.size} patterns")
+    _time("legacy", _legacy_match, questions, args.repeat)
+    _time("compiled", _compiled_match, questions, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Tests for the server-sent analytics streaming endpoint."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.backend.src.agents.district_analytics_agent import AgentResponse
+from app.backend.src.api import agents as agents_api
+from app.backend.src.models import User
+
+app = FastAPI()
+app.include_router(agents_api.router, prefix="/api")
+
+
+@pytest.fixture(autouse=True)
+def override_user() -> None:
+    app.dependency_overrides[agents_api.get_current_user] = lambda: User(
+        id=7, email="d@example.com", name="D", role="district", is_approved=True, district_id=3
+    )
+    yield
+    app.dependency_overrides.clear()
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_emits_rows_before_final(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen_context: dict = {}
+
+    async def _fake_agent(*, query, user_context, on_event):
+        seen_context.update(user_context)
+        on_event("stage_started", {"stage": "nlv_model"})
+        on_event("rows_ready", {"rows": [{"student_name": "A"}], "html": "<table></table>"})
+        on_event("insights_ready", {"insights": ["One student."]})
+        return AgentResponse(text="Done", html="<p>Done</p>", rows=[{"student_name": "A"}])
+
+    monkeypatch.setattr(agents_api, "_aexecute_analytics_agent", _fake_agent)
+
+    response = TestClient(app).post("/api/agents/analytics/stream", json={"query": "list students"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(response.text)
+    assert [name for name, _ in events] == [
+        "stage_started",
+        "rows_ready",
+        "insights_ready",
+        "final",
+    ]
+    assert events[1][1]["html"] == "<table></table>"
+    assert events[-1][1]["text"] == "Done"
+    assert seen_context["district_id"] == 3
+
+
+def test_stream_reports_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _failing_agent(*, query, user_context, on_event):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(agents_api, "_aexecute_analytics_agent", _failing_agent)
+
+    response = TestClient(app).post("/api/agents/analytics/stream", json={"query": "x"})
+
+    events = _parse_events(response.text)
+    assert events == [("error", {"detail": "Analytics agent is temporarily unavailable."})]
@@ -0,0 +1,477 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents import district_analytics_agent
+from app.backend.src.agents.async_llm import run_model_async
+from app.backend.src.agents.district_analytics_agent import AgentContext, Workflow
+from app.backend.src.agents.multi_turn_model import (
+    ConversationState,
+    MultiTurnConversationManager,
+)
+from app.backend.src.agents.insight_model import arun_insight_model, run_insight_model
+from app.backend.src.agents.ir import AnalyticsIR
+from app.backend.src.agents.nlv_model import run_nlv_model
+from app.backend.src.agents.query_cache import intent_cache_key
+from app.backend.src.agents.validator_model import arun_validator_model
+from app.backend.src.core.memory import RedisConversationMemory
+from app.backend.src.services.prefetch_predictor import build_candidates
+
+
+class FakeAsyncClient:
+    def __init__(self, content: str | None = None, error: Exception | None = None) -> None:
+        self.requests: list[dict] = []
+        self._content = content
+        self._error = error
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        if self._error is not None:
+            raise self._error
+        message = SimpleNamespace(content=self._content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _ir() -> AnalyticsIR:
+    return AnalyticsIR(text="", rows=[{"month": "Aug", "total": 10}, {"month": "Sep", "total": 20}])
+
+
+def test_async_stage_awaits_client_and_reuses_parsing() -> None:
+    client = FakeAsyncClient(json.dumps({"insights": ["September is higher."]}))
+
+    result = asyncio.run(
+        arun_insight_model(
+            ir=_ir(), client=client, model="m", system_prompt="sys", temperature=0.1
+        )
+    )
+
+    assert result == {"insights": ["September is higher."]}
+    assert len(client.requests) == 1
+    assert client.requests[0]["model"] == "m"
+    assert client.requests[0]["messages"][0] == {"role": "system", "content": "sys"}
+
+
+def test_async_stage_runs_sync_stage_once_on_the_loop_thread() -> None:
+    client = FakeAsyncClient(json.dumps({"insights": ["x"]}))
+    passes: list[int] = []
+
+    def _stage(**kwargs):
+        passes.append(threading.get_ident())
+        return run_insight_model(**kwargs)
+
+    result = asyncio.run(
+        run_model_async(
+            _stage, client=client, ir=_ir(), model="m", system_prompt="sys", temperature=0.1
+        )
+    )
+
+    assert result == {"insights": ["x"]}
+    assert passes == [threading.get_ident()]
+    assert len(client.requests) == 1
+
+
+class FakeAsyncRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.threads: set[int] = set()
+
+    async def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.threads.add(threading.get_ident())
+        self.store[key] = value
+
+
+_PROMPTS = dict.fromkeys(
+    [
+        "nlv_system_prompt",
+        "entity_resolution_system_prompt",
+        "sql_planner_system_prompt",
+        "router_system_prompt",
+        "logic_system_prompt",
+        "rendering_system_prompt",
+        "validator_system_prompt",
+        "insight_system_prompt",
+        "business_rule_system_prompt",
+    ],
+    "",
+)
+
+
+def test_native_multi_turn_calls_await_the_async_clients() -> None:
+    memory = RedisConversationMemory("redis://localhost:6379/15")
+    memory._async_client = FakeAsyncRedis()
+    sync_client = SimpleNamespace()
+    agent = SimpleNamespace(
+        multi_turn_manager=MultiTurnConversationManager(memory.client, llm_client=sync_client),
+        client=sync_client,
+        async_client=FakeAsyncClient("{}"),
+    )
+    workflow = Workflow(**_PROMPTS, memory=memory)
+    context = AgentContext(query="q", native_async=True)
+
+    async def _turn():
+        state = ConversationState(last_plan_kind="caseload")
+        await workflow._multi_turn(agent, context, "save_state", state, "s1")
+        return await workflow._multi_turn(agent, context, "get_state", "s1")
+
+    state = asyncio.run(_turn())
+
+    assert state.last_plan_kind == "caseload"
+    assert memory._async_client.threads == {threading.get_ident()}
+    # The shared manager keeps its blocking clients for threaded runs.
+    assert agent.multi_turn_manager.redis is memory.client
+
+
+def test_fast_path_answer_makes_no_model_call_in_either_mode(monkeypatch) -> None:
+    module = district_analytics_agent
+    store: dict = {}
+
+    async def _aget(key, **_):
+        return store.get(key)
+
+    async def _aset(key, value, **_):
+        store[key] = value
+
+    cache = SimpleNamespace(
+        get=lambda key, **_: store.get(key),
+        set=lambda key, value, **_: store.__setitem__(key, value),
+        aget=_aget,
+        aset=_aset,
+    )
+    for name in ("CACHE", "QUERY_CACHE"):
+        monkeypatch.setattr(module, name, cache)
+    monkeypatch.setattr(
+        module,
+        "_load_district_entities",
+        lambda engine, district_key: {"students": ["Ana Lopez"], "vendors": [], "clinicians": []},
+    )
+    monkeypatch.setattr(module, "_load_data_version", lambda engine, district_key: 1)
+    monkeypatch.setattr(module, "fetch_materialized_report", lambda **_: None)
+
+    async def _no_report(**_):
+        return None
+
+    monkeypatch.setattr(module, "afetch_materialized_report", _no_report)
+
+    completions: list[str] = []
+
+    def _create(**kwargs):
+        completions.append("sync")
+        raise AssertionError("model called")
+
+    class CountingAsyncClient:
+        def __init__(self) -> None:
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        async def _create(self, **kwargs):
+            completions.append("async")
+            raise AssertionError("model called")
+
+    class RunSql:
+        async def ainvoke(self, context, arguments):
+            return [{"student": "Ana Lopez", "service_month": "August", "total_cost": 100}]
+
+    agent = SimpleNamespace(
+        multi_turn_manager=None,
+        client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create))),
+        async_client=CountingAsyncClient(),
+        nlv_model="m",
+        nlv_temperature=0,
+        lookup_tool=lambda name: RunSql(),
+    )
+    workflow = Workflow(**_PROMPTS)
+    rows = [{"student": "Ana Lopez", "service_month": "August", "total_cost": 100}]
+
+    native = asyncio.run(
+        workflow.aexecute(agent, "monthly spend for Ana Lopez", {"district_key": "D1"})
+    )
+    threaded = workflow.execute(agent, "monthly spend for Ana Lopez", {"district_key": "D1"})
+
+    assert native.rows == rows
+    assert threaded.rows == rows
+    assert completions == []
+
+
+def test_fast_path_serves_the_report_a_templated_prefetch_wrote(monkeypatch) -> None:
+    module = district_analytics_agent
+    store: dict = {}
+    marked: list[str] = []
+    hits: list[str] = []
+    sql: list[str] = []
+
+    async def _aget(key, **_):
+        return store.get(key)
+
+    async def _aset(key, value, **_):
+        store[key] = value
+
+    cache = SimpleNamespace(
+        get=lambda key, **_: store.get(key),
+        set=lambda key, value, **_: store.__setitem__(key, value),
+        aget=_aget,
+        aset=_aset,
+    )
+    for name in ("CACHE", "QUERY_CACHE"):
+        monkeypatch.setattr(module, name, cache)
+    monkeypatch.setattr(
+        module,
+        "_load_district_entities",
+        lambda engine, district_key: {"students": ["Ana Lopez"], "vendors": [], "clinicians": []},
+    )
+    monkeypatch.setattr(module, "_load_data_version", lambda engine, district_key: 3)
+    monkeypatch.setattr(module, "fetch_materialized_report", lambda **_: None)
+    monkeypatch.setattr(module, "persist_materialized_report", lambda **_: None)
+    monkeypatch.setattr(
+        module, "mark_prefetched", lambda district_key, key, edge, **_: marked.append(key)
+    )
+
+    monkeypatch.setattr(module, "record_prefetch_hit", lambda district_key, key: hits.append(key))
+    monkeypatch.setattr(
+        module, "get_settings", lambda: SimpleNamespace(prefetch_enabled=True)
+    )
+
+    class RunSql:
+        async def ainvoke(self, context, arguments):
+            sql.append(arguments["query"])
+            return [{"student": "Ana Lopez", "service_month": "August", "total_cost": 100}]
+
+    agent = SimpleNamespace(
+        multi_turn_manager=None,
+        client=None,
+        async_client=None,
+        nlv_model="m",
+        nlv_temperature=0,
+        lookup_tool=lambda name: RunSql(),
+    )
+    workflow = Workflow(**_PROMPTS)
+    candidates = build_candidates(
+        "student_invoices",
+        {"student_name": "Ana Lopez"},
+        [("student_monthly_spend", 0.6), ("district_monthly_spend", 0.4)],
+    )
+
+    for candidate in candidates:
+        written = asyncio.run(
+            workflow.aprefetch(
+                agent,
+                candidate.query,
+                {
+                    "district_key": "D1",
+                    "session_id": "prefetch-1",
+                    "prefetch_edge": candidate.edge,
+                    "prefetch_intent": candidate.intent,
+                },
+            )
+        )
+        assert written is True
+    assert len(marked) == len(sql) == 2
+
+    # What the NLV model replies for the same questions, nulls and all.
+    def _nlv_reply(intent: str, scope: str, student: str | None) -> str:
+        return json.dumps(
+            {
+                "intent": intent,
+                "entities": {
+                    "student_name": student,
+                    "clinician_name": None,
+                    "vendor_name": None,
+                    "invoice_number": None,
+                    "student_name_candidates": [],
+                    "clinician_name_candidates": [],
+                },
+                "time_period": dict.fromkeys(
+                    ["month", "year", "school_year", "start_date", "end_date", "relative"]
+                ),
+                "scope": scope,
+                "requires_clarification": False,
+                "clarification_needed": [],
+            }
+        )
+
+    replies = [
+        _nlv_reply("student_monthly_spend", "single_student", "Ana Lopez"),
+        _nlv_reply("district_monthly_spend", "district", None),
+    ]
+    for candidate, reply, key in zip(candidates, replies, marked):
+        message = SimpleNamespace(content=reply)
+        client = SimpleNamespace(
+            chat=SimpleNamespace(
+                completions=SimpleNamespace(
+                    create=lambda **_: SimpleNamespace(choices=[SimpleNamespace(message=message)])
+                )
+            )
+        )
+        normalized = run_nlv_model(
+            user_query=candidate.query,
+            user_context={"district_key": "D1", "multi_turn_state": None},
+            client=client,
+            model="m",
+            system_prompt="",
+            temperature=0,
+        )
+        assert intent_cache_key(normalized, "D1", 3) == key
+
+    # The user's own question is answered from the prefetch without SQL.
+    response = asyncio.run(
+        workflow.aexecute(agent, "Monthly spend for Ana Lopez?", {"district_key": "D1"})
+    )
+
+    assert response.rows == [{"student": "Ana Lopez", "service_month": "August", "total_cost": 100}]
+    assert len(sql) == 2
+    assert hits == [marked[0]]
+
+
+def test_prefetch_under_a_windowed_seed_runs_the_models_without_the_fast_path() -> None:
+    workflow = Workflow(**_PROMPTS, fast_path=False)
+    intent = {"intent": "student_monthly_spend", "entities": {"student_name": "Ana Lopez"}}
+    context = {
+        "district_key": "D1",
+        "prefetch_intent": intent,
+        "multi_turn_state_seed": {"last_month": "August"},
+    }
+
+    assert asyncio.run(workflow.aprefetch(SimpleNamespace(), "monthly spend", context)) is False
+
+
+def test_cancelled_threaded_multi_turn_call_drops_its_state_writes() -> None:
+    writes: list[str] = []
+    release = threading.Event()
+
+    class BlockingRedis:
+        def get(self, key):
+            release.wait(5)
+            return None
+
+        def setex(self, key, ttl, value):
+            writes.append(key)
+
+    class Manager(MultiTurnConversationManager):
+        def process_user_message(self, session_id, message):
+            state = self.get_state(session_id)
+            self.save_state(state, session_id)
+            return {"state": state.to_dict(), "fused_query": message}
+
+    manager = Manager(BlockingRedis())
+    agent = SimpleNamespace(multi_turn_manager=manager, client=None, async_client=None)
+    workflow = Workflow(**_PROMPTS)
+    context = AgentContext(query="q")
+
+    async def _cancel_fusion():
+        task = asyncio.ensure_future(
+            workflow._multi_turn(agent, context, "process_user_message", "s1", "q")
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        release.set()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_cancel_fusion())
+
+    assert writes == []
+
+
+def test_async_stage_applies_sync_fallback_on_api_error() -> None:
+    client = FakeAsyncClient(error=RuntimeError("rate limited"))
+
+    result = asyncio.run(
+        run_model_async(
+            run_insight_model,
+            client=client,
+            ir=_ir(),
+            model="m",
+            system_prompt="sys",
+            temperature=0.1,
+        )
+    )
+
+    assert result == {"insights": []}
+
+
+def test_async_stage_short_circuit_skips_completion() -> None:
+    client = FakeAsyncClient("{}")
+    ir = AnalyticsIR(text="", rows=[{"student_name": "A"}])
+
+    result = asyncio.run(
+        arun_validator_model(ir=ir, client=client, model="m", system_prompt="", temperature=0)
+    )
+
+    assert result["valid"] is True
+    assert client.requests == []
+
+
+def test_async_stage_graph_runs_coroutines_concurrently() -> None:
+    from app.backend.src.agents.stage_graph import Stage, StageGraph
+
+    async def _sleep(_):
+        await asyncio.sleep(0.05)
+        return True
+
+    graph = StageGraph([Stage(f"s{i}", _sleep) for i in range(10)])
+
+    result = asyncio.run(graph.arun())
+
+    assert all(result.results.values())
+    assert max(span.end for span in result.spans.values()) < 0.4
+
+
+def test_sync_and_async_sql_helpers_return_the_same_rows(tmp_path) -> None:
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    module = district_analytics_agent
+    path = tmp_path / "analytics.db"
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for ddl in (
+            "CREATE TABLE invoices (id INT, district_key TEXT, student_name TEXT)",
+            "CREATE TABLE vendors (name TEXT, district_key TEXT)",
+            "CREATE TABLE invoice_line_items (invoice_id INT, clinician TEXT)",
+            "CREATE TABLE districts (id INT, district_key TEXT, data_version INT)",
+            "INSERT INTO invoices VALUES (1, 'D1', 'Ana'), (2, 'D1', 'Ben')",
+            "INSERT INTO vendors VALUES ('Acme', 'D1')",
+            "INSERT INTO invoice_line_items VALUES (1, 'Kim')",
+            "INSERT INTO districts VALUES (7, 'D1', 4)",
+        ):
+            conn.execute(text(ddl))
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    tool = module._build_run_sql_tool(engine, async_engine)
+    query = {"query": "SELECT student_name FROM invoices WHERE district_key = :district_key"}
+
+    async def _async_results():
+        context = AgentContext(query="q", user_context={"district_id": 7})
+        rows = await tool.async_handler(context, query)
+        return (
+            await module._aload_district_entities(async_engine, "D1"),
+            await module._aload_data_version(async_engine, "D1"),
+            rows,
+            context.user_context["district_key"],
+        )
+
+    context = AgentContext(query="q", user_context={"district_id": 7})
+    sync_results = (
+        module._load_district_entities(engine, "D1"),
+        module._load_data_version(engine, "D1"),
+        tool.handler(context, query),
+        context.user_context["district_key"],
+    )
+
+    assert asyncio.run(_async_results()) == sync_results
+    assert sync_results == (
+        {"students": ["Ana", "Ben"], "vendors": ["Acme"], "clinicians": ["Kim"]},
+        4,
+        [{"student_name": "Ana"}, {"student_name": "Ben"}],
+        "D1",
+    )
@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+import pytest
+
+from app.backend.src.core import codec as codec_module
+from app.backend.src.core.codec import MAGIC, CodecError, PayloadCodec, decode_payload
+
+PAYLOAD = {
+    "text": "Student monthly spend for Ana Lopez.",
+    "html": "<table>" + "<tr><td>Ana Lopez</td><td>August</td><td>3.0</td></tr>" * 50 + "</table>",
+    "rows": [{"student": "Ana Lopez", "service_month": "August", "total_hours": 3.0}] * 50,
+}
+
+
+def test_every_available_codec_round_trips() -> None:
+    specs = ["legacy", "json", "json+zlib", "orjson", "orjson+zlib"]
+    if codec_module.msgpack is not None:
+        specs.append("msgpack+zlib")
+    if codec_module.zstandard is not None:
+        specs.append("orjson+zstd")
+
+    for spec in specs:
+        encoded = PayloadCodec.from_spec(spec).encode(PAYLOAD)
+        assert decode_payload(encoded) == PAYLOAD, spec
+
+
+def test_large_payloads_compress_and_small_ones_do_not() -> None:
+    codec = PayloadCodec.from_spec("json+zlib", compress_min_bytes=256)
+
+    small = codec.encode({"text": "hi"})
+    large = codec.encode(PAYLOAD)
+
+    assert small[:4] == bytes((MAGIC, 1, 0, 0))
+    assert large[:4] == bytes((MAGIC, 1, 0, 1))
+    assert len(large) < len(json.dumps(PAYLOAD)) / 5
+
+
+def test_legacy_plain_json_still_decodes() -> None:
+    legacy = json.dumps(PAYLOAD)
+
+    assert decode_payload(legacy) == PAYLOAD
+    assert decode_payload(legacy.encode("utf-8")) == PAYLOAD
+    assert PayloadCodec.from_spec("legacy").encode(PAYLOAD) == legacy.encode("utf-8")
+
+
+def test_unknown_formats_are_rejected() -> None:
+    with pytest.raises(CodecError):
+        decode_payload(bytes((MAGIC, 99, 0, 0)) + b"{}")
+    with pytest.raises(ValueError):
+        PayloadCodec.from_spec("pickle")
+
+
+def test_missing_optional_libraries_fall_back(monkeypatch) -> None:
+    monkeypatch.setitem(codec_module._AVAILABLE, "msgpack", False)
+    monkeypatch.setitem(codec_module._AVAILABLE, "zstd", False)
+
+    assert PayloadCodec.from_spec("msgpack+zstd").spec == "json+zlib"
@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.backend.src.db import Base
+from app.backend.src.models import District, Invoice, Vendor
+from app.backend.src.services import district_cache
+
+
+@pytest.fixture
+def session(tmp_path: Path):
+    district_cache.install_data_version_hooks()
+    engine = create_engine(f"sqlite:///{tmp_path / 'versions.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_invoice_changes_bump_district_data_version(session: Session) -> None:
+    session.add(District(company_name="Central", district_key="KEY-1"))
+    session.add(Vendor(id=3, company_name="Care Co", contact_email="c@c.com", district_key="KEY-1"))
+    session.commit()
+    assert district_cache.get_district_data_version(session, "KEY-1") == 0
+
+    invoice = Invoice(
+        vendor_id=3,
+        student_name="Ana",
+        invoice_number="INV-9",
+        service_month="March 2024",
+        invoice_date=datetime(2024, 3, 31, tzinfo=timezone.utc),
+        pdf_s3_key="invoices/a.pdf",
+        district_key="KEY-1",
+    )
+    session.add(invoice)
+    session.commit()
+    assert district_cache.get_district_data_version(session, "KEY-1") == 1
+
+    invoice.total_hours = 4.0
+    session.commit()
+    assert district_cache.get_district_data_version(session, "KEY-1") == 1
+
+    invoice.status = "approved"
+    session.commit()
+    assert district_cache.get_district_data_version(session, "KEY-1") == 2
+
+
+def test_models_import_without_cache_dependency() -> None:
+    code = (
+        "import sys; import app.backend.src.models; "
+        "assert 'app.backend.src.core.redis_cache' not in sys.modules"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[4],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_versioned_response_answers_if_none_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        district_cache,
+        "get_settings",
+        lambda: SimpleNamespace(redis_enabled=False, district_response_cache_ttl_sec=900),
+    )
+    calls: list[int] = []
+    state = {"version": 1}
+
+    app = FastAPI()
+
+    @app.get("/payload")
+    def payload(request: Request):
+        def build() -> dict[str, object]:
+            calls.append(state["version"])
+            return {"version": state["version"]}
+
+        return district_cache.versioned_json_response(
+            request,
+            kind="test",
+            district_key="KEY-1",
+            version=state["version"],
+            params={},
+            build=build,
+        )
+
+    client = TestClient(app)
+
+    first = client.get("/payload")
+    assert first.status_code == 200
+    assert first.json() == {"version": 1}
+    etag = first.headers["etag"]
+
+    cached = client.get("/payload", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert calls == [1]
+
+    state["version"] = 2
+    changed = client.get("/payload", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert calls == [1, 2]
@@ -51,7 +51,10 @@ import pytest
 from app.backend.src.db import get_engine, session_scope
 from app.backend.src.models import District, Invoice, InvoiceLineItem, Vendor
 from app.backend.src.db.base import Base
-from app.backend.src.services.district_overview import fetch_district_vendor_overview
+from app.backend.src.services.district_overview import (
+    fetch_district_vendor_overview,
+    fetch_vendor_month_students,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -113,6 +116,7 @@ def test_fetch_overview_includes_invoice_pdf_url(monkeypatch: pytest.MonkeyPatch
         session.add(
             InvoiceLineItem(
                 invoice_id=invoice.id,
+                invoice_number="INV-001",
                 student="Student One",
                 clinician="Clinician A",
                 service_code="OT",
@@ -142,7 +146,16 @@ def test_fetch_overview_includes_invoice_pdf_url(monkeypatch: pytest.MonkeyPatch
     )
     assert first_invoice.pdf_url == first_invoice.download_url
     assert first_invoice.pdf_s3_key == "invoices/INV-001.pdf"
-    assert first_invoice.students[0].pdf_s3_key == "invoices/INV-001.pdf"
+    assert first_invoice.students == []
+
+    with session_scope() as session:
+        page = fetch_vendor_month_students(session, district.id, vendor.id, 2024, 1)
+
+    assert page is not None
+    assert page.total == 1
+    assert page.students[0].name == "Student One"
+    assert page.students[0].amount == 150.0
+    assert page.students[0].pdf_s3_key == "invoices/INV-001.pdf"
 
 
 def test_fetch_overview_uses_service_month_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -204,3 +217,101 @@ def test_fetch_overview_uses_service_month_tokens(monkeypatch: pytest.MonkeyPatc
     assert first_invoice.month == "October"
     assert first_invoice.year == 2025
     assert first_invoice.download_url.endswith("&filename=INV-002.pdf")
+
+
+def test_overview_months_resolve_to_their_student_pages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The dashboard requests students with each overview month's year and
+    ``month_index + 1``; every month must resolve to its own line items."""
+
+    monkeypatch.setattr(
+        "app.backend.src.services.district_overview.generate_presigned_url",
+        lambda key, **_: f"https://example.com/{key}",
+    )
+
+    with session_scope() as session:
+        district = District(company_name="Central District", district_key="ABC123")
+        vendor = Vendor(
+            company_name="Therapy Group",
+            contact_email="contact@therapy.com",
+            district_key="ABC123",
+        )
+        session.add_all([district, vendor])
+        session.flush()
+
+        structured = Invoice(
+            vendor_id=vendor.id,
+            student_name="Student One",
+            invoice_number="INV-001",
+            invoice_code="CODE-001",
+            service_month="January 2024",
+            service_year=2024,
+            service_month_num=1,
+            invoice_date=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            total_cost=150.0,
+            status="approved",
+            pdf_s3_key="invoices/INV-001.pdf",
+        )
+        legacy = Invoice(
+            vendor_id=vendor.id,
+            student_name="Student Two",
+            invoice_number="INV-002",
+            invoice_code="CODE-002",
+            service_month="October_2025",
+            invoice_date=datetime(2025, 11, 15, tzinfo=timezone.utc),
+            total_cost=200.0,
+            status="approved",
+            pdf_s3_key="invoices/INV-002.pdf",
+        )
+        session.add_all([structured, legacy])
+        session.flush()
+        for invoice, student, codes in (
+            (structured, "Student One", ["OT", "OT", "PT"]),
+            (legacy, "Student Two", ["SLP"]),
+        ):
+            for code in codes:
+                session.add(
+                    InvoiceLineItem(
+                        invoice_id=invoice.id,
+                        invoice_number=invoice.invoice_number,
+                        student=student,
+                        clinician="Clinician A",
+                        service_code=code,
+                        hours=1.0,
+                        rate=50.0,
+                        cost=50.0,
+                        service_date="2024-01-10",
+                    )
+                )
+
+    with session_scope() as session:
+        overview = fetch_district_vendor_overview(session, district.id)
+        months = [
+            (invoice.year, invoice.month_index + 1)
+            for invoices in overview.vendors[0].invoices.values()
+            for invoice in invoices
+        ]
+        pages = {
+            month: fetch_vendor_month_students(
+                session, district.id, vendor.id, *month, page_size=1
+            )
+            for month in months
+        }
+
+    assert sorted(months) == [(2024, 1), (2025, 10)]
+
+    january = pages[(2024, 1)]
+    assert january.total == 2
+    assert january.page_size == 1
+    student = january.students[0].model_dump()
+    assert {"id", "name", "service", "amount", "pdf_url", "pdf_s3_key"} <= set(student)
+    assert (student["name"], student["service"], student["amount"]) == (
+        "Student One",
+        "OT",
+        100.0,
+    )
+    assert student["pdf_url"] == "https://example.com/invoices/INV-001.pdf"
+
+    october = pages[(2025, 10)]
+    assert [s.name for s in october.students] == ["Student Two"]
@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents import domain_config_loader
+from app.backend.src.agents.domain_config_loader import AhoCorasick, get_domain_config
+
+
+def _write_config(path: Path, synonyms: list[str], mtime_ns: int) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "plan_kinds": {"student_monthly_spend": {"intent_synonyms": synonyms}},
+                "router_modes": {
+                    "student_monthly": {"triggers": ["monthly"]},
+                    "district_summary": {"triggers": ["district", "total"]},
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_automaton_matches_like_substring_scan() -> None:
+    patterns = ["he", "she", "his", "hers", "spend", "monthly spend", "end"]
+    matcher = AhoCorasick(patterns)
+
+    for text in ["ushers", "monthly spend for ana", "this", "nothing here", ""]:
+        expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+        assert matcher.find(text) == expected
+
+
+def test_compiled_config_scores_intents_and_triggers(tmp_path, monkeypatch) -> None:
+    config_path = tmp_path / "domain_config.json"
+    _write_config(config_path, ["monthly spend", "spend by month"], 1_000_000_000)
+    monkeypatch.setattr(domain_config_loader, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(domain_config_loader, "_COMPILED", None)
+
+    compiled = get_domain_config()
+
+    assert compiled.intent_scores("Monthly Spend, i.e. spend by month") == {
+        "student_monthly_spend": 2
+    }
+    assert compiled.first_intent("Spend by month") == "student_monthly_spend"
+    assert compiled.first_intent("burn rate") is None
+    assert compiled.triggered_modes("district total monthly") == [
+        "student_monthly",
+        "district_summary",
+    ]
+    assert get_domain_config() is compiled
+
+
+def test_planner_infers_the_first_plan_kind_in_config_order(monkeypatch) -> None:
+    from app.backend.src.agents import sql_planner_model
+
+    compiled = domain_config_loader.CompiledDomainConfig(
+        {
+            "plan_kinds": {
+                "student_invoices": {"intent_synonyms": ["invoices"]},
+                "student_monthly_spend": {"intent_synonyms": ["monthly spend", "Spend"]},
+            }
+        }
+    )
+    monkeypatch.setattr(sql_planner_model, "get_domain_config", lambda: compiled)
+    prompts: list[dict] = []
+
+    def _create(**kwargs):
+        prompts.append(json.loads(kwargs["messages"][1]["content"]))
+        raise RuntimeError("offline")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+
+    for query in ("Monthly SPEND and invoices for Ana", "caseload for Bo"):
+        sql_planner_model.run_sql_planner_model(
+            user_query=query,
+            normalized_intent={},
+            entities={},
+            user_context={},
+            client=client,
+            model="m",
+            system_prompt="",
+            temperature=0,
+        )
+
+    assert [prompt["inferred_plan_kind"] for prompt in prompts] == ["student_invoices", None]
+
+
+def test_config_reloads_when_the_file_changes(tmp_path, monkeypatch) -> None:
+    config_path = tmp_path / "domain_config.json"
+    _write_config(config_path, ["monthly spend"], 1_000_000_000)
+    monkeypatch.setattr(domain_config_loader, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(domain_config_loader, "_COMPILED", None)
+    assert get_domain_config().intent_scores("burn rate") == {}
+
+    _write_config(config_path, ["burn rate"], 2_000_000_000)
+    assert get_domain_config().intent_scores("burn rate") == {"student_monthly_spend": 1}
+
+    # A half-written file keeps the last good config in service.
+    config_path.write_text("{", encoding="utf-8")
+    os.utime(config_path, ns=(3_000_000_000, 3_000_000_000))
+    assert get_domain_config().intent_scores("burn rate") == {"student_monthly_spend": 1}
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.services.entity_catalog import DistrictEntityCatalog
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1).encode()
+
+
+class FakeAsyncRedis:
+    def __init__(self, sync: FakeRedis) -> None:
+        self._sync = sync
+
+    async def get(self, key):
+        return self._sync.get(key)
+
+
+class FakeRedisCache:
+    key_prefix = "entity_catalog"
+
+    def __init__(self) -> None:
+        self.client = FakeRedis()
+        self.async_client = FakeAsyncRedis(self.client)
+
+    def get(self, suffix):
+        raw = self.client.get(f"{self.key_prefix}:{suffix}")
+        return json.loads(raw) if raw else None
+
+    async def aget(self, suffix):
+        return self.get(suffix)
+
+    def set(self, suffix, value):
+        self.client.store[f"{self.key_prefix}:{suffix}"] = json.dumps(value).encode()
+
+    async def aset(self, suffix, value):
+        self.set(suffix, value)
+
+
+def _loader(calls: list[str]):
+    def _load():
+        calls.append("scan")
+        return {"students": ["Ana Lopez"], "vendors": ["Acme"], "clinicians": ["Kim"]}
+
+    return _load
+
+
+def test_catalog_is_built_once_per_version() -> None:
+    calls: list[str] = []
+    catalog = DistrictEntityCatalog(redis_cache=FakeRedisCache())
+
+    first = catalog.get("D1", _loader(calls))
+    second = catalog.get("D1", _loader(calls))
+
+    assert first == second
+    assert calls == ["scan"]
+
+
+def test_catalog_is_shared_between_processes_through_redis() -> None:
+    calls: list[str] = []
+    redis_cache = FakeRedisCache()
+    DistrictEntityCatalog(redis_cache=redis_cache).get("D1", _loader(calls))
+
+    async def _aload():
+        calls.append("async-scan")
+        return {}
+
+    other = DistrictEntityCatalog(redis_cache=redis_cache)
+    result = asyncio.run(other.aget("D1", _aload))
+
+    assert result["students"] == ["Ana Lopez"]
+    assert calls == ["scan"]
+
+
+def test_new_names_bump_the_version() -> None:
+    calls: list[str] = []
+    redis_cache = FakeRedisCache()
+    catalog = DistrictEntityCatalog(redis_cache=redis_cache)
+    catalog.get("D1", _loader(calls))
+
+    assert not catalog.note_entities("D1", students=["Ana Lopez"], clinicians=["Kim"])
+    assert catalog.note_entities("D1", students=["Ben Smith"])
+
+    catalog.get("D1", _loader(calls))
+    assert calls == ["scan", "scan"]
+    assert catalog.version("D1") == 1
+
+
+def test_note_entities_without_cached_catalog_bumps_for_any_name() -> None:
+    catalog = DistrictEntityCatalog(redis_cache=FakeRedisCache())
+
+    assert not catalog.note_entities("D1", students=[])
+    assert catalog.version("D1") == 0
+    assert catalog.note_entities("D1", students=["Ana Lopez"])
+    assert catalog.version("D1") == 1
+
+
+def test_expired_shared_copy_still_refreshes_other_processes() -> None:
+    calls: list[str] = []
+    redis_cache = FakeRedisCache()
+    web = DistrictEntityCatalog(redis_cache=redis_cache)
+    web.get("D1", _loader(calls))
+    # The shared copy outlives its TTL; the ingest worker then sees no catalog.
+    redis_cache.client.store.pop("entity_catalog:D1")
+
+    assert DistrictEntityCatalog(redis_cache=redis_cache).note_entities(
+        "D1", students=["Ben Smith"]
+    )
+    web.get("D1", _loader(calls))
+    assert calls == ["scan", "scan"]
+
+
+def test_local_copy_expires_with_redis_enabled() -> None:
+    calls: list[str] = []
+    catalog = DistrictEntityCatalog(redis_cache=FakeRedisCache(), local_ttl_seconds=0)
+
+    catalog.get("D1", _loader(calls))
+    catalog.redis_cache.client.store.pop("entity_catalog:D1")
+    catalog.get("D1", _loader(calls))
+
+    assert calls == ["scan", "scan"]
+
+
+def test_in_process_catalog_expires_without_redis() -> None:
+    calls: list[str] = []
+    catalog = DistrictEntityCatalog(local_ttl_seconds=0)
+
+    catalog.get("D1", _loader(calls))
+    catalog.get("D1", _loader(calls))
+
+    assert calls == ["scan", "scan"]
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents.entity_matcher import TrigramEntityIndex, shortlist_entities
+from app.backend.src.agents.entity_resolution_model import run_entity_resolution_model
+
+ENTITIES = {
+    "students": ["Ana Lopez", "Ana Lopes", "Ben Smith"] + [f"Student {i:04d}" for i in range(500)],
+    "vendors": ["Acme Therapy Services"],
+    "clinicians": ["Kim Nguyen"],
+}
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = json.dumps({"entities": {"students": ["Ana Lopez"]}})
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _resolve(client, normalized_intent, query="spend", candidate_limit=5):
+    return run_entity_resolution_model(
+        user_query=query,
+        normalized_intent=normalized_intent,
+        user_context={},
+        known_entities=ENTITIES,
+        client=client,
+        model="m",
+        system_prompt="sys",
+        temperature=0,
+        candidate_limit=candidate_limit,
+    )
+
+
+def test_search_ranks_near_misses() -> None:
+    index = TrigramEntityIndex(ENTITIES)
+
+    matches = index.search("ben smyth", kind="students")
+
+    assert matches[0][1] == "Ben Smith"
+    assert matches[0][2] < 1.0
+    assert index.search("ana lopez")[0] == ("students", "Ana Lopez", 1.0)
+
+
+def test_exact_mentions_skip_the_model() -> None:
+    client = FakeClient()
+    intent = {"entities": {"student_name": "ana lopez", "vendor_name": "Acme Therapy Services"}}
+
+    result = _resolve(client, intent)
+
+    assert client.requests == []
+    assert result["entities"] == {"students": ["Ana Lopez"], "vendors": ["Acme Therapy Services"]}
+    assert result["normalized_intent"] == intent
+
+
+def test_ambiguous_mentions_send_only_candidates() -> None:
+    client = FakeClient()
+
+    result = _resolve(client, {"entities": {"student_name": "Ana Lop"}})
+
+    sent = json.loads(client.requests[0]["messages"][1]["content"])["known_entities"]
+    assert sent["students"][:2] == ["Ana Lopes", "Ana Lopez"]
+    assert len(sent["students"]) <= 5
+    assert result["entities"] == {"students": ["Ana Lopez"]}
+
+
+def test_names_missed_by_nlv_are_shortlisted_from_the_query() -> None:
+    index = TrigramEntityIndex(ENTITIES)
+
+    shortlist = shortlist_entities(
+        index,
+        user_query="How many hours did Kim Nguyen bill?",
+        normalized_intent={"entities": {}},
+        top_k=5,
+    )
+
+    assert not shortlist.fully_resolved
+    assert shortlist.known_entities()["clinicians"] == ["Kim Nguyen"]
+
+
+def test_without_candidate_limit_the_full_catalog_is_sent() -> None:
+    client = FakeClient()
+
+    _resolve(client, {"entities": {"student_name": "Ana Lopez"}}, candidate_limit=None)
+
+    sent = json.loads(client.requests[0]["messages"][1]["content"])["known_entities"]
+    assert sent == ENTITIES
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents.fast_path import plan_fast_path, plan_for_intent
+from app.backend.src.agents.logic_model import run_logic_model
+
+ENTITIES = {
+    "students": ["Ana Lopez", "Ana", "Ben Smith"],
+    "vendors": ["Acme Therapy"],
+    "clinicians": [],
+}
+
+
+def test_named_student_question_plans_mv_query() -> None:
+    plan = plan_fast_path("Monthly spend for ana lopez", ENTITIES)
+
+    assert plan is not None
+    assert plan.plan_kind == "student_monthly_spend"
+    assert plan.mode == "student_monthly"
+    assert plan.entity_name == "Ana Lopez"
+    assert "FROM mv_student_monthly_hours_cost" in plan.sql
+    assert "LIKE LOWER('%Ana Lopez%')" in plan.sql
+
+
+def test_provider_breakdown_applies_named_month() -> None:
+    plan = plan_fast_path("who was the provider for Ana Lopez in August", ENTITIES)
+
+    assert plan is not None
+    assert plan.mode == "student_provider_breakdown"
+    assert "LOWER(i.service_month) = LOWER('August')" in plan.sql
+
+
+def test_district_list_needs_no_entity() -> None:
+    plan = plan_fast_path("list all students", ENTITIES)
+
+    assert plan is not None
+    assert plan.mode == "student_list"
+
+
+def test_unclear_questions_fall_back_to_models() -> None:
+    # Two different students, a pronoun follow-up, an unsupported time filter
+    # and a question without the entity its plan kind needs.
+    assert plan_fast_path("monthly spend for Ana Lopez and Ben Smith", ENTITIES) is None
+    assert plan_fast_path("what about her monthly spend", ENTITIES) is None
+    assert plan_fast_path("monthly spend for Ana Lopez in 2024", ENTITIES) is None
+    assert plan_fast_path("monthly spend for student", ENTITIES) is None
+
+
+def test_prefetch_intent_plans_with_catalog_spelling() -> None:
+    intent = {
+        "intent": "student_year_summary",
+        "entities": {"student_name": "ana  LOPEZ"},
+        "scope": "single_student",
+    }
+
+    plan = plan_for_intent(intent, "yearly spend for ana  LOPEZ", ENTITIES)
+
+    assert plan is not None
+    assert plan.mode == "student_year_summary"
+    assert plan.entity_name == "Ana Lopez"
+    assert "LIKE LOWER('%Ana Lopez%')" in plan.sql
+
+    district = plan_for_intent({"intent": "district_monthly_spend"}, "district monthly spend", {})
+    assert district is not None
+    assert district.mode == "district_monthly"
+
+
+def test_prefetch_intents_without_a_plan_are_left_to_models() -> None:
+    def intent(kind: str, name: str) -> dict:
+        return {"intent": kind, "entities": {"student_name": name}}
+
+    # Unknown names, names unsafe to interpolate and unsupported plan kinds.
+    assert plan_for_intent(intent("student_monthly_spend", "Zoe"), "x", ENTITIES) is None
+    quoted = {**ENTITIES, "students": ["Ana O'Neil"]}
+    assert plan_for_intent(intent("student_monthly_spend", "Ana O'Neil"), "x", quoted) is None
+    assert plan_for_intent(intent("comparison", "Ana Lopez"), "x", ENTITIES) is None
+    assert plan_for_intent({"intent": "student_monthly_spend"}, "x", ENTITIES) is None
+
+
+def test_logic_model_override_still_skips_completion() -> None:
+    message = run_logic_model(
+        None,
+        model="m",
+        messages=[],
+        tools=[],
+        temperature=0,
+        router_decision={"mode": "district_monthly", "primary_entities": []},
+    )
+
+    sql = json.loads(message.tool_calls[0].function.arguments)["query"]
+    assert "mv_district_monthly_hours_cost" in sql
@@ -0,0 +1,121 @@
+import os
+import sys
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+from zipfile import ZipFile
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.backend.src.core.storage import InMemoryStorage
+from app.backend.src.db import Base
+from app.backend.src.models import Invoice, InvoiceArchive, Vendor
+from app.backend.src.services import invoice_archives
+
+
+@pytest.fixture
+def session(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'archives.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _invoice(student: str, key: str, number: str) -> Invoice:
+    return Invoice(
+        vendor_id=7,
+        student_name=student,
+        invoice_number=number,
+        service_month="January 2024",
+        service_year=2024,
+        service_month_num=1,
+        invoice_date=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        total_cost=125.0,
+        status="generated",
+        pdf_s3_key=key,
+    )
+
+
+def test_build_vendor_month_archive_records_key(
+    monkeypatch: pytest.MonkeyPatch, session: Session
+) -> None:
+    storage = InMemoryStorage()
+    storage.put("invoices/a.pdf", b"%PDF-a")
+    storage.put("invoices/b.pdf", b"%PDF-b")
+    monkeypatch.setattr(invoice_archives, "get_storage_backend", lambda: storage)
+
+    session.add(Vendor(id=7, company_name="Always Home Nursing", contact_email="a@b.com"))
+    session.add_all(
+        [
+            _invoice("Ana Diaz", "invoices/a.pdf", "INV-1"),
+            _invoice("Ben Lee", "invoices/b.pdf", "INV-2"),
+        ]
+    )
+    session.flush()
+
+    archive = invoice_archives.build_vendor_month_archive(session, 7, 2024, 1)
+
+    assert archive is not None
+    assert archive.s3_key == (
+        "invoices/AlwaysHomeNursing/2024/01/AlwaysHomeNursing_2024_01_invoices_dynamic.zip"
+    )
+    assert archive.invoice_count == 2
+
+    bundle = ZipFile(BytesIO(storage.get(archive.s3_key)))
+    assert sorted(bundle.namelist()) == [
+        "Ana_Diaz_2024_01.pdf",
+        "Ben_Lee_2024_01.pdf",
+        "invoice_summary.csv",
+    ]
+    assert bundle.read("Ana_Diaz_2024_01.pdf") == b"%PDF-a"
+    summary = bundle.read("invoice_summary.csv").decode("utf-8")
+    assert summary.startswith("student_name,invoice_id,total_cost,status,pdf_s3_key")
+
+    rebuilt = invoice_archives.build_vendor_month_archive(session, 7, 2024, 1)
+    assert rebuilt.id == archive.id
+    assert session.query(InvoiceArchive).count() == 1
+
+
+def test_build_vendor_month_archive_without_invoices(session: Session) -> None:
+    assert invoice_archives.build_vendor_month_archive(session, 7, 2024, 3) is None
+
+
+def test_concurrent_build_updates_the_winning_row(
+    monkeypatch: pytest.MonkeyPatch, session: Session
+) -> None:
+    storage = InMemoryStorage()
+    storage.put("invoices/a.pdf", b"%PDF-a")
+    monkeypatch.setattr(invoice_archives, "get_storage_backend", lambda: storage)
+
+    session.add(Vendor(id=7, company_name="Always Home Nursing", contact_email="a@b.com"))
+    session.add(_invoice("Ana Diaz", "invoices/a.pdf", "INV-1"))
+    session.commit()
+
+    # Another worker records the month after this build looked it up.
+    with Session(session.get_bind()) as other:
+        other.add(
+            InvoiceArchive(vendor_id=7, service_year=2024, service_month_num=1, s3_key="k")
+        )
+        other.commit()
+    lookup = invoice_archives.get_vendor_month_archive
+    calls: list[int] = []
+
+    def stale_lookup(*args):
+        calls.append(1)
+        return None if len(calls) == 1 else lookup(*args)
+
+    monkeypatch.setattr(invoice_archives, "get_vendor_month_archive", stale_lookup)
+
+    archive = invoice_archives.build_vendor_month_archive(session, 7, 2024, 1)
+    session.commit()
+
+    assert archive is not None
+    assert archive.invoice_count == 1
+    assert archive.s3_key.endswith("AlwaysHomeNursing_2024_01_invoices_dynamic.zip")
+    assert session.query(InvoiceArchive).count() == 1
@@ -0,0 +1,163 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from app.backend.src.core.codec import get_codec
+from app.backend.src.db.base import Base
+from app.backend.src.models.materialized_report import (
+    ORIGIN_PREFETCH,
+    ORIGIN_USER,
+    MaterializedReport,
+)
+from app.backend.src.services import materialized_report_service as service
+from app.backend.src.services.materialized_report_service import (
+    ReportAccessTracker,
+    evict_materialized_reports,
+    fetch_materialized_report,
+    flush_report_access,
+    persist_materialized_report,
+)
+
+
+def _engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reports.db'}")
+    Base.metadata.create_all(bind=engine)
+    # Flush only when asked so the tests control when writes happen.
+    monkeypatch.setattr(service, "_ACCESS_TRACKER", ReportAccessTracker(3600))
+    return engine
+
+
+def _persist(engine, cache_key: str, text: str, district_key: str = "D1") -> None:
+    persist_materialized_report(
+        engine=engine,
+        district_key=district_key,
+        cache_key=cache_key,
+        normalized_intent={"intent": "student_monthly_spend"},
+        router_decision={"mode": "student_monthly", "primary_entities": ["Ana Lopez"]},
+        agent_response={"text": text},
+    )
+
+
+def _rows(engine) -> list[tuple]:
+    with Session(engine) as session:
+        reports = session.execute(
+            select(MaterializedReport).order_by(
+                MaterializedReport.district_key, MaterializedReport.cache_key
+            )
+        ).scalars()
+        return [
+            (row.district_key, row.cache_key, row.hit_count, row.decoded_payload)
+            for row in reports
+        ]
+
+
+def _age(engine, cache_key: str, hours: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            update(MaterializedReport)
+            .where(MaterializedReport.cache_key == cache_key)
+            .values(last_accessed_at=datetime.utcnow() - timedelta(hours=hours))
+        )
+
+
+def test_persist_upserts_one_row_per_key(tmp_path, monkeypatch) -> None:
+    engine = _engine(tmp_path, monkeypatch)
+
+    _persist(engine, "k1", "first")
+    _persist(engine, "k1", "second")
+    _persist(engine, "k1", "other district", district_key="D2")
+
+    assert _rows(engine) == [
+        ("D1", "k1", 0, {"text": "second"}),
+        ("D2", "k1", 0, {"text": "other district"}),
+    ]
+    with Session(engine) as session:
+        sizes = session.execute(select(MaterializedReport.payload_bytes)).scalars().all()
+    codec = get_codec()
+    assert sizes == [
+        len(codec.encode({"text": "second"})),
+        len(codec.encode({"text": "other district"})),
+    ]
+
+
+def test_fetch_buffers_access_until_flushed(tmp_path, monkeypatch) -> None:
+    engine = _engine(tmp_path, monkeypatch)
+    _persist(engine, "k1", "cached")
+
+    for _ in range(3):
+        assert fetch_materialized_report(engine=engine, cache_key="k1", district_key="D1") == {
+            "text": "cached"
+        }
+    assert fetch_materialized_report(engine=engine, cache_key="k2", district_key="D1") is None
+    assert _rows(engine)[0][2] == 0
+
+    assert flush_report_access(engine) == 1
+    assert _rows(engine)[0][2] == 3
+    assert flush_report_access(engine) == 0
+
+
+def test_lru_eviction_keeps_recent_reports_within_budget(tmp_path, monkeypatch) -> None:
+    engine = _engine(tmp_path, monkeypatch)
+    for index, key in enumerate(["old", "mid", "new"]):
+        _persist(engine, key, "x" * 10)
+        _age(engine, key, hours=3 - index)
+    _persist(engine, "solo", "x", district_key="D2")
+
+    evicted = evict_materialized_reports(
+        engine, max_rows_per_district=2, max_bytes_per_district=0, policy="lru"
+    )
+
+    assert evicted == {"D1": 1}
+    assert [row[1] for row in _rows(engine)] == ["mid", "new", "solo"]
+
+    # A byte budget that fits one report trims the district to the newest one.
+    assert evict_materialized_reports(
+        engine, max_rows_per_district=0, max_bytes_per_district=30, policy="lru"
+    ) == {"D1": 1}
+    assert [row[1] for row in _rows(engine)] == ["new", "solo"]
+
+
+def test_lfu_eviction_prefers_frequently_hit_reports(tmp_path, monkeypatch) -> None:
+    engine = _engine(tmp_path, monkeypatch)
+    for key in ["popular", "recent"]:
+        _persist(engine, key, "payload")
+    _age(engine, "popular", hours=5)
+    for _ in range(4):
+        fetch_materialized_report(engine=engine, cache_key="popular", district_key="D1")
+    _persist(engine, "newest", "payload")
+
+    evicted = evict_materialized_reports(
+        engine, max_rows_per_district=2, max_bytes_per_district=0, policy="lfu"
+    )
+
+    assert evicted == {"D1": 1}
+    assert [(row[1], row[2]) for row in _rows(engine)] == [("newest", 0), ("popular", 4)]
+
+
+def test_reports_record_their_origin(tmp_path, monkeypatch) -> None:
+    engine = _engine(tmp_path, monkeypatch)
+
+    _persist(engine, "k1", "user report")
+    persist_materialized_report(
+        engine=engine,
+        district_key="D1",
+        cache_key="k2",
+        normalized_intent={"intent": "student_monthly_hours"},
+        router_decision=None,
+        agent_response={"text": "prefetched"},
+        origin=ORIGIN_PREFETCH,
+    )
+
+    with Session(engine) as session:
+        origins = dict(
+            session.execute(select(MaterializedReport.cache_key, MaterializedReport.origin)).all()
+        )
+    assert origins == {"k1": ORIGIN_USER, "k2": ORIGIN_PREFETCH}
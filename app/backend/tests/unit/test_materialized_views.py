@@ -0,0 +1,153 @@
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.backend.src.db.base import Base
+from app.backend.src.models import District, Invoice, InvoiceLineItem, Vendor
+from app.backend.src.services.materialized_views import (
+    INCREMENTAL_VIEWS,
+    MATERIALIZED_VIEWS,
+    MaterializedViewManager,
+    apply_summary_deltas,
+)
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'mv.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.add(District(company_name="D", district_key="D1"))
+        session.add(Vendor(id=1, company_name="Acme", contact_email="a@x.com", district_key="D1"))
+        session.commit()
+    return engine
+
+
+def _add_invoice(engine, invoice_id: int, student: str, hours: float) -> None:
+    with Session(engine) as session:
+        session.add(
+            Invoice(
+                id=invoice_id,
+                vendor_id=1,
+                student_name=student,
+                invoice_number=f"INV-{invoice_id}",
+                invoice_code="",
+                service_month="August 2024",
+                service_year=2024,
+                service_month_num=8,
+                invoice_date=datetime(2024, 8, 31, tzinfo=timezone.utc),
+                total_hours=hours,
+                total_cost=hours * 70,
+                status="generated",
+                pdf_s3_key=f"invoices/{invoice_id}.pdf",
+                district_key="D1",
+            )
+        )
+        session.add(
+            InvoiceLineItem(
+                invoice_id=invoice_id,
+                invoice_number=f"INV-{invoice_id}",
+                student=student,
+                clinician="Kim Nguyen",
+                service_code="LVN",
+                hours=hours,
+                rate=70.0,
+                cost=hours * 70,
+                service_date="2024-08-05",
+            )
+        )
+        session.commit()
+
+
+def _student_months(engine) -> list[tuple]:
+    with engine.connect() as connection:
+        return connection.execute(
+            text(
+                "SELECT student, service_month, total_hours "
+                "FROM mv_student_monthly_hours_cost ORDER BY student"
+            )
+        ).all()
+
+
+def test_views_are_created_once_for_sqlite(tmp_path) -> None:
+    engine = _engine(tmp_path)
+    _add_invoice(engine, 1, "Ana Lopez", 3)
+    manager = MaterializedViewManager(engine)
+
+    assert manager.ensure_views() == [spec.name for spec in MATERIALIZED_VIEWS]
+    assert manager.ensure_views() == []
+    assert _student_months(engine) == [("ana lopez", "2024-08", 3.0)]
+    assert all(manager.freshness().values())
+
+
+def test_refresh_swaps_in_current_aggregates(tmp_path) -> None:
+    engine = _engine(tmp_path)
+    _add_invoice(engine, 1, "Ana Lopez", 3)
+    manager = MaterializedViewManager(engine)
+    manager.ensure_views()
+    before = manager.freshness()["mv_student_monthly_hours_cost"]
+
+    _add_invoice(engine, 2, "Ben Smith", 2)
+    results = manager.refresh(["mv_student_monthly_hours_cost"])
+
+    assert results == {"mv_student_monthly_hours_cost": True}
+    assert [row[0] for row in _student_months(engine)] == ["ana lopez", "ben smith"]
+    assert manager.freshness()["mv_student_monthly_hours_cost"] >= before
+    with engine.connect() as connection:
+        indexes = {
+            row[1]
+            for row in connection.execute(
+                text("PRAGMA index_list('mv_student_monthly_hours_cost')")
+            )
+        }
+        staging = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE name LIKE '%__staging'")
+        ).all()
+    assert {"uq_mv_student_monthly_hours_cost", "idx_mv_smhc_lower_student"} <= indexes
+    assert staging == []
+
+
+def test_every_view_renders_for_postgres() -> None:
+    for spec in MATERIALIZED_VIEWS:
+        sql = spec.render("postgresql")
+        assert "{" not in sql and "strftime" not in sql
+
+
+def test_batch_deltas_match_a_full_rebuild(tmp_path) -> None:
+    engine = _engine(tmp_path)
+    _add_invoice(engine, 1, "Ana Lopez", 3)
+    manager = MaterializedViewManager(engine)
+    manager.ensure_views()
+
+    _add_invoice(engine, 2, "Ana Lopez", 2)
+    _add_invoice(engine, 3, "Ben Smith", 1)
+    with engine.begin() as connection:
+        updated = apply_summary_deltas(connection, [2, 3])
+
+    assert updated == [spec.name for spec in INCREMENTAL_VIEWS]
+    assert _student_months(engine) == [("ana lopez", "2024-08", 5.0), ("ben smith", "2024-08", 1.0)]
+    assert manager.reconcile() == {spec.name: 0 for spec in INCREMENTAL_VIEWS}
+
+
+def test_reconcile_repairs_drifted_tables(tmp_path) -> None:
+    engine = _engine(tmp_path)
+    _add_invoice(engine, 1, "Ana Lopez", 3)
+    manager = MaterializedViewManager(engine)
+    manager.ensure_views()
+    # A batch whose deltas were never applied.
+    _add_invoice(engine, 2, "Ben Smith", 2)
+
+    drift = manager.reconcile(["mv_student_monthly_hours_cost"])
+
+    assert drift == {"mv_student_monthly_hours_cost": 1}
+    assert manager.reconcile(["mv_student_monthly_hours_cost"], repair=False) == {
+        "mv_student_monthly_hours_cost": 0
+    }
+    assert len(_student_months(engine)) == 2
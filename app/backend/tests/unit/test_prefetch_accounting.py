@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.services import prefetch_accounting
+from app.backend.src.services.prefetch_accounting import (
+    amark_prefetched,
+    arecord_prefetch_hit,
+    mark_prefetched,
+    prefetch_roi,
+    record_prefetch_hit,
+    summarize_prefetch_stats,
+)
+
+
+class FakeRedis:
+    """Hash, scan and pipeline commands the ROI report uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, dict[str, object]] = {}
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def hset(self, key: str, mapping: dict) -> int:
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = int(bucket.get(field, 0)) + amount
+        return bucket[field]
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return {k.encode(): str(v).encode() for k, v in self.data.get(key, {}).items()}
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return key in self.data
+
+    def scan_iter(self, match: str, count: int = 10):
+        prefix = match.rstrip("*")
+        return [key.encode() for key in self.data if key.startswith(prefix)]
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.calls: list = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def fakeredis():
+    """fakeredis with its embedded Lua runtime, so the real hit script runs."""
+
+    module = pytest.importorskip("fakeredis")
+    try:
+        module.FakeRedis().eval("return 1", 0)
+    except Exception:
+        pytest.skip("fakeredis was installed without Lua support (fakeredis[lua])")
+    return module
+
+
+def _settings() -> SimpleNamespace:
+    return SimpleNamespace(
+        redis_url="redis://cache:6379/0",
+        analytics_cache_ttl_sec=600,
+        prefetch_transition_ttl_sec=3600,
+    )
+
+
+def _text_hash(raw: dict) -> dict[str, str]:
+    return {k.decode(): v.decode() for k, v in raw.items()}
+
+
+def test_hits_on_prefetched_entries_are_counted(monkeypatch, fakeredis) -> None:
+    monkeypatch.setattr(prefetch_accounting, "get_settings", _settings)
+    client = fakeredis.FakeRedis()
+    edge = "student_monthly_spend>student_monthly_hours"
+
+    mark_prefetched("D1", "k1", edge, compute_sec=2.5, client=client)
+    mark_prefetched("D1", "k2", None, compute_sec=1.5, client=client)
+
+    # Entries a user request computed carry no tag.
+    assert record_prefetch_hit("D1", "user-key", client=client) is None
+    assert record_prefetch_hit("D1", "k1", client=client) == edge
+    assert record_prefetch_hit("D1", "k1", client=client) == edge
+    assert record_prefetch_hit("D1", "k2", client=client) == ""
+
+    stats = _text_hash(client.hgetall("prefetch:stats:D1"))
+    assert stats == {"written": "2", "compute_ms": "4000", "hits": "3", "entries_hit": "2"}
+    # Repeat reads count as hits but credit the edge once.
+    assert _text_hash(client.hgetall("prefetch:edges:D1")) == {f"{edge}:hit": "1"}
+    assert client.hget("prefetch:entry:k1", "hits") == b"2"
+    assert not client.exists("prefetch:entry:user-key")
+
+
+def test_async_accounting_runs_the_same_script(monkeypatch, fakeredis) -> None:
+    monkeypatch.setattr(prefetch_accounting, "get_settings", _settings)
+    client = fakeredis.FakeAsyncRedis()
+
+    async def scenario():
+        await amark_prefetched("D1", "k1", "a>b", compute_sec=1.0, client=client)
+        edges = [await arecord_prefetch_hit("D1", key, client=client) for key in ("k1", "k1", "x")]
+        return edges, _text_hash(await client.hgetall("prefetch:stats:D1"))
+
+    edges, stats = asyncio.run(scenario())
+
+    assert edges == ["a>b", "a>b", None]
+    assert stats == {"written": "1", "compute_ms": "1000", "hits": "2", "entries_hit": "1"}
+
+
+def test_roi_summarizes_districts_and_edges(monkeypatch) -> None:
+    monkeypatch.setattr(prefetch_accounting, "get_settings", _settings)
+    client = FakeRedis()
+    client.data["prefetch:stats:D1"] = {
+        "enqueued": 5,
+        "written": 4,
+        "compute_ms": 8000,
+        "hits": 6,
+        "entries_hit": 3,
+    }
+    client.data["prefetch:edges:D1"] = {"a>b:sent": 4, "a>b:hit": 3, "a>c:sent": 1}
+    client.data["prefetch:stats:D2"] = {"enqueued": 2, "written": 2, "compute_ms": 2000}
+
+    report = prefetch_roi(client=client)
+
+    d1 = report["districts"]["D1"]
+    assert d1["hit_rate"] == 0.75
+    assert d1["hits_per_entry"] == 1.5
+    assert d1["saved_sec"] == 12.0
+    assert d1["roi"] == 1.5
+    assert d1["edges"] == {
+        "a>b": {"sent": 4, "hit": 3, "hit_rate": 0.75},
+        "a>c": {"sent": 1, "hit": 0, "hit_rate": 0.0},
+    }
+    assert report["districts"]["D2"]["hit_rate"] == 0.0
+    assert report["totals"]["written"] == 6
+    assert report["totals"]["hits"] == 6
+
+    assert list(prefetch_roi("D2", client=client)["districts"]) == ["D2"]
+    assert summarize_prefetch_stats({})["roi"] is None
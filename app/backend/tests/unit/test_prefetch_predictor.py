@@ -0,0 +1,210 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.services import prefetch_accounting, prefetch_predictor, prefetch_service
+from app.backend.src.services.prefetch_accounting import record_prefetch_sent
+from app.backend.src.services.prefetch_predictor import (
+    arecord_transition,
+    build_candidates,
+    predict_followups,
+    record_transition,
+)
+
+
+class FakeRedis:
+    """Hash and pipeline commands the predictor uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, object] = {}
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0) + amount
+        return bucket[field]
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        bucket = self.data.get(key) or {}
+        return {k.encode(): str(v).encode() for k, v in bucket.items()}
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return key in self.data
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.calls: list = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeAsyncRedis(FakeRedis):
+    def pipeline(self, transaction: bool = True) -> "FakeAsyncPipeline":
+        return FakeAsyncPipeline(self)
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def execute(self) -> list:
+        return super().execute()
+
+
+def _settings(**overrides) -> SimpleNamespace:
+    values = {
+        "redis_url": "redis://cache:6379/0",
+        "prefetch_transition_ttl_sec": 3600,
+        "prefetch_min_transitions": 3,
+        "prefetch_min_probability": 0.1,
+        "prefetch_min_hit_rate": 0.05,
+        "prefetch_hit_rate_min_samples": 20,
+        "analytics_cache_ttl_sec": 600,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _observe(client, district, previous, nxt, times) -> None:
+    for _ in range(times):
+        record_transition(district, previous, nxt, client=client)
+
+
+def test_async_transitions_match_the_sync_counts(monkeypatch) -> None:
+    monkeypatch.setattr(prefetch_predictor, "get_settings", _settings)
+    sync_client, async_client = FakeRedis(), FakeAsyncRedis()
+
+    async def _observe_async() -> None:
+        for previous, nxt in (("caseload", "student_invoices"), ("caseload", "caseload")):
+            await arecord_transition("D1", previous, nxt, client=async_client)
+
+    _observe(sync_client, "D1", "caseload", "student_invoices", 1)
+    _observe(sync_client, "D1", "caseload", "caseload", 1)
+    asyncio.run(_observe_async())
+
+    assert async_client.data == sync_client.data
+    assert async_client.data["prefetch:transitions:_all:caseload"] == {"student_invoices": 1}
+
+
+def test_predictions_blend_district_and_global_history(monkeypatch) -> None:
+    monkeypatch.setattr(prefetch_predictor, "get_settings", _settings)
+    client = FakeRedis()
+
+    _observe(client, "D1", "student_monthly_spend", "student_monthly_hours", 2)
+    # Below PREFETCH_MIN_TRANSITIONS nothing is predicted yet.
+    assert predict_followups("D1", "student_monthly_spend", k=3, client=client) == []
+
+    _observe(client, "D1", "student_monthly_spend", "student_provider_breakdown", 6)
+    _observe(client, "D2", "student_monthly_spend", "student_invoices", 8)
+    # Self transitions and kinds without a template are never predicted.
+    _observe(client, "D1", "student_monthly_spend", "student_monthly_spend", 5)
+    _observe(client, "D1", "student_monthly_spend", "comparison", 1)
+
+    d1 = predict_followups("D1", "student_monthly_spend", k=3, client=client)
+    assert [kind for kind, _ in d1] == [
+        "student_provider_breakdown",
+        "student_monthly_hours",
+        "student_invoices",
+    ]
+    assert all(0 < p < 1 for _, p in d1)
+    assert predict_followups("D1", "student_monthly_spend", k=1, client=client)[0][0] == (
+        "student_provider_breakdown"
+    )
+
+    # A district without history of its own follows the global distribution.
+    d3 = predict_followups("D3", "student_monthly_spend", k=3, client=client)
+    assert d3[0][0] == "student_invoices"
+
+
+def test_candidates_fill_templates_from_request_entities() -> None:
+    predictions = [
+        ("student_monthly_hours", 0.6),
+        ("vendor_invoices", 0.3),
+        ("district_monthly_spend", 0.2),
+    ]
+
+    candidates = build_candidates(
+        "student_monthly_spend", {"student_name": "Ana Lopez"}, predictions
+    )
+
+    assert [(c.plan_kind, c.query, c.edge) for c in candidates] == [
+        (
+            "student_monthly_hours",
+            "i want to see the hours for Ana Lopez",
+            "student_monthly_spend>student_monthly_hours",
+        ),
+        (
+            "district_monthly_spend",
+            "district monthly spend",
+            "student_monthly_spend>district_monthly_spend",
+        ),
+    ]
+    assert candidates[0].intent == {
+        "intent": "student_monthly_hours",
+        "entities": {"student_name": "Ana Lopez"},
+        "scope": "single_student",
+    }
+    assert candidates[1].intent == {
+        "intent": "district_monthly_spend",
+        "entities": {},
+        "scope": "district",
+    }
+
+
+def test_edges_users_never_read_are_dropped(monkeypatch) -> None:
+    monkeypatch.setattr(prefetch_predictor, "get_settings", _settings)
+    monkeypatch.setattr(prefetch_accounting, "get_settings", _settings)
+    client = FakeRedis()
+    _observe(client, "D1", "caseload", "clinician_student_breakdown", 5)
+    _observe(client, "D1", "caseload", "provider_daily_hours", 4)
+
+    useful = "caseload>clinician_student_breakdown"
+    unread = "caseload>provider_daily_hours"
+    pipe = client.pipeline()
+    for _ in range(20):
+        record_prefetch_sent("D1", [useful, unread], pipe=pipe)
+    pipe.execute()
+    client.hincrby("prefetch:edges:D1", f"{useful}:hit", 3)
+
+    assert client.data["prefetch:stats:D1"]["enqueued"] == 40
+    kinds = [kind for kind, _ in predict_followups("D1", "caseload", k=3, client=client)]
+    assert kinds == ["clinician_student_breakdown"]
+
+
+def test_prefetch_service_falls_back_to_static_rules(monkeypatch) -> None:
+    learned: list = []
+    monkeypatch.setattr(prefetch_service, "predict_followups", lambda *a, **k: list(learned))
+    intent = {"intent": "student_monthly_spend", "entities": {"student_name": "Ana"}}
+    rows = [{"service_month": "2024-01"}, {"service_month": "2024-02"}]
+
+    cold = prefetch_service._derive_prefetch_candidates(intent, rows, "D1", budget=4)
+    assert [c.query for c in cold] == [
+        "i want to see the hours for Ana",
+        "provider breakdown for Ana",
+        "service code breakdown for Ana",
+        "invoice details for Ana in 2024-02",
+    ]
+    # The month cannot be expressed as an intent, so only that job runs the models.
+    assert [c.intent is None for c in cold] == [False, False, False, True]
+    assert len(prefetch_service._derive_prefetch_candidates(intent, rows, "D1", budget=2)) == 2
+
+    learned.append(("student_year_summary", 0.7))
+    warm = prefetch_service._derive_prefetch_candidates(intent, rows, "D1", budget=4)
+    assert [(c.query, c.edge) for c in warm] == [
+        ("yearly spend for Ana", "student_monthly_spend>student_year_summary")
+    ]
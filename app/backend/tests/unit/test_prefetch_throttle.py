@@ -0,0 +1,156 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.services import prefetch_throttle
+from app.backend.src.services.prefetch_throttle import should_throttle_prefetch
+
+
+def _settings(**overrides) -> SimpleNamespace:
+    values = {
+        "prefetch_enabled": True,
+        "prefetch_skip_expensive": True,
+        "prefetch_max_queue": 3,
+        "prefetch_max_redis_keys": 5000,
+        "prefetch_min_interval_sec": 10,
+        "prefetch_global_burst": 40,
+        "prefetch_global_refill_per_sec": 2.0,
+        "prefetch_district_burst": 2,
+        "prefetch_district_refill_per_sec": 0.4,
+        "redis_url": "redis://cache:6379/0",
+        "broker_url": "redis://cache:6379/0",
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def lua_redis():
+    """In-process Redis that runs the real decision script."""
+
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    try:
+        client.eval("return 1", 0)
+    except Exception:
+        pytest.skip("fakeredis was installed without Lua support (fakeredis[lua])")
+    return client
+
+
+def _check(settings, **kwargs):
+    params = {
+        "settings": settings,
+        "district_key": "D1",
+        "normalized_intent": {"intent": "student_monthly_spend"},
+        "router_decision": None,
+        "num_predicted_queries": 4,
+        "client": object(),
+    }
+    params.update(kwargs)
+    return should_throttle_prefetch(**params)
+
+
+def test_decision_is_a_single_script_call(monkeypatch) -> None:
+    calls = []
+
+    def fake_decide(client, keys, args):
+        calls.append((keys, args))
+        return [1, b"allowed", 0]
+
+    monkeypatch.setattr(prefetch_throttle, "_decide", fake_decide)
+
+    assert _check(_settings()) == (False, "")
+
+    (keys, args), = calls
+    assert keys == [
+        "invoice-agent-broker:small",
+        "prefetch:cooldown:D1",
+        "prefetch:bucket:global",
+        "prefetch:bucket:district:D1",
+        "prefetch:decisions",
+    ]
+    # A batch bigger than the district burst still fits an empty bucket.
+    assert args[3] == 4 and args[7] == 4
+    assert args[2] == 10_000
+
+
+def test_script_admits_then_enforces_the_cooldown(lua_redis) -> None:
+    assert _check(_settings(), client=lua_redis) == (False, "")
+    assert _check(_settings(), client=lua_redis) == (True, "min_interval")
+
+    assert lua_redis.hgetall("prefetch:decisions") == {b"allowed": b"1", b"min_interval": b"1"}
+    assert lua_redis.pttl("prefetch:cooldown:D1") > 9_000
+    # Both buckets paid for the four predicted queries.
+    assert float(lua_redis.hget("prefetch:bucket:global", "tokens")) == 36
+    assert float(lua_redis.hget("prefetch:bucket:district:D1", "tokens")) == 0
+    assert lua_redis.pttl("prefetch:bucket:district:D1") > 0
+
+
+def test_script_drains_the_district_bucket(lua_redis) -> None:
+    settings = _settings(prefetch_min_interval_sec=0)
+    decisions = [
+        _check(settings, client=lua_redis, num_predicted_queries=1) for _ in range(3)
+    ]
+
+    assert decisions == [(False, ""), (False, ""), (True, "district_rate")]
+    # Another district still has its own bucket.
+    assert _check(settings, client=lua_redis, district_key="D2", num_predicted_queries=1) == (
+        False,
+        "",
+    )
+
+
+def test_script_checks_backlog_and_key_count_first(lua_redis) -> None:
+    lua_redis.rpush(prefetch_throttle._queue_key(), *range(4))
+    assert _check(_settings(), client=lua_redis) == (True, "queue_depth")
+
+    lua_redis.delete(prefetch_throttle._queue_key())
+    lua_redis.set("analytics_cache:k", "v")
+    assert _check(_settings(prefetch_max_redis_keys=1), client=lua_redis) == (
+        True,
+        "redis_keys",
+    )
+    assert not lua_redis.exists("prefetch:cooldown:D1")
+
+
+def test_cheap_checks_skip_redis(monkeypatch) -> None:
+    def fail(*_args, **_kwargs):
+        raise AssertionError("Redis should not be consulted")
+
+    monkeypatch.setattr(prefetch_throttle, "_decide", fail)
+
+    assert _check(_settings(prefetch_enabled=False)) == (True, "disabled")
+    assert _check(_settings(), normalized_intent={"intent": "district_summary"}) == (
+        True,
+        "expensive",
+    )
+
+
+def test_separate_broker_depth_is_measured_there(monkeypatch) -> None:
+    calls = []
+    broker = SimpleNamespace(llen=lambda key: 7)
+    monkeypatch.setattr(prefetch_throttle, "redis_client", lambda url: broker)
+    monkeypatch.setattr(
+        prefetch_throttle,
+        "_decide",
+        lambda client, keys, args: calls.append((keys, args)) or [0, "queue_depth", 7],
+    )
+
+    assert _check(_settings(broker_url="redis://broker:6379/0")) == (True, "queue_depth")
+    assert calls[0][0][0] == "" and calls[0][1][-1] == 7
+
+
+def test_redis_failure_throttles(monkeypatch) -> None:
+    def boom(*_args, **_kwargs):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(prefetch_throttle, "_decide", boom)
+
+    assert _check(_settings()) == (True, "unavailable")
@@ -0,0 +1,97 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents.query_cache import (
+    build_entry,
+    canonical_intent,
+    intent_cache_key,
+    normalize_query,
+    query_cache_key,
+    state_digest,
+)
+
+
+def test_normalize_query_ignores_case_spacing_and_trailing_punctuation() -> None:
+    assert normalize_query("  Total   spend for Aug? ") == "total spend for aug"
+    assert query_cache_key("Total spend?", "D1", None) == query_cache_key(
+        "total  spend", "D1", None
+    )
+
+
+def test_key_separates_districts_and_conversation_topics() -> None:
+    state = {"active_topic": {"type": "student", "value": "Ana"}}
+
+    base = query_cache_key("how many hours", "D1", state)
+
+    assert base != query_cache_key("how many hours", "D2", state)
+    assert base != query_cache_key(
+        "how many hours", "D1", {"active_topic": {"type": "student", "value": "Ben"}}
+    )
+
+
+def test_state_digest_ignores_per_turn_bookkeeping() -> None:
+    state = {"last_month": "August", "history": [], "latest_user_message": "a"}
+    later = {
+        "last_month": "August",
+        "history": [{"role": "user", "content": "a"}],
+        "latest_user_message": "b",
+        "last_session_id": "s1",
+    }
+
+    assert state_digest(state) == state_digest(later)
+    assert state_digest(None) == state_digest({})
+
+
+def test_build_entry_copies_next_state() -> None:
+    state = {"last_plan_kind": "spend"}
+
+    entry = build_entry("abc", state)
+    state["last_plan_kind"] = "hours"
+
+    assert entry == {"intent_key": "abc", "state": {"last_plan_kind": "spend"}}
+    assert build_entry("abc", None)["state"] is None
+
+
+def test_data_version_bump_changes_both_cache_keys() -> None:
+    intent = {"intent": "student_monthly_spend", "entities": {"student_name": "Ana"}}
+
+    assert query_cache_key("spend", "D1", None, data_version=3) != query_cache_key(
+        "spend", "D1", None, data_version=4
+    )
+    assert intent_cache_key(intent, "D1", 3) == intent_cache_key(dict(intent), "D1", 3)
+    assert intent_cache_key(intent, "D1", 3) != intent_cache_key(intent, "D1", 4)
+    assert intent_cache_key(intent, "D1", 3) != intent_cache_key(intent, "D2", 3)
+
+
+def test_intent_key_ignores_spelling_that_does_not_change_the_answer() -> None:
+    user = {
+        "intent": "student_monthly_hours",
+        "entities": {
+            "student_name": "Ana  Lopez ",
+            "clinician_name": None,
+            "student_name_candidates": ["Ana Lopez", "Ana Ruiz"],
+        },
+        "time_period": None,
+        "scope": "single_student",
+        "requires_clarification": False,
+        "clarification_needed": [],
+    }
+    prefetch = {
+        "intent": "student_monthly_hours",
+        "entities": {"student_name": "ana lopez"},
+        "scope": "single_student",
+    }
+
+    assert canonical_intent(prefetch) == canonical_intent(user)
+    assert intent_cache_key(user, "D1", 3) == intent_cache_key(prefetch, "D1", 3)
+    assert intent_cache_key(user, "D1", 3) != intent_cache_key(
+        {**prefetch, "intent": "student_monthly_spend"}, "D1", 3
+    )
+    # Unresolved names keep their candidates apart.
+    unresolved = {"intent": "student_monthly_hours", "entities": {"student_name_candidates": ["A"]}}
+    assert canonical_intent(unresolved)["entities"] == {"student_name_candidates": ["A"]}
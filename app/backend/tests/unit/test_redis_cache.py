@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.core import redis_cache
+from app.backend.src.core.codec import PayloadCodec
+from app.backend.src.core.redis_cache import LocalCacheTier, RedisAnalyticsCache
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+
+def _cache(monkeypatch, **kwargs) -> tuple[RedisAnalyticsCache, _FakeRedis]:
+    monkeypatch.setattr(redis_cache, "_ensure_invalidation_listener", lambda url: None)
+    cache = RedisAnalyticsCache(key_prefix="test", **kwargs)
+    fake = _FakeRedis()
+    cache.client = fake
+    return cache, fake
+
+
+def test_hot_keys_are_served_from_memory(monkeypatch) -> None:
+    cache, fake = _cache(monkeypatch, l1_max_bytes=1024, l1_ttl_seconds=60)
+    fake.store["test:k"] = json.dumps({"text": "cached"}).encode("utf-8")
+
+    assert cache.get("k") == {"text": "cached"}
+    assert cache.get("k") == {"text": "cached"}
+    assert fake.reads == 1
+
+    payload = {"text": "written"}
+    cache.set("w", payload)
+    payload["text"] = "mutated"
+    assert cache.get("w") == {"text": "written"}
+    assert fake.reads == 1
+
+
+def test_local_tier_evicts_by_bytes_and_expires() -> None:
+    tier = LocalCacheTier(max_bytes=10, ttl_seconds=60)
+    tier.put("a", "A", 4)
+    tier.put("b", "B", 4)
+    tier.get("a")
+    tier.put("c", "C", 4)
+    tier.put("huge", "H", 11)
+
+    assert [tier.get(key)[0] for key in ["a", "b", "c", "huge"]] == [True, False, True, False]
+    assert tier.current_bytes == 8
+
+    expired = LocalCacheTier(max_bytes=10, ttl_seconds=0)
+    expired.put("a", "A", 1)
+    assert expired.get("a") == (False, None)
+    assert expired.current_bytes == 0
+
+
+def test_local_tier_charges_uncompressed_size(monkeypatch) -> None:
+    codec = PayloadCodec.from_spec("json+zlib", compress_min_bytes=64)
+    cache, fake = _cache(monkeypatch, l1_max_bytes=1 << 20, l1_ttl_seconds=60, codec=codec)
+    rows = [{"student": "Ana Lopez", "total_cost": 100}] * 200
+    serialized = len(json.dumps(rows, separators=(",", ":")))
+
+    cache.set("k", rows)
+
+    assert len(fake.store["test:k"]) < serialized // 10
+    assert cache.local.current_bytes == serialized
+
+    cache.local.clear()
+    assert cache.get("k") == rows
+    assert cache.local.current_bytes == serialized
+
+
+def test_district_invalidation_drops_only_that_district(monkeypatch) -> None:
+    cache, fake = _cache(monkeypatch, l1_max_bytes=1024, l1_ttl_seconds=60)
+    cache.set("d1", {"v": 1}, district_key="D1")
+    cache.set("d2", {"v": 2}, district_key="D2")
+    fake.store.clear()
+
+    redis_cache._apply_invalidation(json.dumps({"district_key": "D1"}))
+
+    assert cache.get("d1") is None
+    assert cache.get("d2") == {"v": 2}
+
+
+def test_l1_is_off_by_default(monkeypatch) -> None:
+    cache, fake = _cache(monkeypatch)
+    cache.set("k", {"v": 1})
+    cache.get("k")
+    cache.get("k")
+
+    assert cache.local is None
+    assert fake.reads == 2
@@ -22,6 +22,8 @@ def test_generate_presigned_url_uses_sigv4(monkeypatch: pytest.MonkeyPatch) -> N
         aws_access_key_id="test",
         aws_secret_access_key="secret",
         local_storage_path="/tmp/invoice-agent",
+        s3_multipart_part_size_mb=16,
+        s3_multipart_max_concurrency=4,
     )
 
     def fake_boto3_client(service_name: str, **kwargs: object) -> Mock:
@@ -39,3 +41,128 @@ def test_generate_presigned_url_uses_sigv4(monkeypatch: pytest.MonkeyPatch) -> N
     assert url == "https://example.com/presigned"
     assert captured_config is not None
     assert getattr(captured_config, "signature_version", None) == "s3v4"
+
+
+class _FakeMultipartClient:
+    def __init__(self) -> None:
+        self.parts: dict[int, bytes] = {}
+        self.completed: list[dict[str, object]] | None = None
+        self.aborted = False
+        self.put_body: bytes | None = None
+
+    def create_multipart_upload(self, **kwargs: object) -> dict[str, str]:
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, *, PartNumber: int, Body: bytes, **kwargs: object) -> dict[str, str]:
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, *, MultipartUpload: dict, **kwargs: object) -> None:
+        self.completed = MultipartUpload["Parts"]
+
+    def abort_multipart_upload(self, **kwargs: object) -> None:
+        self.aborted = True
+
+    def put_object(self, *, Body: bytes, **kwargs: object) -> None:
+        self.put_body = Body
+
+
+def _writer(client: _FakeMultipartClient) -> s3.S3MultipartWriter:
+    return s3.S3MultipartWriter(
+        client,
+        "bucket",
+        "invoices/bundle.zip",
+        content_type="application/zip",
+        part_size=5 * 1024 * 1024,
+        max_concurrency=2,
+    )
+
+
+def test_multipart_writer_uploads_parts_in_order() -> None:
+    client = _FakeMultipartClient()
+    payload = bytes(range(256)) * (12 * 1024 * 1024 // 256)
+
+    with _writer(client) as stream:
+        for offset in range(0, len(payload), 1024 * 1024):
+            stream.write(payload[offset : offset + 1024 * 1024])
+
+    assert client.completed == [
+        {"PartNumber": 1, "ETag": "etag-1"},
+        {"PartNumber": 2, "ETag": "etag-2"},
+        {"PartNumber": 3, "ETag": "etag-3"},
+    ]
+    assert b"".join(client.parts[n] for n in sorted(client.parts)) == payload
+    assert client.put_body is None
+
+
+def test_multipart_writer_uses_single_put_for_small_streams() -> None:
+    client = _FakeMultipartClient()
+
+    with _writer(client) as stream:
+        stream.write(b"small")
+
+    assert client.put_body == b"small"
+    assert client.completed is None
+
+
+def test_multipart_writer_aborts_on_error() -> None:
+    client = _FakeMultipartClient()
+
+    with pytest.raises(RuntimeError):
+        with _writer(client) as stream:
+            stream.write(b"x" * (6 * 1024 * 1024))
+            raise RuntimeError("boom")
+
+    assert client.aborted
+    assert client.completed is None
+
+
+def test_multipart_writer_resumes_from_first_missing_part() -> None:
+    client = _FakeMultipartClient()
+    part = 5 * 1024 * 1024
+    payload = b"".join(bytes([n]) * part for n in range(1, 5))
+
+    # Parts 1, 2 and 4 finished before the upload was interrupted; 3 did not.
+    writer = s3.S3MultipartWriter(
+        client,
+        "bucket",
+        "invoices/bundle.zip",
+        content_type="application/zip",
+        part_size=part,
+        max_concurrency=2,
+        upload_id="upload-1",
+        completed_parts={1: "etag-1", 2: "etag-2", 4: "etag-4"},
+    )
+    assert writer.resume_offset == 2 * part
+
+    with writer as stream:
+        stream.write(payload[writer.resume_offset :])
+
+    assert client.completed == [
+        {"PartNumber": n, "ETag": f"etag-{n}"} for n in range(1, 5)
+    ]
+    assert client.parts[3] == payload[2 * part : 3 * part]
+    assert client.parts[4] == payload[3 * part :]
+
+
+def test_resumable_writer_keeps_upload_open_on_error() -> None:
+    client = _FakeMultipartClient()
+    writer = s3.S3MultipartWriter(
+        client,
+        "bucket",
+        "invoices/bundle.zip",
+        content_type="application/zip",
+        part_size=5 * 1024 * 1024,
+        max_concurrency=2,
+        resumable=True,
+    )
+
+    with pytest.raises(RuntimeError):
+        with writer as stream:
+            stream.write(b"x" * (6 * 1024 * 1024))
+            raise RuntimeError("boom")
+
+    assert not client.aborted
+    assert client.completed is None
+    assert writer.upload_id == "upload-1"
+    assert writer.completed_parts == {1: "etag-1"}
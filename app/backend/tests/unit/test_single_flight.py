@@ -0,0 +1,170 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents import district_analytics_agent as agent_module
+from app.backend.src.agents.district_analytics_agent import AgentContext, Workflow
+from app.backend.src.core.single_flight import RedisSingleFlight
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    def set(self, key, value, *, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+class _AsyncFakeRedis(_FakeRedis):
+    async def set(self, key, value, *, nx=False, px=None):
+        return _FakeRedis.set(self, key, value, nx=nx, px=px)
+
+    async def eval(self, script, numkeys, key, token):
+        return _FakeRedis.eval(self, script, numkeys, key, token)
+
+
+class _FakeCache:
+    def __init__(self) -> None:
+        self.store: dict[str, dict] = {}
+
+    async def aget(self, key, **_):
+        return self.store.get(key)
+
+
+def _workflow(monkeypatch, wait_sec: float = 5.0):
+    lock = RedisSingleFlight(key_prefix="test_inflight")
+    lock._async_client = _AsyncFakeRedis()
+    cache = _FakeCache()
+    monkeypatch.setattr(agent_module, "SINGLE_FLIGHT", lock)
+    monkeypatch.setattr(agent_module, "CACHE", cache)
+    monkeypatch.setattr(
+        agent_module,
+        "get_settings",
+        lambda: SimpleNamespace(
+            analytics_single_flight_enabled=True,
+            redis_enabled=True,
+            analytics_single_flight_wait_sec=wait_sec,
+        ),
+    )
+    workflow = Workflow.__new__(Workflow)
+    return workflow, lock, cache
+
+
+def _context() -> AgentContext:
+    return AgentContext(query="q", user_context={"district_key": "D1"}, native_async=True)
+
+
+def test_lease_is_exclusive_and_released_by_its_owner_only() -> None:
+    lock = RedisSingleFlight(key_prefix="test_inflight")
+    lock.client = _FakeRedis()
+
+    lease = lock.acquire("k")
+    assert lease is not None and lease.token
+    assert lock.acquire("k") is None
+
+    stale = type(lease)(lease.key, "someone-else")
+    lock.release(stale)
+    assert lock.acquire("k") is None
+
+    lock.release(lease)
+    assert lock.acquire("k") is not None
+
+
+def test_concurrent_requests_share_one_leader(monkeypatch) -> None:
+    workflow, lock, cache = _workflow(monkeypatch)
+
+    async def scenario():
+        contexts = [_context() for _ in range(5)]
+        leader = contexts[0]
+        assert await workflow._join_flight(leader, "k") is None
+        assert leader.flight_lease is not None
+
+        followers = [
+            asyncio.create_task(workflow._join_flight(context, "k")) for context in contexts[1:]
+        ]
+        await asyncio.sleep(0.1)
+        cache.store["k"] = {"text": "shared", "html": "<p>shared</p>"}
+        await workflow._release_flight(leader)
+        return contexts, await asyncio.gather(*followers)
+
+    contexts, responses = asyncio.run(scenario())
+
+    assert [response.text for response in responses] == ["shared"] * 4
+    assert all(context.flight_lease is None for context in contexts)
+    assert lock.async_client.store == {}
+
+
+def test_waiter_takes_over_when_leader_finishes_without_a_result(monkeypatch) -> None:
+    workflow, _, _ = _workflow(monkeypatch)
+
+    async def scenario():
+        leader, follower = _context(), _context()
+        await workflow._join_flight(leader, "k")
+        waiting = asyncio.create_task(workflow._join_flight(follower, "k"))
+        await asyncio.sleep(0.1)
+        await workflow._release_flight(leader)
+        return follower, await waiting
+
+    follower, response = asyncio.run(scenario())
+
+    assert response is None
+    assert follower.flight_lease is not None
+
+
+def test_waiter_falls_back_to_running_unlocked_after_timeout(monkeypatch) -> None:
+    workflow, _, _ = _workflow(monkeypatch, wait_sec=0.2)
+
+    async def scenario():
+        leader, follower = _context(), _context()
+        await workflow._join_flight(leader, "k")
+        return follower, await workflow._join_flight(follower, "k")
+
+    follower, response = asyncio.run(scenario())
+
+    assert response is None
+    assert follower.flight_lease is None
+
+
+def test_waiter_that_wins_the_lease_after_the_leader_cached_shares_the_result(
+    monkeypatch,
+) -> None:
+    workflow, lock, cache = _workflow(monkeypatch)
+    leader, follower = _context(), _context()
+    acquire = lock.aacquire
+    attempts = 0
+
+    async def _acquire(key):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 3:
+            # The leader finishes between the follower's poll and its retry.
+            cache.store["k"] = {"text": "shared", "html": "<p>shared</p>"}
+            await workflow._release_flight(leader)
+        return await acquire(key)
+
+    monkeypatch.setattr(lock, "aacquire", _acquire)
+
+    async def scenario():
+        await workflow._join_flight(leader, "k")
+        return await workflow._join_flight(follower, "k")
+
+    response = asyncio.run(scenario())
+
+    assert response is not None and response.text == "shared"
+    assert follower.flight_lease is None
+    assert lock.async_client.store == {}
@@ -0,0 +1,127 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+import pytest
+
+from app.backend.src.agents.stage_graph import (
+    Stage,
+    StageGraph,
+    StageHalt,
+    StageSpan,
+    critical_path,
+)
+
+
+def test_independent_stages_run_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=2)
+
+    def _waits(_):
+        # Both stages must be in flight at once for the barrier to release.
+        barrier.wait()
+        return "ok"
+
+    graph = StageGraph(
+        [
+            Stage("nlv", _waits),
+            Stage("entities", _waits),
+            Stage("resolve", lambda inputs: sorted(inputs), depends_on=("nlv", "entities")),
+        ]
+    )
+
+    result = graph.run()
+
+    assert result.results["resolve"] == ["entities", "nlv"]
+    assert result.spans["resolve"].start >= max(
+        result.spans["nlv"].end, result.spans["entities"].end
+    )
+
+
+def test_halt_skips_downstream_stages() -> None:
+    calls: list[str] = []
+
+    def _hit(_):
+        raise StageHalt("cached")
+
+    graph = StageGraph(
+        [
+            Stage("lookup", _hit),
+            Stage("expensive", lambda _: calls.append("expensive"), depends_on=("lookup",)),
+        ]
+    )
+
+    result = graph.run()
+
+    assert result.halted
+    assert result.halt_value == "cached"
+    assert calls == []
+
+
+def test_stage_errors_propagate() -> None:
+    def _boom(_):
+        raise RuntimeError("boom")
+
+    graph = StageGraph([Stage("a", _boom), Stage("b", lambda _: 1, depends_on=("a",))])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        graph.run()
+
+
+def test_graph_rejects_cycles() -> None:
+    with pytest.raises(ValueError):
+        StageGraph(
+            [
+                Stage("a", lambda _: None, depends_on=("b",)),
+                Stage("b", lambda _: None, depends_on=("a",)),
+            ]
+        )
+
+
+def test_critical_path_follows_latest_dependency() -> None:
+    spans = {
+        "fusion": StageSpan(0.0, 0.1),
+        "entities": StageSpan(0.0, 0.3),
+        "nlv": StageSpan(0.1, 1.0),
+        "resolve": StageSpan(1.0, 1.5),
+        "planner": StageSpan(1.5, 2.0),
+    }
+    deps = {"nlv": ("fusion",), "resolve": ("nlv", "entities")}
+
+    assert critical_path(spans, deps) == ["fusion", "nlv", "resolve", "planner"]
+
+
+def test_spans_share_origin() -> None:
+    origin = time.perf_counter()
+    graph = StageGraph([Stage("a", lambda _: time.sleep(0.01))])
+
+    result = graph.run(origin=origin)
+
+    assert result.spans["a"].start >= 0
+    assert result.spans["a"].duration >= 0.01
+
+
+def test_halt_does_not_wait_for_blocking_stragglers() -> None:
+    release = threading.Event()
+
+    def _slow(_):
+        release.wait(timeout=5)
+        return "late"
+
+    async def _hit(_):
+        raise StageHalt("cached")
+
+    graph = StageGraph([Stage("entities", _slow), Stage("cache", _hit)])
+
+    started = time.perf_counter()
+    try:
+        result = graph.run()
+        elapsed = time.perf_counter() - started
+    finally:
+        release.set()
+
+    assert result.halted and result.halt_value == "cached"
+    assert "entities" not in result.results
+    assert elapsed < 1.0
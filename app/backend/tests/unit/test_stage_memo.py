@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+from app.backend.src.agents.async_llm import run_model_async
+from app.backend.src.agents.insight_model import run_insight_model
+from app.backend.src.agents.ir import AnalyticsIR
+from app.backend.src.agents.stage_memo import StageMemo
+
+
+class FakeClient:
+    def __init__(self, content: str) -> None:
+        self.requests: list[dict] = []
+        self._content = content
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content=self._content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeAsyncClient(FakeClient):
+    async def _create(self, **kwargs):  # type: ignore[override]
+        return super()._create(**kwargs)
+
+
+class FakeRedisCache:
+    def __init__(self) -> None:
+        self.store: dict[str, object] = {}
+        self.ttls: dict[str, int | None] = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, *, ttl_seconds=None):
+        self.store[key] = value
+        self.ttls[key] = ttl_seconds
+
+
+def _run_insight(client, ir: AnalyticsIR, temperature: float = 0.1):
+    return run_insight_model(
+        ir=ir, client=client, model="m", system_prompt="sys", temperature=temperature
+    )
+
+
+def _ir(total: int = 10) -> AnalyticsIR:
+    return AnalyticsIR(text="", rows=[{"month": "Aug", "total": total}])
+
+
+def test_identical_requests_reuse_the_completion() -> None:
+    memo = StageMemo()
+    client = FakeClient(json.dumps({"insights": ["August only."]}))
+
+    first = _run_insight(memo.wrap(client, "insight_model"), _ir())
+    second = _run_insight(memo.wrap(client, "insight_model"), _ir())
+    _run_insight(memo.wrap(client, "insight_model"), _ir(total=20))
+
+    assert first == second == {"insights": ["August only."]}
+    assert len(client.requests) == 2
+    assert memo.stats()["insight_model"]["lru"] == 1
+    assert memo.stats()["insight_model"]["miss"] == 2
+
+
+def test_redis_tier_is_shared_and_uses_stage_ttl() -> None:
+    redis_cache = FakeRedisCache()
+    client = FakeClient(json.dumps({"insights": ["x"]}))
+    writer = StageMemo(redis_cache=redis_cache, stage_ttls={"insight_model": 42})
+
+    _run_insight(writer.wrap(client, "insight_model"), _ir())
+
+    assert list(redis_cache.ttls.values()) == [42]
+
+    reader = StageMemo(redis_cache=redis_cache)
+    assert _run_insight(reader.wrap(client, "insight_model"), _ir()) == {"insights": ["x"]}
+    assert len(client.requests) == 1
+    assert reader.stats()["insight_model"]["redis"] == 1
+
+
+def test_lru_evicts_oldest_entries() -> None:
+    memo = StageMemo(max_entries=1)
+    client = FakeClient(json.dumps({"insights": []}))
+
+    _run_insight(memo.wrap(client, "insight_model"), _ir(1))
+    _run_insight(memo.wrap(client, "insight_model"), _ir(2))
+    _run_insight(memo.wrap(client, "insight_model"), _ir(1))
+
+    assert len(client.requests) == 3
+
+
+def test_async_client_is_memoized() -> None:
+    memo = StageMemo()
+    client = FakeAsyncClient(json.dumps({"insights": ["y"]}))
+
+    async def _twice():
+        for _ in range(2):
+            await run_model_async(
+                run_insight_model,
+                client=memo.awrap(client, "insight_model"),
+                ir=_ir(),
+                model="m",
+                system_prompt="sys",
+                temperature=0.1,
+            )
+
+    asyncio.run(_twice())
+
+    assert len(client.requests) == 1
+    assert memo.stats()["insight_model"]["hit_rate"] == 0.5
@@ -0,0 +1,113 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_invoice.db")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.backend.src.api import storage as storage_api
+from app.backend.src.core.storage import LocalFilesystemStorage
+from app.backend.src.services import s3
+
+
+@pytest.fixture
+def local_settings(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> SimpleNamespace:
+    settings = SimpleNamespace(
+        aws_region=None,
+        aws_s3_bucket="local",
+        aws_access_key_id=None,
+        aws_secret_access_key=None,
+        local_storage_path=str(tmp_path),
+        local_storage_base_url="/api/storage/local",
+        local_storage_signing_key="test-key",
+    )
+    monkeypatch.setattr(s3, "get_settings", lambda: settings)
+    return settings
+
+
+def test_local_backend_selected_for_local_bucket(local_settings: SimpleNamespace) -> None:
+    backend = s3.get_storage_backend()
+
+    assert isinstance(backend, LocalFilesystemStorage)
+
+    key = s3.upload_bytes(b"%PDF-1", filename="a.pdf", key="invoices/x/a.pdf")
+
+    assert key == "invoices/x/a.pdf"
+    assert backend.exists(key)
+    assert backend.get(key) == b"%PDF-1"
+
+
+def test_local_backend_rejects_keys_outside_root(tmp_path: Path) -> None:
+    backend = LocalFilesystemStorage(tmp_path, base_url="/files", signing_key="k")
+
+    with pytest.raises(ValueError):
+        backend.put("../escape.txt", b"nope")
+
+
+def test_local_download_route_serves_signed_ranges(local_settings: SimpleNamespace) -> None:
+    s3.upload_bytes(b"0123456789", filename="blob.bin", key="invoices/x/blob.bin")
+    url = s3.generate_presigned_url("invoices/x/blob.bin", download_name="blob.bin")
+
+    app = FastAPI()
+    app.include_router(storage_api.router, prefix="/api")
+    client = TestClient(app)
+
+    parts = urlsplit(url)
+    target = f"{parts.path}?{parts.query}"
+
+    full = client.get(target)
+    assert full.status_code == 200
+    assert full.content == b"0123456789"
+    assert 'filename="blob.bin"' in full.headers["content-disposition"]
+
+    partial = client.get(target, headers={"Range": "bytes=2-5"})
+    assert partial.status_code == 206
+    assert partial.content == b"2345"
+
+    tampered = client.get(target.replace("signature=", "signature=0"))
+    assert tampered.status_code == 403
+
+
+def test_local_urls_require_a_signing_key(tmp_path: Path) -> None:
+    backend = LocalFilesystemStorage(tmp_path, base_url="/files", signing_key=None)
+    backend.put("invoices/x/a.pdf", b"%PDF-1")
+
+    with pytest.raises(RuntimeError):
+        backend.url("invoices/x/a.pdf")
+    # Without a key there is nothing to forge a signature against.
+    assert not backend.verify("invoices/x/a.pdf", expires=2**40, signature="")
+
+
+def test_unconfigured_local_key_still_serves_job_downloads(
+    local_settings: SimpleNamespace,
+) -> None:
+    from app.backend.src.api.jobs import _serialize_job
+
+    local_settings.local_storage_signing_key = None
+    s3._ephemeral_signing_key.cache_clear()
+    s3.upload_bytes(b"PK", filename="batch.zip", key="jobs/j1/batch.zip")
+    job = SimpleNamespace(
+        id="j1",
+        filename="batch.csv",
+        status="completed",
+        queue="small",
+        result_key="jobs/j1/batch.zip",
+        created_at=None,
+        message=None,
+    )
+
+    url = _serialize_job(job)["download_url"]
+
+    app = FastAPI()
+    app.include_router(storage_api.router, prefix="/api")
+    parts = urlsplit(url)
+    response = TestClient(app).get(f"{parts.path}?{parts.query}")
+    assert response.status_code == 200
+    assert response.content == b"PK"
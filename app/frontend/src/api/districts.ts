@@ -54,6 +54,7 @@ export interface DistrictVendorInvoice {
   pdf_url: string | null;
   pdf_s3_key?: string | null;
   timesheet_csv_url: string | null;
+  // Empty in the overview; load a month with fetchVendorMonthStudents.
   students: DistrictVendorStudent[];
 }
 
@@ -86,6 +87,16 @@ export interface DistrictVendorProfile {
   invoices: Record<number, DistrictVendorInvoice[]>;
 }
 
+export interface DistrictVendorStudentPage {
+  vendor_id: number;
+  year: number;
+  month: number;
+  page: number;
+  page_size: number;
+  total: number;
+  students: DistrictVendorStudent[];
+}
+
 export interface DistrictVendorOverview {
   generated_at: string;
   vendors: DistrictVendorProfile[];
@@ -138,6 +149,21 @@ export async function fetchDistrictVendors(
   return districtFetch<DistrictVendorOverview>("/districts/vendors", accessToken);
 }
 
+export async function fetchVendorMonthStudents(
+  accessToken: string,
+  vendorId: number,
+  year: number,
+  month: number,
+  page = 1,
+  pageSize = 500,
+): Promise<DistrictVendorStudentPage> {
+  const query = new URLSearchParams({ page: String(page), page_size: String(pageSize) });
+  return districtFetch<DistrictVendorStudentPage>(
+    `/districts/vendors/${vendorId}/months/${year}/${month}/students?${query}`,
+    accessToken,
+  );
+}
+
 export async function fetchDistrictMemberships(
   accessToken: string,
 ): Promise<DistrictMembershipCollection> {
@@ -11,6 +11,7 @@ import {
   updateDistrictProfile,
   addDistrictMembership,
   activateDistrictMembership,
+  fetchVendorMonthStudents,
 } from "../api/districts";
 import { formatPostalAddress } from "../api/common";
 import {
@@ -338,6 +339,50 @@ const aggregateStudentEntries = (entries) => {
     });
 };
 
+const normalizeStudentEntry = (student, studentIndex) => {
+  const trimmedName =
+    typeof student.name === "string" && student.name.trim().length
+      ? student.name.trim()
+      : "Unknown student";
+  const normalizedKey =
+    trimmedName !== "Unknown student"
+      ? trimmedName.toLowerCase()
+      : null;
+  const rawStudentId =
+    typeof student.student_id === "string" && student.student_id.trim().length
+      ? student.student_id.trim()
+      : typeof student.student_id === "number"
+      ? String(student.student_id)
+      : null;
+  const amountValue =
+    typeof student.amount === "number"
+      ? student.amount
+      : Number(student.amount) || 0;
+  const serviceLabel =
+    typeof student.service === "string" && student.service.trim().length
+      ? student.service.trim()
+      : null;
+
+  return {
+    id:
+      rawStudentId ??
+      (typeof student.id === "string"
+        ? student.id
+        : `student-${student.id ?? studentIndex}`),
+    originalLineItemId: student.id,
+    studentId: rawStudentId,
+    originalStudentId: rawStudentId,
+    name: trimmedName,
+    studentKey: normalizedKey,
+    service: serviceLabel,
+    amount: currencyFormatter.format(amountValue),
+    amountValue,
+    pdfUrl: student.pdf_url ?? null,
+    pdfS3Key: student.pdf_s3_key ?? null,
+    timesheetUrl: student.timesheet_url ?? null,
+  };
+};
+
 const collectVendorInvoices = (profiles) =>
   profiles.flatMap((vendor) =>
     Object.entries(vendor.invoices ?? {}).flatMap(([yearString, invoices]) => {
@@ -839,6 +884,8 @@ export default function DistrictDashboard({
   const [invoiceDocumentsError, setInvoiceDocumentsError] = useState(null);
   const [invoiceDocumentCount, setInvoiceDocumentCount] = useState(0);
   const invoiceDocumentsCacheRef = useRef({});
+  const [invoiceStudents, setInvoiceStudents] = useState(null);
+  const invoiceStudentsCacheRef = useRef({});
   const [exportingInvoiceCsv, setExportingInvoiceCsv] = useState(false);
 
   const activeItem = menuItems.find((item) => item.key === activeKey) ?? menuItems[0];
@@ -868,49 +915,7 @@ export default function DistrictDashboard({
                   typeof invoice.month_index === "number"
                     ? invoice.month_index
                     : MONTH_INDEX[invoice.month] ?? -1;
-                const students = (invoice.students ?? []).map((student, studentIndex) => {
-                  const trimmedName =
-                    typeof student.name === "string" && student.name.trim().length
-                      ? student.name.trim()
-                      : "Unknown student";
-                  const normalizedKey =
-                    trimmedName !== "Unknown student"
-                      ? trimmedName.toLowerCase()
-                      : null;
-                  const rawStudentId =
-                    typeof student.student_id === "string" && student.student_id.trim().length
-                      ? student.student_id.trim()
-                      : typeof student.student_id === "number"
-                      ? String(student.student_id)
-                      : null;
-                  const amountValue =
-                    typeof student.amount === "number"
-                      ? student.amount
-                      : Number(student.amount) || 0;
-                  const serviceLabel =
-                    typeof student.service === "string" && student.service.trim().length
-                      ? student.service.trim()
-                      : null;
-
-                  return {
-                    id:
-                      rawStudentId ??
-                      (typeof student.id === "string"
-                        ? student.id
-                        : `student-${student.id ?? studentIndex}`),
-                    originalLineItemId: student.id,
-                    studentId: rawStudentId,
-                    originalStudentId: rawStudentId,
-                    name: trimmedName,
-                    studentKey: normalizedKey,
-                    service: serviceLabel,
-                    amount: currencyFormatter.format(amountValue),
-                    amountValue,
-                    pdfUrl: student.pdf_url ?? null,
-                    pdfS3Key: student.pdf_s3_key ?? null,
-                    timesheetUrl: student.timesheet_url ?? null,
-                  };
-                });
+                const students = (invoice.students ?? []).map(normalizeStudentEntry);
               return {
                 month: invoice.month,
                 monthIndex,
@@ -1245,30 +1250,116 @@ export default function DistrictDashboard({
       districtProfile?.mailing_address?.postal_code,
     ],
   );
-  const activeInvoiceDetails = useMemo(() => {
+  const selectedInvoiceRecord = useMemo(() => {
     if (!selectedVendor || !selectedInvoiceKey) {
       return null;
     }
 
-    const invoiceRecord =
+    return (
       selectedVendor.invoices[selectedInvoiceKey.year]?.find(
         (invoice) => invoice.month === selectedInvoiceKey.month,
-      ) ?? null;
+      ) ?? null
+    );
+  }, [selectedVendor, selectedInvoiceKey]);
+
+  // The vendor overview only carries monthly totals; student detail for the
+  // open month is fetched page by page from the students endpoint.
+  useEffect(() => {
+    let ignore = false;
+    setInvoiceStudents(null);
+
+    if (!isAuthenticated || !selectedInvoiceRecord || !selectedInvoiceKey) {
+      return () => {
+        ignore = true;
+      };
+    }
+    if (selectedInvoiceRecord.students?.length) {
+      return () => {
+        ignore = true;
+      };
+    }
+
+    const vendorNumericId = Number(selectedVendorId);
+    const monthNumber = resolveMonthNumber(
+      selectedInvoiceRecord.month,
+      selectedInvoiceRecord.monthIndex,
+    );
+    if (!Number.isFinite(vendorNumericId) || vendorNumericId <= 0 || !monthNumber) {
+      return () => {
+        ignore = true;
+      };
+    }
+
+    const cacheKey = `${vendorNumericId}-${selectedInvoiceKey.year}-${monthNumber}`;
+    const cached = invoiceStudentsCacheRef.current[cacheKey];
+    if (cached) {
+      setInvoiceStudents(cached);
+      return () => {
+        ignore = true;
+      };
+    }
+
+    (async () => {
+      try {
+        const token = await getAccessTokenSilently();
+        const collected = [];
+        let page = 1;
+        for (;;) {
+          const result = await fetchVendorMonthStudents(
+            token,
+            vendorNumericId,
+            selectedInvoiceKey.year,
+            monthNumber,
+            page,
+          );
+          const rows = result?.students ?? [];
+          collected.push(...rows);
+          if (!rows.length || collected.length >= (result?.total ?? 0)) {
+            break;
+          }
+          page += 1;
+        }
+        const normalized = collected.map(normalizeStudentEntry);
+        invoiceStudentsCacheRef.current[cacheKey] = normalized;
+        if (!ignore) {
+          setInvoiceStudents(normalized);
+        }
+      } catch (error) {
+        console.error("district_vendor_month_students_failed", error);
+        if (!ignore) {
+          setInvoiceStudents([]);
+        }
+      }
+    })();
+
+    return () => {
+      ignore = true;
+    };
+  }, [
+    getAccessTokenSilently,
+    isAuthenticated,
+    selectedInvoiceKey,
+    selectedInvoiceRecord,
+    selectedVendorId,
+  ]);
 
-    if (!invoiceRecord) {
+  const activeInvoiceDetails = useMemo(() => {
+    if (!selectedInvoiceRecord || !selectedInvoiceKey) {
       return null;
     }
 
     const aggregatedStudents = aggregateStudentEntries(
-      invoiceRecord.students ?? [],
+      selectedInvoiceRecord.students?.length
+        ? selectedInvoiceRecord.students
+        : invoiceStudents ?? [],
     );
 
     return {
-      ...invoiceRecord,
+      ...selectedInvoiceRecord,
       year: selectedInvoiceKey.year,
       students: aggregatedStudents,
     };
-  }, [selectedVendor, selectedInvoiceKey]);
+  }, [invoiceStudents, selectedInvoiceKey, selectedInvoiceRecord]);
 
   const selectedMonthNumber = useMemo(() => {
     if (!activeInvoiceDetails) {
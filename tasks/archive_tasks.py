@@ -0,0 +1,39 @@
+"""Celery tasks that pre-build district-facing invoice archives."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import structlog
+
+from app.backend.src.db import session_scope
+from app.backend.src.services.invoice_archives import build_vendor_month_archive
+from .worker import celery
+
+LOGGER = structlog.get_logger(__name__)
+
+
+@celery.task(name="tasks.medium.build_vendor_month_archive")
+def build_vendor_month_archive_task(
+    vendor_id: int, year: int, month: int
+) -> dict[str, Any]:
+    """Assemble the vendor-month ZIP so downloads only need a presigned URL."""
+
+    try:
+        with session_scope() as session:
+            archive = build_vendor_month_archive(session, vendor_id, year, month)
+            key = archive.s3_key if archive else None
+    except Exception as exc:  # pragma: no cover - logged and re-raised
+        LOGGER.error(
+            "invoice_archive_task_failed",
+            vendor_id=vendor_id,
+            year=year,
+            month=month,
+            error=str(exc),
+        )
+        raise
+
+    return {"vendor_id": vendor_id, "year": year, "month": month, "s3_key": key}
+
+
+__all__ = ["build_vendor_month_archive_task"]
@@ -11,11 +11,31 @@ import structlog
 
 from app.backend.src.agents.invoice_agent import InvoiceAgent
 from app.backend.src.services.metrics import job_duration_seconds
+from .archive_tasks import build_vendor_month_archive_task
 from .worker import celery
 
 LOGGER = structlog.get_logger(__name__)
 
 
+def _enqueue_archive_build(vendor_id: int, year: int | None, month: int | None) -> None:
+    """Queue the vendor-month archive rebuild; failures never fail ingestion."""
+
+    if not year or not month:
+        return
+    try:
+        build_vendor_month_archive_task.apply_async(
+            args=[vendor_id, year, month], queue="medium"
+        )
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning(
+            "invoice_archive_enqueue_failed",
+            vendor_id=vendor_id,
+            year=year,
+            month=month,
+            error=str(exc),
+        )
+
+
 @celery.task(name="tasks.process_invoice")
 def process_invoice(
     upload_path: str,
@@ -50,6 +70,8 @@ def process_invoice(
             vendor_id=vendor_id,
             job_id=job_id,
         )
+        if result.get("invoice_ids"):
+            _enqueue_archive_build(vendor_id, agent.service_year, agent.service_month_num)
         return result
     except Exception as exc:  # pragma: no cover - logged and re-raised
         LOGGER.error(
@@ -13,28 +13,41 @@ LOGGER = structlog.get_logger(__name__)
 
 @celery.task(name="tasks.small.prefetch_analytics")
 def prefetch_analytics(query: str, context: dict[str, Any] | None = None, queue_name: str | None = None) -> None:
-    """Background Celery task to prefetch analytics reports using the REAL agent."""
+    """Background Celery task to prefetch analytics reports using the REAL agent.
+
+    Jobs that carry a ``prefetch_intent`` are answered with one SQL query and
+    the MV table templates; only intents without a deterministic plan run the
+    model chain.
+    """
 
     if context is None:
         context = {}
 
     try:
         # Correct import: call the REAL district analytics pipeline
-        from app.backend.src.agents.district_analytics_agent import run_analytics_agent
+        from app.backend.src.agents.district_analytics_agent import (
+            prefetch_analytics_report,
+            run_analytics_agent,
+        )
     except Exception as exc:  # pragma: no cover - defensive
         LOGGER.warning("prefetch_import_failed", error=str(exc))
         return
 
     try:
-        run_analytics_agent(
-            query=query,
-            user_context=context,
+        templated = bool(context.get("prefetch_intent")) and prefetch_analytics_report(
+            query, context
         )
+        if not templated:
+            run_analytics_agent(
+                query=query,
+                user_context=context,
+            )
         LOGGER.info(
             "prefetch_analytics_completed",
             query=query,
             district_key=context.get("district_key"),
             session_id=context.get("session_id"),
+            templated=templated,
         )
     except Exception as exc:  # pragma: no cover - defensive
         LOGGER.warning(
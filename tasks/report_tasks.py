@@ -0,0 +1,26 @@
+"""Celery tasks for the persisted analytics report store."""
+
+from __future__ import annotations
+
+import structlog
+
+from .worker import celery
+
+LOGGER = structlog.get_logger(__name__)
+
+
+@celery.task(name="tasks.medium.evict_materialized_reports")
+def evict_materialized_reports() -> dict[str, int]:
+    """Hold every district's materialized reports to the configured budgets."""
+
+    from app.backend.src.db import get_engine
+    from app.backend.src.services.materialized_report_service import (
+        evict_materialized_reports as _evict,
+    )
+
+    try:
+        evicted = _evict(get_engine())
+    except Exception as exc:  # pragma: no cover - defensive
+        LOGGER.warning("materialized_report_eviction_failed", error=str(exc))
+        return {}
+    return evicted
@@ -103,8 +103,17 @@ celery = Celery(
 # Ensure Celery knows about the project task modules. Without this explicit
 # registration the worker starts successfully but never sees the
 # `tasks.process_invoice` task, so uploads remain stuck in the ``queued`` state
-# forever. We also register analytics prefetch tasks.
-celery.conf.update(include=["tasks.invoice_tasks", "tasks.prefetch_tasks"])
+# forever. We also register analytics prefetch, archive, summary and report
+# store tasks.
+celery.conf.update(
+    include=[
+        "tasks.invoice_tasks",
+        "tasks.prefetch_tasks",
+        "tasks.archive_tasks",
+        "tasks.summary_tasks",
+        "tasks.report_tasks",
+    ]
+)
 
 ssl_options = _build_ssl_options()
 
@@ -131,6 +140,17 @@ celery_conf: dict[str, object] = {
         "global_keyprefix": "invoice-agent-result:",
     },
     "broker_connection_retry_on_startup": True,
+    # Picked up when celery beat runs alongside the workers.
+    "beat_schedule": {
+        "reconcile-summary-tables": {
+            "task": "tasks.medium.reconcile_summary_tables",
+            "schedule": float(settings.summary_reconcile_interval_sec),
+        },
+        "evict-materialized-reports": {
+            "task": "tasks.medium.evict_materialized_reports",
+            "schedule": float(settings.materialized_report_eviction_interval_sec),
+        },
+    },
 }
 
 if settings.broker_url.startswith("rediss://"):
@@ -147,6 +167,15 @@ celery.conf.update(**celery_conf)
 from . import invoice_tasks  # noqa: F401  # isort: skip
 
 
+@signals.worker_init.connect
+def _install_session_hooks(**_: Any) -> None:
+    """Keep district data versions current for invoices written by tasks."""
+
+    from app.backend.src.services.district_cache import install_data_version_hooks
+
+    install_data_version_hooks()
+
+
 @signals.worker_ready.connect
 def _log_worker_configuration(sender: Any | None = None, **_: Any) -> None:
     """Emit structured worker configuration details after startup."""